@@ -88,6 +88,7 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'tournament_creator.read_replica.replica_status',
             ],
         },
     },
@@ -99,20 +100,74 @@ WSGI_APPLICATION = 'ddc.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# SQLite tuning applied to every new connection. busy_timeout matches the
+# driver's 'timeout' so both layers wait equally long for the write lock;
+# mmap and a larger page cache let hot reads skip syscalls, and temp tables
+# (sorting for standings queries) stay in memory.
+SQLITE_BUSY_TIMEOUT = 20  # seconds
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': SQLITE_BUSY_TIMEOUT * 1000,
+    'mmap_size': config('SQLITE_MMAP_SIZE', default=128 * 1024 * 1024, cast=int),
+    'cache_size': config('SQLITE_CACHE_SIZE', default=-32000, cast=int),  # negative = KiB
+    'temp_store': 'MEMORY',
+}
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Keep connections open across requests so the PRAGMAs above run once
+        # per worker thread instead of once per request; health checks replace
+        # a connection that went bad instead of failing the request.
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=600, cast=int),
+        'CONN_HEALTH_CHECKS': True,
         'OPTIONS': {
             # Wait for locks instead of failing with "database is locked" when
             # several gunicorn workers record scores concurrently.
-            'timeout': 20,
+            'timeout': SQLITE_BUSY_TIMEOUT,
             'transaction_mode': 'IMMEDIATE',
-            'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+            'init_command': ' '.join(f'PRAGMA {name}={value};' for name, value in SQLITE_PRAGMAS.items()),
         },
     }
 }
 
+# Optional read replica for spectator traffic: `manage.py refresh_read_replica`
+# keeps a snapshot of the database at this path, and GET page views read from
+# it while scores are written to the primary (tournament_creator/read_replica.py).
+# Empty disables it. A snapshot older than READ_REPLICA_MAX_LAG seconds isn't
+# used; a browser that wrote something stays on the primary for
+# READ_REPLICA_PIN_SECONDS so it sees its own results.
+READ_REPLICA = config('READ_REPLICA', default='')
+READ_REPLICA_MAX_LAG = config('READ_REPLICA_MAX_LAG', default=30, cast=int)
+READ_REPLICA_PIN_SECONDS = config('READ_REPLICA_PIN_SECONDS', default=30, cast=int)
+if READ_REPLICA:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': f'file:{READ_REPLICA}?mode=ro',
+        'OPTIONS': {
+            'timeout': SQLITE_BUSY_TIMEOUT,
+            'init_command': ' '.join(f'PRAGMA {name}={value};' for name, value in SQLITE_PRAGMAS.items()
+                                     if name in ('mmap_size', 'cache_size', 'temp_store')),
+        },
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_ROUTERS = ['tournament_creator.read_replica.ReplicaRouter']
+    MIDDLEWARE.insert(1, 'tournament_creator.read_replica.ReplicaMiddleware')
+
+# Continuous backup: `manage.py replicate` ships the WAL here, inside the
+# Syncthing folder, and `manage.py restore_replica` rebuilds from it.
+REPLICA_DIR = config('REPLICA_DIR', default=str(Path.home() / 'Sync' / 'ddc-backup' / 'replica'))
+
+# `manage.py compact_logs` moves the result and notification logs of finished
+# tournaments into one gzip JSON-lines file per tournament here.
+LOG_ARCHIVE_DIR = config('LOG_ARCHIVE_DIR', default=str(Path.home() / 'Sync' / 'ddc-backup' / 'log-archive'))
+
+# `manage.py build_static_site` renders read-only HTML/JSON copies of the
+# public tournament pages here, for failover and for publishing results.
+STATIC_SITE_DIR = config('STATIC_SITE_DIR', default=str(BASE_DIR / 'site'))
+
 # Match-result notifications (email/Signal) are dispatched from a background
 # thread so score recording doesn't block on the signal-cli daemon. Disabled
 # under test so mocked senders can be asserted synchronously.
@@ -127,16 +182,20 @@ EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='user@example.com')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='password')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='webmaster@localhost')
 
-# Cache configuration - file-based for persistence across server restarts
+# Cache configuration - a SQLite file shared by all gunicorn workers, with
+# approximate-LRU eviction; persists across server restarts. Tests use an
+# isolated in-memory cache.
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
-        'LOCATION': BASE_DIR / 'cache',
+        'BACKEND': 'tournament_creator.cache_backends.SQLiteCache',
+        'LOCATION': BASE_DIR / 'cache' / 'cache.sqlite3',
         'OPTIONS': {
             'MAX_ENTRIES': 1000
         }
     }
 }
+if 'test' in sys.argv:
+    CACHES['default'] = {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
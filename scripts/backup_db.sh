@@ -1,6 +1,8 @@
 #!/usr/bin/env bash
-# Snapshot the DDC sqlite database into the Syncthing folder so an on-site
-# laptop always has a fresh copy to restore from. See RESTORE.md.
+# Hourly whole-file snapshot of the DDC sqlite database into the Syncthing
+# folder. The continuous WAL replica (ddc-replicate.service) is the primary
+# backup; this is a plain-file fallback that needs no restore step, and it
+# keeps env-backup current. See RESTORE.md.
 set -euo pipefail
 
 DB="$HOME/git/ddc/db.sqlite3"
@@ -22,21 +24,18 @@ if ! cmp -s "$ENV_FILE" "$DEST/env-backup"; then
     cp "$ENV_FILE" "$DEST/env-backup"
 fi
 
-# Timestamped copy every 10 minutes. Keep all of today's snapshots (the real
-# recovery window — a tournament-day failure is noticed within the hour) plus
-# the single newest snapshot from yesterday as a hedge against a bad "latest".
-# Everything older is pruned. Long-term backups are a separate concern.
-if (( 10#$(date +%M) % 10 == 0 )); then
-    cp "$DEST/db-latest.sqlite3" "$DEST/db-$(date +%Y%m%d-%H%M).sqlite3"
+# Timestamped copy every run. Keep all of today's snapshots plus the single
+# newest one from yesterday as a hedge against a bad "latest". Everything
+# older is pruned. Long-term backups are a separate concern.
+cp "$DEST/db-latest.sqlite3" "$DEST/db-$(date +%Y%m%d-%H%M).sqlite3"
 
-    today=$(date +%Y%m%d)
-    keep_yesterday=$(ls "$DEST"/db-"$(date -d yesterday +%Y%m%d)"-*.sqlite3 2>/dev/null | sort | tail -1 || true)
-    for f in "$DEST"/db-2*.sqlite3; do
-        [ -e "$f" ] || continue
-        case "$f" in
-            "$DEST"/db-"$today"-*.sqlite3) ;;   # keep all of today
-            "$keep_yesterday") ;;               # keep one from yesterday
-            *) rm -f "$f" ;;
-        esac
-    done
-fi
+today=$(date +%Y%m%d)
+keep_yesterday=$(ls "$DEST"/db-"$(date -d yesterday +%Y%m%d)"-*.sqlite3 2>/dev/null | sort | tail -1 || true)
+for f in "$DEST"/db-2*.sqlite3; do
+    [ -e "$f" ] || continue
+    case "$f" in
+        "$DEST"/db-"$today"-*.sqlite3) ;;   # keep all of today
+        "$keep_yesterday") ;;               # keep one from yesterday
+        *) rm -f "$f" ;;
+    esac
+done
@@ -0,0 +1,137 @@
+"""
+Per-request resolution of a user's role in a tournament.
+
+``TournamentChart.user_can_*`` answer one question each and every answer costs
+its own queries (directors, then MoC players, then pairs). A page that asks
+several of them — the detail view asks for edit rights, admin rights and the
+past-date lock — pays for the same lookups repeatedly. ``TournamentAccess``
+resolves everything it can from the tournament row and the user object, and
+fetches the rest (director, participant) in a single query the first time it
+is needed. ``get_tournament_access`` memoizes one instance per tournament on
+the request, so views, mixins and templates share it.
+"""
+from django.db.models import Exists, OuterRef, Q
+from django.utils.functional import cached_property
+
+
+class TournamentAccess:
+    """The role of ``user`` in ``tournament``: creator, director, participant.
+
+    Attributes are computed lazily; the director/participant lookup is a
+    single query with two EXISTS subqueries, and is skipped entirely for
+    anonymous users and whenever a cheaper rule already decides the answer.
+    """
+
+    def __init__(self, tournament, user):
+        self.tournament = tournament
+        self.user = user
+
+    @cached_property
+    def is_authenticated(self):
+        return bool(self.user) and getattr(self.user, 'is_authenticated', False)
+
+    @cached_property
+    def is_admin(self):
+        """Global administrator — rights over every tournament."""
+        return self.is_authenticated and getattr(self.user, 'is_admin', lambda: False)()
+
+    @cached_property
+    def is_creator(self):
+        created_by_id = self.tournament.created_by_id
+        return self.is_authenticated and bool(created_by_id) and created_by_id == self.user.pk
+
+    @cached_property
+    def is_sandbox(self):
+        return self.tournament.is_sandbox
+
+    @cached_property
+    def is_past(self):
+        return self.tournament.is_past()
+
+    @cached_property
+    def _roles(self):
+        """(is_director, is_participant) for an authenticated user, in one query."""
+        from .models.base_models import (
+            TournamentChart, TournamentDirector, TournamentPlayer, TournamentPair,
+        )
+        if not self.is_authenticated or not self.tournament.pk:
+            return False, False
+        user = self.user
+        row = TournamentChart.objects.filter(pk=self.tournament.pk).annotate(
+            _is_director=Exists(TournamentDirector.objects.filter(
+                tournament=OuterRef('pk'), user=user)),
+            # MoC tournaments link players directly, doubles via the pair.
+            _plays_individually=Exists(TournamentPlayer.objects.filter(
+                tournament_chart=OuterRef('pk'), player__user=user)),
+            _plays_in_pair=Exists(TournamentPair.objects.filter(
+                tournament_chart=OuterRef('pk')).filter(
+                Q(pair__player1__user=user) | Q(pair__player2__user=user))),
+        ).values_list('_is_director', '_plays_individually', '_plays_in_pair').first()
+        if row is None:
+            return False, False
+        is_director, plays_individually, plays_in_pair = row
+        return bool(is_director), bool(plays_individually or plays_in_pair)
+
+    @property
+    def is_director(self):
+        """An appointed director of this tournament (not counting the creator)."""
+        return self._roles[0]
+
+    @property
+    def is_participant(self):
+        """The user's linked ranking player is competing in this tournament."""
+        return self._roles[1]
+
+    @cached_property
+    def can_administer(self):
+        """Director rights: global admins, the creator, and appointed directors."""
+        if not self.is_authenticated:
+            return False
+        if self.is_admin or self.is_creator:
+            return True
+        return self.is_director
+
+    @property
+    def can_manage_directors(self):
+        return self.can_administer
+
+    @cached_property
+    def can_edit_results(self):
+        """Whether the user may record or edit match results.
+
+        Sandbox tournaments are open to every logged-in user; directors can
+        always edit; everyone else must be a participant of a current
+        tournament.
+        """
+        if not self.is_authenticated:
+            return False
+        if self.is_sandbox:
+            return True
+        if self.can_administer:
+            return True
+        if self.is_past:
+            return False
+        return self.is_participant
+
+    @cached_property
+    def results_locked_past(self):
+        """Recording is unavailable only because the tournament is over."""
+        return self.is_past and not self.is_sandbox and not self.can_administer
+
+    @property
+    def edit_denied_message(self):
+        """Why recording was refused, for users without edit rights."""
+        if self.is_past and not self.can_administer:
+            return 'This tournament is in the past; results can no longer be edited.'
+        return "You don't have permission to record results for this tournament."
+
+
+def get_tournament_access(request, tournament):
+    """The memoized ``TournamentAccess`` for ``request.user`` in ``tournament``."""
+    cache = getattr(request, '_tournament_access', None)
+    if cache is None:
+        cache = request._tournament_access = {}
+    access = cache.get(tournament.pk)
+    if access is None:
+        access = cache[tournament.pk] = TournamentAccess(tournament, request.user)
+    return access
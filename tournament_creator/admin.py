@@ -13,8 +13,11 @@ from .models.base_models import Player, TournamentChart, TournamentPlayer, Tourn
 from .models.tournament_types import MonarchOfTheCourt8, FourPairsSwedishFormat, EightPairsSwedishFormat
 from .models.scoring import MatchScore, PlayerScore
 from .models.auth import User
-from .models.logging import MatchResultLog
+from .models.logging import LogArchive, MatchResultLog
 from .models.notifications import NotificationBackendSetting, NotificationLog
+from .models.jobs import BackgroundJob
+from .models.rankings import PlayerRanking
+from .caching import invalidate_tournament
 from .forms import EmailBackendConfigForm, SignalBackendConfigForm, TournamentCreationForm
 from django.utils.text import Truncator
 # import functools # Removed import
@@ -189,6 +192,22 @@ class MatchScoreAdmin(admin.ModelAdmin):
     list_display = ('matchup', 'set_number', 'team1_score', 'team2_score', 'winning_team', 'point_difference')
     ordering = ('matchup', 'set_number')
 
+    # Edits here skip the record view, so move the tournament's cached pages on by hand.
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        invalidate_tournament(obj.matchup.tournament_chart)
+
+    def delete_model(self, request, obj):
+        tournament = obj.matchup.tournament_chart
+        super().delete_model(request, obj)
+        invalidate_tournament(tournament)
+
+    def delete_queryset(self, request, queryset):
+        tournaments = list(TournamentChart.objects.filter(matchups__scores__in=queryset).distinct())
+        super().delete_queryset(request, queryset)
+        for tournament in tournaments:
+            invalidate_tournament(tournament)
+
 @admin.register(PlayerScore)
 class PlayerScoreAdmin(admin.ModelAdmin):
     list_display = ('tournament', 'player', 'wins', 'matches_played', 'total_point_difference')
@@ -196,10 +215,31 @@ class PlayerScoreAdmin(admin.ModelAdmin):
 
 @admin.register(MatchResultLog)
 class MatchResultLogAdmin(admin.ModelAdmin):
-    list_display = ('matchup', 'recorded_by', 'recorded_at', 'action')
+    list_display = ('tournament', 'matchup', 'recorded_by', 'recorded_at', 'action')
+    list_filter = ('action',)
     ordering = ('-recorded_at',)
     readonly_fields = ('recorded_at', 'details')
 
+@admin.register(LogArchive)
+class LogArchiveAdmin(admin.ModelAdmin):
+    list_display = ('tournament', 'events', 'notifications', 'failed_notifications', 'last_event_at', 'archived_at', 'file_name')
+    ordering = ('-archived_at',)
+    readonly_fields = [f.name for f in LogArchive._meta.fields]
+
+@admin.register(PlayerRanking)
+class PlayerRankingAdmin(admin.ModelAdmin):
+    list_display = ('player', 'division', 'year', 'rank', 'points')
+    list_filter = ('division', 'year')
+    search_fields = ('player__first_name', 'player__last_name')
+    raw_id_fields = ('player',)
+
+@admin.register(BackgroundJob)
+class BackgroundJobAdmin(admin.ModelAdmin):
+    list_display = ('kind', 'params', 'status', 'progress', 'created_by', 'created_at', 'finished_at')
+    list_filter = ('kind', 'status')
+    ordering = ('-created_at',)
+    readonly_fields = ('started_at', 'finished_at', 'output', 'error')
+
 # Note: Abstract models can't be registered directly in admin
 # The concrete TournamentArchetype objects from the database
 # are already registered via TournamentArchetypeAdmin above
@@ -8,6 +8,9 @@ class TournamentCreatorConfig(AppConfig):
     def ready(self):
         # Import models here to ensure they're registered
         from .models.tournament_types import MonarchOfTheCourt8, FourPairsSwedishFormat, EightPairsSwedishFormat
+        from . import checks  # noqa: F401 — registers the SQLite profile check
+        from . import player_directory  # noqa: F401 — connects its invalidation signals
+        from . import location_summary  # noqa: F401 — connects its invalidation signals
 
         # Connect signal to populate archetypes after migrations
         from django.db.models.signals import post_migrate
@@ -0,0 +1,243 @@
+"""
+Load a tournament archive (export.archive_chunks) into this database.
+
+The archive carries the ids of the instance it came from. Importing gives
+every row a fresh primary key and rewrites the references between them:
+matchups to stages, pools and pairs, scores to matchups, tiebreak decisions
+to players or pairs, log events to matchups. Rows are inserted with
+bulk_create in dependency order, one statement per table, inside a single
+transaction. Either the whole tournament arrives or nothing does.
+
+Things that exist on both instances are matched, not copied:
+
+- players by normalized name (``rankings.name_key``, as update_rankings),
+  and by ranking or nickname among namesakes. Players unknown here are
+  created with the archive's ranking columns.
+- the archetype by name.
+- users (creator, directors, whoever recorded a result) by username. Unknown
+  users are left out.
+
+A tournament with the same name and date is refused unless ``replace`` is
+given, in which case it is deleted in the same transaction. That lets the
+venue laptop swap one tournament for a fresher copy without restoring the
+whole database.
+"""
+import gzip
+import json
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+
+from django.db import transaction
+
+from . import player_directory
+from .export import ARCHIVE_VERSION
+from .models.auth import User
+from .models.base_models import (Matchup, Pair, Player, Pool, PoolPair, Stage, TournamentArchetype, TournamentChart,
+                                 TournamentDirector, TournamentPair, TournamentPlayer)
+from .models.logging import MatchResultLog
+from .models.scoring import (ManualPoolTiebreakResolution, ManualTiebreakResolution, MatchScore, PairScore,
+                             PlayerScore)
+from .models.search import PlayerSearchTerm
+from .rankings import BATCH_SIZE, name_key
+
+
+class ArchiveImportError(Exception):
+    """The archive can't be imported (unreadable, wrong version, or conflicting)."""
+
+
+@dataclass
+class ImportResult:
+    tournament: TournamentChart
+    players_matched: int = 0
+    players_created: int = 0
+    replaced: int = 0  # tournaments deleted to make way
+    rows: dict = field(default_factory=dict)  # record type -> rows inserted
+
+
+def read_records(path):
+    """Records of an archive file, grouped by type. Gzip or plain JSON lines."""
+    with open(path, 'rb') as f:
+        gzipped = f.read(2) == b'\x1f\x8b'
+    records = defaultdict(list)
+    try:
+        with (gzip.open(path, 'rt', encoding='utf-8') if gzipped else open(path, encoding='utf-8')) as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    records[record.pop('type')].append(record)
+    except (OSError, ValueError, KeyError) as e:
+        raise ArchiveImportError(f"Can't read {path}: {e}")
+    return records
+
+
+@transaction.atomic
+def import_archive(path, created_by=None, name=None, replace=False):
+    """Import the tournament archived in ``path``; returns an ImportResult.
+
+    ``created_by`` is used when the archive's creator has no account here;
+    ``name`` renames the imported tournament.
+    """
+    records = read_records(path)
+    header = records.get('archive', [{}])[0]
+    if header.get('version') != ARCHIVE_VERSION or len(records.get('tournament', [])) != 1:
+        raise ArchiveImportError(f"{path} is not a version {ARCHIVE_VERSION} tournament archive")
+    source = records['tournament'][0]
+
+    usernames = {source.get('created_by__username')} | {d['username'] for d in records['director']}
+    for kind in ('event', 'tiebreak_resolution', 'pool_tiebreak_resolution'):
+        usernames.update(r.get('recorded_by__username') or r.get('resolved_by__username') for r in records[kind])
+    users = User.objects.in_bulk([u for u in usernames if u], field_name='username')
+
+    archetype = None
+    if source.get('archetype__name'):
+        archetype = TournamentArchetype.objects.filter(name=source['archetype__name']).first()
+        if archetype is None:
+            raise ArchiveImportError(f"No tournament format named {source['archetype__name']!r} here")
+
+    tournament = _build(TournamentChart, source, archetype=archetype,
+                        created_by=users.get(source.get('created_by__username')) or created_by)
+    if name:
+        tournament.name = name
+    clashing = TournamentChart.objects.filter(name=tournament.name, date=tournament.date)
+    result = ImportResult(tournament)
+    if clashing.exists():
+        if not replace:
+            raise ArchiveImportError(
+                f"'{tournament.name}' on {tournament.date} already exists (id {clashing.first().pk}); "
+                f"replace it, or import under another name")
+        result.replaced = clashing.count()
+        clashing.delete()
+    tournament.save()
+    rows = result.rows
+
+    TournamentDirector.objects.bulk_create(
+        TournamentDirector(tournament=tournament, user=users[d['username']])
+        for d in records['director'] if d['username'] in users)
+
+    players = _resolve_players(records['player'], result)
+    TournamentPlayer.objects.bulk_create(
+        TournamentPlayer(tournament_chart=tournament, player_id=players[p['id']])
+        for p in records['player'] if p.get('roster'))
+
+    pairs = _insert(rows, 'pair', Pair, records['pair'], lambda r: {
+        'player1_id': players[r['player1_id']], 'player2_id': players[r['player2_id']]})
+    TournamentPair.objects.bulk_create(
+        TournamentPair(tournament_chart=tournament, pair_id=pairs[r['id']], seed=r.get('tournament_seed'))
+        for r in records['pair'])
+
+    stages = _insert(rows, 'stage', Stage, records['stage'], lambda r: {'tournament': tournament})
+    pools = _insert(rows, 'pool', Pool, records['pool'], lambda r: {'stage_id': stages[r['stage_id']]})
+    _insert(rows, 'pool_pair', PoolPair, records['pool_pair'], lambda r: {
+        'pool_id': pools[r['pool_id']], 'pair_id': pairs[r['pair_id']]})
+
+    def remap(mapping, old):
+        return mapping[old] if old is not None else None
+
+    matchups = _insert(rows, 'matchup', Matchup, records['matchup'], lambda r: {
+        'tournament_chart': tournament,
+        'stage_id': remap(stages, r['stage_id']), 'pool_id': remap(pools, r['pool_id']),
+        'pair1_id': remap(pairs, r['pair1_id']), 'pair2_id': remap(pairs, r['pair2_id']),
+        **{f: remap(players, r[f]) for f in ('pair1_player1_id', 'pair1_player2_id',
+                                             'pair2_player1_id', 'pair2_player2_id')},
+    })
+    _insert(rows, 'set_score', MatchScore, records['set_score'], lambda r: {'matchup_id': matchups[r['matchup_id']]})
+    _insert(rows, 'player_score', PlayerScore, records['player_score'], lambda r: {
+        'tournament': tournament, 'player_id': players[r['player_id']]})
+    _insert(rows, 'pair_score', PairScore, records['pair_score'], lambda r: {
+        'tournament': tournament, 'pair_id': pairs[r['pair_id']]})
+
+    decisions = _insert(rows, 'tiebreak_resolution', ManualTiebreakResolution, records['tiebreak_resolution'],
+                        lambda r: {'tournament': tournament, 'resolved_by': users.get(r['resolved_by__username']),
+                                   'resolved_order': [players[p] for p in r['resolved_order']]},
+                        keep_timestamp='resolved_at')
+    ManualTiebreakResolution.tied_players.through.objects.bulk_create(
+        ManualTiebreakResolution.tied_players.through(
+            manualtiebreakresolution_id=decisions[r['id']], player_id=players[p])
+        for r in records['tiebreak_resolution'] for p in r.get('tied_players', []))
+    _insert(rows, 'pool_tiebreak_resolution', ManualPoolTiebreakResolution, records['pool_tiebreak_resolution'],
+            lambda r: {'pool_id': pools[r['pool_id']], 'resolved_by': users.get(r['resolved_by__username']),
+                       'resolved_order': [pairs[p] for p in r['resolved_order']]},
+            keep_timestamp='resolved_at')
+    # Events whose matchup was torn down keep only their matchup_key, as they did there.
+    _insert(rows, 'event', MatchResultLog, records['event'], lambda r: {
+        'tournament': tournament, 'matchup_id': matchups.get(r['matchup_id']),
+        'recorded_by': users.get(r.get('recorded_by__username'))}, keep_timestamp='recorded_at')
+    return result
+
+
+def _resolve_players(entries, result):
+    """``{archive player id: local player id}``, creating players unknown here.
+
+    Where a name is shared, by players here or in the archive, the ranking
+    and then the nickname must single out one local player; otherwise the
+    import fails rather than merge two people.
+    """
+    local = defaultdict(list)
+    for player in Player.objects.only('id', 'first_name', 'last_name', 'nickname', 'ranking'):
+        local[name_key(player.first_name, player.last_name)].append(player)
+    archived = Counter(name_key(entry['first_name'], entry['last_name']) for entry in entries)
+
+    mapping, to_create, taken = {}, [], set()
+    for entry in entries:
+        key = name_key(entry['first_name'], entry['last_name'])
+        candidates = local.get(key)
+        if not candidates:
+            player = Player(first_name=entry['first_name'], last_name=entry['last_name'],
+                            nickname=entry.get('nickname'), ranking=entry['ranking'],
+                            ranking_points=entry['ranking_points'])
+            to_create.append(player)
+        else:
+            if len(candidates) > 1 or archived[key] > 1:
+                candidates = _namesake(entry, candidates)
+            if len(candidates) != 1 or candidates[0].pk in taken:
+                raise ArchiveImportError(
+                    f"Can't tell which {entry['first_name']} {entry['last_name']} here is the archive's "
+                    f"player {entry['id']}: the name is shared and neither ranking nor nickname decides")
+            player = candidates[0]
+            taken.add(player.pk)
+        mapping[entry['id']] = player
+    if to_create:
+        Player.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+        # bulk_create skips Player.save(), which indexes names and tells the directory.
+        PlayerSearchTerm.index_players(to_create, created=True)
+        player_directory.invalidate()
+    result.players_created = len(to_create)
+    result.players_matched = len(mapping) - len(to_create)
+    return {old: player.pk for old, player in mapping.items()}
+
+
+def _namesake(entry, candidates):
+    """The one of ``candidates`` with ``entry``'s ranking, or else its nickname; [] if neither decides."""
+    for field in ('ranking', 'nickname'):
+        if entry.get(field) in (None, ''):
+            continue
+        matching = [player for player in candidates if getattr(player, field) == entry[field]]
+        if len(matching) == 1:
+            return matching
+    return []
+
+
+def _build(model, record, **overrides):
+    """An unsaved ``model`` from an archive record: its own columns, minus the old id, plus ``overrides``."""
+    columns = {f.attname: f for f in model._meta.concrete_fields if not f.primary_key}
+    instance = model(**{k: columns[k].to_python(v) for k, v in record.items() if k in columns})
+    for attr, value in overrides.items():
+        setattr(instance, attr, value)
+    return instance
+
+
+def _insert(rows, kind, model, records, references, keep_timestamp=None):
+    """Bulk-insert ``records`` with their references rewritten; returns ``{old id: new id}``.
+
+    ``keep_timestamp`` names an auto_now_add column: bulk_create stamps it
+    with the current time, so the archived values are written back after.
+    """
+    instances = [_build(model, record, **references(record)) for record in records]
+    model.objects.bulk_create(instances, batch_size=BATCH_SIZE)
+    if keep_timestamp and instances:
+        column = model._meta.get_field(keep_timestamp)
+        for instance, record in zip(instances, records):
+            setattr(instance, keep_timestamp, column.to_python(record[keep_timestamp]))
+        model.objects.bulk_update(instances, [keep_timestamp], batch_size=BATCH_SIZE)
+    rows[kind] = len(instances)
+    return {record['id']: instance.pk for record, instance in zip(records, instances)}
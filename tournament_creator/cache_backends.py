@@ -0,0 +1,180 @@
+"""
+A Django cache backend stored in its own SQLite file.
+
+Django's ``FileBasedCache`` opens, locks and unpickles one file per lookup and
+culls by listing the whole directory. This backend keeps every entry in one
+indexed table instead: a lookup is a primary-key read on an already open
+connection, and SQLite's locking makes the store safe to share between
+gunicorn workers. Entries survive restarts like the file cache did.
+
+Eviction is approximate LRU. Each entry records when it was last read, but
+reads only rewrite that stamp when it is older than ``TOUCH_INTERVAL``
+seconds, so hot keys don't turn every read into a write. When the table
+outgrows ``MAX_ENTRIES``, expired entries go first, then the least recently
+used ``1 / CULL_FREQUENCY`` of the rest.
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'tournament_creator.cache_backends.SQLiteCache',
+            'LOCATION': BASE_DIR / 'cache' / 'cache.sqlite3',
+            'OPTIONS': {'MAX_ENTRIES': 1000},
+        }
+    }
+"""
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+TOUCH_INTERVAL = 60
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entry (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS cache_entry_accessed ON cache_entry (accessed);
+"""
+
+
+class SQLiteCache(BaseCache):
+    pickle_protocol = pickle.HIGHEST_PROTOCOL
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._path = Path(location)
+        options = params.get('OPTIONS', {})
+        self._busy_timeout = options.get('BUSY_TIMEOUT', 20)
+        self._local = threading.local()
+
+    # -- connection handling -------------------------------------------------
+
+    def _connection(self):
+        """One connection per thread and process (gunicorn forks after import)."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self._path, timeout=self._busy_timeout, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.executescript(_SCHEMA)
+        self._local.conn = conn
+        self._local.pid = os.getpid()
+        return conn
+
+    def close(self, **kwargs):
+        # Keep the per-thread connection open between requests; it is cheap to
+        # hold and expensive (schema check, PRAGMAs) to reopen.
+        pass
+
+    # -- helpers -------------------------------------------------------------
+
+    def _dumps(self, value):
+        return pickle.dumps(value, self.pickle_protocol)
+
+    def _write(self, key, value, timeout, only_if_missing=False):
+        conn = self._connection()
+        now = time.time()
+        expires = self.get_backend_timeout(timeout)
+        blob = self._dumps(value)
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            if only_if_missing:
+                row = conn.execute('SELECT expires FROM cache_entry WHERE key = ?', (key,)).fetchone()
+                if row is not None and (row[0] is None or row[0] > now):
+                    conn.execute('COMMIT')
+                    return False
+            conn.execute(
+                'INSERT OR REPLACE INTO cache_entry (key, value, expires, accessed) VALUES (?, ?, ?, ?)',
+                (key, blob, expires, now))
+            self._cull(conn, now)
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        return True
+
+    def _cull(self, conn, now):
+        count = conn.execute('SELECT COUNT(*) FROM cache_entry').fetchone()[0]
+        if count <= self._max_entries:
+            return
+        conn.execute('DELETE FROM cache_entry WHERE expires IS NOT NULL AND expires <= ?', (now,))
+        count = conn.execute('SELECT COUNT(*) FROM cache_entry').fetchone()[0]
+        if count <= self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            conn.execute('DELETE FROM cache_entry')
+            return
+        conn.execute(
+            'DELETE FROM cache_entry WHERE key IN '
+            '(SELECT key FROM cache_entry ORDER BY accessed LIMIT ?)',
+            (max(1, count // self._cull_frequency),))
+
+    # -- BaseCache API -------------------------------------------------------
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._write(key, value, timeout, only_if_missing=True)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._write(key, value, timeout)
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        conn = self._connection()
+        row = conn.execute(
+            'SELECT value, expires, accessed FROM cache_entry WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return default
+        value, expires, accessed = row
+        now = time.time()
+        if expires is not None and expires <= now:
+            conn.execute('DELETE FROM cache_entry WHERE key = ? AND expires <= ?', (key, now))
+            return default
+        if now - accessed > TOUCH_INTERVAL:
+            conn.execute('UPDATE cache_entry SET accessed = ? WHERE key = ?', (now, key))
+        return pickle.loads(value)
+
+    def get_many(self, keys, version=None):
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        if not key_map:
+            return {}
+        conn = self._connection()
+        now = time.time()
+        placeholders = ', '.join('?' * len(key_map))
+        rows = conn.execute(
+            f'SELECT key, value FROM cache_entry WHERE key IN ({placeholders}) '
+            f'AND (expires IS NULL OR expires > ?)', (*key_map, now)).fetchall()
+        return {key_map[key]: pickle.loads(value) for key, value in rows}
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = time.time()
+        cursor = self._connection().execute(
+            'UPDATE cache_entry SET expires = ?, accessed = ? '
+            'WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (self.get_backend_timeout(timeout), now, key, now))
+        return cursor.rowcount > 0
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        cursor = self._connection().execute('DELETE FROM cache_entry WHERE key = ?', (key,))
+        return cursor.rowcount > 0
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        row = self._connection().execute(
+            'SELECT 1 FROM cache_entry WHERE key = ? AND (expires IS NULL OR expires > ?)',
+            (key, time.time())).fetchone()
+        return row is not None
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache_entry')
@@ -0,0 +1,56 @@
+"""
+Version-stamped caching of per-tournament data.
+
+Cache keys embed the tournament's change stamp (``results_version`` and
+``modified_at``), so every score write, phase generation or settings edit
+moves the tournament onto fresh keys and old entries are simply never read
+again; the backend's LRU eviction cleans them up. Nothing has to enumerate
+or delete stale keys, which keeps invalidation correct across workers.
+Data that only changes with the schedule itself is keyed on the matchup set
+instead (``structure_cache_key``), so it survives score writes.
+"""
+import zlib
+
+from django.core.cache import cache
+
+
+def tournament_stamp(tournament):
+    """The tournament's current change stamp, as used in cache keys."""
+    return f'{tournament.results_version}.{tournament.modified_at.timestamp():.6f}'
+
+
+def tournament_cache_key(tournament, name):
+    return f'tournament:{tournament.pk}:{tournament_stamp(tournament)}:{name}'
+
+
+def get_tournament_cached(tournament, name, compute, timeout=None):
+    """Return the cached ``name`` for the current stamp, computing it on a miss.
+
+    ``tournament`` must be freshly loaded: a stale instance reads stale keys.
+    """
+    return get_cached(tournament_cache_key(tournament, name), compute, timeout)
+
+
+def structure_cache_key(tournament, matchups, seeding):
+    """Key for data that depends only on which matchups exist and on ``seeding`` (ids in seed order).
+
+    Matchups are created and deleted (phase generation, reseeding, sandbox
+    resets) but never edited, so their count and highest id identify the
+    set. Score writes leave these keys alone.
+    """
+    signature = zlib.crc32(','.join(map(str, seeding)).encode())
+    return f'tournament:{tournament.pk}:structure:{len(matchups)}.{max(m.pk for m in matchups)}.{signature:08x}'
+
+
+def get_cached(key, compute, timeout=None):
+    """Return the value cached under ``key``, computing and storing it on a miss."""
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, timeout)
+    return value
+
+
+def invalidate_tournament(tournament):
+    """Drop every cached value of ``tournament`` by moving it to a new stamp."""
+    tournament.touch()
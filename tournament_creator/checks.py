@@ -0,0 +1,62 @@
+"""
+System checks for the SQLite production profile.
+
+``manage.py check --database default`` (also worth running after every
+deploy) opens a connection and reports the settings that are actually in
+effect, warning when they differ from ``SQLITE_PRAGMAS`` or when
+connections aren't persistent outside DEBUG.
+"""
+from django.conf import settings
+from django.core.checks import Info, Tags, Warning, register
+from django.db import connections
+
+# PRAGMAs whose effective value is reported; values that SQLite returns in a
+# different form than they're set in are normalized before comparing.
+_TEMP_STORE = {0: 'DEFAULT', 1: 'FILE', 2: 'MEMORY'}
+_SYNCHRONOUS = {0: 'OFF', 1: 'NORMAL', 2: 'FULL', 3: 'EXTRA'}
+
+
+def effective_sqlite_settings(alias='default'):
+    """The connection-level settings SQLite reports for ``alias``, as a dict."""
+    connection = connections[alias]
+    with connection.cursor() as cursor:
+        values = {}
+        for name in ('journal_mode', 'synchronous', 'busy_timeout', 'mmap_size', 'cache_size', 'temp_store'):
+            cursor.execute(f'PRAGMA {name}')
+            values[name] = cursor.fetchone()[0]
+    values['journal_mode'] = str(values['journal_mode']).upper()
+    values['synchronous'] = _SYNCHRONOUS.get(values['synchronous'], values['synchronous'])
+    values['temp_store'] = _TEMP_STORE.get(values['temp_store'], values['temp_store'])
+    values['CONN_MAX_AGE'] = connection.settings_dict['CONN_MAX_AGE']
+    values['CONN_HEALTH_CHECKS'] = connection.settings_dict['CONN_HEALTH_CHECKS']
+    return values
+
+
+@register(Tags.database)
+def check_sqlite_profile(app_configs=None, databases=None, **kwargs):
+    if not databases or 'default' not in databases:
+        return []
+    connection = connections['default']
+    # The test runner's in-memory database can't use WAL or mmap.
+    if connection.vendor != 'sqlite' or connection.is_in_memory_db():
+        return []
+    effective = effective_sqlite_settings()
+    messages = [Info(
+        'SQLite profile: ' + ', '.join(f'{name}={value}' for name, value in effective.items()),
+        id='tournament_creator.I001',
+    )]
+    for name, expected in getattr(settings, 'SQLITE_PRAGMAS', {}).items():
+        actual = effective.get(name)
+        if str(actual).upper() != str(expected).upper():
+            messages.append(Warning(
+                f'PRAGMA {name} is {actual}, expected {expected}.',
+                hint='Check the init_command in DATABASES["default"]["OPTIONS"].',
+                id='tournament_creator.W001',
+            ))
+    if not effective['CONN_MAX_AGE'] and not settings.DEBUG:
+        messages.append(Warning(
+            'Database connections are not persistent (CONN_MAX_AGE=0).',
+            hint='Every request reconnects and re-runs the PRAGMAs; set DB_CONN_MAX_AGE.',
+            id='tournament_creator.W002',
+        ))
+    return messages
@@ -0,0 +1,279 @@
+"""
+Results export, streamed.
+
+Every exporter here is a generator of text (or, for the archive, bytes)
+chunks meant for a StreamingHttpResponse or a file. Matches, set scores and
+log events come from iterator() querysets, so memory stays flat however large
+the tournament or season. Only the standings are built in memory; they are
+one row per entrant.
+
+- ``text_lines``: the plain-text "Final Standings" download.
+- ``csv_chunks``: one CSV row per placed player or pair, for any number of
+  tournaments under a single header. This is the season file for the ranking
+  body.
+- ``json_chunks``: a JSON array of tournaments, each with its standings and
+  every match with its sets.
+- ``archive_chunks``: a gzip JSON-lines dump of one tournament: the
+  tournament, its directors, players and pairs, structure, matches, set
+  scores, stored standings, manual tiebreak decisions and the full result
+  log (archived events included). Each line is ``{"type": ..., ...}``, the
+  same shape as the log archives of log_archive.py, with database ids as
+  they were; ``manage.py import_tournament`` loads it into another instance.
+"""
+import csv
+import datetime
+import decimal
+import json
+import zlib
+
+from django.db.models import Q
+from django.utils import timezone
+
+from .log_archive import EVENT_FIELDS, archive_dir, read_archive
+from .models.base_models import (Matchup, Player, Pool, PoolPair, Stage, TournamentChart, TournamentDirector,
+                                 TournamentPair, TournamentPlayer)
+from .models.logging import MatchResultLog
+from .models.scoring import (ManualPoolTiebreakResolution, ManualTiebreakResolution, MatchScore, PairScore,
+                             PlayerScore)
+from .models.tournament_types import get_implementation
+from .tiebreaks import apply_tiebreaks
+
+FORMATS = {
+    # format: (content type, file extension)
+    'txt': ('text/plain; charset=utf-8', 'txt'),
+    'csv': ('text/csv; charset=utf-8', 'csv'),
+    'json': ('application/json', 'json'),
+    'archive': ('application/gzip', 'jsonl.gz'),
+}
+SEASON_FORMATS = ('csv', 'json')
+
+# Bumped whenever archive records change shape; archive_import.py reads it.
+ARCHIVE_VERSION = 1
+
+CSV_HEADER = ['tournament_id', 'tournament', 'date', 'end_date', 'place', 'country', 'format',
+              'position', 'player1', 'player2', 'player1_id', 'player2_id', 'wins', 'played',
+              'point_difference']
+
+CHUNK_SIZE = 500
+
+
+def season_tournaments(year):
+    """The tournaments that count for ``year``'s season: no sandboxes, nothing archived."""
+    return (TournamentChart.objects
+            .filter(date__year=year, is_sandbox=False, archived=False)
+            .select_related('archetype')
+            .order_by('date', 'id'))
+
+
+def filename(tournament, fmt):
+    return f"{tournament.name.replace(' ', '_')}_{tournament.date.strftime('%Y%m%d')}.{FORMATS[fmt][1]}"
+
+
+def full_name(player):
+    return f"{player.first_name} {player.last_name}".strip() or str(player)
+
+
+def standings(tournament):
+    """The final order as dicts: position, players (Player objects), pair_id, wins, played, pd.
+
+    Multi-phase formats that have finished rank by their finals and carry no
+    win/loss record; pairs formats rank by PairScore; Monarch of the Court by
+    PlayerScore with the tiebreak rules.
+    """
+    impl = get_implementation(tournament.archetype) if tournament.archetype else None
+    final = None
+    if impl and getattr(impl, 'is_multi_phase', False):
+        final = impl.get_final_standings(tournament)
+    if final:
+        return [{'position': entry['position'], 'players': [entry['pair'].player1, entry['pair'].player2],
+                 'pair_id': entry['pair'].id, 'wins': None, 'played': None, 'pd': None}
+                for entry in final]
+
+    if tournament.archetype and tournament.archetype.tournament_category == 'PAIRS':
+        scores = sorted(PairScore.objects.filter(tournament=tournament)
+                        .select_related('pair__player1', 'pair__player2'),
+                        key=lambda s: (s.wins, s.total_point_difference), reverse=True)
+        return [{'position': idx, 'players': [s.pair.player1, s.pair.player2], 'pair_id': s.pair_id,
+                 'wins': s.wins, 'played': s.matches_played, 'pd': s.total_point_difference}
+                for idx, s in enumerate(scores, start=1)]
+
+    scores = apply_tiebreaks(tournament, list(PlayerScore.objects.filter(tournament=tournament)
+                                              .select_related('player')))
+    return [{'position': idx, 'players': [s.player], 'pair_id': None,
+             'wins': s.wins, 'played': s.matches_played, 'pd': s.total_point_difference}
+            for idx, s in enumerate(scores, start=1)]
+
+
+def text_lines(tournament):
+    """The plain-text results download, one line per chunk."""
+    yield f"Tournament: {tournament.name}\n"
+    yield f"Date: {tournament.date.strftime('%B %d, %Y')}\n"
+    yield "\n"
+    yield "Final Standings:\n"
+    yield "-" * 60
+    for entry in standings(tournament):
+        names = ' & '.join(full_name(p) for p in entry['players'])
+        record = f" - {entry['wins']}W {entry['pd']:+d}PD" if entry['wins'] is not None else ''
+        yield f"\n{entry['position']}. {names}{record}"
+
+
+class _Echo:
+    """A file-like object whose write() hands back the line, for streaming csv.writer output."""
+
+    def write(self, value):
+        return value
+
+
+def csv_chunks(tournaments):
+    """CSV: a header, then one row per entrant of each tournament, in placing order."""
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER)
+    for tournament in _iterate(tournaments):
+        meta = [tournament.id, tournament.name, tournament.date, tournament.end_date or '',
+                tournament.place, tournament.country, tournament.archetype.name if tournament.archetype else '']
+        for entry in standings(tournament):
+            players = entry['players'] + [None] * (2 - len(entry['players']))
+            yield writer.writerow(meta + [
+                entry['position'],
+                *[full_name(p) if p else '' for p in players],
+                *[p.id if p else '' for p in players],
+                *['' if entry[key] is None else entry[key] for key in ('wins', 'played', 'pd')],
+            ])
+
+
+def json_chunks(tournaments):
+    """JSON: ``[{tournament fields, "standings": [...], "matches": [...]}, ...]``, built piece by piece."""
+    yield '['
+    for index, tournament in enumerate(_iterate(tournaments)):
+        head = _dumps({
+            'id': tournament.id, 'name': tournament.name, 'date': tournament.date,
+            'end_date': tournament.end_date, 'place': tournament.place, 'country': tournament.country,
+            'format': tournament.archetype.name if tournament.archetype else None,
+            'standings': [
+                {'position': e['position'], 'players': [{'id': p.id, 'name': full_name(p)} for p in e['players']],
+                 'pair': e['pair_id'], 'wins': e['wins'], 'played': e['played'], 'point_difference': e['pd']}
+                for e in standings(tournament)
+            ],
+        })
+        yield (',' if index else '') + head[:-1] + ', "matches": ['
+        for number, match in enumerate(_matches(tournament)):
+            yield (',' if number else '') + _dumps(match)
+        yield ']}'
+    yield ']'
+
+
+def archive_chunks(tournament):
+    """Gzip-compressed JSON lines of everything stored about ``tournament``."""
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    buffer = []
+    size = 0
+    for record in _archive_records(tournament):
+        line = (_dumps(record) + '\n').encode('utf-8')
+        buffer.append(line)
+        size += len(line)
+        if size >= 64 * 1024:
+            chunk = compressor.compress(b''.join(buffer))
+            buffer, size = [], 0
+            if chunk:
+                yield chunk
+    yield compressor.compress(b''.join(buffer)) + compressor.flush()
+
+
+def exporter(fmt):
+    """The generator producing ``fmt``; csv and json also take a queryset of tournaments."""
+    return {'txt': text_lines, 'csv': csv_chunks, 'json': json_chunks, 'archive': archive_chunks}[fmt]
+
+
+def _archive_records(tournament):
+    yield {'type': 'archive', 'version': ARCHIVE_VERSION, 'exported_at': timezone.now()}
+    # Archetype and users by name: their ids differ between instances.
+    yield {'type': 'tournament', **TournamentChart.objects.filter(pk=tournament.pk).values().get(),
+           'archetype__name': tournament.archetype.name if tournament.archetype else None,
+           'created_by__username': tournament.created_by.username if tournament.created_by else None}
+    for username in TournamentDirector.objects.filter(tournament=tournament).values_list('user__username', flat=True):
+        yield {'type': 'director', 'username': username}
+    roster = set(TournamentPlayer.objects.filter(tournament_chart=tournament).values_list('player_id', flat=True))
+    players = Player.objects.filter(
+        Q(tournamentplayer__tournament_chart=tournament)
+        | Q(pair_player1__tournamentpair__tournament_chart=tournament)
+        | Q(pair_player2__tournamentpair__tournament_chart=tournament)).distinct().order_by('id')
+    for player in players.values('id', 'first_name', 'last_name', 'nickname', 'ranking', 'ranking_points'):
+        yield {'type': 'player', **player, 'roster': player['id'] in roster}
+    for pair in (TournamentPair.objects.filter(tournament_chart=tournament).order_by('pair_id')
+                 .values('pair_id', 'seed', 'pair__player1_id', 'pair__player2_id', 'pair__ranking_points_sum',
+                         'pair__seed', 'pair__entry_order')):
+        yield {'type': 'pair', 'id': pair['pair_id'], 'player1_id': pair['pair__player1_id'],
+               'player2_id': pair['pair__player2_id'], 'ranking_points_sum': pair['pair__ranking_points_sum'],
+               'seed': pair['pair__seed'], 'entry_order': pair['pair__entry_order'], 'tournament_seed': pair['seed']}
+    for stage in Stage.objects.filter(tournament=tournament).order_by('stage_number').values():
+        yield {'type': 'stage', **stage}
+    for pool in Pool.objects.filter(stage__tournament=tournament).order_by('stage__stage_number', 'order').values():
+        yield {'type': 'pool', **pool}
+    for entry in PoolPair.objects.filter(pool__stage__tournament=tournament).order_by('pool_id', 'position').values():
+        yield {'type': 'pool_pair', **entry}
+    for matchup in Matchup.objects.filter(tournament_chart=tournament).order_by('id').values().iterator(CHUNK_SIZE):
+        yield {'type': 'matchup', **matchup}
+    for score in (MatchScore.objects.filter(matchup__tournament_chart=tournament)
+                  .order_by('matchup_id', 'set_number').values().iterator(CHUNK_SIZE)):
+        yield {'type': 'set_score', **score}
+    for score in PlayerScore.objects.filter(tournament=tournament).values():
+        yield {'type': 'player_score', **score}
+    for score in PairScore.objects.filter(tournament=tournament).values():
+        yield {'type': 'pair_score', **score}
+    for decision in ManualTiebreakResolution.objects.filter(tournament=tournament).prefetch_related('tied_players'):
+        yield {'type': 'tiebreak_resolution', 'id': decision.id, 'wins_tied_at': decision.wins_tied_at,
+               'tied_players': [p.id for p in decision.tied_players.all()],
+               'resolved_order': decision.resolved_order, 'reason': decision.reason,
+               'resolved_by__username': decision.resolved_by.username if decision.resolved_by else None,
+               'resolved_at': decision.resolved_at}
+    for decision in ManualPoolTiebreakResolution.objects.filter(pool__stage__tournament=tournament).values(
+            'id', 'pool_id', 'wins_tied_at', 'resolved_order', 'reason', 'resolved_by__username', 'resolved_at'):
+        yield {'type': 'pool_tiebreak_resolution', **decision}
+    for archive in tournament.log_archives.order_by('last_event_id'):
+        for record in read_archive(archive_dir() / archive.file_name):
+            if record['type'] == 'event':
+                yield record
+    for event in (MatchResultLog.objects.filter(tournament=tournament).order_by('id')
+                  .values(*EVENT_FIELDS).iterator(CHUNK_SIZE)):
+        yield {'type': 'event', **event}
+
+
+def _matches(tournament):
+    matchups = (Matchup.objects.filter(tournament_chart=tournament)
+                .select_related('stage', 'pool', 'pair1', 'pair2')
+                .prefetch_related('scores')
+                .order_by('stage__stage_number', 'pool__order', 'round_number', 'court_number', 'id'))
+    for m in matchups.iterator(CHUNK_SIZE):
+        if m.pair1_id:
+            teams = ([m.pair1.player1_id, m.pair1.player2_id], [m.pair2.player1_id, m.pair2.player2_id])
+        else:
+            teams = ([i for i in (m.pair1_player1_id, m.pair1_player2_id) if i],
+                     [i for i in (m.pair2_player1_id, m.pair2_player2_id) if i])
+        sets = [[s.team1_score, s.team2_score] for s in m.scores.all()]
+        won = sum(1 for t1, t2 in sets if t1 > t2)
+        yield {
+            'stage': m.stage.name if m.stage_id else None,
+            'pool': m.pool.name if m.pool_id else None,
+            'round': m.round_number, 'court': m.court_number, 'label': m.label or None,
+            'date': m.match_date, 'team1': teams[0], 'team2': teams[1],
+            'pair1': m.pair1_id, 'pair2': m.pair2_id, 'sets': sets,
+            'winner': (1 if won * 2 > len(sets) else 2 if won * 2 < len(sets) else None) if sets else None,
+        }
+
+
+def _iterate(tournaments):
+    if isinstance(tournaments, TournamentChart):
+        return [tournaments]
+    return tournaments.iterator(CHUNK_SIZE)
+
+
+def _json_default(value):
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def _dumps(value):
+    return json.dumps(value, default=_json_default, ensure_ascii=False)
@@ -1,4 +1,4 @@
-from datetime import date
+from datetime import date, timedelta
 
 from django import forms
 from django.conf import settings
@@ -47,7 +47,8 @@ class TournamentCreationForm(forms.ModelForm):
     class Meta:
         model = TournamentChart
         fields = [
-            'name', 'short_name', 'place', 'country', 'date', 'end_date', 'number_of_stages', 'format_type',
+            'name', 'short_name', 'place', 'country', 'date', 'end_date', 'registration_date',
+            'number_of_stages', 'format_type',
             'notify_by_email', 'notify_by_signal', 'notify_by_matrix',
             'signal_recipient_usernames', 'signal_recipient_group_ids',
             'name_display_format', 'show_structure', 'default_sets_per_match',
@@ -69,6 +70,7 @@ class TournamentCreationForm(forms.ModelForm):
             'notify_by_matrix': forms.CheckboxInput,
             'date': forms.DateInput(attrs={'type': 'date', 'class': 'form-control', 'style': 'max-width: 200px;'}),
             'end_date': forms.DateInput(attrs={'type': 'date', 'class': 'form-control', 'style': 'max-width: 200px;'}),
+            'registration_date': forms.DateInput(attrs={'type': 'date', 'class': 'form-control', 'style': 'max-width: 200px;'}),
             'number_of_stages': forms.NumberInput(attrs={'class': 'form-control', 'style': 'width: 60px;', 'min': '1', 'max': '9'}),
             'format_type': forms.Select(attrs={'class': 'form-select'}),
             'name_display_format': forms.Select(attrs={'class': 'form-select'}),
@@ -282,14 +284,58 @@ class TournamentDirectorAddForm(forms.Form):
         )
 
 
+class LeagueCalendarForm(forms.Form):
+    """Spread a league's matches over regular matchdays in one go.
+
+    Matches are taken in stage/round/court order, ``courts_per_day`` to a
+    matchday, with a matchday every ``every_days`` days from ``first_day``.
+    """
+    first_day = forms.DateField(
+        label="First matchday",
+        widget=forms.DateInput(attrs={'type': 'date', 'class': 'form-control'}),
+    )
+    every_days = forms.IntegerField(
+        label="Days between matchdays", min_value=1, max_value=365, initial=7,
+        widget=forms.NumberInput(attrs={'class': 'form-control'}),
+    )
+    courts_per_day = forms.IntegerField(
+        label="Matches per matchday", min_value=1, initial=2,
+        help_text="How many matches the courts fit on one matchday.",
+        widget=forms.NumberInput(attrs={'class': 'form-control'}),
+    )
+    start_time = forms.TimeField(
+        label="Start time", required=False,
+        help_text="Leave blank to keep the matches' current times.",
+        widget=forms.TimeInput(attrs={'type': 'time', 'class': 'form-control'}),
+    )
+    only_unscheduled = forms.BooleanField(
+        label="Only matches without a date", required=False, initial=True,
+        widget=forms.CheckboxInput(attrs={'class': 'form-check-input'}),
+    )
+
+    def assign(self, matchups):
+        """Set dates (and times) on ``matchups`` in memory; returns the ones that changed."""
+        data = self.cleaned_data
+        if data['only_unscheduled']:
+            matchups = [m for m in matchups if m.match_date is None]
+        changed = []
+        for index, matchup in enumerate(matchups):
+            day = data['first_day'] + timedelta(days=(index // data['courts_per_day']) * data['every_days'])
+            time = data['start_time'] or matchup.match_time
+            if (matchup.match_date, matchup.match_time) != (day, time):
+                matchup.match_date, matchup.match_time = day, time
+                changed.append(matchup)
+        return changed
+
+
 class PairForm(forms.Form):
     player1 = forms.ModelChoiceField(
         queryset=Player.objects.all(),
-        widget=autocomplete.ModelSelect2(url='player-autocomplete')
+        widget=autocomplete.ModelSelect2(url='player-directory')
     )
     player2 = forms.ModelChoiceField(
         queryset=Player.objects.all(),
-        widget=autocomplete.ModelSelect2(url='player-autocomplete')
+        widget=autocomplete.ModelSelect2(url='player-directory')
     )
     def clean(self):
         cleaned = super().clean()
@@ -304,7 +350,7 @@ PairFormSet = forms.formset_factory(PairForm, extra=0)
 class MoCPlayerSelectForm(forms.Form):
     players = forms.ModelMultipleChoiceField(
         queryset=Player.objects.all(),
-        widget=autocomplete.ModelSelect2Multiple(url='player-autocomplete'),
+        widget=autocomplete.ModelSelect2Multiple(url='player-directory'),
         label="Players"
     )
 
@@ -1,6 +1,7 @@
 import os
 from django.db import transaction
-from tournament_creator.models import Player
+from tournament_creator import player_directory
+from tournament_creator.models import Player, PlayerSearchTerm
 
 def import_rankings(filepath, dry_run=False):
     """
@@ -43,4 +44,6 @@ def import_rankings(filepath, dry_run=False):
     else:
         with transaction.atomic():
             Player.objects.bulk_create(to_create)
+            PlayerSearchTerm.index_players(to_create, created=True)
+            player_directory.invalidate()
         print(f"Imported {len(to_create)} players.")
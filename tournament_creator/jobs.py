@@ -0,0 +1,54 @@
+"""
+Handlers for ``BackgroundJob`` kinds, executed by the ``run_jobs`` worker.
+
+A handler takes the job and returns its textual output; raising marks the job
+failed with the exception message. Handlers report progress through
+``job.report_progress``.
+"""
+import logging
+from io import StringIO
+
+from django.core.management import call_command
+
+from .models.jobs import BackgroundJob
+
+logger = logging.getLogger(__name__)
+
+
+def run_update_rankings(job):
+    from .management.commands.update_rankings import Command as UpdateRankingsCommand
+    out = StringIO()
+    command = UpdateRankingsCommand(stdout=out, stderr=out)
+    command.progress = job.report_progress
+    call_command(command, division=job.params.get('division', 'O'))
+    return out.getvalue()
+
+
+JOB_HANDLERS = {
+    'update_rankings': run_update_rankings,
+}
+
+
+def run_job(job):
+    """Execute a claimed job and record its outcome on the row."""
+    handler = JOB_HANDLERS.get(job.kind)
+    if handler is None:
+        job.finish(error=f"Unknown job kind '{job.kind}'")
+        return job
+    try:
+        output = handler(job)
+    except Exception as e:
+        logger.exception("Background job %s failed", job.pk)
+        job.finish(error=str(e) or e.__class__.__name__)
+    else:
+        job.finish(output=output or '')
+    return job
+
+
+def run_pending_jobs():
+    """Run queued jobs until the queue is empty; returns how many ran."""
+    count = 0
+    while (job := BackgroundJob.claim_next()) is not None:
+        run_job(job)
+        count += 1
+    return count
@@ -0,0 +1,75 @@
+"""
+Cached summary of where tournaments are played.
+
+The tournament list's location filter and the place/country suggestions on
+the creation form only need tournament counts per location. They come from
+one grouped query whose few rows are cached. A tournament save or delete
+drops the cache (score writes update the row directly and leave it alone),
+and the next page view rebuilds it.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models.base_models import TournamentChart
+from .read_replica import primary_reads
+
+CACHE_KEY = 'tournament-locations'
+# Invalidation keeps the summary current; the timeout is only a backstop.
+CACHE_TIMEOUT = 60 * 60
+
+
+def location_rows():
+    """``[(country, place, archived, count), ...]`` over all tournaments."""
+    rows = cache.get(CACHE_KEY)
+    if rows is None:
+        # From the primary, so a lagging replica can't refill it with the rows just invalidated.
+        with primary_reads():
+            rows = [tuple(row) for row in TournamentChart.objects.order_by()
+                    .values_list('country', 'place', 'archived').annotate(count=Count('id'))]
+        cache.set(CACHE_KEY, rows, CACHE_TIMEOUT)
+    return rows
+
+
+def location_facets(country=''):
+    """Country and place choices for the list filter, with counts of non-archived tournaments.
+
+    Places are narrowed to ``country`` (case-insensitively) when one is given.
+    Returns two lists of ``{'value', 'count'}`` dicts, sorted by name.
+    """
+    countries, places = {}, {}
+    for row_country, row_place, archived, count in location_rows():
+        if archived:
+            continue
+        if row_country:
+            countries[row_country] = countries.get(row_country, 0) + count
+        if row_place and (not country or row_country.lower() == country.lower()):
+            places[row_place] = places.get(row_place, 0) + count
+    return (
+        [{'value': name, 'count': n} for name, n in sorted(countries.items())],
+        [{'value': name, 'count': n} for name, n in sorted(places.items())],
+    )
+
+
+def known_locations():
+    """Every place and country used so far, archived tournaments included: ``(places, countries)``."""
+    rows = location_rows()
+    return (
+        sorted({place for _, place, _, _ in rows if place}),
+        sorted({country for country, _, _, _ in rows if country}),
+    )
+
+
+def invalidate():
+    # Drop it now, and again on commit in case a request rebuilt it from the
+    # pre-commit rows in between.
+    cache.delete(CACHE_KEY)
+    transaction.on_commit(lambda: cache.delete(CACHE_KEY))
+
+
+@receiver(post_save, sender=TournamentChart)
+@receiver(post_delete, sender=TournamentChart)
+def _tournament_changed(sender, **kwargs):
+    invalidate()
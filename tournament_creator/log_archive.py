@@ -0,0 +1,205 @@
+"""
+Retention for the result and notification logs.
+
+MatchResultLog gets an event for every score change, and NotificationLog a
+row per backend for each of them (failures included). Once a tournament is
+over nothing reads those rows except replay and the occasional audit, so
+``manage.py compact_logs`` moves them out of the live tables:
+
+- ``archive_tournament`` writes the tournament's events, and the
+  notification rows of those events, to one gzip JSON-lines file under
+  settings.LOG_ARCHIVE_DIR (``tournament-<id>/events-<first>-<last>.jsonl.gz``),
+  records a LogArchive summary row, then deletes the archived rows.
+- ``archive_unattached_notifications`` does the same for old notification
+  rows that belong to no event (their event was reset away).
+- ``archived_events`` reads the events back, so replay.py sees a compacted
+  tournament's full history.
+
+The file is complete on disk (written to a temporary name, fsynced and
+renamed) before its summary row is committed, and rows are deleted only
+after that, in batches of short transactions so score recording never waits
+long on the write lock. An interrupted run leaves rows that are already in
+an archive; the next run deletes those first instead of archiving them
+twice.
+"""
+import datetime
+import gzip
+import json
+import os
+import time
+from collections import Counter
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, F, Max, OuterRef
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models.base_models import TournamentChart
+from .models.logging import LogArchive, MatchResultLog
+from .models.notifications import NotificationLog
+
+DEFAULT_BATCH_SIZE = 500
+
+EVENT_FIELDS = ('id', 'recorded_at', 'recorded_by_id', 'recorded_by__username', 'action',
+                'matchup_id', 'matchup_key', 'details')
+NOTIFICATION_FIELDS = ('id', 'timestamp', 'backend_setting__backend_name', 'success', 'details',
+                       'match_result_log_id')
+
+
+def archive_dir():
+    return Path(settings.LOG_ARCHIVE_DIR)
+
+
+def finished_tournaments(older_than_days):
+    """Tournaments over for more than ``older_than_days`` days that still have live log rows.
+
+    Sandboxes are left alone: resetting one already clears its log.
+    """
+    cutoff = timezone.localdate() - datetime.timedelta(days=older_than_days)
+    return (TournamentChart.objects
+            .filter(is_sandbox=False)
+            .annotate(last_day=Coalesce(F('end_date'), F('date')))
+            .filter(last_day__lt=cutoff)
+            .filter(Exists(MatchResultLog.objects.filter(tournament=OuterRef('pk'))))
+            .order_by('last_day', 'id'))
+
+
+def archive_tournament(tournament, batch_size=DEFAULT_BATCH_SIZE, pause=0.0):
+    """Move ``tournament``'s live log rows into a new archive file.
+
+    Returns the LogArchive row, or None if there was nothing new to archive.
+    """
+    directory = archive_dir()
+    archived_up_to = tournament.log_archives.aggregate(last=Max('last_event_id'))['last'] or 0
+    if archived_up_to:
+        prune_events(tournament, archived_up_to, batch_size, pause)
+
+    live = MatchResultLog.objects.filter(tournament=tournament, id__gt=archived_up_to)
+    last_id = live.aggregate(last=Max('id'))['last']
+    if last_id is None:
+        return None
+    live = live.filter(id__lte=last_id).order_by('id')
+    notifications = NotificationLog.objects.filter(
+        match_result_log__in=live.values('id')).order_by('id')
+
+    first_id = live.values_list('id', flat=True).first()
+    file_name = f'tournament-{tournament.id}/events-{first_id}-{last_id}.jsonl.gz'
+    summary = LogArchive(tournament=tournament, file_name=file_name, last_event_id=last_id)
+    actions = Counter()
+
+    def records():
+        for event in live.values(*EVENT_FIELDS).iterator():
+            actions[event['action']] += 1
+            summary.first_event_at = summary.first_event_at or event['recorded_at']
+            summary.last_event_at = event['recorded_at']
+            yield {'type': 'event', **event}
+        for row in notifications.values(*NOTIFICATION_FIELDS).iterator():
+            summary.notifications += 1
+            summary.failed_notifications += not row['success']
+            yield {'type': 'notification', **row}
+
+    summary.size_bytes = _write_atomically(directory / file_name, records())
+    summary.events = sum(actions.values())
+    summary.actions = dict(actions)
+    summary.save()
+
+    prune_events(tournament, last_id, batch_size, pause)
+    return summary
+
+
+def prune_events(tournament, up_to, batch_size=DEFAULT_BATCH_SIZE, pause=0.0):
+    """Delete ``tournament``'s events with id <= ``up_to``, and their notification rows.
+
+    Returns ``(events, notifications)`` deleted.
+    """
+    events = MatchResultLog.objects.filter(tournament=tournament, id__lte=up_to)
+    notifications = NotificationLog.objects.filter(match_result_log__in=events.values('id'))
+    # Notifications first: deleting an event would otherwise null their link one batch at a time.
+    deleted_notifications = _delete_in_batches(notifications, batch_size, pause)
+    return _delete_in_batches(events, batch_size, pause), deleted_notifications
+
+
+def archive_unattached_notifications(older_than_days, batch_size=DEFAULT_BATCH_SIZE, pause=0.0):
+    """Move notification rows older than ``older_than_days`` that belong to no event into an archive.
+
+    Returns ``(file name, rows)``, or ``(None, 0)`` if there were none.
+    """
+    directory = archive_dir()
+    cutoff = timezone.now() - datetime.timedelta(days=older_than_days)
+    rows = NotificationLog.objects.filter(match_result_log__isnull=True, timestamp__lt=cutoff)
+    last_id = rows.aggregate(last=Max('id'))['last']
+    if last_id is None:
+        return None, 0
+    rows = rows.filter(id__lte=last_id).order_by('id')
+
+    file_name = f'unattached/notifications-upto-{last_id}.jsonl.gz'
+    _write_atomically(directory / file_name,
+                      ({'type': 'notification', **row} for row in rows.values(*NOTIFICATION_FIELDS).iterator()))
+    return file_name, _delete_in_batches(rows, batch_size, pause)
+
+
+def read_archive(path):
+    """The records of one archive file, in order, as written."""
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def archived_events(tournament, until=None):
+    """``tournament``'s archived events, oldest first, shaped like ``replay.events`` rows.
+
+    Each carries ``'archived': True``: its MatchResultLog row no longer exists.
+    """
+    directory = archive_dir()
+    for archive in tournament.log_archives.order_by('last_event_id'):
+        if until is not None and archive.first_event_at and archive.first_event_at > until:
+            return
+        for record in read_archive(directory / archive.file_name):
+            if record['type'] != 'event':
+                continue
+            if until is not None and datetime.datetime.fromisoformat(record['recorded_at']) > until:
+                return
+            yield {'id': record['id'], 'action': record['action'], 'matchup_key': record['matchup_key'],
+                   'details': record['details'], 'archived': True}
+
+
+def _write_atomically(path, records):
+    """Write ``records`` as gzip JSON lines to ``path``; returns the file size."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    try:
+        with open(tmp, 'wb') as raw:
+            with gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                for record in records:
+                    f.write(json.dumps(record, default=_isoformat, ensure_ascii=False).encode('utf-8'))
+                    f.write(b'\n')
+            raw.flush()
+            os.fsync(raw.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    return path.stat().st_size
+
+
+def _isoformat(value):
+    # Full precision (DjangoJSONEncoder drops microseconds), so replay's --at cut stays exact.
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def _delete_in_batches(queryset, batch_size, pause):
+    """Delete ``queryset`` ``batch_size`` rows at a time, each batch its own short transaction."""
+    model = queryset.model
+    deleted = 0
+    while True:
+        ids = list(queryset.order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return deleted
+        with transaction.atomic():
+            deleted += model.objects.filter(id__in=ids).delete()[1].get(model._meta.label, 0)
+        if pause:
+            time.sleep(pause)  # let waiting writers in between batches
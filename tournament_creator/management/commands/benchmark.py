@@ -0,0 +1,311 @@
+"""
+Micro-benchmarks for the request paths that matter on tournament day.
+
+Every scenario runs against a synthetic 20-pair euros tournament (phase 1
+fully scored) that is built inside a transaction and rolled back afterwards,
+so the command is safe to run against a live database:
+
+    python manage.py benchmark                  # all scenarios
+    python manage.py benchmark conditional-get --iterations 50
+
+Scenarios:
+
+    conditional-get   Full render vs. 304 Not Modified for the tournament
+                      detail page, list and results download.
+    fragments         Template render of the tournament detail page just
+                      after a change (every cached fragment rebuilt) vs.
+                      with its fragments cached.
+    cache             get/set of a full state snapshot on the file-based,
+                      SQLite and in-memory cache backends.
+    connections       Per-request database cost: a fresh connection (with
+                      the old and the tuned PRAGMAs) vs. a persistent one.
+    player-search     Autocomplete keystrokes against 2,000 players: the
+                      indexed database view vs. the in-memory directory.
+"""
+
+import itertools
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from tournament_creator.models.base_models import Pair, Player, TournamentArchetype, TournamentChart
+from tournament_creator.models.tournament_types import EurosFormat
+
+BENCHMARK_USERNAME = 'benchmark_bot'
+
+SCENARIOS = {}
+
+
+def scenario(name):
+    """Register a ``(command, fixture, iterations)`` function as a named scenario."""
+    def register(func):
+        SCENARIOS[name] = func
+        return func
+    return register
+
+
+class Fixture:
+    """The synthetic tournament every scenario runs against."""
+
+    def __init__(self, tournament, user):
+        self.tournament = tournament
+        self.user = user
+        self.factory = RequestFactory()
+
+    def get(self, view, path, headers=None, data=None, **kwargs):
+        """GET ``view`` as the benchmark user; returns (response, query count)."""
+        request = self.factory.get(path, data=data, headers=headers)
+        request.user = self.user
+        with CaptureQueriesContext(connection) as queries:
+            response = view(request, **kwargs)
+            if hasattr(response, 'render'):
+                response.render()
+        return response, len(queries)
+
+
+def build_euros_fixture():
+    """Create a 20-pair euros tournament with every phase 1 match scored."""
+    from tournament_creator.views.tournament_views import record_match_result
+
+    User = get_user_model()
+    user = User.objects.create_user(username=BENCHMARK_USERNAME, role=User.Role.ADMIN)
+    user.set_unusable_password()
+    user.save()
+
+    impl = EurosFormat()
+    pairs = []
+    for seed in range(1, 21):
+        player1 = Player.objects.create(first_name=f'Bench{seed}a', last_name='Pair',
+                                        ranking=seed * 2 - 1, ranking_points=1000 - seed)
+        player2 = Player.objects.create(first_name=f'Bench{seed}b', last_name='Pair',
+                                        ranking=seed * 2, ranking_points=1000 - seed)
+        pairs.append(Pair.objects.create(player1=player1, player2=player2, seed=seed, entry_order=seed))
+    archetype = TournamentArchetype.objects.filter(name='20 pairs euros format').first()
+    if archetype is None:
+        raise CommandError("The '20 pairs euros format' archetype is missing — run migrate first")
+    tournament = TournamentChart.objects.create(
+        name='Benchmark Euros', place='Benchmark', country='Benchmark', date='2026-07-01',
+        number_of_rounds=impl.calculate_rounds(20), number_of_courts=impl.calculate_courts(20),
+        number_of_stages=3, archetype=archetype, is_sandbox=True, created_by=user,
+    )
+    tournament.pairs.set(pairs)
+    stages = impl.create_stages(tournament)
+    impl.generate_matchups(tournament, pairs, stage=stages[0])
+
+    # Score through the real view so aggregates and versions are maintained.
+    factory = RequestFactory()
+    for matchup in stages[0].matchups.select_related('pair1', 'pair2'):
+        team1, team2 = (21, 15) if matchup.pair1.seed < matchup.pair2.seed else (15, 21)
+        request = factory.post('/', {'team1_scores': json.dumps([team1]),
+                                     'team2_scores': json.dumps([team2]), 'confirmed': '1'})
+        request.user = user
+        record_match_result(request, tournament.id, matchup.id)
+    tournament.refresh_from_db()
+    return Fixture(tournament, user)
+
+
+def timed(func, iterations):
+    """Run ``func`` ``iterations`` times; returns per-call durations in ms."""
+    durations = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        durations.append((time.perf_counter() - start) * 1000)
+    return durations
+
+
+@scenario('conditional-get')
+def conditional_get(command, fixture, iterations):
+    from tournament_creator.views.tournament_views import (
+        TournamentDetailView, TournamentDownloadResultsView, TournamentListView,
+    )
+    pk = fixture.tournament.pk
+    pages = [
+        ('detail', TournamentDetailView.as_view(), f'/tournaments/{pk}/', {'pk': pk}),
+        ('list', TournamentListView.as_view(), '/tournaments/', {}),
+        ('download', TournamentDownloadResultsView.as_view(), f'/tournaments/{pk}/download/', {'pk': pk}),
+    ]
+    for label, view, path, kwargs in pages:
+        response, full_queries = fixture.get(view, path, **kwargs)
+        etag = response.get('ETag')
+        if not etag:
+            raise CommandError(f'{label}: no ETag on the full response')
+        response, cached_queries = fixture.get(view, path, headers={'If-None-Match': etag}, **kwargs)
+        if response.status_code != 304:
+            raise CommandError(f'{label}: expected 304, got {response.status_code}')
+
+        full = timed(lambda: fixture.get(view, path, **kwargs), iterations)
+        cached = timed(lambda: fixture.get(view, path, headers={'If-None-Match': etag}, **kwargs),
+                       iterations)
+        command.report(f'{label} 200', full, queries=full_queries)
+        command.report(f'{label} 304', cached, queries=cached_queries)
+
+
+@scenario('fragments')
+def detail_fragments(command, fixture, iterations):
+    from tournament_creator.views.tournament_views import TournamentDetailView
+
+    pk = fixture.tournament.pk
+    view = TournamentDetailView.as_view()
+    request = fixture.factory.get(f'/tournaments/{pk}/')
+    request.user = fixture.user
+
+    def render(changed):
+        """Template render time alone; the view's context is built either way."""
+        if changed:
+            # A new stamp, as after a score write: every fragment key misses.
+            fixture.tournament.touch()
+        response = view(request, pk=pk)
+        start = time.perf_counter()
+        response.render()
+        return (time.perf_counter() - start) * 1000
+
+    render(changed=False)
+    command.report('detail render after change', [render(changed=True) for _ in range(iterations)])
+    command.report('detail render, cached', [render(changed=False) for _ in range(iterations)])
+
+
+@scenario('cache')
+def cache_backends(command, fixture, iterations):
+    from django.core.cache.backends.filebased import FileBasedCache
+    from django.core.cache.backends.locmem import LocMemCache
+    from tournament_creator.cache_backends import SQLiteCache
+    from tournament_creator.state import build_tournament_state
+
+    payload = build_tournament_state(fixture.tournament)
+    command.stdout.write(f'  payload: full state snapshot, {len(json.dumps(payload))} bytes as JSON')
+    with tempfile.TemporaryDirectory() as tmpdir:
+        params = {'OPTIONS': {'MAX_ENTRIES': 1000}}
+        backends = [
+            ('file', FileBasedCache(Path(tmpdir) / 'files', params)),
+            ('sqlite', SQLiteCache(Path(tmpdir) / 'cache.sqlite3', params)),
+            ('locmem', LocMemCache('benchmark', params)),
+        ]
+        for label, backend in backends:
+            counter = itertools.count()
+            # Warm: 200 keys so lookups hit a populated store.
+            for i in range(200):
+                backend.set(f'warm:{i}', payload)
+            command.report(f'{label} set', timed(lambda: backend.set(f'key:{next(counter)}', payload),
+                                                 iterations))
+            command.report(f'{label} get hit', timed(lambda: backend.get('warm:7'), iterations))
+            command.report(f'{label} get miss', timed(lambda: backend.get('missing'), iterations))
+
+
+@scenario('connections')
+def connection_overhead(command, fixture, iterations):
+    from django.db.backends.sqlite3.base import DatabaseWrapper
+
+    def request_query(wrapper):
+        # A typical cheap per-request lookup: the conditional GET stamp.
+        with wrapper.cursor() as cursor:
+            cursor.execute('SELECT modified_at FROM tournament_creator_tournamentchart WHERE id = %s',
+                           [fixture.tournament.pk])
+            cursor.fetchone()
+
+    def fresh(settings_dict):
+        def run():
+            wrapper = DatabaseWrapper(settings_dict, alias='benchmark')
+            try:
+                request_query(wrapper)
+            finally:
+                wrapper.close()
+        return run
+
+    tuned = dict(connection.settings_dict)
+    legacy = dict(tuned, OPTIONS=dict(
+        tuned['OPTIONS'], init_command='PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;'))
+    if connection.is_in_memory_db():
+        raise CommandError('connections: needs a file database, not in-memory')
+
+    command.report('fresh, old PRAGMAs', timed(fresh(legacy), iterations))
+    command.report('fresh, tuned PRAGMAs', timed(fresh(tuned), iterations))
+    persistent = DatabaseWrapper(tuned, alias='benchmark')
+    try:
+        request_query(persistent)
+        command.report('persistent connection', timed(lambda: request_query(persistent), iterations))
+    finally:
+        persistent.close()
+
+
+@scenario('player-search')
+def player_search(command, fixture, iterations):
+    from tournament_creator import player_directory
+    from tournament_creator.models.search import PlayerSearchTerm
+    from tournament_creator.views.autocomplete import PlayerAutocomplete, player_directory_autocomplete
+
+    surnames = ['Hämäläinen', 'Virtanen', 'Korhonen', 'Mäkinen', 'Nieminen', 'Smith', 'Müller', 'Dupont']
+    players = Player.objects.bulk_create([
+        Player(first_name=f'Search{i}', last_name=surnames[i % len(surnames)],
+               ranking=1000 + i, ranking_points=i % 300)
+        for i in range(2000)
+    ])
+    PlayerSearchTerm.index_players(players, created=True)
+    # Not committed, so reload this process's directory directly rather
+    # than through the (cross-process) version stamp.
+    player_directory._directory = player_directory.PlayerDirectory.load(player_directory.current_version())
+
+    queries = ['h', 'hama', 'search12', 'mak sea', 'zz']
+    database_view = PlayerAutocomplete.as_view()
+    keystrokes = itertools.cycle(queries)
+    _, db_queries = fixture.get(database_view, '/player-autocomplete/', data={'q': 'hama'})
+    command.report('database view', timed(
+        lambda: fixture.get(database_view, '/player-autocomplete/', data={'q': next(keystrokes)}),
+        iterations), queries=db_queries)
+    _, directory_queries = fixture.get(player_directory_autocomplete, '/player-directory/',
+                                       data={'q': 'hama'})
+    command.report('directory view', timed(
+        lambda: fixture.get(player_directory_autocomplete, '/player-directory/',
+                            data={'q': next(keystrokes)}),
+        iterations), queries=directory_queries)
+    directory = player_directory.get_directory()
+    command.report('directory lookup only', timed(lambda: directory.search(next(keystrokes)), iterations))
+    command.report('directory rebuild', timed(
+        lambda: player_directory.PlayerDirectory.load(), max(1, iterations // 10)))
+    player_directory._directory = None
+
+
+class Command(BaseCommand):
+    help = ('Benchmark hot request paths against a synthetic euros tournament '
+            '(built in a transaction and rolled back).')
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenarios', nargs='*', metavar='scenario',
+                            help=f"Scenarios to run (default: all). Available: {', '.join(SCENARIOS)}")
+        parser.add_argument('--iterations', type=int, default=20,
+                            help='Timed repetitions per measurement (default 20)')
+
+    def handle(self, *args, **options):
+        names = options['scenarios'] or list(SCENARIOS)
+        unknown = [name for name in names if name not in SCENARIOS]
+        if unknown:
+            raise CommandError(f"Unknown scenario(s): {', '.join(unknown)}. "
+                               f"Available: {', '.join(SCENARIOS)}")
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be positive')
+
+        with transaction.atomic():
+            fixture = build_euros_fixture()
+            for name in names:
+                self.stdout.write(self.style.MIGRATE_HEADING(f'\n{name}'))
+                SCENARIOS[name](self, fixture, options['iterations'])
+            transaction.set_rollback(True)
+
+    def report(self, label, durations, queries=None):
+        """One result line: median / mean / p95 / p99 in ms, plus the query count."""
+        ordered = sorted(durations)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+        line = (f'  {label:<28} median {statistics.median(ordered):8.2f} ms   '
+                f'mean {statistics.mean(ordered):8.2f} ms   p95 {p95:8.2f} ms   p99 {p99:8.2f} ms')
+        if queries is not None:
+            line += f'   {queries} queries'
+        self.stdout.write(line)
@@ -0,0 +1,58 @@
+"""
+Render read-only static copies of the public tournament pages.
+
+Writes index.html plus t/<id>/index.html and t/<id>/state.json for every
+listed tournament into settings.STATIC_SITE_DIR (or --output). Only
+tournaments whose results changed since the last pass are rendered again;
+pages of deleted or archived tournaments are removed. See
+tournament_creator/static_site.py, and RESTORE.md for using the copy during
+failover.
+
+Run permanently by scripts/ddc-static-site.service:
+
+    python manage.py build_static_site
+    python manage.py build_static_site --output /srv/ddc-results --force
+    python manage.py build_static_site --watch 10   # rebuild every 10 s until stopped
+"""
+import signal
+import sys
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tournament_creator.static_site import build_site, site_dir
+
+
+class Command(BaseCommand):
+    help = 'Render the public tournament pages into static HTML/JSON files.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Directory to write to (default settings.STATIC_SITE_DIR)')
+        parser.add_argument('--force', action='store_true', help='Render every tournament, changed or not')
+        parser.add_argument('--watch', type=float, metavar='SECONDS',
+                            help='Keep running, bringing the copy up to date every SECONDS')
+
+    def handle(self, *args, **options):
+        if options['watch'] is not None and options['watch'] <= 0:
+            raise CommandError('--watch must be a positive number of seconds')
+        directory = options['output'] or site_dir()
+
+        self.build(directory, options['force'])
+        if options['watch'] is None:
+            return
+        # systemd stops the service with SIGTERM.
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        try:
+            while True:
+                time.sleep(options['watch'])
+                self.build(directory, False, quiet=True)
+        except KeyboardInterrupt:
+            pass
+
+    def build(self, directory, force, quiet=False):
+        result = build_site(directory, force=force)
+        if quiet and not (result.written or result.removed):
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f'{directory}: rendered {len(result.written)}, removed {len(result.removed)}, '
+            f'unchanged {result.unchanged}'))
@@ -1,16 +1,46 @@
+import datetime
+
 from django.core.management.base import BaseCommand, CommandError
-from tournament_creator.models import TournamentChart, Matchup
+from tournament_creator.models import Pair, TournamentChart, Matchup
 from tournament_creator.models.scoring import MatchScore
 
 
+def add_points_basis_arguments(parser):
+    parser.add_argument(
+        '--as-of', type=datetime.date.fromisoformat, metavar='YYYY-MM-DD',
+        help="Use ranking points as they stood at the end of this day "
+             "(default: the tournament's registration date).",
+    )
+    parser.add_argument(
+        '--live', action='store_true',
+        help="Use the current ranking points even if the tournament has a registration date.",
+    )
+
+
+def points_as_of(tournament, options):
+    """The moment whose ranking points seed ``tournament`` (None: live points)."""
+    if options['live']:
+        return None
+    return tournament.seeding_as_of(options['as_of'])
+
+
+def describe_points_basis(as_of):
+    if as_of is None:
+        return "Using current ranking points."
+    return f"Using ranking points as of {as_of:%Y-%m-%d} (ranking history)."
+
+
 class Command(BaseCommand):
     help = (
         "Check whether a pairs tournament's stored seeding still matches the "
-        "current player ranking points (e.g. after a rankings refresh)."
+        "player ranking points (e.g. after a rankings refresh). Points are taken "
+        "from the ranking history as of the registration date when the "
+        "tournament has one, otherwise the current points are used."
     )
 
     def add_arguments(self, parser):
         parser.add_argument('tournament_id', type=int)
+        add_points_basis_arguments(parser)
 
     def handle(self, *args, **options):
         try:
@@ -22,18 +52,21 @@ class Command(BaseCommand):
         if not pairs:
             raise CommandError(f"Tournament '{tournament}' has no pairs (not a pairs tournament?)")
 
-        # Recompute what the seeding would be with current player points, using the
-        # same ordering rule as tournament creation (points sum desc, stable on
-        # entry order for ties).
+        # Recompute what the seeding would be with the chosen player points, using
+        # the same ordering rule as tournament creation (points sum desc, stable
+        # on entry order for ties).
+        as_of = points_as_of(tournament, options)
+        fresh_sums = Pair.points_sums(pairs, as_of)
         pairs.sort(key=lambda p: (p.entry_order is None, p.entry_order))
-        reseeded = sorted(pairs, key=lambda p: p.calculate_points_sum(), reverse=True)
+        reseeded = sorted(pairs, key=lambda p: fresh_sums[p.pk], reverse=True)
         new_seed_by_pair = {pair.pk: idx for idx, pair in enumerate(reseeded, start=1)}
 
         changes = []
         self.stdout.write(f"Tournament: {tournament.name} (id={tournament.pk})")
+        self.stdout.write(describe_points_basis(as_of))
         self.stdout.write(f"{'seed':>4} {'new':>4}  {'stored pts':>10} {'fresh pts':>10}  pair")
         for pair in sorted(pairs, key=lambda p: (p.seed is None, p.seed)):
-            fresh_sum = pair.calculate_points_sum()
+            fresh_sum = fresh_sums[pair.pk]
             new_seed = new_seed_by_pair[pair.pk]
             marker = '' if new_seed == pair.seed else '  <-- CHANGED'
             self.stdout.write(
@@ -45,7 +78,7 @@ class Command(BaseCommand):
 
         if not changes:
             self.stdout.write(self.style.SUCCESS(
-                "Seeding unchanged: stored seeds match current ranking points."
+                "Seeding unchanged: stored seeds match the ranking points."
             ))
             return
 
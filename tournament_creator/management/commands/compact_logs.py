@@ -0,0 +1,61 @@
+"""
+Move the result and notification logs of finished tournaments out of the live tables.
+
+Each tournament over for more than --older-than-days gets its MatchResultLog
+events, with their NotificationLog rows, written to a gzip JSON-lines file
+under settings.LOG_ARCHIVE_DIR and a LogArchive summary row; the archived rows
+are then deleted in batches of short transactions, so it is safe to run while
+scores are being recorded. Notification rows attached to no event are
+archived the same way once they are as old. Replay reads the archives back.
+See tournament_creator/log_archive.py.
+
+Run weekly by scripts/ddc-compact-logs.timer:
+
+    python manage.py compact_logs
+    python manage.py compact_logs --older-than-days 60 --batch-size 200
+    python manage.py compact_logs --dry-run          # list what would be archived
+"""
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count
+
+from tournament_creator.log_archive import (DEFAULT_BATCH_SIZE, archive_tournament,
+                                            archive_unattached_notifications, finished_tournaments)
+
+
+class Command(BaseCommand):
+    help = 'Archive the logs of finished tournaments to compressed files and prune the live tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--older-than-days', type=int, default=14,
+                            help="Archive tournaments whose last day is more than this many days ago (default 14)")
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE,
+                            help=f'Rows deleted per transaction (default {DEFAULT_BATCH_SIZE})')
+        parser.add_argument('--pause', type=float, default=0.05,
+                            help='Seconds to wait between delete batches (default 0.05)')
+        parser.add_argument('--dry-run', action='store_true', help='Only list what would be archived')
+
+    def handle(self, *args, **options):
+        if options['older_than_days'] < 0 or options['batch_size'] < 1:
+            raise CommandError('--older-than-days must be >= 0 and --batch-size >= 1')
+
+        tournaments = finished_tournaments(options['older_than_days'])
+        if options['dry_run']:
+            for tournament in tournaments.annotate(live_events=Count('result_log')):
+                self.stdout.write(f"{tournament.id:>5} {tournament.name} ({tournament.last_day}): "
+                                  f"{tournament.live_events} events")
+            return
+
+        archived = 0
+        for tournament in tournaments:
+            summary = archive_tournament(tournament, options['batch_size'], options['pause'])
+            if summary is None:
+                continue
+            archived += 1
+            self.stdout.write(f"{tournament.name}: {summary.events} events, "
+                              f"{summary.notifications} notifications -> {summary.file_name}")
+
+        file_name, rows = archive_unattached_notifications(
+            options['older_than_days'], options['batch_size'], options['pause'])
+        if file_name:
+            self.stdout.write(f"{rows} notifications without an event -> {file_name}")
+        self.stdout.write(self.style.SUCCESS(f"Archived the logs of {archived} tournament(s)"))
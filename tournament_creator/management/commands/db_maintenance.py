@@ -0,0 +1,63 @@
+"""
+Periodic SQLite housekeeping for the production database.
+
+With persistent connections and steady score traffic the WAL file can keep
+growing, because automatic checkpoints never get a moment when no reader
+holds an old snapshot. This command forces a checkpoint (truncating the WAL)
+and runs ``PRAGMA optimize`` so the query planner's statistics follow the
+data. It is safe to run while the site is serving: the checkpoint waits up to
+the busy timeout for readers.
+
+When ``manage.py replicate`` is running it checkpoints the WAL itself, and its
+read transaction would keep a TRUNCATE checkpoint waiting (with writers
+blocked) for the whole busy timeout: pass ``--skip-checkpoint`` then.
+
+Run hourly by scripts/ddc-db-maintenance.timer:
+
+    python manage.py db_maintenance
+    python manage.py db_maintenance --report   # also print effective settings
+    python manage.py db_maintenance --skip-checkpoint
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from tournament_creator.checks import effective_sqlite_settings
+
+
+class Command(BaseCommand):
+    help = 'Checkpoint the SQLite WAL and refresh query planner statistics.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database alias (default "default")')
+        parser.add_argument('--report', action='store_true',
+                            help='Print the effective connection settings first')
+        parser.add_argument('--skip-checkpoint', action='store_true',
+                            help='Only refresh statistics (the replicate command checkpoints the WAL itself)')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError(f"Database '{options['database']}' is not SQLite")
+
+        if options['report']:
+            for name, value in effective_sqlite_settings(options['database']).items():
+                self.stdout.write(f'{name:<20} {value}')
+
+        if options['skip_checkpoint']:
+            with connection.cursor() as cursor:
+                cursor.execute('PRAGMA optimize')
+            self.stdout.write(self.style.SUCCESS('Planner statistics optimized'))
+            return
+
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+            busy, log_frames, checkpointed = cursor.fetchone()
+            cursor.execute('PRAGMA optimize')
+
+        if busy:
+            self.stdout.write(self.style.WARNING(
+                f'Checkpoint incomplete: readers still active ({checkpointed}/{log_frames} frames copied)'))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f'WAL checkpointed and truncated ({checkpointed} frames); planner statistics optimized'))
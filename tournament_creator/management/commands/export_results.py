@@ -0,0 +1,57 @@
+"""
+Export results to a file, streamed (see tournament_creator/export.py).
+
+    python manage.py export_results 12                                  # text standings to stdout
+    python manage.py export_results 12 --format archive -o eo26.jsonl.gz
+    python manage.py export_results --season 2026 --format csv -o ddc-2026.csv
+
+A season is every tournament dated that year that is neither a sandbox nor
+archived; it exports as csv or json.
+"""
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tournament_creator import export
+from tournament_creator.models import TournamentChart
+
+
+class Command(BaseCommand):
+    help = "Export a tournament's results, or a whole season's, as text, CSV, JSON or a full archive."
+
+    def add_arguments(self, parser):
+        parser.add_argument('tournament_id', type=int, nargs='?')
+        parser.add_argument('--season', type=int, help='Export every tournament of this year instead')
+        parser.add_argument('--format', choices=list(export.FORMATS), default='txt')
+        parser.add_argument('-o', '--output', help='File to write (default: stdout)')
+
+    def handle(self, *args, **options):
+        fmt = options['format']
+        if (options['tournament_id'] is None) == (options['season'] is None):
+            raise CommandError('Give either a tournament id or --season')
+        if options['season'] is not None:
+            if fmt not in export.SEASON_FORMATS:
+                raise CommandError(f"A season exports as {' or '.join(export.SEASON_FORMATS)}")
+            chunks = export.exporter(fmt)(export.season_tournaments(options['season']))
+        else:
+            try:
+                tournament = TournamentChart.objects.select_related('archetype').get(pk=options['tournament_id'])
+            except TournamentChart.DoesNotExist:
+                raise CommandError(f"Tournament {options['tournament_id']} does not exist")
+            chunks = export.exporter(fmt)(tournament)
+
+        binary = fmt == 'archive'
+        if options['output']:
+            mode = {'mode': 'wb'} if binary else {'mode': 'w', 'encoding': 'utf-8', 'newline': ''}
+            with open(options['output'], **mode) as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            self.stdout.write(self.style.SUCCESS(f"Wrote {options['output']}"))
+        elif binary:
+            if sys.stdout.isatty():
+                raise CommandError('Refusing to write a gzip archive to a terminal; use --output')
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
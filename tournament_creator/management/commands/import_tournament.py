@@ -0,0 +1,50 @@
+"""
+Import a tournament archive written by `export_results --format archive`
+(or the "Full archive" download) into this database.
+
+    python manage.py import_tournament eo26.jsonl.gz
+    python manage.py import_tournament eo26.jsonl.gz --replace        # swap out the local copy
+    python manage.py import_tournament eo26.jsonl.gz --name "EO26 (server copy)"
+
+Everything is inserted in one transaction with fresh ids; players are matched
+by name and users by username. See tournament_creator/archive_import.py.
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tournament_creator.archive_import import ArchiveImportError, import_archive
+from tournament_creator.models import User
+
+
+class Command(BaseCommand):
+    help = 'Import a single tournament from its archive file, remapping ids and matching players by name.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archive', help='Archive file (.jsonl.gz)')
+        parser.add_argument('--replace', action='store_true',
+                            help='Delete a tournament with the same name and date first')
+        parser.add_argument('--name', help='Import under this name instead')
+        parser.add_argument('--created-by', help="Username to own the tournament if the archive's creator has no account here")
+
+    def handle(self, *args, **options):
+        created_by = None
+        if options['created_by']:
+            created_by = User.objects.filter(username=options['created_by']).first()
+            if created_by is None:
+                raise CommandError(f"No user named {options['created_by']!r}")
+
+        started = time.monotonic()
+        try:
+            result = import_archive(options['archive'], created_by=created_by,
+                                    name=options['name'], replace=options['replace'])
+        except (ArchiveImportError, OSError) as e:
+            raise CommandError(str(e))
+        elapsed = time.monotonic() - started
+
+        if result.replaced:
+            self.stdout.write(self.style.WARNING(f"Replaced the existing '{result.tournament.name}'"))
+        self.stdout.write(f"Players: {result.players_matched} matched by name, {result.players_created} created")
+        self.stdout.write(', '.join(f'{count} {kind}' for kind, count in result.rows.items() if count))
+        self.stdout.write(self.style.SUCCESS(
+            f"Imported '{result.tournament.name}' as tournament {result.tournament.pk} in {elapsed:.2f}s"))
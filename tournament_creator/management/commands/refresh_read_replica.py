@@ -0,0 +1,57 @@
+"""
+Keep the read replica (settings.READ_REPLICA) a fresh copy of the database.
+
+Every --interval seconds the database is copied with SQLite's online backup
+into a temporary file, which then replaces the replica. Spectator page views
+read from the copy; see tournament_creator/read_replica.py.
+
+Run permanently by scripts/ddc-read-replica.service:
+
+    python manage.py refresh_read_replica                 # every 5 s
+    python manage.py refresh_read_replica --interval 2
+    python manage.py refresh_read_replica --once
+"""
+import signal
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from tournament_creator.read_replica import refresh
+
+
+class Command(BaseCommand):
+    help = 'Refresh the read-only replica that spectator page views read from.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--replica', default=settings.READ_REPLICA,
+                            help='Replica file (default settings.READ_REPLICA)')
+        parser.add_argument('--interval', type=float, default=5.0,
+                            help='Seconds between copies (default 5); keep it well under READ_REPLICA_MAX_LAG')
+        parser.add_argument('--once', action='store_true', help='Copy once and exit')
+
+    def handle(self, *args, **options):
+        if not options['replica']:
+            raise CommandError('No replica file: set READ_REPLICA or pass --replica')
+        if options['interval'] <= 0:
+            raise CommandError('--interval must be positive')
+        connection = connections['default']
+        if connection.vendor != 'sqlite':
+            raise CommandError("Database 'default' is not SQLite")
+        primary = connection.settings_dict['NAME']
+
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        try:
+            while True:
+                started = time.monotonic()
+                size = refresh(primary, options['replica'])
+                if options['once']:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"Copied {primary} to {options['replica']} ({size / 1e6:.1f} MB "
+                        f"in {time.monotonic() - started:.2f} s)"))
+                    return
+                time.sleep(max(0.0, options['interval'] - (time.monotonic() - started)))
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,68 @@
+"""
+Replay a tournament's result log: standings at any moment, or a full rebuild.
+
+    python manage.py replay_results 12                          # standings now, from the log alone
+    python manage.py replay_results 12 --at "2026-07-12 14:05"  # standings as they stood then
+    python manage.py replay_results 12 --rebuild                # rewrite scores/standings from the log
+
+Without --rebuild nothing is changed. --at is read in settings.TIME_ZONE
+unless it carries an offset.
+"""
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tournament_creator.models import Pair, Player, TournamentChart
+from tournament_creator.replay import rebuild, standings_as_of
+
+
+class Command(BaseCommand):
+    help = "Replay a tournament's result log to show past standings or rebuild its results."
+
+    def add_arguments(self, parser):
+        parser.add_argument('tournament_id', type=int)
+        parser.add_argument('--at', help='Replay the events up to this moment (default: all of them)')
+        parser.add_argument('--rebuild', action='store_true',
+                            help="Replace the tournament's scores, standings and generated phases with the replay")
+
+    def handle(self, *args, **options):
+        try:
+            tournament = TournamentChart.objects.get(pk=options['tournament_id'])
+        except TournamentChart.DoesNotExist:
+            raise CommandError(f"Tournament {options['tournament_id']} does not exist")
+
+        until = None
+        if options['at']:
+            try:
+                until = datetime.datetime.fromisoformat(options['at'])
+            except ValueError:
+                raise CommandError(f"Can't read --at {options['at']!r}; use e.g. \"2026-07-12 14:05\"")
+            if timezone.is_naive(until):
+                until = timezone.make_aware(until)
+
+        if options['rebuild']:
+            applied = rebuild(tournament, until)
+            self.stdout.write(self.style.SUCCESS(
+                f"Rebuilt '{tournament.name}' from {applied} logged events"))
+            return
+
+        standings = standings_as_of(tournament, until)
+        if isinstance(standings, dict):  # multi-phase: per pool, plus the final order once decided
+            for pool_id, entries in standings['pools'].items():
+                self.stdout.write(f'Pool {pool_id}')
+                self._write_rows(entries)
+            if standings['final']:
+                self.stdout.write('Final standings')
+                self._write_rows(standings['final'])
+        else:
+            self._write_rows(standings)
+
+    def _write_rows(self, entries):
+        pairs = Pair.objects.in_bulk([e['pair'] for e in entries if 'pair' in e])
+        players = Player.objects.in_bulk([e['player'] for e in entries if 'player' in e])
+        for entry in entries:
+            name = pairs[entry['pair']] if 'pair' in entry else players[entry['player']]
+            record = (f"  {entry['wins']} wins, {entry['played']} played, {entry['pd']:+d}"
+                      if 'wins' in entry else '')
+            self.stdout.write(f"{entry['position']:>3}. {name}{record}")
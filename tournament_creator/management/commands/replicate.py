@@ -0,0 +1,80 @@
+"""
+Continuously back up the SQLite database by shipping its WAL.
+
+Every poll copies only the pages committed since the previous one into a
+small segment file under the replica directory. A full snapshot is taken when
+a generation starts: at startup if the WAL can't be picked up where the last
+run stopped, once a day, and whenever the WAL was restarted behind our back.
+See tournament_creator/replication.py for the format, and RESTORE.md for
+restoring.
+
+Run permanently by scripts/ddc-replicate.service:
+
+    python manage.py replicate                       # into settings.REPLICA_DIR
+    python manage.py replicate --replica /path/to/replica --interval 2
+    python manage.py replicate --once                # single poll, then exit
+"""
+import signal
+import sys
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from tournament_creator.replication import ReplicationError, Replicator
+
+
+class Command(BaseCommand):
+    help = 'Continuously ship the SQLite WAL to a replica directory.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default', help='Database alias (default "default")')
+        parser.add_argument('--replica', default=settings.REPLICA_DIR,
+                            help='Replica directory (default settings.REPLICA_DIR)')
+        parser.add_argument('--interval', type=float, default=1.0,
+                            help='Seconds between polls, i.e. the most that can be lost (default 1)')
+        parser.add_argument('--snapshot-hours', type=float, default=24,
+                            help='Start a new generation with a full snapshot this often (default 24)')
+        parser.add_argument('--retain', type=int, default=2,
+                            help='Generations to keep, the current one included (default 2)')
+        parser.add_argument('--checkpoint-pages', type=int, default=1000,
+                            help='Checkpoint the WAL once it holds this many frames (default 1000)')
+        parser.add_argument('--once', action='store_true', help='Poll once and exit')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError(f"Database '{options['database']}' is not SQLite")
+
+        replicator = Replicator(
+            connection.settings_dict['NAME'], options['replica'],
+            checkpoint_pages=options['checkpoint_pages'],
+            snapshot_interval=options['snapshot_hours'] * 3600,
+            retain_generations=options['retain'],
+            busy_timeout=settings.SQLITE_BUSY_TIMEOUT,
+        )
+        # systemd stops the service with SIGTERM; exit through the finally below.
+        signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+        try:
+            replicator.open()
+        except ReplicationError as e:
+            raise CommandError(str(e))
+        generation = replicator.generation
+        if generation:
+            self.stdout.write(f'Resuming generation {generation}')
+        try:
+            while True:
+                shipped = replicator.poll()
+                if replicator.generation != generation:
+                    generation = replicator.generation
+                    self.stdout.write(self.style.SUCCESS(f'Started generation {generation} with a full snapshot'))
+                elif shipped and options['verbosity'] >= 2:
+                    self.stdout.write(f'Shipped {shipped} pages')
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            replicator.close()
@@ -1,7 +1,10 @@
 from django.db import transaction
 from django.core.management.base import BaseCommand, CommandError
 
-from tournament_creator.models import TournamentChart, Matchup
+from tournament_creator.management.commands.check_seeding import (
+    add_points_basis_arguments, describe_points_basis, points_as_of,
+)
+from tournament_creator.models import Pair, TournamentChart, Matchup
 from tournament_creator.models.base_models import Pool
 from tournament_creator.models.scoring import MatchScore
 from tournament_creator.models.tournament_types import get_implementation
@@ -10,7 +13,8 @@ from tournament_creator.models.tournament_types import get_implementation
 class Command(BaseCommand):
     help = (
         "Reseed a multi-phase pairs tournament's Phase 1 after a rankings refresh: "
-        "recompute pair seeds from current player points, then regenerate the "
+        "recompute pair seeds from player points (as of the registration date "
+        "when the tournament has one), then regenerate the "
         "Phase 1 pools and matchups. Safe only while no scores are recorded and "
         "later phases have not been generated (see check_seeding first)."
     )
@@ -21,6 +25,7 @@ class Command(BaseCommand):
             '--yes', action='store_true',
             help="Skip the confirmation prompt and apply the reseed.",
         )
+        add_points_basis_arguments(parser)
 
     def handle(self, *args, **options):
         tid = options['tournament_id']
@@ -58,13 +63,16 @@ class Command(BaseCommand):
 
         # Compute the new seeding the same way tournament creation does: refresh
         # each pair's stored points, then order by points sum descending.
+        as_of = points_as_of(tournament, options)
+        sums = Pair.points_sums(pairs, as_of)
         for pair in pairs:
-            pair.ranking_points_sum = pair.calculate_points_sum()
+            pair.ranking_points_sum = sums[pair.pk]
         reseeded = sorted(pairs, key=lambda p: p.ranking_points_sum, reverse=True)
         new_seed = {p.pk: idx for idx, p in enumerate(reseeded, start=1)}
 
         changed = [p for p in pairs if p.seed != new_seed[p.pk]]
         self.stdout.write(f"Tournament: {tournament.name} (id={tournament.pk})")
+        self.stdout.write(describe_points_basis(as_of))
         if not changed:
             self.stdout.write(self.style.SUCCESS(
                 "Seeding unchanged — nothing to regenerate."
@@ -90,11 +98,14 @@ class Command(BaseCommand):
 
             for pair in pairs:
                 pair.seed = new_seed[pair.pk]
-                pair.save()  # save() also recomputes ranking_points_sum
+            # bulk_update rather than save(): save() would recompute the sum
+            # from the live points.
+            Pair.objects.bulk_update(pairs, ['seed', 'ranking_points_sum'])
 
             Matchup.objects.filter(stage=stage1).delete()
             Pool.objects.filter(stage=stage1).delete()
             archetype_impl.generate_matchups(locked, pairs, stage=stage1)
+            locked.bump_results_version(stage1.matchups.all())
 
         self.stdout.write(self.style.SUCCESS("Reseeded. New Phase 1 pools:"))
         for pool in stage1.pools.order_by('order'):
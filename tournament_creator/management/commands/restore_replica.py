@@ -0,0 +1,72 @@
+"""
+Rebuild the database from the WAL replica written by ``manage.py replicate``.
+
+The newest snapshot taken at or before the requested moment is unpacked, and
+the segments shipped after it are applied in order up to that moment. The
+result is integrity-checked. The output is a new file; move it into place
+yourself (see RESTORE.md).
+
+    python manage.py restore_replica --list
+    python manage.py restore_replica --output /tmp/db.sqlite3
+    python manage.py restore_replica --output /tmp/db.sqlite3 --at "2026-07-12 14:05:30"
+
+``--at`` is read in settings.TIME_ZONE unless it carries an offset.
+"""
+import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from tournament_creator.replication import (ReplicationError, generation_start, list_generations,
+                                            list_segments, restore)
+
+
+class Command(BaseCommand):
+    help = 'Restore the database from the WAL replica, optionally to a point in time.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--replica', default=settings.REPLICA_DIR,
+                            help='Replica directory (default settings.REPLICA_DIR)')
+        parser.add_argument('--output', help='Database file to create')
+        parser.add_argument('--at', help='Restore the state as of this time (default: the latest)')
+        parser.add_argument('--list', action='store_true', help='List generations and the time span they cover')
+
+    def handle(self, *args, **options):
+        replica = options['replica']
+        if options['list']:
+            for generation in list_generations(replica):
+                segments = list_segments(replica, generation)
+                until = segments[-1][0] if segments else generation_start(generation)
+                self.stdout.write(f'{generation}  {self.local(generation_start(generation))} .. '
+                                  f'{self.local(until)}  ({len(segments)} segments)')
+            return
+        if not options['output']:
+            raise CommandError('Give --output (or --list)')
+
+        at = None
+        if options['at']:
+            try:
+                moment = datetime.datetime.fromisoformat(options['at'])
+            except ValueError:
+                raise CommandError(f"Can't read --at {options['at']!r}; use e.g. \"2026-07-12 14:05:30\"")
+            if timezone.is_naive(moment):
+                moment = timezone.make_aware(moment)
+            at = moment.timestamp()
+
+        try:
+            result = restore(replica, options['output'], at=at)
+        except ReplicationError as e:
+            raise CommandError(str(e))
+
+        summary = (f'Restored generation {result.generation} plus {result.segments} segments '
+                   f'to {options["output"]}; state as of {self.local(result.restored_to)}')
+        if result.integrity == 'ok':
+            self.stdout.write(self.style.SUCCESS(f'{summary}; integrity check ok'))
+        else:
+            self.stdout.write(self.style.WARNING(f'{summary}; integrity check FAILED: {result.integrity}'))
+
+    @staticmethod
+    def local(timestamp):
+        moment = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+        return timezone.localtime(moment).strftime('%Y-%m-%d %H:%M:%S')
@@ -0,0 +1,67 @@
+"""
+Worker for queued background jobs (see tournament_creator.jobs).
+
+Web requests only queue a BackgroundJob row; this command executes them, one
+at a time, reporting progress on the row for the UI to poll. Run it as a
+long-lived service (scripts/ddc-jobs.service):
+
+    python manage.py run_jobs
+
+or drain the queue once, e.g. from cron or while developing:
+
+    python manage.py run_jobs --once
+"""
+
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+from django.utils import timezone
+
+from tournament_creator.jobs import run_pending_jobs
+from tournament_creator.models.jobs import BackgroundJob
+
+
+class Command(BaseCommand):
+    help = 'Execute queued background jobs (rankings refreshes, ...).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true',
+                            help='Run the jobs queued now, then exit')
+        parser.add_argument('--poll-interval', type=float, default=2.0,
+                            help='Seconds between queue checks (default 2)')
+        parser.add_argument('--stale-after', type=int, default=30,
+                            help='Minutes after which a RUNNING job is considered abandoned by a '
+                                 'crashed worker and marked failed at startup (default 30)')
+
+    def handle(self, *args, **options):
+        if options['poll_interval'] <= 0:
+            raise CommandError('--poll-interval must be positive')
+        self._fail_abandoned(options['stale_after'])
+
+        if options['once']:
+            count = run_pending_jobs()
+            self.stdout.write(self.style.SUCCESS(f'Ran {count} job(s)'))
+            return
+
+        self.stdout.write(f"Waiting for jobs (polling every {options['poll_interval']} s)...")
+        try:
+            while True:
+                # A persistent connection may have gone stale while idle.
+                close_old_connections()
+                count = run_pending_jobs()
+                if count:
+                    self.stdout.write(f'Ran {count} job(s)')
+                time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('Stopped')
+
+    def _fail_abandoned(self, stale_minutes):
+        cutoff = timezone.now() - timedelta(minutes=stale_minutes)
+        abandoned = BackgroundJob.objects.filter(
+            status=BackgroundJob.Status.RUNNING, started_at__lt=cutoff
+        ).update(status=BackgroundJob.Status.FAILED, finished_at=timezone.now(),
+                 error='Abandoned: the worker stopped while running this job')
+        if abandoned:
+            self.stdout.write(self.style.WARNING(f'Marked {abandoned} abandoned job(s) as failed'))
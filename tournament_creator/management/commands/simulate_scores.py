@@ -155,13 +155,8 @@ class Command(BaseCommand):
         from tournament_creator.models.tournament_types import get_implementation
         impl = get_implementation(tournament.archetype) if tournament.archetype else None
         if impl and getattr(impl, 'is_multi_phase', False):
-            from_number = max(stage.stage_number, 2) if stage else 2
-            for s in Stage.objects.filter(tournament=tournament,
-                                          stage_number__gte=from_number).order_by('stage_number'):
-                if s.matchups.exists() or s.pools.exists():
-                    s.matchups.all().delete()
-                    s.pools.all().delete()
-                    reset_stages.append(s.name)
+            from_number = stage.stage_number if stage else 2
+            reset_stages = [s.name for s in impl.clear_generated_stages(tournament, from_number)]
 
         # The aggregate standings are only recomputed when a result is
         # recorded, so deleting scores leaves them stale. Wipe them and
@@ -181,6 +176,9 @@ class Command(BaseCommand):
                              [s.team1_score for s in sets],
                              [s.team2_score for s in sets],
                              user)
+        # Deleting scores and stages doesn't go through the scoring view, so
+        # mark the tournament as changed for the state API and page caches.
+        tournament.bump_results_version(Matchup.objects.filter(tournament_chart=tournament))
 
         message = (f"Cleared scores from {len(scored)} matchup(s) in tournament "
                    f"'{tournament.name}'; standings rebuilt from {len(remaining)} "
@@ -3,175 +3,277 @@ from datetime import date
 from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 from django.utils import timezone
-from tournament_creator.models import Player, RankingsUpdate
+from tournament_creator import player_directory, rankings_api
+from tournament_creator.models import Player, PlayerRanking, PlayerSearchTerm, RankingSnapshot, RankingsUpdate
+from tournament_creator.rankings import ALL_DIVISIONS, BATCH_SIZE, name_key
+
 
 class Command(BaseCommand):
     help = 'Updates player rankings from doubledisccourt.com API'
 
+    # Set by the background job runner to a ``(percent, message)`` callable.
+    progress = None
+
+    def _progress(self, percent, message):
+        self.stdout.write(message)
+        if self.progress:
+            self.progress(percent, message)
+
     def add_arguments(self, parser):
-        parser.add_argument('--division', type=str, default='O', help='Division to update (default: O)')
+        parser.add_argument('--division', type=str, default='O',
+                            help="Division to update, or 'all' for every division in one pass (default: O)")
         parser.add_argument('--year', type=str, default=str(date.today().year), help='Year for rankings (default: current year)')
         parser.add_argument('--dry-run', action='store_true', help='Show what would be updated without making changes')
+        parser.add_argument('--force', action='store_true',
+                            help='Apply the rankings even if the payloads are unchanged since the last sync')
+        parser.add_argument('--base-url', default=rankings_api.DEFAULT_BASE_URL,
+                            help='Rankings API base URL (default: %(default)s)')
+        parser.add_argument('--timeout', type=float, default=rankings_api.DEFAULT_TIMEOUT[1],
+                            help='Read timeout in seconds for each API request (default: %(default)s)')
 
     def handle(self, *args, **options):
         division = options['division']
         year = options['year']
         dry_run = options['dry_run']
-        
+
+        if division == ALL_DIVISIONS:
+            divisions = list(PlayerRanking.Division.values)
+        elif division in PlayerRanking.Division.values:
+            divisions = [division]
+        else:
+            raise CommandError(f"Unknown division '{division}'. Choose from "
+                               f"{', '.join(PlayerRanking.Division.values)} or '{ALL_DIVISIONS}'.")
+        try:
+            year_number = int(year)
+        except ValueError:
+            raise CommandError(f"Invalid year '{year}'")
+
         self.stdout.write(f"Updating {division} division rankings for {year}...")
         
-        # API endpoint details
-        base_url = "https://doubledisccourt.com"
-        rankings_endpoint = "/data/ddc.php"
-        player_endpoint = "/data/ddc.php"
-        operation_rankings = "get-rankings"
-        operation_player = "load-player"
-        
-        headers = {
-            'accept': '*/*',
-            'referer': 'https://doubledisccourt.com/results/rankings.html',
-            'user-agent': 'Mozilla/5.0 (iPad; CPU OS 16_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 Mobile/15E148 Safari/604.1',
-            'x-requested-with': 'XMLHttpRequest'
-        }
-        
+        timeout = (rankings_api.DEFAULT_TIMEOUT[0], options['timeout'])
         rankings_params = {
-            'op': operation_rankings,
+            'op': 'get-rankings',
             'year': year
         }
         
         player_params = {
-            'op': operation_player
+            'op': 'load-player'
         }
         
-        # Create a new rankings update record
-        update_record = RankingsUpdate(
-            division=division,
-            successful=False  # Initially set to False, updated to True on success
-        )
-        
         try:
-            # Fetch rankings data
-            self.stdout.write("Fetching rankings data...")
-            response_rankings = requests.get(
-                base_url + rankings_endpoint, 
-                params=rankings_params, 
-                headers=headers
-            )
-            response_rankings.raise_for_status()
-            rankings_data = response_rankings.json()
-            
-            # Fetch player data
-            self.stdout.write("Fetching player data...")
-            response_player = requests.get(
-                base_url + player_endpoint, 
-                params=player_params, 
-                headers=headers
-            )
-            response_player.raise_for_status()
-            player_data = response_player.json()
-            
-            if rankings_data is None:
+            # Fetch rankings and player data; cached copies are revalidated
+            # with ETag / Last-Modified, so unchanged payloads cost a 304.
+            # One rankings payload carries every division.
+            with requests.Session() as session:
+                self._progress(10, "Fetching rankings data...")
+                rankings_payload = rankings_api.fetch_payload(
+                    rankings_params, options['base_url'], timeout, session)
+                self._progress(40, "Fetching player data...")
+                player_payload = rankings_api.fetch_payload(
+                    player_params, options['base_url'], timeout, session)
+
+            fingerprint = rankings_api.payloads_fingerprint(rankings_payload, player_payload)
+            if not options['force']:
+                divisions = [d for d in divisions if not rankings_api.already_synced(d, year, fingerprint)]
+                if not divisions:
+                    self.stdout.write(self.style.SUCCESS(
+                        f"Rankings unchanged since the last {division} division sync; nothing to do"))
+                    return
+
+            if rankings_api.is_null_payload(rankings_payload.path):
                 raise CommandError(f"API returned no rankings data for year {year}. The year may not have data yet.")
-            if player_data is None:
+            if rankings_api.is_null_payload(player_payload.path):
                 raise CommandError("API returned no player data.")
 
             # Create a dictionary for player lookup
-            player_dict = {player['id']: player['name'] for player in player_data}
+            player_dict = {
+                player['id']: player['name']
+                for player in rankings_api.iter_json_array(player_payload.path)
+            }
 
-            # Filter rankings for requested division
-            filtered_rankings = [
-                ranking for ranking in rankings_data
-                if ranking['division'] == division
-            ]
+            # Group the requested divisions' rankings in a single pass
+            rankings_by_division = {d: [] for d in divisions}
+            for ranking in rankings_api.iter_json_array(rankings_payload.path):
+                if ranking['division'] in rankings_by_division:
+                    rankings_by_division[ranking['division']].append(ranking)
             
-            # Prepare for database update
-            to_create = []
-            to_update = []
-
-            # Match incoming rankings to existing players on a normalized
-            # (whitespace-trimmed, case-folded) name so hand-created rows — e.g.
-            # players seeded before they had ranking points — merge in place and
-            # keep any linked login account, instead of spawning a duplicate.
-            def name_key(first, last):
-                return (first.strip().casefold(), last.strip().casefold())
-
-            existing_by_name = {}
-            for player in Player.objects.all():
-                existing_by_name.setdefault(
-                    name_key(player.first_name, player.last_name), player
-                )
-
-            for ranking in filtered_rankings:
-                player_id = ranking['player_id']
-                player_name = player_dict.get(player_id, "Unknown")
+            self._progress(70, "Applying rankings...")
+            to_create, changed, unchanged, entries = self._diff(rankings_by_division, player_dict)
 
-                # Split name into first and last name
-                name_parts = player_name.split(' ', 1)
-                first_name = name_parts[0]
-                last_name = name_parts[1] if len(name_parts) > 1 else ''
-
-                rank = int(ranking['rank'])
-                points = float(ranking['points'])
-
-                # Check if player exists (normalized name match)
-                player = existing_by_name.get(name_key(first_name, last_name))
-                if player is not None:
-                    # Update existing player
-                    player.ranking = rank
-                    player.ranking_points = points
-                    to_update.append(player)
-                else:
-                    # Create new player
-                    player = Player(
-                        first_name=first_name,
-                        last_name=last_name,
-                        ranking=rank,
-                        ranking_points=points
-                    )
-                    to_create.append(player)
-            
             # Show summary if dry run
             if dry_run:
                 self.stdout.write(f"Would create {len(to_create)} new players:")
                 for p in to_create:
                     self.stdout.write(f"  {p.ranking}: {p.first_name} {p.last_name} ({p.ranking_points} pts)")
-                
-                self.stdout.write(f"Would update {len(to_update)} existing players:")
-                for p in to_update:
+
+                self.stdout.write(f"Would update {len(changed)} existing players:")
+                for p in changed:
                     self.stdout.write(f"  {p.ranking}: {p.first_name} {p.last_name} ({p.ranking_points} pts)")
+                self.stdout.write(f"{unchanged} existing players unchanged")
+                for d in divisions:
+                    self.stdout.write(f"Would store {len(rankings_by_division[d])} {d} division rankings")
             else:
                 # Apply updates in a transaction
                 with transaction.atomic():
-                    # Create new players
                     if to_create:
-                        Player.objects.bulk_create(to_create)
-                        self.stdout.write(f"Created {len(to_create)} new players")
-                    
-                    # Update existing players
-                    for player in to_update:
-                        player.save()
-                    
-                    self.stdout.write(f"Updated {len(to_update)} existing players")
-                    
-                    # Update the rankings update record
-                    update_record.player_count = len(to_create) + len(to_update)
-                    update_record.successful = True
-                    update_record.save()
-            
+                        Player.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+                        # bulk_create skips Player.save(), which indexes names.
+                        PlayerSearchTerm.index_players(to_create, created=True)
+                    # Only rows whose ranking actually moved are written, and
+                    # only the two ranking columns, in batched UPDATEs.
+                    if changed:
+                        Player.objects.bulk_update(
+                            changed, ['ranking', 'ranking_points'], batch_size=BATCH_SIZE)
+
+                    self.stdout.write(
+                        f"Created {len(to_create)} new players, updated {len(changed)}, "
+                        f"{unchanged} unchanged")
+
+                    created, updated, removed = self._apply_division_rankings(divisions, year_number, entries)
+                    self.stdout.write(
+                        f"Division rankings: {created} added, {updated} updated, {removed} removed")
+
+                    RankingsUpdate.objects.bulk_create([
+                        RankingsUpdate(division=d, player_count=len(rankings_by_division[d]), successful=True)
+                        for d in divisions
+                    ])
+                for d in divisions:
+                    rankings_api.mark_synced(d, year, fingerprint)
+                if to_create or changed:
+                    player_directory.invalidate()
+
             self.stdout.write(self.style.SUCCESS(f"Successfully processed {division} division rankings"))
             
         except requests.exceptions.RequestException as e:
             error_msg = f"Error fetching data from API: {str(e)}"
-            self.stderr.write(self.style.ERROR(error_msg))
-            update_record.error_message = error_msg
-            if not dry_run:
-                update_record.save()
+            self._record_failure(divisions, error_msg, dry_run)
             raise CommandError(error_msg)
             
         except Exception as e:
             error_msg = f"Unexpected error: {str(e)}"
-            self.stderr.write(self.style.ERROR(error_msg))
-            update_record.error_message = error_msg
-            if not dry_run:
-                update_record.save()
-            raise CommandError(error_msg)
\ No newline at end of file
+            self._record_failure(divisions, error_msg, dry_run)
+            raise CommandError(error_msg)
+
+    def _record_failure(self, divisions, error_msg, dry_run):
+        self.stderr.write(self.style.ERROR(error_msg))
+        if not dry_run:
+            RankingsUpdate.objects.bulk_create([
+                RankingsUpdate(division=d, successful=False, error_message=error_msg) for d in divisions
+            ])
+
+    def _diff(self, rankings_by_division, player_dict):
+        """Resolve incoming rankings to players.
+
+        Returns new players, changed players, an unchanged count and the
+        ``(division, player, rank, points)`` entries to store as
+        ``PlayerRanking`` rows. Only the Open list updates the ``Player``
+        ranking columns; players first seen in another division are created
+        at the bottom of the Open order with 0 points, like hand-added ones.
+
+        Incoming rankings are matched to existing players on a normalized
+        name so hand-created rows — e.g. players seeded before they had
+        ranking points — merge in place and keep any linked login account,
+        instead of spawning a duplicate.
+        """
+        existing_by_name = {}
+        last_ranking = 0
+        for player in Player.objects.only('id', 'first_name', 'last_name', 'ranking', 'ranking_points'):
+            existing_by_name.setdefault(name_key(player.first_name, player.last_name), player)
+            last_ranking = max(last_ranking, player.ranking)
+
+        open_rankings = rankings_by_division.get(PlayerRanking.Division.OPEN, [])
+        if open_rankings:
+            last_ranking = max(last_ranking, max(int(r['rank']) for r in open_rankings))
+        # Open first, so a player ranked in several divisions is created with
+        # their Open numbers.
+        ordered = sorted(rankings_by_division.items(), key=lambda item: item[0] != PlayerRanking.Division.OPEN)
+
+        to_create, changed, unchanged, entries = [], [], 0, []
+        for division, rankings in ordered:
+            is_open = division == PlayerRanking.Division.OPEN
+            for ranking in rankings:
+                player_name = player_dict.get(ranking['player_id'], "Unknown")
+
+                # Split name into first and last name
+                name_parts = player_name.split(' ', 1)
+                first_name = name_parts[0]
+                last_name = name_parts[1] if len(name_parts) > 1 else ''
+
+                rank = int(ranking['rank'])
+                points = float(ranking['points'])
+
+                key = name_key(first_name, last_name)
+                player = existing_by_name.get(key)
+                if player is None:
+                    if is_open:
+                        player = Player(first_name=first_name, last_name=last_name,
+                                        ranking=rank, ranking_points=points)
+                    else:
+                        last_ranking += 1
+                        player = Player(first_name=first_name, last_name=last_name,
+                                        ranking=last_ranking, ranking_points=0)
+                    to_create.append(player)
+                    # A name listed twice in the feed must not create two rows.
+                    existing_by_name[key] = player
+                elif not is_open or player.pk is None or (player.ranking, player.ranking_points) == (rank, points):
+                    if is_open:
+                        unchanged += 1
+                else:
+                    player.ranking = rank
+                    player.ranking_points = points
+                    changed.append(player)
+                entries.append((division, player, rank, points))
+        return to_create, changed, unchanged, entries
+
+    def _apply_division_rankings(self, divisions, year, entries):
+        """Bring the PlayerRanking rows for ``divisions`` / ``year`` in line with ``entries``.
+
+        One query loads the existing rows; new, moved and dropped rankings
+        are then written in batches, and each of them is appended to the
+        ranking history. Returns (created, updated, removed).
+
+        Only the current season goes into the history: it is stamped with
+        the time of the sync, so a backfill of an older year would shadow
+        the points that were really in force.
+        """
+        existing = {
+            (row.division, row.player_id): row
+            for row in PlayerRanking.objects.filter(division__in=divisions, year=year)
+            .only('id', 'division', 'player_id', 'rank', 'points')
+        }
+        to_create, to_update, seen = [], [], set()
+        for division, player, rank, points in entries:
+            # A name listed twice in one division's feed resolves to the same
+            # player; the first listing wins.
+            if (division, id(player)) in seen:
+                continue
+            seen.add((division, id(player)))
+            row = existing.pop((division, player.pk), None)
+            if row is None:
+                to_create.append(PlayerRanking(player=player, division=division, year=year,
+                                               rank=rank, points=points))
+            elif (row.rank, row.points) != (rank, points):
+                row.rank, row.points = rank, points
+                to_update.append(row)
+        if to_create:
+            PlayerRanking.objects.bulk_create(to_create, batch_size=BATCH_SIZE)
+        if to_update:
+            PlayerRanking.objects.bulk_update(to_update, ['rank', 'points'], batch_size=BATCH_SIZE)
+        if existing:
+            PlayerRanking.objects.filter(pk__in=[row.pk for row in existing.values()]).delete()
+        if year != date.today().year:
+            return len(to_create), len(to_update), len(existing)
+
+        recorded_at = timezone.now()
+        snapshots = [
+            RankingSnapshot(player_id=row.player_id, division=row.division, recorded_at=recorded_at,
+                            rank=row.rank, points=row.points)
+            for row in to_create + to_update
+        ] + [
+            RankingSnapshot(player_id=row.player_id, division=row.division, recorded_at=recorded_at,
+                            rank=None, points=0)
+            for row in existing.values()
+        ]
+        if snapshots:
+            RankingSnapshot.objects.bulk_create(snapshots, batch_size=BATCH_SIZE)
+        return len(to_create), len(to_update), len(existing)
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.5 on 2026-10-19 09:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament_creator', '0030_backfill_tournament_location'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchup',
+            name='results_version',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Tournament results version that last changed this matchup'),
+        ),
+        migrations.AddField(
+            model_name='tournamentchart',
+            name='results_version',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
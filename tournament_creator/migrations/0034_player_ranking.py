@@ -0,0 +1,52 @@
+# Generated by Django 5.1.5 on 2026-10-19 09:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament_creator', '0033_background_job'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerRanking',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('division', models.CharField(choices=[('O', 'Open'), ('W', 'Women'), ('M', 'Mixed'), ('MO', 'Masters Open'), ('MW', 'Masters Women')], max_length=10)),
+                ('year', models.PositiveSmallIntegerField()),
+                ('rank', models.IntegerField()),
+                ('points', models.FloatField(default=0)),
+            ],
+            options={
+                'ordering': ['division', '-year', 'rank'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['ranking'], name='player_ranking_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='player',
+            index=models.Index(fields=['ranking_points'], name='player_ranking_points_idx'),
+        ),
+        migrations.AddField(
+            model_name='playerranking',
+            name='player',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rankings', to='tournament_creator.player'),
+        ),
+        migrations.AddIndex(
+            model_name='playerranking',
+            index=models.Index(fields=['division', 'year', 'rank'], name='playerranking_div_year_rank'),
+        ),
+        migrations.AddIndex(
+            model_name='playerranking',
+            index=models.Index(fields=['division', 'year', 'points'], name='playerranking_div_year_points'),
+        ),
+        migrations.AddConstraint(
+            model_name='playerranking',
+            constraint=models.UniqueConstraint(fields=('player', 'division', 'year'), name='unique_player_division_year'),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.1.5 on 2026-10-19 09:53
+
+import datetime
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+# The baseline is dated at the epoch: those numbers are the best we know for
+# any earlier date, so lookups before the first sync must find them.
+BASELINE_RECORDED_AT = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def record_baseline(apps, schema_editor):
+    # Start the history with everyone's current Open numbers, so points
+    # changed by the next sync can still be looked up as of before it.
+    Player = apps.get_model('tournament_creator', 'Player')
+    RankingSnapshot = apps.get_model('tournament_creator', 'RankingSnapshot')
+    RankingSnapshot.objects.bulk_create(
+        (RankingSnapshot(player_id=pk, division='O', recorded_at=BASELINE_RECORDED_AT, rank=rank, points=points)
+         for pk, rank, points in Player.objects.values_list('pk', 'ranking', 'ranking_points').iterator()),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament_creator', '0034_player_ranking'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='tournamentchart',
+            name='registration_date',
+            field=models.DateField(blank=True, help_text='Registration deadline. Pairs are seeded with the ranking points as they stood at the end of this day; leave blank to use the current rankings.', null=True),
+        ),
+        migrations.CreateModel(
+            name='RankingSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('division', models.CharField(choices=[('O', 'Open'), ('W', 'Women'), ('M', 'Mixed'), ('MO', 'Masters Open'), ('MW', 'Masters Women')], max_length=10)),
+                ('recorded_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('rank', models.IntegerField(blank=True, null=True)),
+                ('points', models.FloatField(default=0)),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ranking_snapshots', to='tournament_creator.player')),
+            ],
+            options={
+                'ordering': ['player', 'division', '-recorded_at'],
+                'indexes': [models.Index(fields=['player', 'division', '-recorded_at'], name='rankingsnapshot_as_of')],
+            },
+        ),
+        migrations.RunPython(record_baseline, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.1.5 on 2026-10-19 09:58
+
+import django.db.models.deletion
+import re
+import unicodedata
+
+from django.db import migrations, models
+
+
+def index_existing_players(apps, schema_editor):
+    # Same folding as tournament_creator.models.search, frozen here.
+    def tokens(text):
+        folded = ''.join(ch for ch in unicodedata.normalize('NFKD', text.casefold())
+                         if not unicodedata.combining(ch))
+        return {token for token in re.split(r'[\W_]+', folded) if token}
+
+    Player = apps.get_model('tournament_creator', 'Player')
+    PlayerSearchTerm = apps.get_model('tournament_creator', 'PlayerSearchTerm')
+    PlayerSearchTerm.objects.bulk_create(
+        (PlayerSearchTerm(player_id=pk, term=term)
+         for pk, first, last, nickname in Player.objects.values_list(
+             'pk', 'first_name', 'last_name', 'nickname').iterator()
+         for term in tokens(' '.join(filter(None, [first, last, nickname])))),
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament_creator', '0035_ranking_snapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlayerSearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=255)),
+                ('player', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='tournament_creator.player')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', 'player'], name='playersearchterm_term')],
+                'constraints': [models.UniqueConstraint(fields=('player', 'term'), name='unique_player_search_term')],
+            },
+        ),
+        migrations.RunPython(index_existing_players, reverse_code=migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.5 on 2026-10-19 10:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament_creator', '0036_player_search_term'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='tournamentchart',
+            index=models.Index(fields=['archived', 'date', 'id'], name='tournamentchart_list_idx'),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 5.1.5 on 2026-10-19 10:33
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_event_stream(apps, schema_editor):
+    """Give existing log entries their tournament and matchup key, and turn the
+    always-'UPDATE' history into CREATE/UPDATE events with their before scores."""
+    MatchResultLog = apps.get_model('tournament_creator', 'MatchResultLog')
+    last_scores = {}
+    changed = []
+    for log in MatchResultLog.objects.select_related('matchup__stage', 'matchup__pool').order_by('id').iterator():
+        matchup = log.matchup
+        log.tournament_id = matchup.tournament_chart_id
+        log.matchup_key = '/'.join(str(part) for part in (
+            matchup.stage.stage_number if matchup.stage_id else 0,
+            matchup.pool.order if matchup.pool_id else 0,
+            matchup.round_number, matchup.court_number))
+        after = {'team1_scores': log.details.get('team1_scores', []),
+                 'team2_scores': log.details.get('team2_scores', [])}
+        before = last_scores.get(matchup.id)
+        log.action = 'UPDATE' if before else 'CREATE'
+        log.details = {**log.details, 'before': before}
+        last_scores[matchup.id] = after
+        changed.append(log)
+    MatchResultLog.objects.bulk_update(changed, ['tournament', 'matchup_key', 'action', 'details'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament_creator', '0037_tournamentchart_list_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='matchresultlog',
+            name='matchup_key',
+            field=models.CharField(blank=True, default='', max_length=40),
+        ),
+        migrations.AddField(
+            model_name='matchresultlog',
+            name='tournament',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.CASCADE, related_name='result_log', to='tournament_creator.tournamentchart'),
+        ),
+        migrations.AlterField(
+            model_name='matchresultlog',
+            name='action',
+            field=models.CharField(choices=[('CREATE', 'Result Created'), ('UPDATE', 'Result Updated'), ('DELETE', 'Result Deleted'), ('ADVANCE', 'Next Phase Generated')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='matchresultlog',
+            name='matchup',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='tournament_creator.matchup'),
+        ),
+        migrations.AddIndex(
+            model_name='matchresultlog',
+            index=models.Index(fields=['tournament', 'id'], name='resultlog_stream_idx'),
+        ),
+        migrations.RunPython(backfill_event_stream, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.5 on 2026-10-19 10:42
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tournament_creator', '0038_match_result_event_stream'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LogArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file_name', models.CharField(help_text='Relative to settings.LOG_ARCHIVE_DIR', max_length=200)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('events', models.PositiveIntegerField(default=0)),
+                ('actions', models.JSONField(default=dict)),
+                ('notifications', models.PositiveIntegerField(default=0)),
+                ('failed_notifications', models.PositiveIntegerField(default=0)),
+                ('first_event_at', models.DateTimeField(blank=True, null=True)),
+                ('last_event_at', models.DateTimeField(blank=True, null=True)),
+                ('last_event_id', models.PositiveIntegerField()),
+                ('size_bytes', models.PositiveIntegerField(default=0)),
+                ('tournament', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='log_archives', to='tournament_creator.tournamentchart')),
+            ],
+            options={
+                'ordering': ['tournament', 'last_event_id'],
+            },
+        ),
+    ]
@@ -1,7 +1,9 @@
 from .auth import User
 from .base_models import Player, Pair, TournamentChart, TournamentPlayer, TournamentPair, TournamentDirector, Matchup, TournamentArchetype, Stage, Pool, PoolPair
-from .logging import MatchResultLog
-from .rankings import RankingsUpdate
+from .logging import MatchResultLog, LogArchive
+from .rankings import RankingsUpdate, PlayerRanking, RankingSnapshot
+from .jobs import BackgroundJob
+from .search import PlayerSearchTerm
 from .scoring import MatchScore, PlayerScore, PairScore, ManualTiebreakResolution, ManualPoolTiebreakResolution
 from .tournament_types import (
     FourPairsSwedishFormat, EightPairsSwedishFormat, EurosFormat,
@@ -14,8 +16,10 @@ from .notifications import NotificationBackendSetting, NotificationLog
 __all__ = [
     'User',
     'Player', 'Pair', 'TournamentChart', 'TournamentPlayer', 'TournamentPair', 'TournamentDirector', 'Matchup', 'TournamentArchetype', 'Stage', 'Pool', 'PoolPair',
-    'MatchResultLog',
-    'RankingsUpdate',
+    'MatchResultLog', 'LogArchive',
+    'RankingsUpdate', 'PlayerRanking', 'RankingSnapshot',
+    'BackgroundJob',
+    'PlayerSearchTerm',
     'MatchScore', 'PlayerScore', 'PairScore', 'ManualTiebreakResolution',
     'FourPairsSwedishFormat', 'EightPairsSwedishFormat', 'EurosFormat',
     'MonarchOfTheCourt5', 'MonarchOfTheCourt6', 'MonarchOfTheCourt7', 'MonarchOfTheCourt8',
@@ -1,5 +1,8 @@
+import datetime
+
 from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
 class Player(models.Model):
     """Represents a player registered in the system."""
@@ -19,7 +22,27 @@ class Player(models.Model):
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
-    
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._indexed_names = instance._search_names()
+        return instance
+
+    def _search_names(self):
+        # Deferred fields count as unchanged; a save() can't alter them.
+        loaded = self.__dict__
+        return tuple(loaded.get(field) for field in ('first_name', 'last_name', 'nickname'))
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # Keep the search index current, skipping saves that don't touch a name.
+        names = self._search_names()
+        if names != getattr(self, '_indexed_names', None):
+            from .search import PlayerSearchTerm
+            PlayerSearchTerm.index_players([self])
+            self._indexed_names = names
+
     def get_display_name(self, players=None):
         """
         Returns a name for display with first name (or nickname) and enough of the last name to disambiguate.
@@ -82,6 +105,10 @@ class Player(models.Model):
 
     class Meta:
         ordering = ['ranking']
+        indexes = [
+            models.Index(fields=['ranking'], name='player_ranking_idx'),
+            models.Index(fields=['ranking_points'], name='player_ranking_points_idx'),
+        ]
 
 class Pair(models.Model):
     """Represents a fixed pair (team) of two players."""
@@ -90,8 +117,48 @@ class Pair(models.Model):
     ranking_points_sum = models.FloatField()
     seed = models.IntegerField(null=True, blank=True)
     entry_order = models.IntegerField(null=True, blank=True, help_text="Order in which this pair was entered (1-based)")
-    def calculate_points_sum(self):
-        return self.player1.ranking_points + self.player2.ranking_points
+    def calculate_points_sum(self, as_of=None):
+        """Combined ranking points: live, or as they stood at ``as_of`` (from the ranking history)."""
+        if as_of is None:
+            return self.player1.ranking_points + self.player2.ranking_points
+        from .rankings import RankingSnapshot
+        points = RankingSnapshot.points_as_of([self.player1_id, self.player2_id], as_of)
+        return points[self.player1_id] + points[self.player2_id]
+
+    @staticmethod
+    def points_sums(pairs, as_of=None):
+        """Map pair pk -> ``calculate_points_sum(as_of)`` for many pairs, with one history query."""
+        if as_of is None:
+            return {pair.pk: pair.calculate_points_sum() for pair in pairs}
+        from .rankings import RankingSnapshot
+        points = RankingSnapshot.points_as_of(
+            {pid for pair in pairs for pid in (pair.player1_id, pair.player2_id)}, as_of)
+        return {pair.pk: points[pair.player1_id] + points[pair.player2_id] for pair in pairs}
+
+    @classmethod
+    def seeded_from_players(cls, players, as_of=None):
+        """Unsaved pairs of consecutive ``players`` in entry order, with points sums and seeds.
+
+        Seeds follow the combined ranking points, highest first (ties keep
+        entry order). Live points come from the player instances themselves;
+        with ``as_of`` they are looked up in the ranking history in one query.
+        Save the result with ``bulk_create``: ``save()`` would recompute the
+        sum from live points.
+        """
+        if as_of is None:
+            points = {player.pk: player.ranking_points for player in players}
+        else:
+            from .rankings import RankingSnapshot
+            points = RankingSnapshot.points_as_of(players, as_of)
+        pairs = [
+            cls(player1=player1, player2=player2, entry_order=index,
+                ranking_points_sum=points[player1.pk] + points[player2.pk])
+            for index, (player1, player2) in enumerate(zip(players[::2], players[1::2]), start=1)
+        ]
+        for seed, pair in enumerate(sorted(pairs, key=lambda p: p.ranking_points_sum, reverse=True), start=1):
+            pair.seed = seed
+        return pairs
+
     def save(self, *args, **kwargs):
         self.ranking_points_sum = self.calculate_points_sum()
         super().save(*args, **kwargs)
@@ -106,6 +173,7 @@ class TournamentChart(models.Model):
     country = models.CharField(max_length=100, default="", help_text="Country the tournament is played in (e.g. 'Finland').")
     date = models.DateField()  # Start date (kept for backward compatibility)
     end_date = models.DateField(null=True, blank=True, help_text="End date for multi-day tournaments. Leave blank for single-day tournaments.")
+    registration_date = models.DateField(null=True, blank=True, help_text="Registration deadline. Pairs are seeded with the ranking points as they stood at the end of this day; leave blank to use the current rankings.")
     number_of_rounds = models.IntegerField()
     number_of_courts = models.IntegerField()
     number_of_stages = models.IntegerField(default=1, help_text="Number of stages in this tournament (1 for single-stage, 2+ for multi-stage)")
@@ -156,6 +224,23 @@ class TournamentChart(models.Model):
         blank=True,
         related_name='directed_tournaments',
     )
+    # Incremented on every change to results or generated structure (score
+    # writes, phase generation, resets, manual tiebreaks). Clients use it as a
+    # cheap "has anything changed?" validator; matchups carry the version that
+    # last touched them so changes can be sent as deltas.
+    results_version = models.PositiveIntegerField(default=0, editable=False)
+    # Last change to anything the tournament pages show; drives ETag /
+    # Last-Modified on the detail, list and download views. Saved by every
+    # ``save()``, and by ``touch()`` / ``bump_results_version()`` for changes
+    # that don't save the tournament row itself.
+    modified_at = models.DateTimeField(auto_now=True)
+
+    def seeding_as_of(self, day=None):
+        """End of ``day`` (default: the registration day), or None to seed from the live rankings."""
+        day = day or self.registration_date
+        if day is None:
+            return None
+        return timezone.make_aware(datetime.datetime.combine(day, datetime.time.max))
 
     @property
     def location(self):
@@ -165,6 +250,30 @@ class TournamentChart(models.Model):
     def __str__(self):
         return self.name
 
+    def bump_results_version(self, matchups=None):
+        """Record a change to this tournament's results; returns the new version.
+
+        The increment is done in the database so concurrent scorers never hand
+        out the same version. ``matchups`` (a queryset) are stamped with the
+        new version, marking them as changed for delta consumers.
+        """
+        from django.db import transaction
+        from django.utils import timezone
+        with transaction.atomic():
+            TournamentChart.objects.filter(pk=self.pk).update(
+                results_version=models.F('results_version') + 1, modified_at=timezone.now())
+            self.results_version, self.modified_at = TournamentChart.objects.filter(
+                pk=self.pk).values_list('results_version', 'modified_at').get()
+            if matchups is not None:
+                matchups.update(results_version=self.results_version)
+        return self.results_version
+
+    def touch(self):
+        """Mark the tournament's pages as changed without saving the whole row."""
+        from django.utils import timezone
+        self.modified_at = timezone.now()
+        TournamentChart.objects.filter(pk=self.pk).update(modified_at=self.modified_at)
+
     def is_past(self):
         """True if the tournament's last day is before today.
 
@@ -180,36 +289,19 @@ class TournamentChart(models.Model):
         Covers both MoC tournaments (players linked directly) and doubles
         tournaments (players linked via their pair).
         """
-        if not user or not getattr(user, 'is_authenticated', False):
-            return False
-        from django.core.exceptions import ObjectDoesNotExist
-        try:
-            player = user.player
-        except (AttributeError, ObjectDoesNotExist):
-            player = None
-        if player is None:
-            return False
-        if self.players.filter(id=player.id).exists():
-            return True
-        return self.pairs.filter(
-            models.Q(player1=player) | models.Q(player2=player)
-        ).exists()
+        from ..access import TournamentAccess
+        return TournamentAccess(self, user).is_participant
 
     def user_can_administer(self, user):
         """Whether ``user`` has director (admin) rights over *this* tournament.
 
         Global admins can administer everything; a tournament creator and the
         directors they appoint can administer only their own tournaments.
+        Views should prefer ``access.get_tournament_access``, which memoizes
+        the answer for the request.
         """
-        if not user or not getattr(user, 'is_authenticated', False):
-            return False
-        if getattr(user, 'is_admin', lambda: False)():
-            return True
-        if self.created_by_id and self.created_by_id == user.pk:
-            return True
-        if not self.pk:
-            return False
-        return self.directors.filter(pk=user.pk).exists()
+        from ..access import TournamentAccess
+        return TournamentAccess(self, user).can_administer
 
     def user_can_manage_directors(self, user):
         """Whether ``user`` may add or remove tournament directors.
@@ -229,18 +321,15 @@ class TournamentChart(models.Model):
         - For everyone else, past tournaments are locked.
         - For current tournaments, non-directors must be competing participants.
         """
-        if not user or not getattr(user, 'is_authenticated', False):
-            return False
-        if self.is_sandbox:
-            return True
-        if self.user_can_administer(user):
-            return True
-        if self.is_past():
-            return False
-        return self.has_participant(user)
+        from ..access import TournamentAccess
+        return TournamentAccess(self, user).can_edit_results
 
     class Meta:
         ordering = ['-date']
+        indexes = [
+            # The list's tabs page through (archived, date, id) keysets.
+            models.Index(fields=['archived', 'date', 'id'], name='tournamentchart_list_idx'),
+        ]
 
 
 class TournamentDirector(models.Model):
@@ -366,6 +455,7 @@ class Matchup(models.Model):
     )
     match_date = models.DateField(null=True, blank=True, help_text="For league-format tournaments, the date this match will be played")
     match_time = models.TimeField(null=True, blank=True, help_text="For league-format tournaments, the time this match will be played")
+    results_version = models.PositiveIntegerField(default=0, editable=False, help_text="Tournament results version that last changed this matchup")
 
     def get_team1_player1(self):
         if self.pair1:
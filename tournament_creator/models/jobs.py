@@ -0,0 +1,87 @@
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+
+class BackgroundJob(models.Model):
+    """
+    A unit of slow work (e.g. a rankings refresh) queued by a web request and
+    executed by the ``run_jobs`` worker, so the request returns immediately.
+    The worker reports progress on the row; the UI polls it.
+    """
+    class Status(models.TextChoices):
+        QUEUED = 'QUEUED', 'Queued'
+        RUNNING = 'RUNNING', 'Running'
+        SUCCEEDED = 'SUCCEEDED', 'Succeeded'
+        FAILED = 'FAILED', 'Failed'
+
+    ACTIVE_STATUSES = (Status.QUEUED, Status.RUNNING)
+
+    kind = models.CharField(max_length=50, help_text="Handler name, see tournament_creator.jobs.JOB_HANDLERS")
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.QUEUED, db_index=True)
+    progress = models.PositiveSmallIntegerField(default=0, help_text="Percent complete, 0-100")
+    message = models.CharField(max_length=255, blank=True, help_text="Latest progress message")
+    output = models.TextField(blank=True)
+    error = models.TextField(blank=True)
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True,
+        related_name='background_jobs',
+    )
+    created_at = models.DateTimeField(default=timezone.now)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.get_status_display()})"
+
+    @property
+    def is_active(self):
+        return self.status in self.ACTIVE_STATUSES
+
+    @classmethod
+    def enqueue(cls, kind, params=None, user=None):
+        """Queue a job unless an identical one is already queued or running.
+
+        Returns ``(job, created)`` like ``get_or_create``.
+        """
+        params = params or {}
+        existing = cls.objects.filter(kind=kind, params=params, status__in=cls.ACTIVE_STATUSES).first()
+        if existing:
+            return existing, False
+        return cls.objects.create(kind=kind, params=params, created_by=user), True
+
+    @classmethod
+    def claim_next(cls):
+        """Atomically mark the oldest queued job as running and return it (or None).
+
+        The conditional UPDATE makes claiming safe with several workers: only
+        one of them sees its update succeed for a given job.
+        """
+        while True:
+            job = cls.objects.filter(status=cls.Status.QUEUED).order_by('created_at', 'pk').first()
+            if job is None:
+                return None
+            now = timezone.now()
+            claimed = cls.objects.filter(pk=job.pk, status=cls.Status.QUEUED).update(
+                status=cls.Status.RUNNING, started_at=now, progress=0)
+            if claimed:
+                job.status, job.started_at, job.progress = cls.Status.RUNNING, now, 0
+                return job
+
+    def report_progress(self, progress, message=''):
+        self.progress = max(0, min(100, int(progress)))
+        self.message = message[:255]
+        type(self).objects.filter(pk=self.pk).update(progress=self.progress, message=self.message)
+
+    def finish(self, output='', error=''):
+        self.status = self.Status.FAILED if error else self.Status.SUCCEEDED
+        self.output = output
+        self.error = error
+        self.finished_at = timezone.now()
+        if not error:
+            self.progress = 100
+        self.save(update_fields=['status', 'output', 'error', 'finished_at', 'progress'])
@@ -1,26 +1,119 @@
 from django.db import models
-from .base_models import Matchup
+from .base_models import Matchup, TournamentChart
 from .auth import User
 
 class MatchResultLog(models.Model):
     """
-    Stores log entries for match result actions (create, update, delete).
-    Tracks who recorded the result and when, along with action-specific details.
+    A tournament's result history, as an ordered event stream (by id).
+
+    Every change to a match's scores is an event: CREATE (the match had no
+    result), UPDATE (it replaced one) or DELETE (it cleared one), with the
+    scores after the change in ``details`` (``team1_scores``/``team2_scores``)
+    and the ones before it in ``details['before']``. Generating the next phase
+    of a multi-phase format is an ADVANCE event. ``matchup_key`` names the match
+    by its place in the structure, so an event still resolves after generated
+    phases are torn down and rebuilt. Replaying the stream is tournament_creator/replay.py.
     """
-    matchup = models.ForeignKey(Matchup, on_delete=models.CASCADE)
+    ACTION_CHOICES = [
+        ('CREATE', 'Result Created'),
+        ('UPDATE', 'Result Updated'),
+        ('DELETE', 'Result Deleted'),
+        ('ADVANCE', 'Next Phase Generated'),
+    ]
+
+    tournament = models.ForeignKey(TournamentChart, on_delete=models.CASCADE, related_name='result_log', null=True)
+    # Kept when a generated phase is torn down: the event is still history.
+    matchup = models.ForeignKey(Matchup, on_delete=models.SET_NULL, null=True, blank=True)
+    matchup_key = models.CharField(max_length=40, blank=True, default='')
     recorded_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True)
     recorded_at = models.DateTimeField(auto_now_add=True)
-    action = models.CharField(
-        max_length=20,
-        choices=[('CREATE', 'Result Created'),('UPDATE', 'Result Updated'),('DELETE', 'Result Deleted')],
-    )
+    action = models.CharField(max_length=20, choices=ACTION_CHOICES)
     details = models.JSONField()  # Store scores and any relevant metadata
 
     class Meta:
         ordering = ['-recorded_at']
+        indexes = [models.Index(fields=['tournament', 'id'], name='resultlog_stream_idx')]
 
     def __str__(self) -> str:
         """
         String representation for admin/log review purposes.
         """
         return f"{self.get_action_display()} by {self.recorded_by} at {self.recorded_at}"
+
+    @staticmethod
+    def key_for(matchup) -> str:
+        """'stage/pool/round/court', e.g. '2/1/4/7'; 0 for a missing stage or pool.
+
+        Loads ``matchup.stage`` and ``matchup.pool`` (select_related them).
+        """
+        stage = matchup.stage.stage_number if matchup.stage_id else 0
+        pool = matchup.pool.order if matchup.pool_id else 0
+        return f"{stage}/{pool}/{matchup.round_number}/{matchup.court_number}"
+
+    @classmethod
+    def record_result(cls, matchup, recorded_by, before, after, **details):
+        """Log a change of ``matchup``'s scores from ``before`` to ``after``.
+
+        Both are lists of ``(team1_score, team2_score)`` per set, empty for no
+        result; the action follows from them. Extra ``details`` are stored
+        alongside the scores.
+        """
+        if not after:
+            action = 'DELETE'
+        elif before:
+            action = 'UPDATE'
+        else:
+            action = 'CREATE'
+        return cls.objects.create(
+            tournament_id=matchup.tournament_chart_id,
+            matchup=matchup,
+            matchup_key=cls.key_for(matchup),
+            recorded_by=recorded_by,
+            action=action,
+            details={
+                'team1_scores': [s1 for s1, _ in after],
+                'team2_scores': [s2 for _, s2 in after],
+                **details,
+                'before': {
+                    'team1_scores': [s1 for s1, _ in before],
+                    'team2_scores': [s2 for _, s2 in before],
+                } if before else None,
+            },
+        )
+
+    @classmethod
+    def record_advance(cls, tournament, stage, recorded_by):
+        """Log that ``stage`` of a multi-phase tournament was generated."""
+        return cls.objects.create(
+            tournament=tournament, recorded_by=recorded_by, action='ADVANCE',
+            details={'stage': stage.stage_number, 'name': stage.name},
+        )
+
+
+class LogArchive(models.Model):
+    """
+    Summary of one compaction of a finished tournament's logs.
+
+    ``manage.py compact_logs`` moves the tournament's MatchResultLog events,
+    and the NotificationLog rows of those events, into a gzip JSON-lines file
+    under settings.LOG_ARCHIVE_DIR and deletes them from the live tables. This
+    row records what the file holds; every event up to ``last_event_id`` is in
+    an archive. See tournament_creator/log_archive.py.
+    """
+    tournament = models.ForeignKey(TournamentChart, on_delete=models.CASCADE, related_name='log_archives')
+    file_name = models.CharField(max_length=200, help_text="Relative to settings.LOG_ARCHIVE_DIR")
+    archived_at = models.DateTimeField(auto_now_add=True)
+    events = models.PositiveIntegerField(default=0)
+    actions = models.JSONField(default=dict)  # e.g. {'CREATE': 40, 'UPDATE': 3}
+    notifications = models.PositiveIntegerField(default=0)
+    failed_notifications = models.PositiveIntegerField(default=0)
+    first_event_at = models.DateTimeField(null=True, blank=True)
+    last_event_at = models.DateTimeField(null=True, blank=True)
+    last_event_id = models.PositiveIntegerField()
+    size_bytes = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ['tournament', 'last_event_id']
+
+    def __str__(self) -> str:
+        return f"{self.tournament}: {self.events} events in {self.file_name}"
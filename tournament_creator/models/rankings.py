@@ -1,4 +1,6 @@
 from django.db import models
+from django.db.models import Case, Exists, F, OuterRef, Subquery, Value, When
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.conf import settings
 
@@ -22,4 +24,92 @@ class RankingsUpdate(models.Model):
         verbose_name_plural = "Rankings Updates"
     
     def __str__(self):
-        return f"{self.division} Division - {self.timestamp.strftime('%Y-%m-%d %H:%M')}"
\ No newline at end of file
+        return f"{self.division} Division - {self.timestamp.strftime('%Y-%m-%d %H:%M')}"
+
+class PlayerRanking(models.Model):
+    """
+    A player's rank and points in one division for one ranking year.
+
+    ``Player.ranking`` / ``ranking_points`` keep mirroring the Open list (they
+    drive seeding everywhere); every division, Open included, is also stored
+    here so a Women or Mixed sync no longer overwrites the Open numbers.
+    """
+    class Division(models.TextChoices):
+        OPEN = 'O', 'Open'
+        WOMEN = 'W', 'Women'
+        MIXED = 'M', 'Mixed'
+        MASTERS_OPEN = 'MO', 'Masters Open'
+        MASTERS_WOMEN = 'MW', 'Masters Women'
+
+    player = models.ForeignKey('Player', on_delete=models.CASCADE, related_name='rankings')
+    division = models.CharField(max_length=10, choices=Division.choices)
+    year = models.PositiveSmallIntegerField()
+    rank = models.IntegerField()
+    points = models.FloatField(default=0)
+
+    class Meta:
+        ordering = ['division', '-year', 'rank']
+        constraints = [
+            models.UniqueConstraint(fields=['player', 'division', 'year'], name='unique_player_division_year'),
+        ]
+        indexes = [
+            # The player list pages through one division/year by rank or points.
+            models.Index(fields=['division', 'year', 'rank'], name='playerranking_div_year_rank'),
+            models.Index(fields=['division', 'year', 'points'], name='playerranking_div_year_points'),
+        ]
+
+    def __str__(self):
+        return f"{self.player} - {self.division} {self.year}: #{self.rank} ({self.points} pts)"
+
+
+class RankingSnapshot(models.Model):
+    """
+    Append-only ranking history: one row each time a player's rank or points
+    in a division change (a sync writes only the changed values; ``rank`` is
+    None when the player dropped off the list). The values at any moment are
+    those of the latest snapshot at or before it, which the
+    (player, division, -recorded_at) index answers with a single seek.
+    The history starts with everyone's Open numbers from before the first
+    sync, dated at the epoch, so they answer any earlier date. Only the
+    current season is recorded.
+    """
+    player = models.ForeignKey('Player', on_delete=models.CASCADE, related_name='ranking_snapshots')
+    division = models.CharField(max_length=10, choices=PlayerRanking.Division.choices)
+    recorded_at = models.DateTimeField(default=timezone.now)
+    rank = models.IntegerField(null=True, blank=True)
+    points = models.FloatField(default=0)
+
+    class Meta:
+        ordering = ['player', 'division', '-recorded_at']
+        indexes = [
+            models.Index(fields=['player', 'division', '-recorded_at'], name='rankingsnapshot_as_of'),
+        ]
+
+    def __str__(self):
+        return f"{self.player} - {self.division} @ {self.recorded_at:%Y-%m-%d %H:%M}: {self.rank} ({self.points} pts)"
+
+    @classmethod
+    def as_of(cls, player, when, division=PlayerRanking.Division.OPEN):
+        """The snapshot in force for ``player`` at ``when`` (None if there is no history that old)."""
+        return (cls.objects.filter(player=player, division=division, recorded_at__lte=when)
+                .order_by('-recorded_at').first())
+
+    @classmethod
+    def points_as_of(cls, players, when, division=PlayerRanking.Division.OPEN):
+        """Map player id -> ranking points at ``when``, in one query.
+
+        A player whose history only starts after ``when`` wasn't ranked yet
+        (0 points). One with no history at all has never been synced, so
+        their live Open points (``Player.ranking_points``) stand; in other
+        divisions they have 0.
+        """
+        from .base_models import Player
+        history = cls.objects.filter(player=OuterRef('pk'), division=division)
+        latest = history.filter(recorded_at__lte=when).order_by('-recorded_at').values('points')[:1]
+        fallback = Value(0.0)
+        if division == PlayerRanking.Division.OPEN:
+            fallback = Case(When(Exists(history), then=Value(0.0)), default=F('ranking_points'))
+        player_ids = [getattr(player, 'pk', player) for player in players]
+        return dict(Player.objects.filter(pk__in=player_ids)
+                    .annotate(points_then=Coalesce(Subquery(latest), fallback))
+                    .values_list('pk', 'points_then'))
@@ -29,6 +29,14 @@ class MatchScore(models.Model):
         Save method override to automatically set the winning_team and point_difference
         based on the current scores.
         """
+        self.set_outcome()
+        super().save(*args, **kwargs)
+
+    def set_outcome(self) -> None:
+        """
+        Set winning_team and point_difference from the scores (save() does this;
+        call it yourself before bulk_create).
+        """
         # Automatically determine winning team from scores
         if self.team1_score > self.team2_score:
             self.winning_team = 1
@@ -41,7 +49,6 @@ class MatchScore(models.Model):
             # This is just a fallback; ties should be handled at the UI level
             self.winning_team = 1
             self.point_difference = 0
-        super().save(*args, **kwargs)
 
 class PlayerScore(models.Model):
     """
@@ -0,0 +1,80 @@
+import re
+import unicodedata
+
+from django.db import models
+from django.db.models import Exists, OuterRef
+
+# Sorts after every other character, so [token, token + _PREFIX_END) is the
+# range of strings starting with token.
+_PREFIX_END = '\U0010ffff'
+_WORD_SPLIT = re.compile(r'[\W_]+')
+
+
+def fold(text):
+    """Case- and accent-insensitive form of ``text``: 'Hämäläinen' -> 'hamalainen'."""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def search_tokens(text):
+    """Folded words of ``text``; hyphens and other punctuation separate words."""
+    return [token for token in _WORD_SPLIT.split(fold(text or '')) if token]
+
+
+class PlayerSearchTerm(models.Model):
+    """
+    Search index for player names: one row per folded word of a player's
+    first name, last name and nickname. A keystroke query becomes an index
+    range scan per typed word instead of a case-insensitive LIKE '%q%' over
+    the whole player table. ``Player.save()`` keeps a player's terms current;
+    code that bulk-creates players calls ``index_players`` itself.
+    """
+    player = models.ForeignKey('Player', on_delete=models.CASCADE, related_name='search_terms')
+    term = models.CharField(max_length=255)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['player', 'term'], name='unique_player_search_term'),
+        ]
+        indexes = [
+            # Covers the prefix range scan and yields player ids without a table lookup.
+            models.Index(fields=['term', 'player'], name='playersearchterm_term'),
+        ]
+
+    def __str__(self):
+        return f"{self.term} -> {self.player_id}"
+
+    @staticmethod
+    def terms_for(player):
+        return set(search_tokens(' '.join(filter(None, [player.first_name, player.last_name, player.nickname]))))
+
+    @classmethod
+    def index_players(cls, players, created=False):
+        """(Re)build the terms of ``players``, which must be saved.
+
+        ``created``: the players were just inserted and have no terms yet.
+        """
+        players = list(players)
+        if not created:
+            cls.objects.filter(player__in=players).delete()
+        cls.objects.bulk_create(
+            [cls(player=player, term=term) for player in players for term in cls.terms_for(player)],
+            batch_size=500,
+        )
+
+    @classmethod
+    def search(cls, queryset, query):
+        """Narrow a Player ``queryset`` to names matching every word of ``query`` as a prefix.
+
+        Matching ignores case and accents ('hama' finds 'Hämäläinen'). Players
+        get a ``search_exact`` annotation, true when a typed word is a whole
+        name word, for ranking exact matches first. Still a single query.
+        """
+        tokens = search_tokens(query)
+        if not tokens:
+            return queryset
+        for token in tokens:
+            queryset = queryset.filter(pk__in=cls.objects.filter(
+                term__gte=token, term__lt=token + _PREFIX_END).values('player_id'))
+        return queryset.annotate(search_exact=Exists(
+            cls.objects.filter(player=OuterRef('pk'), term__in=tokens)))
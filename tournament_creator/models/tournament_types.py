@@ -1,3 +1,6 @@
+from collections import defaultdict
+from functools import cached_property
+
 from django.db import models
 from .base_models import TournamentArchetype, Matchup, Pair, Player, Stage, Pool, PoolPair
 from typing import List, Dict, Optional, Any
@@ -57,16 +60,18 @@ class PairsTournamentArchetype(TournamentArchetype):
         if len(pairs) != self.number_of_pairs:
             raise ValueError(f"This tournament format requires exactly {self.number_of_pairs} pairs")
         pairs_by_seed = {pair.seed: pair for pair in pairs}
-        for round_idx, round_matches in enumerate(self.schedule, 1):
-            for field_idx, (seed1, seed2) in enumerate(round_matches, 1):
-                Matchup.objects.create(
-                    tournament_chart=tournament_chart,
-                    stage=stage,
-                    pair1=pairs_by_seed[seed1],
-                    pair2=pairs_by_seed[seed2],
-                    round_number=round_idx,
-                    court_number=field_idx
-                )
+        Matchup.objects.bulk_create([
+            Matchup(
+                tournament_chart=tournament_chart,
+                stage=stage,
+                pair1=pairs_by_seed[seed1],
+                pair2=pairs_by_seed[seed2],
+                round_number=round_idx,
+                court_number=field_idx
+            )
+            for round_idx, round_matches in enumerate(self.schedule, 1)
+            for field_idx, (seed1, seed2) in enumerate(round_matches, 1)
+        ])
 
 class TwoPairsFormat(PairsTournamentArchetype):
     number_of_pairs = 2
@@ -248,10 +253,10 @@ class EurosFormat(PairsTournamentArchetype):
 
     def create_stages(self, tournament) -> List[Stage]:
         """Create the three stages. Each stage's standings are computed from its own matches."""
-        return [
-            Stage.objects.create(tournament=tournament, scoring_mode='RESET', **definition)
+        return Stage.objects.bulk_create([
+            Stage(tournament=tournament, scoring_mode='RESET', **definition)
             for definition in self.STAGE_DEFINITIONS
-        ]
+        ])
 
     def generate_matchups(self, tournament_chart, pairs: List[Pair], stage=None):
         """Generate phase 1: snake-seed 20 pairs into 5 pools of 4, round robin in each."""
@@ -271,18 +276,19 @@ class EurosFormat(PairsTournamentArchetype):
             for pool_idx, pair in enumerate(block):
                 pool_members[pool_idx].append(pair)
 
-        for pool_idx, members in enumerate(pool_members):
-            pool = self._create_pool(
-                stage,
-                name=f"Pool {chr(ord('A') + pool_idx)}",
-                order=pool_idx,
-                ordered_pairs=members,
-            )
-            self._generate_pool_round_robin(
+        pools = self._create_pools(stage, [
+            (f"Pool {chr(ord('A') + pool_idx)}", members)
+            for pool_idx, members in enumerate(pool_members)
+        ])
+        Matchup.objects.bulk_create([
+            matchup
+            for pool_idx, (pool, members) in enumerate(zip(pools, pool_members))
+            for matchup in self._pool_round_robin(
                 tournament_chart, stage, pool, members,
                 schedule=FourPairsSwedishFormat.schedule,
                 court_offset=pool_idx * 2,
             )
+        ])
 
     def advance_to_next_stage(self, tournament) -> Stage:
         """
@@ -290,24 +296,39 @@ class EurosFormat(PairsTournamentArchetype):
         Raises ValueError if the previous stage is incomplete or everything is generated.
         Returns the stage that was populated.
         """
-        stages = list(tournament.stages.order_by('stage_number'))
-        if len(stages) != 3:
+        state = self.get_phase_state(tournament)
+        if len(state.stages) != 3:
             raise ValueError("This tournament does not have the expected three stages")
-        stage1, stage2, stage3 = stages
+        stage1, stage2, stage3 = state.stages
 
-        if not stage2.matchups.exists():
-            if not self.is_stage_complete(stage1):
+        if not state.has_matchups(stage2):
+            if not state.is_complete(stage1):
                 raise ValueError(f"{stage1.name} is not complete yet - record all scores first")
-            self._generate_second_phase(tournament, stage1, stage2)
+            self._generate_second_phase(tournament, state, stage1, stage2)
             return stage2
-        elif not stage3.matchups.exists():
-            if not self.is_stage_complete(stage2):
+        elif not state.has_matchups(stage3):
+            if not state.is_complete(stage2):
                 raise ValueError(f"{stage2.name} is not complete yet - record all scores first")
-            self._generate_finals(tournament, stage2, stage3)
+            self._generate_finals(tournament, state, stage2, stage3)
             return stage3
         else:
             raise ValueError("All stages have already been generated")
 
+    def clear_generated_stages(self, tournament, from_number=2) -> List[Stage]:
+        """
+        Tear down the generated structure (matchups, pools, and manual tiebreak
+        resolutions via cascade) of stage ``from_number`` and every later stage.
+        Phase 1 is created with the tournament and is never generated, so
+        ``from_number`` is at least 2. Returns the stages that had something to clear.
+        """
+        cleared = []
+        for stage in tournament.stages.filter(stage_number__gte=max(from_number, 2)).order_by('stage_number'):
+            if stage.matchups.exists() or stage.pools.exists():
+                stage.matchups.all().delete()
+                stage.pools.all().delete()
+                cleared.append(stage)
+        return cleared
+
     def get_next_stage_to_generate(self, tournament) -> Optional[Stage]:
         """Returns the first stage without matchups, or None if all are generated."""
         return tournament.stages.filter(matchups__isnull=True).order_by('stage_number').first()
@@ -317,58 +338,51 @@ class EurosFormat(PairsTournamentArchetype):
         matchups = stage.matchups.annotate(num_scores=models.Count('scores'))
         return matchups.exists() and not matchups.filter(num_scores=0).exists()
 
-    def _generate_second_phase(self, tournament, stage1, stage2):
+    def _generate_second_phase(self, tournament, state, stage1, stage2):
         """Top 2 of each phase-1 pool -> A Pool, bottom 2 -> B Pool; fresh 10-team round robins."""
-        rankings = [
-            [entry['pair'] for entry in self.get_pool_standings(pool)]
-            for pool in stage1.pools.order_by('order')
-        ]
+        rankings = [[entry['pair'] for entry in state.standings(pool)] for pool in state.pools(stage1)]
         # Pool-internal seeding: pool winners first (in pool order), then runners-up, etc.
         a_pool_pairs = [r[0] for r in rankings] + [r[1] for r in rankings]
         b_pool_pairs = [r[2] for r in rankings] + [r[3] for r in rankings]
 
-        for order, (name, members, court_offset) in enumerate([
-            ("A Pool", a_pool_pairs, 0),
-            ("B Pool", b_pool_pairs, 5),
-        ]):
-            pool = self._create_pool(stage2, name=name, order=order, ordered_pairs=members)
-            self._generate_pool_round_robin(
-                tournament, stage2, pool, members,
-                schedule=TenPairsFormat.schedule,
-                court_offset=court_offset,
-            )
+        a_pool, b_pool = self._create_pools(stage2, [("A Pool", a_pool_pairs), ("B Pool", b_pool_pairs)])
+        Matchup.objects.bulk_create(
+            self._pool_round_robin(tournament, stage2, a_pool, a_pool_pairs,
+                                   schedule=TenPairsFormat.schedule, court_offset=0)
+            + self._pool_round_robin(tournament, stage2, b_pool, b_pool_pairs,
+                                     schedule=TenPairsFormat.schedule, court_offset=5)
+        )
 
-    def _generate_finals(self, tournament, stage2, stage3):
+    def _generate_finals(self, tournament, state, stage2, stage3):
         """Slice the provisional order into groups of 4; each group plays semis 1v4 and 2v3."""
-        a_pool, b_pool = list(stage2.pools.order_by('order'))
+        a_pool, b_pool = state.pools(stage2)
         provisional_order = (
-            [entry['pair'] for entry in self.get_pool_standings(a_pool)]
-            + [entry['pair'] for entry in self.get_pool_standings(b_pool)]
+            [entry['pair'] for entry in state.standings(a_pool)]
+            + [entry['pair'] for entry in state.standings(b_pool)]
         )
 
-        for group_idx in range(5):
-            base = group_idx * 4
-            group = provisional_order[base:base + 4]
-            pool = self._create_pool(
-                stage3,
-                name=f"Places {base + 1}-{base + 4}",
-                order=group_idx,
-                ordered_pairs=group,
-            )
+        groups = [provisional_order[base:base + 4] for base in range(0, 20, 4)]
+        pools = self._create_pools(stage3, [
+            (f"Places {group_idx * 4 + 1}-{group_idx * 4 + 4}", group)
+            for group_idx, group in enumerate(groups)
+        ])
+        semis = []
+        for group_idx, (pool, group) in enumerate(zip(pools, groups)):
             # Semifinals: 1v4 and 2v3 (positions within the group)
-            semi_label = self._semifinal_label(base)
-            Matchup.objects.create(
+            semi_label = self._semifinal_label(group_idx * 4)
+            semis.append(Matchup(
                 tournament_chart=tournament, stage=stage3, pool=pool,
                 pair1=group[0], pair2=group[3],
                 round_number=1, court_number=group_idx * 2 + 1,
                 label=semi_label,
-            )
-            Matchup.objects.create(
+            ))
+            semis.append(Matchup(
                 tournament_chart=tournament, stage=stage3, pool=pool,
                 pair1=group[1], pair2=group[2],
                 round_number=1, court_number=group_idx * 2 + 2,
                 label=semi_label,
-            )
+            ))
+        Matchup.objects.bulk_create(semis)
 
     @staticmethod
     def _semifinal_label(base):
@@ -392,32 +406,34 @@ class EurosFormat(PairsTournamentArchetype):
         """
         Called after a score is recorded. If both semifinals of a finals group are now
         scored and the placement matches don't exist yet, create them (winners play for
-        the higher placement, losers for the lower).
+        the higher placement, losers for the lower). Returns the created matchups.
         """
         pool = matchup.pool
         if pool is None or matchup.stage is None or matchup.stage.stage_type != 'PLAYOFF':
-            return
+            return []
         if pool.matchups.filter(round_number=2).exists():
-            return
+            return []
         semis = list(pool.matchups.filter(round_number=1).order_by('court_number'))
         if len(semis) != 2 or any(not semi.scores.exists() for semi in semis):
-            return
+            return []
 
         winner1, loser1 = self._matchup_winner_loser(semis[0])
         winner2, loser2 = self._matchup_winner_loser(semis[1])
         base = pool.order * 4
-        Matchup.objects.create(
-            tournament_chart=tournament, stage=matchup.stage, pool=pool,
-            pair1=winner1, pair2=winner2,
-            round_number=2, court_number=semis[0].court_number,
-            label=self._placement_match_label(base, winners=True),
-        )
-        Matchup.objects.create(
-            tournament_chart=tournament, stage=matchup.stage, pool=pool,
-            pair1=loser1, pair2=loser2,
-            round_number=2, court_number=semis[1].court_number,
-            label=self._placement_match_label(base, winners=False),
-        )
+        return [
+            Matchup.objects.create(
+                tournament_chart=tournament, stage=matchup.stage, pool=pool,
+                pair1=winner1, pair2=winner2,
+                round_number=2, court_number=semis[0].court_number,
+                label=self._placement_match_label(base, winners=True),
+            ),
+            Matchup.objects.create(
+                tournament_chart=tournament, stage=matchup.stage, pool=pool,
+                pair1=loser1, pair2=loser2,
+                round_number=2, court_number=semis[1].court_number,
+                label=self._placement_match_label(base, winners=False),
+            ),
+        ]
 
     def get_pool_standings(self, pool) -> List[Dict]:
         """
@@ -437,13 +453,24 @@ class EurosFormat(PairsTournamentArchetype):
         'position'}, plus tiebreak stats ('h2h_wins', 'h2h_losses', 'h2h_pd',
         'above_wins', 'above_pd', 'manually_resolved', 'manual_reason') on tied entries.
         """
+        from .scoring import ManualPoolTiebreakResolution
         members = [pp.pair for pp in PoolPair.objects.filter(pool=pool).select_related(
             'pair', 'pair__player1', 'pair__player2').order_by('position')]
+        matchups = pool.matchups.select_related('pair1', 'pair2').prefetch_related('scores')
+        resolutions = {r.wins_tied_at: r for r in ManualPoolTiebreakResolution.objects.filter(pool=pool)}
+        return self._rank_pool(members, matchups, resolutions)
+
+    def _rank_pool(self, members, matchups, resolutions):
+        """
+        get_pool_standings from loaded rows: the pool's pairs in seed position
+        order, its matchups with their scores prefetched, and its manual
+        resolutions by ``wins_tied_at``.
+        """
         stats = {pair.id: {'pair': pair, 'wins': 0, 'matches_played': 0, 'point_difference': 0}
                  for pair in members}
 
         scored_matchups = []
-        for m in pool.matchups.select_related('pair1', 'pair2').prefetch_related('scores'):
+        for m in matchups:
             scores = list(m.scores.all())
             if not scores:
                 continue
@@ -470,7 +497,8 @@ class EurosFormat(PairsTournamentArchetype):
                 group.append(ordered[idx + len(group)])
             if len(group) > 1:
                 above_ids = {entry['pair'].id for entry in ordered[:idx]}
-                group = self._sort_tied_group(group, scored_matchups, above_ids, pool)
+                group = self._sort_tied_group(group, scored_matchups, above_ids,
+                                              resolutions.get(group[0]['wins']))
             result.extend(group)
             idx += len(group)
 
@@ -478,11 +506,12 @@ class EurosFormat(PairsTournamentArchetype):
             entry['position'] = position
         return result
 
-    def _sort_tied_group(self, group, scored_matchups, above_ids, pool):
+    def _sort_tied_group(self, group, scored_matchups, above_ids, resolution):
         """
         Sort a group of entries tied on wins, per the DDC doubles tiebreak rules
-        (see get_pool_standings). Annotates each entry with the stats used so the
-        UI can show how the tie was resolved.
+        (see get_pool_standings). ``resolution`` is the pool's manual resolution
+        at this number of wins, if any. Annotates each entry with the stats used
+        so the UI can show how the tie was resolved.
         """
         tied_ids = {entry['pair'].id for entry in group}
         records = {pair_id: {'h2h_wins': 0, 'h2h_losses': 0, 'h2h_pd': 0,
@@ -528,9 +557,6 @@ class EurosFormat(PairsTournamentArchetype):
         ))
 
         # Step 7: manual resolution by the director overrides the automatic order
-        from .scoring import ManualPoolTiebreakResolution
-        resolution = ManualPoolTiebreakResolution.objects.filter(
-            pool=pool, wins_tied_at=group[0]['wins']).first()
         if resolution:
             auto_order = [e['pair'].id for e in group]
             rank = {pair_id: i for i, pair_id in enumerate(resolution.resolved_order)}
@@ -560,63 +586,53 @@ class EurosFormat(PairsTournamentArchetype):
         the next phase is generated from these standings.
         Returns a list of {'pool', 'wins', 'pairs'} in pool order.
         """
-        ties = []
-        for pool in stage.pools.order_by('order'):
-            by_wins = {}
-            for entry in self.get_pool_standings(pool):
-                if entry.get('seed_decided'):
-                    by_wins.setdefault(entry['wins'], []).append(entry['pair'])
-            for wins, pairs in sorted(by_wins.items(), reverse=True):
-                ties.append({'pool': pool, 'wins': wins, 'pairs': pairs})
-        return ties
+        return self.get_phase_state(stage.tournament).unresolved_seed_ties(stage)
 
     def get_final_standings(self, tournament) -> Optional[List[Dict]]:
         """
         Final placements 1-20 once all finals placement matches are played.
         Returns a list of dicts {'position', 'pair'}, or None if the finals aren't done.
         """
-        stage3 = tournament.stages.filter(stage_number=3).first()
-        if stage3 is None or not stage3.matchups.exists():
-            return None
+        return self.get_phase_state(tournament).final_standings
 
-        standings = []
-        for group_idx, pool in enumerate(stage3.pools.order_by('order')):
-            placement_matches = list(pool.matchups.filter(round_number=2).order_by('court_number'))
-            if len(placement_matches) != 2 or any(not m.scores.exists() for m in placement_matches):
-                return None
-            base = group_idx * 4
-            final, consolation = placement_matches
-            final_winner, final_loser = self._matchup_winner_loser(final)
-            consolation_winner, consolation_loser = self._matchup_winner_loser(consolation)
-            standings.extend([
-                {'position': base + 1, 'pair': final_winner},
-                {'position': base + 2, 'pair': final_loser},
-                {'position': base + 3, 'pair': consolation_winner},
-                {'position': base + 4, 'pair': consolation_loser},
-            ])
-        return standings
+    def get_phase_state(self, tournament) -> 'MultiPhaseState':
+        """Stage progress, pool standings, seed ties and final placements, loaded together."""
+        return MultiPhaseState(self, tournament)
 
-    def _create_pool(self, stage, name, order, ordered_pairs) -> Pool:
-        pool = Pool.objects.create(stage=stage, name=name, order=order)
-        for position, pair in enumerate(ordered_pairs, start=1):
-            PoolPair.objects.create(pool=pool, pair=pair, position=position)
-        return pool
+    def _create_pools(self, stage, named_members) -> List[Pool]:
+        """Create a stage's pools, in order, from ``(name, ordered_pairs)`` tuples.
 
-    def _generate_pool_round_robin(self, tournament_chart, stage, pool, ordered_pairs,
-                                   schedule, court_offset):
-        """Create matchups for a pool using a schedule of pool-internal seed positions."""
+        Two inserts regardless of the number of pools: one for the pools, one
+        for their memberships.
+        """
+        pools = Pool.objects.bulk_create([
+            Pool(stage=stage, name=name, order=order)
+            for order, (name, _) in enumerate(named_members)
+        ])
+        PoolPair.objects.bulk_create([
+            PoolPair(pool=pool, pair=pair, position=position)
+            for pool, (_, ordered_pairs) in zip(pools, named_members)
+            for position, pair in enumerate(ordered_pairs, start=1)
+        ])
+        return pools
+
+    def _pool_round_robin(self, tournament_chart, stage, pool, ordered_pairs,
+                          schedule, court_offset) -> List[Matchup]:
+        """Unsaved matchups for a pool from a schedule of pool-internal seed positions."""
         pairs_by_position = {position: pair for position, pair in enumerate(ordered_pairs, start=1)}
-        for round_idx, round_matches in enumerate(schedule, 1):
-            for match_idx, (pos1, pos2) in enumerate(round_matches, 1):
-                Matchup.objects.create(
-                    tournament_chart=tournament_chart,
-                    stage=stage,
-                    pool=pool,
-                    pair1=pairs_by_position[pos1],
-                    pair2=pairs_by_position[pos2],
-                    round_number=round_idx,
-                    court_number=court_offset + match_idx,
-                )
+        return [
+            Matchup(
+                tournament_chart=tournament_chart,
+                stage=stage,
+                pool=pool,
+                pair1=pairs_by_position[pos1],
+                pair2=pairs_by_position[pos2],
+                round_number=round_idx,
+                court_number=court_offset + match_idx,
+            )
+            for round_idx, round_matches in enumerate(schedule, 1)
+            for match_idx, (pos1, pos2) in enumerate(round_matches, 1)
+        ]
 
     def _matchup_winner_loser(self, matchup, scores=None):
         """
@@ -642,6 +658,127 @@ class EurosFormat(PairsTournamentArchetype):
             return matchup.pair1, matchup.pair2
         return matchup.pair2, matchup.pair1
 
+class MultiPhaseState:
+    """
+    A multi-phase tournament's progress, read in one go.
+
+    Stages, pools, pool members, matchups with their scores and the manual
+    pool tiebreaks are loaded in a fixed number of queries, however many
+    pools and matches there are. Everything the detail page, the state API
+    and stage advancement need is derived from those rows: per-stage
+    completion, pool standings (computed once per pool, on first use),
+    seed-decided ties and the final placements. Build one with
+    ``EurosFormat.get_phase_state`` and reuse it within a request; it does
+    not see writes made after it was built.
+    """
+
+    def __init__(self, impl, tournament):
+        from .scoring import ManualPoolTiebreakResolution
+        self.impl = impl
+        self.tournament = tournament
+        self.stages = list(tournament.stages.order_by('stage_number'))
+        self._pools = {stage.id: [] for stage in self.stages}
+        for pool in Pool.objects.filter(stage__tournament=tournament).order_by('order'):
+            self._pools[pool.stage_id].append(pool)
+
+        pairs = Pair.objects.filter(pools__stage__tournament=tournament).select_related(
+            'player1', 'player2').distinct().in_bulk()
+        self._members = defaultdict(list)
+        for pool_id, pair_id in PoolPair.objects.filter(pool__stage__tournament=tournament).order_by(
+                'position').values_list('pool_id', 'pair_id'):
+            self._members[pool_id].append(pairs[pair_id])
+
+        # [matchups, scored matchups] per stage
+        self._progress = {stage.id: [0, 0] for stage in self.stages}
+        self._matchups = defaultdict(list)
+        for m in Matchup.objects.filter(stage__tournament=tournament).prefetch_related('scores'):
+            # Share one Pair object per pair, so display names set on it show everywhere.
+            m.pair1, m.pair2 = pairs[m.pair1_id], pairs[m.pair2_id]
+            self._matchups[m.pool_id].append(m)
+            self._progress[m.stage_id][0] += 1
+            self._progress[m.stage_id][1] += bool(m.scores.all())
+
+        self._resolutions = defaultdict(dict)
+        for resolution in ManualPoolTiebreakResolution.objects.filter(pool__stage__tournament=tournament):
+            self._resolutions[resolution.pool_id][resolution.wins_tied_at] = resolution
+        self._standings = {}
+
+    def pools(self, stage) -> List[Pool]:
+        return self._pools.get(stage.id, [])
+
+    def has_matchups(self, stage) -> bool:
+        return bool(self._progress[stage.id][0])
+
+    def is_complete(self, stage) -> bool:
+        """A stage is complete when it has matchups and every matchup has a recorded score."""
+        total, scored = self._progress[stage.id]
+        return total > 0 and scored == total
+
+    @cached_property
+    def next_stage(self) -> Optional[Stage]:
+        """The first stage without matchups, or None if all are generated."""
+        return next((stage for stage in self.stages if not self.has_matchups(stage)), None)
+
+    @cached_property
+    def previous_stage(self) -> Optional[Stage]:
+        """The stage the next one is generated from."""
+        if self.next_stage is None:
+            return None
+        return next((s for s in self.stages if s.stage_number == self.next_stage.stage_number - 1), None)
+
+    @property
+    def can_advance(self) -> bool:
+        return bool(self.previous_stage and self.is_complete(self.previous_stage))
+
+    def standings(self, pool) -> List[Dict]:
+        """EurosFormat.get_pool_standings for ``pool``, without further queries."""
+        if pool.id not in self._standings:
+            self._standings[pool.id] = self.impl._rank_pool(
+                self._members[pool.id], self._matchups[pool.id], self._resolutions[pool.id])
+        return self._standings[pool.id]
+
+    def resolution(self, pool, wins):
+        """The manual tiebreak saved for ``pool`` at ``wins``, or None."""
+        return self._resolutions[pool.id].get(wins)
+
+    def unresolved_seed_ties(self, stage) -> List[Dict]:
+        """EurosFormat.get_unresolved_seed_ties for ``stage``."""
+        ties = []
+        for pool in self.pools(stage):
+            by_wins = {}
+            for entry in self.standings(pool):
+                if entry.get('seed_decided'):
+                    by_wins.setdefault(entry['wins'], []).append(entry['pair'])
+            for wins, pairs in sorted(by_wins.items(), reverse=True):
+                ties.append({'pool': pool, 'wins': wins, 'pairs': pairs})
+        return ties
+
+    @cached_property
+    def final_standings(self) -> Optional[List[Dict]]:
+        """EurosFormat.get_final_standings: placements once every placement match is played, else None."""
+        stage3 = next((stage for stage in self.stages if stage.stage_number == 3), None)
+        if stage3 is None or not self.has_matchups(stage3):
+            return None
+
+        standings = []
+        for group_idx, pool in enumerate(self.pools(stage3)):
+            placement_matches = sorted((m for m in self._matchups[pool.id] if m.round_number == 2),
+                                       key=lambda m: m.court_number)
+            if len(placement_matches) != 2 or any(not m.scores.all() for m in placement_matches):
+                return None
+            base = group_idx * 4
+            final, consolation = placement_matches
+            final_winner, final_loser = self.impl._matchup_winner_loser(final, list(final.scores.all()))
+            consolation_winner, consolation_loser = self.impl._matchup_winner_loser(
+                consolation, list(consolation.scores.all()))
+            standings.extend([
+                {'position': base + 1, 'pair': final_winner},
+                {'position': base + 2, 'pair': final_loser},
+                {'position': base + 3, 'pair': consolation_winner},
+                {'position': base + 4, 'pair': consolation_loser},
+            ])
+        return standings
+
 # -- Monarch of the Court base --
 class MoCTournamentArchetype(TournamentArchetype):
     class Meta:
@@ -695,10 +832,11 @@ class MonarchOfTheCourt8(MoCTournamentArchetype):
         ]
 
         # Create matchups
+        matchups = []
         for round_idx, round_matches in enumerate(schedule, 1):
             for match in round_matches:
                 p1, p2, p3, p4, court = match
-                Matchup.objects.create(
+                matchups.append(Matchup(
                     tournament_chart=tournament_chart,
                     stage=stage,
                     pair1_player1=sorted_players[p1],
@@ -707,7 +845,8 @@ class MonarchOfTheCourt8(MoCTournamentArchetype):
                     pair2_player2=sorted_players[p4],
                     round_number=round_idx,
                     court_number=court
-                )
+                ))
+        Matchup.objects.bulk_create(matchups)
 
 # 5-player Monarch of the Court (Option A)
 class MonarchOfTheCourt5(MoCTournamentArchetype):
@@ -744,9 +883,10 @@ class MonarchOfTheCourt5(MoCTournamentArchetype):
         ]
 
         # Create matchups
+        matchups = []
         for round_idx, round_matches in enumerate(schedule, 1):
             for field_idx, (p1, p2, p3, p4) in enumerate(round_matches, 1):
-                Matchup.objects.create(
+                matchups.append(Matchup(
                     tournament_chart=tournament_chart,
                     stage=stage,
                     pair1_player1=sorted_players[p1],
@@ -755,7 +895,8 @@ class MonarchOfTheCourt5(MoCTournamentArchetype):
                     pair2_player2=sorted_players[p4],
                     round_number=round_idx,
                     court_number=field_idx
-                )
+                ))
+        Matchup.objects.bulk_create(matchups)
 
 # 6-player Monarch of the Court (Option A)
 class MonarchOfTheCourt6(MoCTournamentArchetype):
@@ -796,9 +937,10 @@ class MonarchOfTheCourt6(MoCTournamentArchetype):
         ]
 
         # Create matchups
+        matchups = []
         for round_idx, round_matches in enumerate(schedule, 1):
             for field_idx, (p1, p2, p3, p4) in enumerate(round_matches, 1):
-                Matchup.objects.create(
+                matchups.append(Matchup(
                     tournament_chart=tournament_chart,
                     stage=stage,
                     pair1_player1=sorted_players[p1],
@@ -807,7 +949,8 @@ class MonarchOfTheCourt6(MoCTournamentArchetype):
                     pair2_player2=sorted_players[p4],
                     round_number=round_idx,
                     court_number=field_idx
-                )
+                ))
+        Matchup.objects.bulk_create(matchups)
                 
 # 7-player Monarch of the Court
 class MonarchOfTheCourt7(MoCTournamentArchetype):
@@ -857,9 +1000,10 @@ class MonarchOfTheCourt7(MoCTournamentArchetype):
         ]
 
         # Create matchups
+        matchups = []
         for round_idx, round_matches in enumerate(schedule, 1):
             for field_idx, (p1, p2, p3, p4) in enumerate(round_matches, 1):
-                Matchup.objects.create(
+                matchups.append(Matchup(
                     tournament_chart=tournament_chart,
                     stage=stage,
                     pair1_player1=sorted_players[p1],
@@ -868,7 +1012,8 @@ class MonarchOfTheCourt7(MoCTournamentArchetype):
                     pair2_player2=sorted_players[p4],
                     round_number=round_idx,
                     court_number=field_idx
-                )
+                ))
+        Matchup.objects.bulk_create(matchups)
                 
 # 9-player Monarch of the Court
 class MonarchOfTheCourt9(MoCTournamentArchetype):
@@ -916,10 +1061,11 @@ class MonarchOfTheCourt9(MoCTournamentArchetype):
         ]
 
         # Create matchups
+        matchups = []
         for round_idx, round_matches in enumerate(schedule, 1):
             for match in round_matches:
                 p1, p2, p3, p4, court = match
-                Matchup.objects.create(
+                matchups.append(Matchup(
                     tournament_chart=tournament_chart,
                     stage=stage,
                     pair1_player1=sorted_players[p1],
@@ -928,7 +1074,8 @@ class MonarchOfTheCourt9(MoCTournamentArchetype):
                     pair2_player2=sorted_players[p4],
                     round_number=round_idx,
                     court_number=court
-                )
+                ))
+        Matchup.objects.bulk_create(matchups)
                 
 # 10-player Monarch of the Court
 class MonarchOfTheCourt10(MoCTournamentArchetype):
@@ -980,10 +1127,11 @@ class MonarchOfTheCourt10(MoCTournamentArchetype):
         ]
 
         # Create matchups
+        matchups = []
         for round_idx, round_matches in enumerate(schedule, 1):
             for match in round_matches:
                 p1, p2, p3, p4, court = match
-                Matchup.objects.create(
+                matchups.append(Matchup(
                     tournament_chart=tournament_chart,
                     stage=stage,
                     pair1_player1=sorted_players[p1],
@@ -992,7 +1140,8 @@ class MonarchOfTheCourt10(MoCTournamentArchetype):
                     pair2_player2=sorted_players[p4],
                     round_number=round_idx,
                     court_number=court
-                )
+                ))
+        Matchup.objects.bulk_create(matchups)
                 
 # 11-player Monarch of the Court
 class MonarchOfTheCourt11(MoCTournamentArchetype):
@@ -1055,10 +1204,11 @@ class MonarchOfTheCourt11(MoCTournamentArchetype):
         ]
 
         # Create matchups
+        matchups = []
         for round_idx, round_matches in enumerate(schedule, 1):
             for match in round_matches:
                 p1, p2, p3, p4, court = match
-                Matchup.objects.create(
+                matchups.append(Matchup(
                     tournament_chart=tournament_chart,
                     stage=stage,
                     pair1_player1=sorted_players[p1],
@@ -1067,7 +1217,8 @@ class MonarchOfTheCourt11(MoCTournamentArchetype):
                     pair2_player2=sorted_players[p4],
                     round_number=round_idx,
                     court_number=court
-                )
+                ))
+        Matchup.objects.bulk_create(matchups)
                 
 # 12-player Monarch of the Court
 class MonarchOfTheCourt12(MoCTournamentArchetype):
@@ -1119,10 +1270,11 @@ class MonarchOfTheCourt12(MoCTournamentArchetype):
         ]
 
         # Create matchups
+        matchups = []
         for round_idx, round_matches in enumerate(schedule, 1):
             for match in round_matches:
                 p1, p2, p3, p4, court = match
-                Matchup.objects.create(
+                matchups.append(Matchup(
                     tournament_chart=tournament_chart,
                     stage=stage,
                     pair1_player1=sorted_players[p1],
@@ -1131,7 +1283,8 @@ class MonarchOfTheCourt12(MoCTournamentArchetype):
                     pair2_player2=sorted_players[p4],
                     round_number=round_idx,
                     court_number=court
-                )
+                ))
+        Matchup.objects.bulk_create(matchups)
                 
 # 13-player Monarch of the Court
 class MonarchOfTheCourt13(MoCTournamentArchetype):
@@ -1184,10 +1337,11 @@ class MonarchOfTheCourt13(MoCTournamentArchetype):
         ]
 
         # Create matchups
+        matchups = []
         for round_idx, round_matches in enumerate(schedule, 1):
             for match in round_matches:
                 p1, p2, p3, p4, court = match
-                Matchup.objects.create(
+                matchups.append(Matchup(
                     tournament_chart=tournament_chart,
                     stage=stage,
                     pair1_player1=sorted_players[p1],
@@ -1196,7 +1350,8 @@ class MonarchOfTheCourt13(MoCTournamentArchetype):
                     pair2_player2=sorted_players[p4],
                     round_number=round_idx,
                     court_number=court
-                )
+                ))
+        Matchup.objects.bulk_create(matchups)
                 
 # 14-player Monarch of the Court
 class MonarchOfTheCourt14(MoCTournamentArchetype):
@@ -1257,10 +1412,11 @@ class MonarchOfTheCourt14(MoCTournamentArchetype):
         ]
 
         # Create matchups
+        matchups = []
         for round_idx, round_matches in enumerate(schedule, 1):
             for match in round_matches:
                 p1, p2, p3, p4, court = match
-                Matchup.objects.create(
+                matchups.append(Matchup(
                     tournament_chart=tournament_chart,
                     stage=stage,
                     pair1_player1=sorted_players[p1],
@@ -1269,7 +1425,8 @@ class MonarchOfTheCourt14(MoCTournamentArchetype):
                     pair2_player2=sorted_players[p4],
                     round_number=round_idx,
                     court_number=court
-                )
+                ))
+        Matchup.objects.bulk_create(matchups)
                 
 # 15-player Monarch of the Court
 class MonarchOfTheCourt15(MoCTournamentArchetype):
@@ -1336,10 +1493,11 @@ class MonarchOfTheCourt15(MoCTournamentArchetype):
         ]
 
         # Create matchups
+        matchups = []
         for round_idx, round_matches in enumerate(schedule, 1):
             for match in round_matches:
                 p1, p2, p3, p4, court = match
-                Matchup.objects.create(
+                matchups.append(Matchup(
                     tournament_chart=tournament_chart,
                     stage=stage,
                     pair1_player1=sorted_players[p1],
@@ -1348,7 +1506,8 @@ class MonarchOfTheCourt15(MoCTournamentArchetype):
                     pair2_player2=sorted_players[p4],
                     round_number=round_idx,
                     court_number=court
-                )
+                ))
+        Matchup.objects.bulk_create(matchups)
                 
 # 16-player Monarch of the Court
 class MonarchOfTheCourt16(MoCTournamentArchetype):
@@ -1410,10 +1569,11 @@ class MonarchOfTheCourt16(MoCTournamentArchetype):
         ]
 
         # Create matchups
+        matchups = []
         for round_idx, round_matches in enumerate(schedule, 1):
             for match in round_matches:
                 p1, p2, p3, p4, court = match
-                Matchup.objects.create(
+                matchups.append(Matchup(
                     tournament_chart=tournament_chart,
                     stage=stage,
                     pair1_player1=sorted_players[p1],
@@ -1422,4 +1582,5 @@ class MonarchOfTheCourt16(MoCTournamentArchetype):
                     pair2_player2=sorted_players[p4],
                     round_number=round_idx,
                     court_number=court
-                )
+                ))
+        Matchup.objects.bulk_create(matchups)
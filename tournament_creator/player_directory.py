@@ -0,0 +1,146 @@
+"""
+In-process directory of player names for the tournament creation pickers.
+
+Each worker keeps the few thousand players in memory: ids, display labels,
+rankings and a sorted list of folded name words (see ``models.search``). A
+prefix query is then a binary search per typed word rather than a database
+round trip, which keeps per-keystroke autocomplete well under a millisecond
+of work.
+
+Workers share a version stamp in the cache. Any change to players bumps
+it, and each worker rebuilds its directory lazily on the next lookup that
+sees a new stamp. Player saves and deletes bump it via signals. Bulk
+writes, which send no signals, call ``invalidate()`` themselves.
+"""
+import bisect
+import threading
+import time
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models.base_models import Player
+from .models.search import search_tokens
+from .read_replica import primary_reads, reading_replica, snapshot_time
+
+VERSION_KEY = 'player-directory:version'
+_PREFIX_END = '\U0010ffff'
+
+
+class PlayerDirectory:
+    """An immutable snapshot of every player's name, ranking and search words."""
+
+    def __init__(self, rows, version=None):
+        self.version = version
+        self.ids = []
+        self.labels = []
+        self.rankings = []
+        terms = []
+        for index, (pk, first_name, last_name, nickname, ranking) in enumerate(rows):
+            self.ids.append(pk)
+            self.labels.append(f"{first_name} {last_name}")
+            self.rankings.append(ranking)
+            for term in set(search_tokens(' '.join(filter(None, [first_name, last_name, nickname])))):
+                terms.append((term, index))
+        terms.sort()
+        self.terms = [term for term, _ in terms]
+        self.term_players = [index for _, index in terms]
+        # Default list before anything is typed, like the old autocomplete.
+        self.by_name = sorted(range(len(self.ids)), key=lambda i: (rows[i][2], rows[i][1]))
+
+    @classmethod
+    def load(cls, version=None):
+        # From the primary: a replica snapshot may predate the change that bumped ``version``.
+        with primary_reads():
+            return cls(Player.objects.order_by().values_list(
+                'pk', 'first_name', 'last_name', 'nickname', 'ranking'), version)
+
+    def _prefix_matches(self, token):
+        start = bisect.bisect_left(self.terms, token)
+        end = bisect.bisect_left(self.terms, token + _PREFIX_END, start)
+        return set(self.term_players[start:end])
+
+    def search(self, query, exclude=(), offset=0, limit=10):
+        """Players whose name words start with every word of ``query``, best ranked first.
+
+        Returns ``([(id, label), ...], more)``; an empty query lists players
+        by last name.
+        """
+        tokens = search_tokens(query)
+        if tokens:
+            matches = self._prefix_matches(tokens[0])
+            for token in tokens[1:]:
+                if not matches:
+                    break
+                matches &= self._prefix_matches(token)
+            order = sorted(matches, key=lambda i: (self.rankings[i], self.ids[i]))
+        else:
+            order = self.by_name
+        excluded = set(exclude)
+        results = []
+        skipped = 0
+        for index in order:
+            if self.ids[index] in excluded:
+                continue
+            if skipped < offset:
+                skipped += 1
+                continue
+            if len(results) == limit:
+                return results, True
+            results.append((self.ids[index], self.labels[index]))
+        return results, False
+
+
+_directory = None
+_lock = threading.Lock()
+
+
+def current_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Never set, or evicted: start a new stamp so every worker reloads.
+        cache.add(VERSION_KEY, time.time_ns(), None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def data_stamp():
+    """The current version, for keys of cached renders that show player data.
+
+    Renders read from a replica snapshot older than the last player change
+    are also keyed to that snapshot, so they aren't reused once it catches up.
+    """
+    version = current_version()
+    taken = snapshot_time() if reading_replica() else None
+    if taken is not None and taken * 1e9 < version:
+        return f'{version}@{taken}'
+    return version
+
+
+def get_directory():
+    """This worker's directory, reloaded if players changed since it was built."""
+    global _directory
+    version = current_version()
+    directory = _directory
+    if directory is not None and directory.version == version:
+        return directory
+    with _lock:
+        if _directory is None or _directory.version != version:
+            _directory = PlayerDirectory.load(version)
+        return _directory
+
+
+def invalidate():
+    """Tell every worker to reload its directory on the next lookup.
+
+    Deferred to commit, so no worker can reload before the change is visible.
+    """
+    transaction.on_commit(lambda: cache.set(VERSION_KEY, time.time_ns(), None))
+
+
+@receiver(post_save, sender=Player)
+@receiver(post_delete, sender=Player)
+def _player_changed(sender, **kwargs):
+    invalidate()
@@ -0,0 +1,16 @@
+"""
+Names shared by the rankings sync (``update_rankings``) and the code that
+reuses its player matching: the rankings page and the archive import.
+"""
+
+# Upper bound on rows per bulk INSERT/UPDATE statement; Django lowers it
+# further where the backend's query-parameter limit requires.
+BATCH_SIZE = 500
+
+# --division value that refreshes every division from the one rankings payload.
+ALL_DIVISIONS = 'all'
+
+
+def name_key(first, last):
+    """Normalized (whitespace-trimmed, case-folded) name used to match players."""
+    return (first.strip().casefold(), last.strip().casefold())
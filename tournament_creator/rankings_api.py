@@ -0,0 +1,169 @@
+"""
+Conditional, cached downloads from the doubledisccourt.com rankings API.
+
+The ``get-rankings`` and ``load-player`` payloads change a few times a week
+but were downloaded and reprocessed in full on every sync. ``fetch_payload``
+keeps the last copy of each payload on disk next to its ETag, Last-Modified
+and SHA-256, sends them back as ``If-None-Match`` / ``If-Modified-Since``,
+and reports whether the content actually changed (a 304, or a 200 whose body
+hashes the same — the API doesn't always send validators). Bodies are
+streamed to disk rather than held in memory, and ``iter_json_array`` parses
+them one element at a time.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+import requests
+from django.conf import settings
+
+DEFAULT_BASE_URL = 'https://doubledisccourt.com'
+ENDPOINT = '/data/ddc.php'
+# (connect, read) seconds; the API is slow but a hung sync must not block
+# the timer (or a web worker) forever.
+DEFAULT_TIMEOUT = (10, 60)
+CHUNK_SIZE = 64 * 1024
+
+HEADERS = {
+    'accept': '*/*',
+    'accept-encoding': 'gzip, deflate',
+    'referer': 'https://doubledisccourt.com/results/rankings.html',
+    'user-agent': 'Mozilla/5.0 (iPad; CPU OS 16_6 like Mac OS X) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/16.6 Mobile/15E148 Safari/604.1',
+    'x-requested-with': 'XMLHttpRequest'
+}
+
+
+@dataclass
+class Payload:
+    """A downloaded (or cached) API response body on disk."""
+    path: Path
+    sha256: str
+    changed: bool
+
+
+def cache_dir():
+    return Path(getattr(settings, 'RANKINGS_CACHE_DIR', settings.BASE_DIR / 'cache' / 'rankings'))
+
+
+def _cache_name(params):
+    return '-'.join(f'{key}={params[key]}' for key in sorted(params))
+
+
+def _read_meta(path):
+    try:
+        return json.loads(path.read_text())
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def fetch_payload(params, base_url=DEFAULT_BASE_URL, timeout=DEFAULT_TIMEOUT, session=None):
+    """Download the API response for ``params``, revalidating the cached copy.
+
+    Returns a ``Payload``; ``changed`` is False when the server answered 304
+    or sent the same bytes as last time. Raises ``requests.RequestException``
+    on network and HTTP errors, leaving the cache untouched.
+    """
+    directory = cache_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    name = _cache_name(params)
+    body_path = directory / f'{name}.json'
+    meta_path = directory / f'{name}.meta.json'
+    meta = _read_meta(meta_path) if body_path.exists() else {}
+
+    headers = dict(HEADERS)
+    if meta.get('etag'):
+        headers['if-none-match'] = meta['etag']
+    if meta.get('last_modified'):
+        headers['if-modified-since'] = meta['last_modified']
+
+    session = session or requests
+    with session.get(base_url.rstrip('/') + ENDPOINT, params=params, headers=headers,
+                     timeout=timeout, stream=True) as response:
+        if response.status_code == 304 and meta:
+            return Payload(body_path, meta['sha256'], changed=False)
+        response.raise_for_status()
+
+        # Stream to a temp file in the cache directory, hashing as we go, and
+        # only replace the cached copy once the whole body has arrived.
+        digest = hashlib.sha256()
+        fd, tmp_name = tempfile.mkstemp(dir=directory, suffix='.part')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    digest.update(chunk)
+                    tmp.write(chunk)
+            os.replace(tmp_name, body_path)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+        validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+        }
+
+    sha256 = digest.hexdigest()
+    meta_path.write_text(json.dumps({**validators, 'sha256': sha256}))
+    return Payload(body_path, sha256, changed=sha256 != meta.get('sha256'))
+
+
+def is_null_payload(path):
+    """The API answers ``null`` for years without data."""
+    with open(path, 'rb') as f:
+        return f.read(16).strip() == b'null'
+
+
+def iter_json_array(path):
+    """Yield the elements of the top-level JSON array in ``path`` one by one."""
+    decoder = json.JSONDecoder()
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = f.read(CHUNK_SIZE).lstrip()
+        if not buffer.startswith('['):
+            raise ValueError('Expected a JSON array')
+        buffer = buffer[1:]
+        eof = False
+        while True:
+            buffer = buffer.lstrip().lstrip(',').lstrip()
+            if buffer.startswith(']'):
+                return
+            try:
+                item, end = decoder.raw_decode(buffer)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                more = f.read(CHUNK_SIZE)
+                eof = not more
+                buffer += more
+                continue
+            # An element that ends exactly at the buffer's end may be a
+            # truncated number; read on before trusting it.
+            if end == len(buffer) and not eof:
+                more = f.read(CHUNK_SIZE)
+                eof = not more
+                buffer += more
+                if more:
+                    continue
+            yield item
+            buffer = buffer[end:]
+
+
+def sync_marker_path(division, year):
+    return cache_dir() / f'synced-{division}-{year}.txt'
+
+
+def payloads_fingerprint(*payloads):
+    return ':'.join(payload.sha256 for payload in payloads)
+
+
+def already_synced(division, year, fingerprint):
+    """True if this exact pair of payloads was already applied to the database."""
+    try:
+        return sync_marker_path(division, year).read_text() == fingerprint
+    except FileNotFoundError:
+        return False
+
+
+def mark_synced(division, year, fingerprint):
+    sync_marker_path(division, year).write_text(fingerprint)
@@ -0,0 +1,160 @@
+"""
+Serve spectator page views from a read-only snapshot of the database.
+
+With ``READ_REPLICA`` set, settings.py adds a ``replica`` database: a copy of
+db.sqlite3 that ``manage.py refresh_read_replica`` replaces every few seconds
+using SQLite's online backup. Requests then go to one database or the other:
+
+- ``ReplicaMiddleware`` lets a GET or HEAD request read from the replica
+  unless it is for the admin site, or the browser wrote something in the
+  last ``READ_REPLICA_PIN_SECONDS``. A write sets a short-lived cookie that
+  pins the browser to the primary, so scorekeepers see their own results
+  right away.
+- ``ReplicaRouter`` routes reads to the replica only inside such requests.
+  Writes, and reads inside a transaction on the primary, always go to the
+  primary.
+- A snapshot older than ``READ_REPLICA_MAX_LAG`` seconds is not used, so a
+  stopped refresher costs a little speed but never shows stale results.
+
+Code that fills a cache shared with writers (the player directory, the
+location summary) loads inside ``primary_reads()``: rebuilt from a lagging
+snapshot right after an invalidation, the old rows would be cached as new.
+
+Spectator renders then take no locks on the primary and don't hold back its
+checkpoints. The lag is sent as an ``X-Replica-Lag`` header and shown in the
+page footer (``replica_status`` context processor).
+
+Each snapshot is written to a temporary file and renamed into place, with
+its mtime set to the moment the copy started. A thread's replica connection
+is reopened when it notices a newer file.
+"""
+import os
+import sqlite3
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+REPLICA = 'replica'
+PIN_COOKIE = 'ddc_primary'
+PRIMARY_PATHS = ('/admin/',)
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def replica_path():
+    return Path(settings.READ_REPLICA) if settings.READ_REPLICA else None
+
+
+def snapshot_time(path=None):
+    """When the current snapshot was taken (epoch seconds), or None without one."""
+    path = path or replica_path()
+    try:
+        return path.stat().st_mtime
+    except (OSError, AttributeError):
+        return None
+
+
+def replica_lag():
+    """Seconds the snapshot is behind the primary, or None without one."""
+    taken = snapshot_time()
+    return None if taken is None else max(0.0, time.time() - taken)
+
+
+def reading_replica():
+    """Whether reads in the current request go to the replica."""
+    return _use_replica.get()
+
+
+@contextmanager
+def primary_reads():
+    """Read from the primary inside this block, even in a replica request."""
+    token = _use_replica.set(False)
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def refresh(primary, replica):
+    """Copy ``primary`` into ``replica`` as a rollback-journal snapshot; returns the copy's size."""
+    replica = Path(replica)
+    replica.parent.mkdir(parents=True, exist_ok=True)
+    tmp = replica.with_name(f'.{replica.name}.tmp')
+    tmp.unlink(missing_ok=True)
+    started = time.time()
+    source = sqlite3.connect(f'file:{primary}?mode=ro', uri=True, timeout=settings.SQLITE_BUSY_TIMEOUT)
+    target = sqlite3.connect(tmp)
+    try:
+        # One step: a single read transaction, so the copy is consistent.
+        source.backup(target)
+        # Read-only connections can't open a WAL database without its -shm file.
+        target.execute('PRAGMA journal_mode=DELETE')
+    finally:
+        target.close()
+        source.close()
+    os.utime(tmp, (started, started))
+    os.replace(tmp, replica)
+    return replica.stat().st_size
+
+
+class ReplicaRouter:
+    """Reads go to the replica inside requests ReplicaMiddleware marked; everything else to the primary."""
+
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and not connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return REPLICA
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both databases hold the same rows.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        use_replica = self.can_use_replica(request)
+        token = _use_replica.set(use_replica)
+        try:
+            response = self.get_response(request)
+        finally:
+            _use_replica.reset(token)
+        if use_replica:
+            response['X-Replica-Lag'] = f'{request.replica_lag:.1f}'
+        elif request.method not in ('GET', 'HEAD', 'OPTIONS'):
+            response.set_cookie(PIN_COOKIE, '1', max_age=settings.READ_REPLICA_PIN_SECONDS, samesite='Lax')
+        return response
+
+    def can_use_replica(self, request):
+        request.replica_lag = None
+        if (request.method not in ('GET', 'HEAD') or PIN_COOKIE in request.COOKIES
+                or request.path.startswith(PRIMARY_PATHS)):
+            return False
+        taken = snapshot_time()
+        if taken is None or time.time() - taken > settings.READ_REPLICA_MAX_LAG:
+            return False
+        request.replica_lag = max(0.0, time.time() - taken)
+        # Persistent connections keep reading the file they opened; reopen on a new snapshot.
+        connection = connections[REPLICA]
+        if getattr(connection, 'snapshot_time', None) != taken:
+            connection.close()
+            connection.snapshot_time = taken
+        return True
+
+
+def replica_status(request):
+    """Template context: ``replica_lag`` (seconds) when the page was read from the replica."""
+    lag = getattr(request, 'replica_lag', None)
+    return {'replica_lag': round(lag) if lag is not None else None}
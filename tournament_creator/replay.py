@@ -0,0 +1,252 @@
+"""
+Replay a tournament's results from its MatchResultLog event stream.
+
+The log (see models/logging.py) holds every score change and every generated
+phase, in order. A single streaming pass over it, from the start up to any
+moment, gives the results as they stood then:
+
+- ``results_as_of`` returns ``{matchup key: [(team1, team2), ...]}`` and
+  writes nothing.
+- ``rebuild`` rewrites MatchScore, PlayerScore and PairScore, and regenerates
+  the later phases of a multi-phase format, from the log alone. Use it for
+  disaster recovery, or to check that stored standings match their history.
+- ``standings_as_of`` returns the standings at that moment ("after round 7").
+  It runs a rebuild inside a transaction that is rolled back.
+
+A compacted tournament replays from its log archives (log_archive.py), then
+from whatever is still live.
+
+Only results are replayed. The tournament, its players or pairs, and the
+structure created with it (phase 1) must exist. Manual pool tiebreak
+decisions in regenerated phases are carried over by pool, so a rebuild
+regenerates the same finals.
+"""
+from collections import defaultdict
+
+from django.db import transaction
+
+from .log_archive import archived_events
+from .models.base_models import Matchup
+from .models.logging import MatchResultLog
+from .models.scoring import ManualPoolTiebreakResolution, MatchScore, PairScore, PlayerScore
+from .models.tournament_types import get_implementation
+
+
+def events(tournament, until=None):
+    """The tournament's log entries as dicts, oldest first.
+
+    Events moved out by ``compact_logs`` are read from their archive files
+    first, then the live rows are streamed from the database.
+    """
+    yield from archived_events(tournament, until)
+    log = MatchResultLog.objects.filter(tournament=tournament).order_by('id')
+    if until is not None:
+        log = log.filter(recorded_at__lte=until)
+    yield from log.values('id', 'action', 'matchup_key', 'details').iterator()
+
+
+def event_sets(event):
+    """The ``[(team1, team2), ...]`` a score event leaves the match with."""
+    details = event['details']
+    return list(zip(details.get('team1_scores', []), details.get('team2_scores', [])))
+
+
+def results_as_of(tournament, until=None):
+    """``{matchup key: sets}`` for every match with a result after the events up to ``until``."""
+    results = {}
+    for event in events(tournament, until):
+        if event['action'] == 'ADVANCE':
+            continue
+        sets = event_sets(event)
+        if sets:
+            results[event['matchup_key']] = sets
+        else:
+            results.pop(event['matchup_key'], None)
+    return results
+
+
+def standings_as_of(tournament, until=None):
+    """The standings as ``build_tournament_state`` reports them, as of ``until``.
+
+    Rebuilds inside a transaction and rolls it back, so the same standings
+    code answers for any moment.
+    """
+    from .state import build_tournament_state
+    with transaction.atomic():
+        rebuild(tournament, until)
+        standings = build_tournament_state(tournament)['standings']
+        transaction.set_rollback(True)
+    return standings
+
+
+@transaction.atomic
+def rebuild(tournament, until=None):
+    """Replace ``tournament``'s results with the replay of its log up to ``until``.
+
+    Returns the number of events applied.
+    """
+    impl = get_implementation(tournament.archetype) if tournament.archetype else None
+    multi_phase = bool(impl and getattr(impl, 'is_multi_phase', False))
+
+    MatchScore.objects.filter(matchup__tournament_chart=tournament).delete()
+    PlayerScore.objects.filter(tournament=tournament).delete()
+    PairScore.objects.filter(tournament=tournament).delete()
+    pool_decisions = {}
+    if multi_phase:
+        pool_decisions = _generated_pool_decisions(tournament, until)
+        impl.clear_generated_stages(tournament)
+
+    matchups = _matchups_by_key(tournament)
+    results, pending, relinked = {}, {}, []
+    written = set()  # keys whose scores are already in the database
+
+    def flush():
+        if not pending:
+            return
+        rewritten = [matchups[key].id for key in pending if key in written]
+        if rewritten:
+            MatchScore.objects.filter(matchup_id__in=rewritten).delete()
+        written.update(pending)
+        rows = []
+        for key, sets in pending.items():
+            for set_number, (team1, team2) in enumerate(sets, 1):
+                score = MatchScore(matchup=matchups[key], set_number=set_number,
+                                   team1_score=team1, team2_score=team2)
+                score.set_outcome()
+                rows.append(score)
+        MatchScore.objects.bulk_create(rows)
+        pending.clear()
+
+    def advance():
+        flush()
+        try:
+            stage = impl.advance_to_next_stage(tournament)
+        except ValueError:
+            return False
+        _restore_pool_decisions(stage, pool_decisions)
+        matchups.update(_matchups_by_key(tournament, stage=stage))
+        return True
+
+    applied = 0
+    for event in events(tournament, until):
+        applied += 1
+        if event['action'] == 'ADVANCE':
+            if multi_phase:
+                advance()
+            continue
+        key = event['matchup_key']
+        # Logs from before ADVANCE events were recorded only imply the phase change.
+        while multi_phase and key not in matchups and advance():
+            pass
+        matchup = matchups.get(key)
+        if matchup is None:
+            continue
+        sets = event_sets(event)
+        if sets:
+            results[key] = sets
+        else:
+            results.pop(key, None)
+        pending[key] = sets
+        if not event.get('archived'):
+            relinked.append(MatchResultLog(id=event['id'], matchup=matchup))
+        if multi_phase and matchup.stage and matchup.stage.stage_type == 'PLAYOFF':
+            flush()
+            for created in impl.maybe_generate_placement_matches(tournament, matchup):
+                created.stage, created.pool = matchup.stage, matchup.pool
+                matchups[MatchResultLog.key_for(created)] = created
+    flush()
+
+    MatchResultLog.objects.bulk_update(relinked, ['matchup'], batch_size=500)
+    _store_standings(tournament, impl, matchups, results)
+    tournament.bump_results_version(Matchup.objects.filter(tournament_chart=tournament))
+    return applied
+
+
+def _matchups_by_key(tournament, stage=None):
+    matchups = Matchup.objects.filter(tournament_chart=tournament).select_related(
+        'stage', 'pool', 'pair1', 'pair2')
+    if stage is not None:
+        matchups = matchups.filter(stage=stage)
+    return {MatchResultLog.key_for(m): m for m in matchups}
+
+
+def _generated_pool_decisions(tournament, until):
+    """Manual tiebreak decisions of generated pools, by (stage number, pool order)."""
+    decisions = ManualPoolTiebreakResolution.objects.filter(
+        pool__stage__tournament=tournament, pool__stage__stage_number__gte=2,
+    ).select_related('pool__stage')
+    if until is not None:
+        decisions = decisions.filter(resolved_at__lte=until)
+    by_pool = defaultdict(list)
+    for decision in decisions:
+        by_pool[decision.pool.stage.stage_number, decision.pool.order].append(decision)
+    return by_pool
+
+
+def _restore_pool_decisions(stage, decisions):
+    restored = []
+    for pool in stage.pools.all():
+        for decision in decisions.get((stage.stage_number, pool.order), []):
+            decision.pk, decision.pool = None, pool
+            restored.append(decision)
+    ManualPoolTiebreakResolution.objects.bulk_create(restored)
+
+
+def _store_standings(tournament, impl, matchups, results):
+    """PlayerScore and PairScore rows from the replayed results.
+
+    Follows the rules record_match_result applies one match at a time: each
+    set won counts as a win and a match for Monarch of the Court players;
+    pairs (and players of pairs formats) count matches, a pair winning the
+    match on sets; automatic wins go to the format's top seeds.
+    """
+    players = defaultdict(lambda: {'wins': 0, 'matches_played': 0, 'total_point_difference': 0})
+    pairs = defaultdict(lambda: {'wins': 0, 'matches_played': 0, 'total_point_difference': 0})
+    is_moc = any(m.pair1_player1_id or m.pair1_player2_id for m in matchups.values())
+
+    for key, sets in results.items():
+        matchup = matchups[key]
+        if matchup.pair1_id:
+            teams = ((matchup.pair1.player1_id, matchup.pair1.player2_id),
+                     (matchup.pair2.player1_id, matchup.pair2.player2_id))
+        else:
+            teams = ((matchup.pair1_player1_id, matchup.pair1_player2_id),
+                     (matchup.pair2_player1_id, matchup.pair2_player2_id))
+        outcomes = []
+        for team1, team2 in sets:
+            score = MatchScore(team1_score=team1, team2_score=team2)
+            score.set_outcome()
+            outcomes.append((score.winning_team, score.point_difference))
+
+        for side, team in enumerate(teams, 1):
+            for player_id in filter(None, team):
+                entry = players[player_id]
+                entry['matches_played'] += len(sets) if is_moc else 1
+                for winner, difference in outcomes:
+                    entry['wins'] += winner == side
+                    entry['total_point_difference'] += difference if winner == side else -difference
+
+        if matchup.pair1_id:
+            for side, pair_id in enumerate((matchup.pair1_id, matchup.pair2_id), 1):
+                won = sum(1 for winner, _ in outcomes if winner == side)
+                entry = pairs[pair_id]
+                entry['matches_played'] += 1
+                entry['wins'] += won > len(outcomes) - won
+                entry['total_point_difference'] += sum(
+                    difference if winner == side else -difference for winner, difference in outcomes)
+
+    automatic_wins = {}
+    if impl and hasattr(impl, 'get_automatic_wins'):
+        roster = sorted(tournament.players.all(), key=lambda p: p.ranking if p.ranking is not None else 9999)
+        per_seed = impl.get_automatic_wins(len(roster))
+        automatic_wins = {player.id: per_seed.get(seed, 0) * tournament.default_sets_per_match
+                          for seed, player in enumerate(roster)}
+
+    player_rows = []
+    for player_id, entry in players.items():
+        bonus = automatic_wins.get(player_id, 0)
+        player_rows.append(PlayerScore(tournament=tournament, player_id=player_id, automatic_wins=bonus,
+                                       **{**entry, 'wins': entry['wins'] + bonus}))
+    PlayerScore.objects.bulk_create(player_rows)
+    PairScore.objects.bulk_create(
+        PairScore(tournament=tournament, pair_id=pair_id, **entry) for pair_id, entry in pairs.items())
@@ -0,0 +1,434 @@
+"""
+Continuous replication of the SQLite database by shipping its write-ahead log.
+
+``manage.py replicate`` (run by scripts/ddc-replicate.service) replaces the
+minutely whole-file snapshots of scripts/backup_db.sh. It keeps a replica
+directory, normally inside the Syncthing folder:
+
+    generations/<generation>/snapshot.sqlite3.gz
+    generations/<generation>/segments/<index>-<UTC time>.seg.gz
+    generations/<generation>/position.json
+
+A generation starts with a full snapshot. From then on, every poll (one per
+second by default) reads only the WAL frames committed since the previous
+poll and writes them as one compact segment holding the last image of each
+changed page. The backup is seconds behind and its I/O follows the write
+volume, not the database size. ``manage.py restore_replica`` rebuilds a
+database from the snapshot plus the segments up to any point in time.
+
+How the WAL is kept from being lost under us:
+
+- Every poll runs under a brief write lock (BEGIN IMMEDIATE), so all frames
+  it reads are complete and none are added while it reads.
+- Between polls the replicator holds a read transaction on the shipped end
+  of the WAL. While it does, SQLite can't checkpoint past that point, so it
+  can't restart the WAL and overwrite frames that haven't been shipped yet.
+- The replicator checkpoints the WAL itself once it holds
+  ``checkpoint_pages`` frames. It does this under the same write lock, right
+  after shipping everything, and then writes one row to ``_ddc_replication``
+  so that a WAL restart happens at a point it knows about.
+
+If the WAL was restarted while the replicator wasn't looking, the salts in
+the WAL header no longer match. This happens when the replicator was stopped
+and a checkpoint ran in the meantime. The continuity is then lost, and it
+starts a new generation with a fresh snapshot. A new generation also starts
+every ``snapshot_interval`` seconds, which bounds restore time, and old ones
+are pruned.
+"""
+import datetime
+import gzip
+import json
+import os
+import shutil
+import sqlite3
+import struct
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+
+WAL_HEADER = struct.Struct('>8I')  # magic, version, page size, checkpoint seq, salt-1, salt-2, checksum-1, checksum-2
+FRAME_HEADER = struct.Struct('>6I')  # page number, db size after commit (0 = not a commit), salt-1, salt-2, checksum-1, checksum-2
+WAL_MAGIC_LE, WAL_MAGIC_BE = 0x377f0682, 0x377f0683
+SEGMENT_MAGIC = b'DDCSEG1\n'
+SEGMENT_HEADER = struct.Struct('>III')  # page size, db size in pages, number of pages
+SEQ_TABLE = '_ddc_replication'
+STAMP_FORMAT = '%Y%m%dT%H%M%S'
+
+
+class ReplicationError(Exception):
+    pass
+
+
+def wal_checksum(data, s0, s1, big_endian):
+    """SQLite's cumulative WAL checksum over ``data`` (a multiple of 8 bytes)."""
+    words = struct.unpack(f"{'>' if big_endian else '<'}{len(data) // 4}I", data)
+    for i in range(0, len(words), 2):
+        s0 = (s0 + words[i] + s1) & 0xFFFFFFFF
+        s1 = (s1 + words[i + 1] + s0) & 0xFFFFFFFF
+    return s0, s1
+
+
+@dataclass(frozen=True)
+class WalPosition:
+    """Where shipping stopped in a WAL: just after the last shipped commit frame."""
+    salt1: int
+    salt2: int
+    page_size: int
+    big_endian: bool
+    offset: int
+    s0: int
+    s1: int
+
+    @property
+    def frames(self):
+        return (self.offset - WAL_HEADER.size) // (FRAME_HEADER.size + self.page_size)
+
+    def same_wal(self, other):
+        return other is not None and (self.salt1, self.salt2) == (other.salt1, other.salt2)
+
+
+def read_wal_start(wal_path):
+    """The position of the WAL's first frame, or None if it has no valid header."""
+    try:
+        with open(wal_path, 'rb') as f:
+            raw = f.read(WAL_HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(raw) < WAL_HEADER.size:
+        return None
+    magic, _, page_size, _, salt1, salt2, c0, c1 = WAL_HEADER.unpack(raw)
+    if magic not in (WAL_MAGIC_LE, WAL_MAGIC_BE):
+        return None
+    big_endian = magic == WAL_MAGIC_BE
+    if wal_checksum(raw[:24], 0, 0, big_endian) != (c0, c1):
+        return None
+    return WalPosition(salt1, salt2, page_size, big_endian, WAL_HEADER.size, c0, c1)
+
+
+def read_committed_frames(wal_path, position):
+    """Read the frames committed after ``position``.
+
+    Returns ``(pages, db_size, end)``: the last image of every page changed by
+    those transactions (``{page number: bytes}``), the database size in pages
+    after the last of them (None if there were none) and the position after
+    it. Frames of an unfinished transaction, stale frames from an earlier pass
+    over the file and torn writes all fail the salt, checksum or commit tests
+    and are left alone.
+    """
+    frame_size = FRAME_HEADER.size + position.page_size
+    pages, pending = {}, {}
+    db_size = None
+    end = position
+    offset, s0, s1 = position.offset, position.s0, position.s1
+    with open(wal_path, 'rb') as f:
+        f.seek(offset)
+        while True:
+            frame = f.read(frame_size)
+            if len(frame) < frame_size:
+                break
+            pgno, commit_size, salt1, salt2, c0, c1 = FRAME_HEADER.unpack_from(frame)
+            if (salt1, salt2) != (position.salt1, position.salt2):
+                break
+            s0, s1 = wal_checksum(frame[:8], s0, s1, position.big_endian)
+            s0, s1 = wal_checksum(frame[FRAME_HEADER.size:], s0, s1, position.big_endian)
+            if (s0, s1) != (c0, c1):
+                break
+            offset += frame_size
+            pending[pgno] = frame[FRAME_HEADER.size:]
+            if commit_size:
+                pages.update(pending)
+                pending.clear()
+                db_size = commit_size
+                end = replace(position, offset=offset, s0=s0, s1=s1)
+    if db_size is not None:
+        pages = {pgno: data for pgno, data in pages.items() if pgno <= db_size}
+    return pages, db_size, end
+
+
+def format_stamp(timestamp):
+    moment = datetime.datetime.fromtimestamp(timestamp, datetime.timezone.utc)
+    return f'{moment.strftime(STAMP_FORMAT)}.{moment.microsecond // 1000:03d}Z'
+
+
+def parse_stamp(stamp):
+    moment = datetime.datetime.strptime(stamp.rstrip('Z'), f'{STAMP_FORMAT}.%f')
+    return moment.replace(tzinfo=datetime.timezone.utc).timestamp()
+
+
+def _write_atomically(path, write):
+    """Write ``path`` through a temporary file, fsync it and move it in place."""
+    tmp = path.with_name(f'.{path.name}.tmp')
+    with open(tmp, 'wb') as raw:
+        write(raw)
+        raw.flush()
+        os.fsync(raw.fileno())
+    os.replace(tmp, path)
+
+
+def write_segment(path, page_size, db_size, pages):
+    def write(raw):
+        with gzip.GzipFile(fileobj=raw, mode='wb') as f:
+            f.write(SEGMENT_MAGIC)
+            f.write(SEGMENT_HEADER.pack(page_size, db_size, len(pages)))
+            for pgno in sorted(pages):
+                f.write(struct.pack('>I', pgno))
+                f.write(pages[pgno])
+    _write_atomically(path, write)
+
+
+def read_segment(path):
+    """``(page_size, db_size, {page number: bytes})`` from a segment file."""
+    with gzip.open(path, 'rb') as f:
+        if f.read(len(SEGMENT_MAGIC)) != SEGMENT_MAGIC:
+            raise ReplicationError(f'{path} is not a replication segment')
+        page_size, db_size, count = SEGMENT_HEADER.unpack(f.read(SEGMENT_HEADER.size))
+        pages = {}
+        for _ in range(count):
+            (pgno,) = struct.unpack('>I', f.read(4))
+            pages[pgno] = f.read(page_size)
+    return page_size, db_size, pages
+
+
+class Replicator:
+    """Ships a WAL-mode database's committed frames to a replica directory.
+
+    Call ``open()``, then ``poll()`` repeatedly, then ``close()``.
+    """
+
+    def __init__(self, db_path, replica_dir, checkpoint_pages=1000, snapshot_interval=24 * 3600,
+                 retain_generations=2, busy_timeout=10.0, clock=time.time):
+        self.db_path = Path(db_path)
+        self.wal_path = Path(f'{db_path}-wal')
+        self.generations_dir = Path(replica_dir) / 'generations'
+        self.checkpoint_pages = checkpoint_pages
+        self.snapshot_interval = snapshot_interval
+        self.retain_generations = retain_generations
+        self.busy_timeout = busy_timeout
+        self.clock = clock
+        self.generation = None
+        self.generation_started = None
+        self.position = None
+        self.segment_index = 0
+        self._lock = self._pin = None
+
+    # Connections: _lock takes the brief write lock of each poll, _pin holds
+    # the read transaction between polls (and runs snapshots and checkpoints).
+    def open(self):
+        self._lock = sqlite3.connect(self.db_path, timeout=self.busy_timeout, isolation_level=None)
+        self._pin = sqlite3.connect(self.db_path, timeout=self.busy_timeout, isolation_level=None)
+        mode = self._lock.execute('PRAGMA journal_mode').fetchone()[0]
+        if mode.lower() != 'wal':
+            self.close()
+            raise ReplicationError(f'{self.db_path} is in {mode} mode; replication needs WAL')
+        self._lock.execute(f'CREATE TABLE IF NOT EXISTS {SEQ_TABLE} (id INTEGER PRIMARY KEY, seq INTEGER NOT NULL)')
+        self._resume()
+
+    def close(self):
+        for connection in (self._pin, self._lock):
+            if connection is not None:
+                connection.close()
+        self._lock = self._pin = None
+
+    def _hold_read(self):
+        self._release_read()
+        self._pin.execute('BEGIN')
+        self._pin.execute(f'SELECT COUNT(*) FROM {SEQ_TABLE}').fetchone()
+
+    def _release_read(self):
+        if self._pin.in_transaction:
+            self._pin.execute('COMMIT')
+
+    def poll(self):
+        """Ship what was committed since the last poll; returns the number of pages shipped."""
+        now = self.clock()
+        shipped = 0
+        with self._write_lock():
+            start = read_wal_start(self.wal_path)
+            if (self.generation is None or now - self.generation_started >= self.snapshot_interval
+                    or self._lost_track(start)):
+                self._start_generation(now, start)
+            else:
+                if self.position is None and start is not None:
+                    self.position = start  # first write since an empty WAL
+                if self.position is not None:
+                    pages, db_size, end = read_committed_frames(self.wal_path, self.position)
+                    if pages:
+                        self._write_segment(now, db_size, pages)
+                        shipped = len(pages)
+                    self._save_position(end)
+            checkpointed = (self.position is not None and self.position.frames >= self.checkpoint_pages
+                            and self._checkpoint())
+        if checkpointed:
+            # Everything is shipped and copied back, so the WAL may now start
+            # over. SQLite only restarts it in a write transaction begun after
+            # the checkpoint: make one, so the restart happens where we see it.
+            with self._write_lock():
+                if self.position.same_wal(read_wal_start(self.wal_path)):
+                    self._lock.execute(f'INSERT INTO {SEQ_TABLE} (id, seq) VALUES (1, 1) '
+                                       f'ON CONFLICT (id) DO UPDATE SET seq = seq + 1')
+            start = read_wal_start(self.wal_path)
+            if start is not None and not self.position.same_wal(start):
+                self._save_position(start)
+        self._hold_read()
+        return shipped
+
+    @contextmanager
+    def _write_lock(self):
+        self._lock.execute('BEGIN IMMEDIATE')
+        try:
+            yield
+        except BaseException:
+            self._lock.execute('ROLLBACK')
+            raise
+        self._lock.execute('COMMIT')
+
+    def _checkpoint(self):
+        """Copy the shipped WAL back into the database; True if all of it was copied."""
+        self._release_read()
+        busy, log_frames, checkpointed = self._pin.execute('PRAGMA wal_checkpoint(PASSIVE)').fetchone()
+        return log_frames == checkpointed
+
+    def _lost_track(self, start):
+        """True if the WAL was restarted (or removed) behind our back."""
+        if self.position is None:
+            return False
+        return not self.position.same_wal(start)
+
+    def _generation_dir(self, generation=None):
+        return self.generations_dir / (generation or self.generation)
+
+    def _start_generation(self, now, start):
+        """Snapshot the database (under the poll's write lock) and ship from there."""
+        generation = f'{format_stamp(now)}-{uuid.uuid4().hex[:6]}'
+        directory = self._generation_dir(generation)
+        (directory / 'segments').mkdir(parents=True)
+        snapshot_tmp = directory / '.snapshot.sqlite3.tmp'
+        self._release_read()
+        target = sqlite3.connect(snapshot_tmp)
+        try:
+            self._pin.backup(target)
+        finally:
+            target.close()
+
+        def write(raw):
+            with open(snapshot_tmp, 'rb') as source, gzip.GzipFile(fileobj=raw, mode='wb') as f:
+                shutil.copyfileobj(source, f)
+        _write_atomically(directory / 'snapshot.sqlite3.gz', write)
+        snapshot_tmp.unlink()
+
+        self.generation = generation
+        self.generation_started = now
+        self.segment_index = 0
+        # The snapshot already holds every committed frame.
+        self._save_position(read_committed_frames(self.wal_path, start)[2] if start else None)
+        self._prune_generations()
+
+    def _write_segment(self, now, db_size, pages):
+        self.segment_index += 1
+        path = self._generation_dir() / 'segments' / f'{self.segment_index:08d}-{format_stamp(now)}.seg.gz'
+        write_segment(path, self.position.page_size, db_size, pages)
+
+    def _save_position(self, position):
+        if position == self.position and (self._generation_dir() / 'position.json').exists():
+            return
+        self.position = position
+        state = {'position': asdict(position) if position else None, 'segment_index': self.segment_index,
+                 'started': self.generation_started}
+        _write_atomically(self._generation_dir() / 'position.json', lambda raw: raw.write(json.dumps(state).encode()))
+
+    def _resume(self):
+        """Carry on with the newest generation if the WAL is still the one it was shipping."""
+        generations = list_generations(self.generations_dir.parent)
+        if not generations:
+            return
+        generation = generations[-1]
+        try:
+            state = json.loads((self._generation_dir(generation) / 'position.json').read_text())
+        except (FileNotFoundError, ValueError):
+            return
+        position = WalPosition(**state['position']) if state['position'] else None
+        start = read_wal_start(self.wal_path)
+        if position is None or not position.same_wal(start):
+            return
+        self.generation = generation
+        self.generation_started = state['started']
+        self.segment_index = state['segment_index']
+        self.position = position
+
+    def _prune_generations(self):
+        for generation in list_generations(self.generations_dir.parent)[:-self.retain_generations]:
+            shutil.rmtree(self._generation_dir(generation))
+
+
+def list_generations(replica_dir):
+    """Generation names, oldest first (they start with their UTC start time)."""
+    directory = Path(replica_dir) / 'generations'
+    if not directory.is_dir():
+        return []
+    return sorted(path.name for path in directory.iterdir()
+                  if path.is_dir() and (path / 'snapshot.sqlite3.gz').exists())
+
+
+def list_segments(replica_dir, generation):
+    """``[(timestamp, path), ...]`` of a generation's segments, in shipping order."""
+    segments = []
+    for path in sorted((Path(replica_dir) / 'generations' / generation / 'segments').glob('*.seg.gz')):
+        segments.append((parse_stamp(path.name[:-len('.seg.gz')].split('-', 1)[1]), path))
+    return segments
+
+
+def generation_start(generation):
+    return parse_stamp(generation.rsplit('-', 1)[0])
+
+
+@dataclass
+class RestoreResult:
+    generation: str
+    segments: int
+    restored_to: float
+    integrity: str
+
+
+def restore(replica_dir, output, at=None):
+    """Rebuild the database as of ``at`` (a POSIX timestamp; default: latest) into ``output``.
+
+    Uses the newest generation started at or before ``at`` and applies its
+    segments up to ``at``. ``output`` must not exist.
+    """
+    output = Path(output)
+    if output.exists():
+        raise ReplicationError(f'{output} already exists')
+    generations = [g for g in list_generations(replica_dir) if at is None or generation_start(g) <= at]
+    if not generations:
+        raise ReplicationError('No snapshot in the replica is old enough' if at else 'The replica is empty')
+    generation = generations[-1]
+    restored_to = generation_start(generation)
+
+    tmp = output.with_name(f'.{output.name}.restoring')
+    with gzip.open(Path(replica_dir) / 'generations' / generation / 'snapshot.sqlite3.gz', 'rb') as source, \
+            open(tmp, 'wb') as target:
+        shutil.copyfileobj(source, target)
+    applied = 0
+    with open(tmp, 'r+b') as db:
+        for timestamp, path in list_segments(replica_dir, generation):
+            if at is not None and timestamp > at:
+                break
+            page_size, db_size, pages = read_segment(path)
+            for pgno, data in pages.items():
+                db.seek((pgno - 1) * page_size)
+                db.write(data)
+            db.truncate(db_size * page_size)
+            applied += 1
+            restored_to = timestamp
+        db.flush()
+        os.fsync(db.fileno())
+    os.replace(tmp, output)
+
+    connection = sqlite3.connect(output)
+    try:
+        integrity = connection.execute('PRAGMA integrity_check').fetchone()[0]
+    finally:
+        connection.close()
+    return RestoreResult(generation, applied, restored_to, integrity)
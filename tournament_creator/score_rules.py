@@ -0,0 +1,97 @@
+"""
+Expected match formats (points to, cap, sets) and the checks run against them.
+
+Recording a result warns about scores that don't fit the format; the detail
+page and the state API describe the format next to unplayed matches.
+"""
+from .models.tournament_types import get_implementation
+
+# Practice (sandbox) tournaments rehearse the Euros pool-phase game format so
+# players meet the score-check dialog before the real event; the set count is
+# left free so people can play around with multi-set entries.
+SANDBOX_SCORE_RULES = {'points_to': 21, 'cap': 23, 'best_of': None}
+
+
+def score_rule_warnings(rules, team1_scores, team2_scores):
+    """Human-readable warnings for scores that don't fit the expected match format.
+
+    ``rules`` is the dict from TournamentArchetype.get_score_rules(): games are
+    played to ``points_to`` win-by-2, ``cap`` ends a game early, ``best_of`` is
+    the sets per match (None: any number of sets, validate each set only).
+    Returns [] when everything conforms.
+    """
+    points_to, cap, best_of = rules['points_to'], rules['cap'], rules['best_of']
+    warnings = []
+    multiple_sets = len(team1_scores) > 1
+    for set_num, (s1, s2) in enumerate(zip(team1_scores, team2_scores), 1):
+        prefix = f"Set {set_num}: " if multiple_sets else ""
+        hi, lo = max(s1, s2), min(s1, s2)
+        if s1 == s2:
+            warnings.append(f"{prefix}{s1}–{s2} is a tie — every game needs a winner.")
+        elif hi > cap:
+            warnings.append(f"{prefix}{hi} points is over the point cap of {cap}.")
+        elif hi < points_to:
+            warnings.append(f"{prefix}the game is played to {points_to}, but the winner has only {hi} points.")
+        elif hi == points_to:
+            if hi - lo < 2:
+                warnings.append(
+                    f"{prefix}the winner must lead by 2 points — at {hi}–{lo} "
+                    f"the game continues up to the cap of {cap}.")
+        elif hi - lo != 2 and not (hi == cap and hi - lo < 2):
+            # Past points_to a game only continues at deuce, so the final margin is
+            # exactly 2 — except a cap game, which can also end with a 1-point lead.
+            warnings.append(
+                f"{prefix}{hi}–{lo} isn't reachable playing to {points_to} "
+                f"win-by-2 (cap {cap}).")
+    if best_of == 1:
+        if multiple_sets:
+            warnings.append(f"This match is a single game, but {len(team1_scores)} sets were entered.")
+    elif best_of:
+        sets_needed = best_of // 2 + 1
+        wins1 = wins2 = 0
+        decided_after = None
+        for set_num, (s1, s2) in enumerate(zip(team1_scores, team2_scores), 1):
+            wins1 += 1 if s1 > s2 else 0
+            wins2 += 1 if s2 > s1 else 0
+            if decided_after is None and max(wins1, wins2) >= sets_needed:
+                decided_after = set_num
+        if decided_after is None:
+            warnings.append(
+                f"Best-of-{best_of} match: the winner needs {sets_needed} set wins, "
+                f"but these sets don't give either team {sets_needed}.")
+        elif decided_after < len(team1_scores):
+            warnings.append(
+                f"The match was already decided after set {decided_after} — "
+                f"the remaining sets shouldn't have been played.")
+    return warnings
+
+
+def score_rules_text(rules):
+    """One-line human description of a match format, e.g. "Best of 3 to 15, cap 18"."""
+    if not rules:
+        return None
+    if rules['best_of'] == 1:
+        prefix = "One game"
+    elif rules['best_of']:
+        prefix = f"Best of {rules['best_of']}"
+    else:
+        prefix = "Games"
+    return f"{prefix} to {rules['points_to']}, win by 2, cap {rules['cap']}"
+
+
+def expected_score_rules(tournament, matchup, impl=None):
+    """The score rules to validate ``matchup`` against, or None (no validation).
+
+    Pass ``impl`` (the archetype implementation) when checking many matchups
+    of the same tournament, to skip looking it up for each one.
+    """
+    if tournament.archetype:
+        if impl is None:
+            impl = get_implementation(tournament.archetype)
+        if impl:
+            rules = impl.get_score_rules(matchup)
+            if rules:
+                return rules
+    if tournament.is_sandbox:
+        return SANDBOX_SCORE_RULES
+    return None
@@ -0,0 +1,146 @@
+"""
+Compact, JSON-serializable snapshots of a tournament's state.
+
+Scorekeepers on phones only need the schedule, the scores and the standings —
+not the full HTML detail page. ``build_tournament_state`` returns exactly that:
+matchups reference players and pairs by id, and the id → name tables are sent
+once, in the full snapshot.
+
+Every change to a tournament's results bumps ``TournamentChart.results_version``
+and stamps the matchups it touched with the new version. A client that already
+holds version N can ask for a delta (``since=N``): only matchups changed after
+N, plus the list of current matchup ids so it can drop deleted ones (practice
+resets tear down generated phases). Standings are small and always sent whole.
+"""
+from .models.base_models import Matchup, Stage, Pool
+from .models.scoring import PairScore, PlayerScore
+from .models.tournament_types import get_implementation
+from .score_rules import expected_score_rules, score_rules_text
+from .tiebreaks import apply_tiebreaks
+
+
+def build_tournament_state(tournament, since=None):
+    """Snapshot of ``tournament``: full, or a delta against version ``since``.
+
+    A ``since`` that is newer than the current version (e.g. after a database
+    restore) can't be served as a delta, so a full snapshot is returned.
+    """
+    full = since is None or since > tournament.results_version
+    impl = get_implementation(tournament.archetype) if tournament.archetype else None
+    is_pairs = bool(tournament.archetype and tournament.archetype.tournament_category == 'PAIRS')
+    is_multi_phase = bool(impl and getattr(impl, 'is_multi_phase', False))
+
+    matchups = Matchup.objects.filter(tournament_chart=tournament).select_related(
+        'stage', 'pool', 'pair1', 'pair2',
+    ).prefetch_related('scores').order_by('stage__stage_number', 'round_number', 'court_number')
+    if not full:
+        matchups = matchups.filter(results_version__gt=since)
+
+    state = {
+        'id': tournament.id,
+        'name': tournament.name,
+        'version': tournament.results_version,
+        'full': full,
+        'format': 'PAIRS' if is_pairs else 'MOC',
+        'multi_phase': is_multi_phase,
+        'stages': [
+            {'id': stage.id, 'number': stage.stage_number, 'name': stage.name, 'type': stage.stage_type}
+            for stage in Stage.objects.filter(tournament=tournament).order_by('stage_number')
+        ],
+        'pools': [
+            {'id': pool.id, 'stage': pool.stage_id, 'name': pool.name}
+            for pool in Pool.objects.filter(stage__tournament=tournament).order_by('stage__stage_number', 'order')
+        ],
+        'matchups': [_matchup_state(tournament, m, impl) for m in matchups],
+        'standings': _standings_state(tournament, impl, is_pairs, is_multi_phase),
+    }
+    if full:
+        state['names'] = _names_state(tournament, is_pairs)
+    else:
+        state['since'] = since
+        state['matchup_ids'] = list(
+            Matchup.objects.filter(tournament_chart=tournament).values_list('id', flat=True)
+        )
+    return state
+
+
+def _matchup_state(tournament, matchup, impl):
+    entry = {
+        'id': matchup.id,
+        'stage': matchup.stage_id,
+        'pool': matchup.pool_id,
+        'round': matchup.round_number,
+        'court': matchup.court_number,
+        'scores': [[s.team1_score, s.team2_score] for s in matchup.scores.all()],
+        'rules': score_rules_text(expected_score_rules(tournament, matchup, impl)),
+        'v': matchup.results_version,
+    }
+    if matchup.pair1_id:
+        entry['pair1'] = matchup.pair1_id
+        entry['pair2'] = matchup.pair2_id
+        entry['team1'] = [matchup.pair1.player1_id, matchup.pair1.player2_id]
+        entry['team2'] = [matchup.pair2.player1_id, matchup.pair2.player2_id]
+    else:
+        entry['team1'] = [pid for pid in (matchup.pair1_player1_id, matchup.pair1_player2_id) if pid]
+        entry['team2'] = [pid for pid in (matchup.pair2_player1_id, matchup.pair2_player2_id) if pid]
+    if matchup.label:
+        entry['label'] = matchup.label
+    if matchup.match_date:
+        entry['date'] = matchup.match_date.isoformat()
+    if matchup.match_time:
+        entry['time'] = matchup.match_time.strftime('%H:%M')
+    return entry
+
+
+def _names_state(tournament, is_pairs):
+    """id → display name for every player, and id → [player ids, seed] for pairs."""
+    if is_pairs:
+        pairs = list(tournament.pairs.select_related('player1', 'player2'))
+        players = [p for pair in pairs for p in (pair.player1, pair.player2)]
+    else:
+        pairs = []
+        players = list(tournament.players.all())
+    use_last_names = tournament.name_display_format == 'LAST'
+    return {
+        'players': {
+            player.id: (player.get_display_name_last_name_mode(players) if use_last_names
+                        else player.get_display_name(players))
+            for player in players
+        },
+        'pairs': {
+            pair.id: {'players': [pair.player1_id, pair.player2_id], 'seed': pair.seed}
+            for pair in pairs
+        },
+    }
+
+
+def _standings_state(tournament, impl, is_pairs, is_multi_phase):
+    if is_multi_phase:
+        phase_state = impl.get_phase_state(tournament)
+        pools = {}
+        for stage in phase_state.stages:
+            for pool in phase_state.pools(stage):
+                pools[pool.id] = [
+                    {'pair': e['pair'].id, 'position': e['position'], 'wins': e['wins'],
+                     'played': e['matches_played'], 'pd': e['point_difference']}
+                    for e in phase_state.standings(pool)
+                ]
+        final = phase_state.final_standings
+        return {
+            'pools': pools,
+            'final': [{'position': e['position'], 'pair': e['pair'].id} for e in final] if final else None,
+        }
+    if is_pairs:
+        scores = PairScore.objects.filter(tournament=tournament)  # ordered by wins, then PD
+        return [
+            {'pair': s.pair_id, 'position': idx, 'wins': s.wins,
+             'played': s.matches_played, 'pd': s.total_point_difference}
+            for idx, s in enumerate(scores, start=1)
+        ]
+    scores = apply_tiebreaks(
+        tournament, list(PlayerScore.objects.filter(tournament=tournament).select_related('player')))
+    return [
+        {'player': s.player_id, 'position': idx, 'wins': s.wins,
+         'played': s.matches_played, 'pd': s.total_point_difference}
+        for idx, s in enumerate(scores, start=1)
+    ]
@@ -0,0 +1,148 @@
+"""
+Read-only static copy of the public tournament pages.
+
+``build_site`` renders, under settings.STATIC_SITE_DIR:
+
+- ``index.html``: the tournament list.
+- ``t/<id>/index.html``: a tournament's standings, pool tables and every
+  match with its scores.
+- ``t/<id>/state.json``: the same data as the state API
+  (``build_tournament_state``), for scripts and phone clients.
+- ``manifest.json``: the ``results_version`` and ``modified_at`` each page
+  was rendered from.
+
+A tournament is re-rendered only when those two no longer match the
+manifest, so keeping the copy current costs one query per pass while nothing
+changes. Links are relative, and the pages need nothing from Django. Any
+file server can serve the folder, and a phone can open it straight from a
+synced folder. During failover, spectators read these pages and only
+scorekeepers use the laptop's Django server (RESTORE.md). Finished
+tournaments can be published the same way.
+
+Files are written to a temporary name and renamed into place, so a reader
+never sees a half-written page.
+"""
+import json
+import os
+import shutil
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .models.base_models import TournamentChart
+from .state import build_tournament_state
+
+MANIFEST = 'manifest.json'
+
+
+@dataclass
+class BuildResult:
+    written: list = field(default_factory=list)  # tournament ids rendered
+    removed: list = field(default_factory=list)  # tournament ids whose pages were deleted
+    unchanged: int = 0
+
+
+def site_dir():
+    return Path(settings.STATIC_SITE_DIR)
+
+
+def published_tournaments():
+    """What the static site lists: the public tournament list, without sandboxes."""
+    return TournamentChart.objects.filter(archived=False, is_sandbox=False)
+
+
+def build_site(directory=None, force=False):
+    """Bring the static copy in ``directory`` (default settings.STATIC_SITE_DIR) up to date."""
+    directory = Path(directory or site_dir())
+    manifest = _read_manifest(directory)
+    pages = manifest.get('tournaments', {})
+    result = BuildResult()
+
+    current = {str(pk): f'{version}-{modified_at.isoformat()}' for pk, version, modified_at in
+               published_tournaments().values_list('pk', 'results_version', 'modified_at')}
+    for pk, stamp in current.items():
+        if not force and pages.get(pk) == stamp:
+            result.unchanged += 1
+            continue
+        tournament = TournamentChart.objects.select_related('archetype').get(pk=pk)
+        render_tournament(tournament, directory)
+        pages[pk] = stamp
+        result.written.append(int(pk))
+    for pk in set(pages) - set(current):
+        shutil.rmtree(directory / 't' / pk, ignore_errors=True)
+        del pages[pk]
+        result.removed.append(int(pk))
+
+    if result.written or result.removed or not (directory / 'index.html').exists():
+        tournaments = published_tournaments().select_related('archetype').order_by('-date', 'name')
+        _write(directory / 'index.html', render_to_string('tournament_creator/static_site/index.html', {
+            'tournaments': tournaments, 'generated_at': timezone.now(),
+        }))
+        _write(directory / MANIFEST, json.dumps({'generated_at': timezone.now().isoformat(), 'tournaments': pages},
+                                                indent=1, sort_keys=True))
+    return result
+
+
+def render_tournament(tournament, directory=None):
+    """Write ``t/<id>/index.html`` and ``state.json`` for ``tournament``."""
+    directory = Path(directory or site_dir()) / 't' / str(tournament.pk)
+    state = build_tournament_state(tournament)
+    _write(directory / 'state.json', json.dumps(state, separators=(',', ':')))
+    _write(directory / 'index.html', render_to_string('tournament_creator/static_site/tournament.html', {
+        'tournament': tournament, 'generated_at': timezone.now(), **page_context(state),
+    }))
+
+
+def page_context(state):
+    """Names instead of ids: the standings tables and match list of a state snapshot."""
+    players = state['names']['players']
+    pairs = state['names']['pairs']
+    stages = {stage['id']: stage['name'] for stage in state['stages']}
+    pools = {pool['id']: pool['name'] for pool in state['pools']}
+
+    def team(ids):
+        return ' & '.join(players.get(pid, '?') for pid in ids)
+
+    def rows(entries):
+        return [{**entry, 'name': team(pairs[entry['pair']]['players']) if 'pair' in entry
+                 else players.get(entry['player'], '?')} for entry in entries]
+
+    sections = []
+    for matchup in state['matchups']:
+        title = ' – '.join(filter(None, (stages.get(matchup['stage']), pools.get(matchup['pool']))))
+        if not sections or sections[-1]['title'] != title:
+            sections.append({'title': title, 'matches': []})
+        scores = matchup['scores']
+        won = sum(1 for t1, t2 in scores if t1 > t2)
+        sections[-1]['matches'].append({
+            **matchup, 'team1_name': team(matchup['team1']), 'team2_name': team(matchup['team2']),
+            'score_text': ', '.join(f'{t1}–{t2}' for t1, t2 in scores),
+            'winner': (1 if won * 2 > len(scores) else 2 if won * 2 < len(scores) else None) if scores else None,
+        })
+
+    standings = state['standings']
+    if state['multi_phase']:
+        return {
+            'final': rows(standings['final']) if standings['final'] else None,
+            'pool_tables': [{'name': pools.get(int(pool_id), ''), 'rows': rows(entries)}
+                            for pool_id, entries in standings['pools'].items()],
+            'sections': sections,
+        }
+    return {'standings': rows(standings), 'sections': sections}
+
+
+def _read_manifest(directory):
+    try:
+        return json.loads((directory / MANIFEST).read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write(path, text):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + '.tmp')
+    tmp.write_text(text, encoding='utf-8')
+    os.replace(tmp, path)
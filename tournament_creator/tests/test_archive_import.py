@@ -0,0 +1,110 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ..archive_import import ArchiveImportError, import_archive
+from ..export import archive_chunks
+from ..models import (ManualPoolTiebreakResolution, Matchup, MatchResultLog, Player, TournamentArchetype,
+                      TournamentChart)
+from ..replay import rebuild
+from .test_replay import EurosReplayTestBase
+
+
+def results(tournament):
+    """``{matchup key: (team1 players, team2 players, sets)}``, comparable across tournaments."""
+    return {
+        MatchResultLog.key_for(m): ((m.pair1.player1_id, m.pair1.player2_id), (m.pair2.player1_id, m.pair2.player2_id),
+                                    [(s.team1_score, s.team2_score) for s in m.scores.all()])
+        for m in Matchup.objects.filter(tournament_chart=tournament)
+        .select_related('stage', 'pool', 'pair1', 'pair2').prefetch_related('scores')
+    }
+
+
+class ArchiveImportTest(EurosReplayTestBase):
+    """A played-through 20-pair Euros, with its history, exported and imported again."""
+
+    def setUp(self):
+        super().setUp()
+        self.play_through_finals()
+        pool = self.stages[2].pools.first()
+        ManualPoolTiebreakResolution.objects.create(
+            pool=pool, wins_tied_at=1, resolved_order=list(pool.pairs.values_list('id', flat=True)), reason='coin')
+        self.path = Path(tempfile.mkdtemp()) / 'euros.jsonl.gz'
+        self.addCleanup(self.path.unlink, missing_ok=True)
+        with open(self.path, 'wb') as f:
+            for chunk in archive_chunks(self.tournament):
+                f.write(chunk)
+
+    def final_players(self, tournament):
+        return [(e['pair'].player1_id, e['pair'].player2_id) for e in self.impl.get_final_standings(tournament)]
+
+    def test_round_trip_with_remapped_ids_in_bulk(self):
+        with CaptureQueriesContext(connection) as queries:
+            result = import_archive(self.path, name='Euros Copy')
+        # One statement per table, however many matches and events.
+        self.assertLess(len(queries), 25)
+
+        copy = result.tournament
+        self.assertNotEqual(copy.pk, self.tournament.pk)
+        self.assertEqual((result.players_matched, result.players_created), (40, 0))
+        self.assertEqual(results(copy), results(self.tournament))
+        self.assertEqual(self.final_players(copy), self.final_players(self.tournament))
+        self.assertEqual(list(MatchResultLog.objects.filter(tournament=copy).order_by('id')
+                              .values_list('action', 'matchup_key', 'recorded_at')),
+                         list(MatchResultLog.objects.filter(tournament=self.tournament).order_by('id')
+                              .values_list('action', 'matchup_key', 'recorded_at')))
+        decision = ManualPoolTiebreakResolution.objects.get(pool__stage__tournament=copy)
+        self.assertEqual(set(decision.resolved_order), set(decision.pool.pairs.values_list('id', flat=True)))
+
+        # The imported history replays to the same results.
+        rebuild(copy)
+        self.assertEqual(results(copy), results(self.tournament))
+
+    def test_unknown_players_are_created(self):
+        Player.objects.filter(first_name='P1a').update(first_name='Renamed')
+        result = import_archive(self.path, name='Euros Copy')
+        self.assertEqual((result.players_matched, result.players_created), (39, 1))
+        self.assertTrue(Player.objects.filter(first_name='P1a', last_name='Test').exists())
+
+    def test_namesakes_are_told_apart_or_refused(self):
+        # Two archived players share a name; a third namesake lives only here.
+        Player.objects.filter(first_name='P2a').update(first_name='P1a')
+        with open(self.path, 'wb') as f:
+            for chunk in archive_chunks(self.tournament):
+                f.write(chunk)
+        Player.objects.create(first_name='P1a', last_name='Test', ranking=500)
+        copy = import_archive(self.path, name='Euros Copy').tournament
+        self.assertEqual(results(copy), results(self.tournament))
+
+        Player.objects.filter(ranking=500).update(ranking=1)
+        with self.assertRaises(ArchiveImportError):
+            import_archive(self.path, name='Euros Copy 2')
+
+    def test_same_tournament_is_replaced_only_when_asked(self):
+        with self.assertRaises(CommandError):
+            call_command('import_tournament', str(self.path), stdout=StringIO())
+        out = StringIO()
+        call_command('import_tournament', str(self.path), '--replace', stdout=out)
+        self.assertIn('Replaced', out.getvalue())
+        self.assertFalse(TournamentChart.objects.filter(pk=self.tournament.pk).exists())
+        self.assertEqual(TournamentChart.objects.filter(name='Euros Test').count(), 1)
+
+    def test_failed_import_leaves_nothing_behind(self):
+        TournamentArchetype.objects.filter(pk=self.archetype.pk).update(name='Renamed format')
+        with self.assertRaises(ArchiveImportError):
+            import_archive(self.path, name='Euros Copy')
+        TournamentArchetype.objects.filter(pk=self.archetype.pk).update(name=self.archetype.name)
+
+        # Failing halfway through a replace rolls the deletion back too.
+        matchups = Matchup.objects.count()
+        with mock.patch('tournament_creator.archive_import._resolve_players', side_effect=RuntimeError):
+            with self.assertRaises(RuntimeError):
+                import_archive(self.path, replace=True)
+        self.assertEqual(list(TournamentChart.objects.values_list('pk', flat=True)), [self.tournament.pk])
+        self.assertEqual(Matchup.objects.count(), matchups)
@@ -0,0 +1,97 @@
+"""Tests for the SQLite cache backend and version-stamped tournament caching."""
+import itertools
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from .. import cache_backends
+from ..caching import get_tournament_cached, invalidate_tournament, tournament_cache_key
+from ..cache_backends import SQLiteCache
+from ..models import TournamentChart
+
+
+class SQLiteCacheTests(SimpleTestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmpdir.cleanup)
+        self.cache = self.make_cache()
+
+    def make_cache(self, **options):
+        return SQLiteCache(Path(self.tmpdir.name) / 'cache.sqlite3', {'OPTIONS': options})
+
+    def test_set_get_delete(self):
+        self.cache.set('groups', [{'id': 'g1', 'name': 'Scorers'}])
+        self.assertEqual(self.cache.get('groups'), [{'id': 'g1', 'name': 'Scorers'}])
+        self.assertTrue(self.cache.has_key('groups'))
+        self.assertTrue(self.cache.delete('groups'))
+        self.assertIsNone(self.cache.get('groups'))
+        self.assertEqual(self.cache.get('groups', 'fallback'), 'fallback')
+
+    def test_shared_between_instances(self):
+        # Two workers opening the same file see each other's writes.
+        self.cache.set('key', 1)
+        self.assertEqual(self.make_cache().get('key'), 1)
+
+    def test_expiry_and_touch(self):
+        self.cache.set('short', 'value', timeout=0.05)
+        self.cache.set('forever', 'value', timeout=None)
+        time.sleep(0.1)
+        self.assertIsNone(self.cache.get('short'))
+        self.assertFalse(self.cache.touch('short'))
+        self.assertTrue(self.cache.touch('forever', timeout=60))
+        self.assertEqual(self.cache.get('forever'), 'value')
+
+    def test_add_only_when_missing(self):
+        self.assertTrue(self.cache.add('key', 'first'))
+        self.assertFalse(self.cache.add('key', 'second'))
+        self.assertEqual(self.cache.get('key'), 'first')
+
+    def test_get_many_and_incr(self):
+        self.cache.set_many({'a': 1, 'b': 2})
+        self.assertEqual(self.cache.get_many(['a', 'b', 'c']), {'a': 1, 'b': 2})
+        self.assertEqual(self.cache.incr('a'), 2)
+
+    def test_cull_evicts_least_recently_used(self):
+        cache = self.make_cache(MAX_ENTRIES=4, CULL_FREQUENCY=2)
+        clock = itertools.count(1000, 100)
+        with patch.object(cache_backends.time, 'time', lambda: next(clock)):
+            for key in 'abcd':
+                cache.set(key, key, timeout=None)
+            cache.get('a')  # 'a' becomes the most recently used
+            cache.set('e', 'e', timeout=None)  # five entries: evict the two oldest reads
+        self.assertEqual(sorted(k for k in 'abcde' if cache.has_key(k)), ['a', 'd', 'e'])
+
+    def test_clear(self):
+        self.cache.set('key', 1)
+        self.cache.clear()
+        self.assertIsNone(self.cache.get('key'))
+
+
+class TournamentCachingTests(TestCase):
+
+    def setUp(self):
+        self.tournament = TournamentChart.objects.create(
+            name='Cache Cup', date=timezone.now().date(), number_of_rounds=1, number_of_courts=1)
+
+    def test_value_is_reused_until_the_tournament_changes(self):
+        calls = []
+
+        def compute():
+            calls.append(1)
+            return len(calls)
+
+        self.assertEqual(get_tournament_cached(self.tournament, 'standings', compute), 1)
+        self.assertEqual(get_tournament_cached(self.tournament, 'standings', compute), 1)
+
+        old_key = tournament_cache_key(self.tournament, 'standings')
+        self.tournament.bump_results_version()
+        self.assertNotEqual(tournament_cache_key(self.tournament, 'standings'), old_key)
+        self.assertEqual(get_tournament_cached(self.tournament, 'standings', compute), 2)
+
+        invalidate_tournament(self.tournament)
+        self.assertEqual(get_tournament_cached(self.tournament, 'standings', compute), 3)
@@ -1,12 +1,14 @@
+from datetime import timedelta
 from io import StringIO
 
 from django.test import TestCase, Client
 from django.urls import reverse
+from django.utils import timezone
 from django.core.management import call_command
 from django.core.management.base import CommandError
 from ..forms import TournamentCreationForm
 from ..models import (Player, Pair, TournamentChart, TournamentArchetype, Matchup, MatchScore,
-                      Pool, PoolPair, User, ManualPoolTiebreakResolution)
+                      Pool, PoolPair, RankingSnapshot, User, ManualPoolTiebreakResolution)
 from ..models.tournament_types import EurosFormat, get_implementation
 
 
@@ -52,6 +54,8 @@ class EurosFormatTestBase(TestCase):
         MatchScore.objects.create(
             matchup=matchup, set_number=1,
             team1_score=team1_score, team2_score=team2_score)
+        # As the record view does, so cached pages see the result.
+        self.tournament.bump_results_version()
 
     def play_stage_lower_seed_wins(self, stage):
         """Score every matchup in a stage with the lower-seeded (stronger) pair winning."""
@@ -277,6 +281,21 @@ class EurosFinalsTest(EurosFormatTestBase):
         for entry in standings:
             self.assertEqual(entry['position'], entry['pair'].seed)
 
+    def test_phase_state_answers_everything_in_a_fixed_number_of_queries(self):
+        self.advance_through_phase2()
+        self.play_finals()
+        pools = list(Pool.objects.filter(stage__tournament=self.tournament))
+        with self.assertNumQueries(7):
+            state = self.impl.get_phase_state(self.tournament)
+            standings = {pool.id: [e['pair'].id for e in state.standings(pool)] for pool in pools}
+            final = [(e['position'], e['pair'].id) for e in state.final_standings]
+            self.assertEqual([state.unresolved_seed_ties(stage) for stage in self.stages], [[], [], []])
+            self.assertTrue(all(state.is_complete(stage) for stage in self.stages))
+            self.assertIsNone(state.next_stage)
+        self.assertEqual(standings, {pool.id: [e['pair'].id for e in self.impl.get_pool_standings(pool)]
+                                     for pool in pools})
+        self.assertEqual(final, [(position, self.pair_by_seed(position).id) for position in range(1, 21)])
+
     def test_every_pair_plays_14_matches(self):
         self.advance_through_phase2()
         self.play_finals()
@@ -712,17 +731,18 @@ class EurosViewsTest(EurosFormatTestBase):
 class EurosCreationViewTest(TestCase):
     """Creating a PAIRS tournament with 40 players auto-detects the euros format."""
 
-    def test_create_with_40_players(self):
-        client = Client()
+    def setUp(self):
+        self.client = Client()
         User.objects.create_user(username='creator_test', password='test123', role='TC')
-        client.login(username='creator_test', password='test123')
-
-        players = [
+        self.client.login(username='creator_test', password='test123')
+        self.players = [
             Player.objects.create(
                 first_name=f'F{i}', last_name=f'L{i}', ranking=i, ranking_points=1000 - i)
             for i in range(1, 41)
         ]
-        response = client.post(reverse('tournament_create'), data={
+
+    def post_create(self, players):
+        return self.client.post(reverse('tournament_create'), data={
             'name': 'EO 2026',
             'place': 'Helsinki',
             'country': 'Finland',
@@ -734,6 +754,9 @@ class EurosCreationViewTest(TestCase):
             'name_display_format': 'FIRST',
             'players': [p.id for p in players],
         })
+
+    def test_create_with_40_players(self):
+        response = self.post_create(self.players)
         self.assertEqual(response.status_code, 302, getattr(response.context, 'get', lambda k: None)('form'))
 
         tournament = TournamentChart.objects.latest('id')
@@ -747,6 +770,28 @@ class EurosCreationViewTest(TestCase):
         self.assertEqual(tournament.stages.get(stage_number=2).matchups.count(), 0)
         self.assertEqual(tournament.stages.get(stage_number=3).matchups.count(), 0)
 
+    def test_pairs_follow_selection_order_and_seed_by_points(self):
+        # Select the weakest players first: entry order and seeds then run opposite ways.
+        self.post_create(list(reversed(self.players)))
+        tournament = TournamentChart.objects.latest('id')
+        pairs = list(tournament.pairs.order_by('entry_order'))
+        self.assertEqual([p.entry_order for p in pairs], list(range(1, 21)))
+        self.assertEqual((pairs[0].player1, pairs[0].player2), (self.players[39], self.players[38]))
+        self.assertEqual(pairs[0].ranking_points_sum, 960 + 961)
+        self.assertEqual([p.seed for p in pairs], list(range(20, 0, -1)))
+        pool_a = tournament.stages.get(stage_number=1).pools.get(order=0)
+        self.assertEqual([pp.pair.seed for pp in PoolPair.objects.filter(pool=pool_a)], [1, 10, 11, 20])
+
+    def test_creation_issues_a_fixed_number_of_queries(self):
+        # Players are resolved in one query and every table gets a single bulk
+        # insert, so the count doesn't depend on the number of players:
+        # session, user, players, archetype, then inside a savepoint the
+        # tournament, pairs, tournament links, stages, pools, pool memberships
+        # and matchups.
+        with self.assertNumQueries(13):
+            response = self.post_create(self.players)
+        self.assertEqual(response.status_code, 302)
+
 
 class EurosReseedPhase1CommandTest(EurosFormatTestBase):
     """Tests for the reseed_phase1 management command (used after a rankings
@@ -790,6 +835,27 @@ class EurosReseedPhase1CommandTest(EurosFormatTestBase):
         # New seed 4 lands in Pool D (snake: seeds 1-5 -> pools A-E).
         self.assertEqual(self._pool_name_of(self.stages[0], pair8), 'Pool D')
 
+    def test_reseed_uses_history_as_of_registration_date(self):
+        """Points that changed after the registration deadline don't move seeds."""
+        for pair in self.pairs:
+            for player in (pair.player1, pair.player2):
+                RankingSnapshot.objects.create(player=player, division='O', rank=player.ranking,
+                                               points=player.ranking_points,
+                                               recorded_at=timezone.now() - timedelta(days=10))
+        self.tournament.registration_date = timezone.localdate() - timedelta(days=5)
+        self.tournament.save()
+        pair8 = self._bump_pair_to_seed_4()
+
+        out = StringIO()
+        call_command('check_seeding', self.tournament.id, stdout=out)
+        self.assertIn('Seeding unchanged', out.getvalue())
+        self.assertIn('ranking history', out.getvalue())
+
+        call_command('reseed_phase1', self.tournament.id, '--yes', '--live', stdout=StringIO())
+        pair8.refresh_from_db()
+        self.assertEqual(pair8.seed, 4)
+        self.assertEqual(pair8.ranking_points_sum, 1993)
+
     def test_reseed_noop_when_seeding_unchanged(self):
         old_matchup_ids = set(self.stages[0].matchups.values_list('id', flat=True))
         out = StringIO()
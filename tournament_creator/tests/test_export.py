@@ -0,0 +1,88 @@
+import csv
+import gzip
+import io
+import json
+from collections import Counter
+
+from django.urls import reverse
+
+from ..export import standings
+from ..models import TournamentChart, User
+from .test_replay import MocReplayTestBase
+
+
+def content(response):
+    return b''.join(response.streaming_content)
+
+
+class ResultsExportTest(MocReplayTestBase):
+    """Exports of a partly played 7-player Monarch of the Court."""
+
+    def setUp(self):
+        super().setUp()
+        for i, matchup in enumerate(self.matchups[:5]):
+            self.record(matchup, [15, 10 + i], [8, 15])
+        self.record(self.matchups[2], [15], [12])
+
+    def export(self, fmt):
+        response = self.client.get(reverse('tournament_export', args=[self.tournament.pk, fmt]))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response
+
+    def test_text_download_lists_the_standings(self):
+        response = self.client.get(reverse('tournament_download_results', args=[self.tournament.pk]))
+        self.assertTrue(response.streaming)
+        lines = content(response).decode().split('\n')
+        self.assertEqual(lines[:2], ['Tournament: MoC', f"Date: {self.tournament.date.strftime('%B %d, %Y')}"])
+        first = standings(self.tournament)[0]
+        self.assertEqual(lines[5], f"1. {first['players'][0].first_name} Test - {first['wins']}W {first['pd']:+d}PD")
+        self.assertEqual(len(lines), 5 + 7)
+
+    def test_csv_has_a_row_per_player_in_placing_order(self):
+        response = self.export('csv')
+        self.assertIn('attachment; filename="MoC_', response['Content-Disposition'])
+        rows = list(csv.DictReader(io.StringIO(content(response).decode())))
+        self.assertEqual([int(r['position']) for r in rows], list(range(1, 8)))
+        self.assertEqual([int(r['player1_id']) for r in rows], [e['players'][0].id for e in standings(self.tournament)])
+        self.assertEqual({r['player2'] for r in rows}, {''})
+
+    def test_json_carries_every_match_and_its_sets(self):
+        [exported] = json.loads(content(self.export('json')))
+        self.assertEqual(len(exported['standings']), 7)
+        self.assertEqual(len(exported['matches']), self.tournament.matchups.count())
+        played = [m for m in exported['matches'] if m['sets']]
+        self.assertEqual(len(played), 5)
+        self.assertIn([[15, 12]], [m['sets'] for m in played])
+
+    def test_archive_holds_everything_for_directors_only(self):
+        response = self.export('archive')
+        records = [json.loads(line) for line in gzip.decompress(content(response)).decode().splitlines()]
+        counts = Counter(r['type'] for r in records)
+        self.assertEqual(counts['tournament'], 1)
+        self.assertEqual(counts['player'], 7)
+        self.assertEqual(counts['matchup'], self.tournament.matchups.count())
+        self.assertEqual(counts['set_score'], 4 * 2 + 1)
+        self.assertEqual(counts['event'], 6)
+        self.assertEqual(counts['player_score'], 7)
+
+        User.objects.create_user(username='spectator', password='test123')
+        self.client.login(username='spectator', password='test123')
+        response = self.client.get(reverse('tournament_export', args=[self.tournament.pk, 'archive']))
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(self.client.get(reverse('tournament_export', args=[self.tournament.pk, 'xls'])).status_code,
+                         404)
+
+    def test_season_export_covers_counting_tournaments_for_admins(self):
+        sandbox = TournamentChart.objects.create(
+            name='Practice', date=self.tournament.date, number_of_rounds=1, number_of_courts=1, is_sandbox=True)
+        url = reverse('season_results_export', args=[self.tournament.date.year, 'csv'])
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        User.objects.create_user(username='admin', password='test123', role='ADMIN')
+        self.client.login(username='admin', password='test123')
+        rows = list(csv.DictReader(io.StringIO(content(self.client.get(url)).decode())))
+        self.assertEqual({r['tournament_id'] for r in rows}, {str(self.tournament.pk)})
+        self.assertNotIn(str(sandbox.pk), {r['tournament_id'] for r in rows})
+        self.assertEqual(json.loads(content(self.client.get(
+            reverse('season_results_export', args=[self.tournament.date.year - 1, 'json'])))), [])
@@ -0,0 +1,108 @@
+import datetime
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+from .. import log_archive
+from ..log_archive import archive_tournament, read_archive
+from ..models import LogArchive, MatchResultLog, MatchScore, NotificationLog, PlayerScore
+from ..replay import rebuild
+from .test_replay import MocReplayTestBase
+
+
+class LogArchiveTest(MocReplayTestBase):
+    """Compaction of a finished 7-player Monarch of the Court scored through the view."""
+
+    def setUp(self):
+        super().setUp()
+        self.archive_dir = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.archive_dir)
+        settings_override = override_settings(LOG_ARCHIVE_DIR=str(self.archive_dir))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def finish(self, days_ago=30):
+        self.tournament.date = timezone.localdate() - datetime.timedelta(days=days_ago)
+        self.tournament.save(update_fields=['date'])
+
+    def play(self):
+        for i, matchup in enumerate(self.matchups[:4]):
+            self.record(matchup, [15], [9 + i])
+        self.record(self.matchups[1], [13], [15])
+        # The email backend isn't configured: every event leaves a failure row.
+        NotificationLog.objects.bulk_create(
+            NotificationLog(success=False, details='Email backend not active', match_result_log=event)
+            for event in MatchResultLog.objects.filter(tournament=self.tournament))
+
+    def test_compaction_archives_and_prunes_finished_tournament(self):
+        self.play()
+        self.finish()
+        events = list(MatchResultLog.objects.filter(tournament=self.tournament).order_by('id')
+                      .values_list('id', 'action', 'details'))
+
+        out = StringIO()
+        call_command('compact_logs', '--batch-size', '2', '--pause', '0', stdout=out)
+        self.assertIn('Archived the logs of 1 tournament(s)', out.getvalue())
+
+        self.assertFalse(MatchResultLog.objects.filter(tournament=self.tournament).exists())
+        self.assertFalse(NotificationLog.objects.exists())
+        summary = LogArchive.objects.get(tournament=self.tournament)
+        self.assertEqual((summary.events, summary.notifications, summary.failed_notifications), (5, 5, 5))
+        self.assertEqual(summary.actions, {'CREATE': 4, 'UPDATE': 1})
+        self.assertEqual(summary.last_event_id, events[-1][0])
+
+        records = list(read_archive(self.archive_dir / summary.file_name))
+        self.assertEqual([(r['id'], r['action'], r['details']) for r in records if r['type'] == 'event'], events)
+        self.assertEqual(sum(r['type'] == 'notification' for r in records), 5)
+        self.assertEqual(records[0]['recorded_by__username'], 'creator')
+
+    def test_recent_tournaments_are_left_alone(self):
+        self.play()
+        self.finish(days_ago=3)
+        out = StringIO()
+        call_command('compact_logs', '--dry-run', stdout=out)
+        self.assertEqual(out.getvalue(), '')
+        call_command('compact_logs', stdout=StringIO())
+        self.assertEqual(MatchResultLog.objects.filter(tournament=self.tournament).count(), 5)
+        self.assertFalse(LogArchive.objects.exists())
+
+    def test_interrupted_prune_is_finished_without_archiving_twice(self):
+        self.play()
+        self.finish()
+        with mock.patch.object(log_archive, '_delete_in_batches', side_effect=RuntimeError('killed')):
+            with self.assertRaises(RuntimeError):
+                archive_tournament(self.tournament)
+        self.assertEqual(MatchResultLog.objects.filter(tournament=self.tournament).count(), 5)
+
+        self.assertIsNone(archive_tournament(self.tournament))
+        self.assertFalse(MatchResultLog.objects.filter(tournament=self.tournament).exists())
+        self.assertFalse(NotificationLog.objects.exists())
+        self.assertEqual(LogArchive.objects.count(), 1)
+
+    def test_replay_reads_the_archive_then_the_live_log(self):
+        self.play()
+        self.finish()
+        archive_tournament(self.tournament)
+        self.record(self.matchups[5], [15, 15], [3, 4])  # a late correction, still live
+        recorded_standings = self.standings()
+
+        MatchScore.objects.filter(matchup__tournament_chart=self.tournament).delete()
+        PlayerScore.objects.filter(tournament=self.tournament).delete()
+        self.assertEqual(rebuild(self.tournament), 6)
+        self.assertEqual(self.standings(), recorded_standings)
+
+    def test_old_unattached_notifications_are_archived(self):
+        old = NotificationLog.objects.create(success=False, details='no event')
+        NotificationLog.objects.filter(pk=old.pk).update(timestamp=timezone.now() - datetime.timedelta(days=20))
+        recent = NotificationLog.objects.create(success=False, details='no event yet')
+
+        call_command('compact_logs', stdout=StringIO())
+        self.assertEqual(list(NotificationLog.objects.values_list('pk', flat=True)), [recent.pk])
+        [archived] = (self.archive_dir / 'unattached').iterdir()
+        self.assertEqual([r['details'] for r in read_archive(archived)], ['no event'])
@@ -452,6 +452,23 @@ class TestNotificationTriggerInView(TestCase):
         mock_send_email.assert_not_called()
         mock_send_signal.assert_not_called()
 
+class TestAsyncNotificationWorker(TestCase):
+    """Production sends go through one long-lived worker thread per process."""
+
+    @patch('tournament_creator.views.tournament_views._send_match_notifications')
+    def test_worker_is_reused_across_sends(self, send_mock):
+        from tournament_creator.views import tournament_views
+
+        tournament_views._send_match_notifications_async('u1', 'log1', 't1')
+        worker = tournament_views._notification_worker
+        tournament_views._send_match_notifications_async('u2', 'log2', 't2')
+        tournament_views._notification_queue.join()
+
+        self.assertIs(tournament_views._notification_worker, worker)
+        self.assertEqual([c.args for c in send_mock.call_args_list],
+                         [('u1', 'log1', 't1'), ('u2', 'log2', 't2')])
+
+
 # Admin view tests remain largely unchanged by this feature, 
 # but are kept for completeness of the file.
 class TestNotificationAdminViews(TestCase):
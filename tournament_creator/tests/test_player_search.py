@@ -0,0 +1,131 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from tournament_creator import player_directory
+from tournament_creator.models import Player, PlayerSearchTerm
+from tournament_creator.models.search import fold, search_tokens
+
+
+class PlayerSearchIndexTest(TestCase):
+
+    def setUp(self):
+        self.hamalainen = Player.objects.create(first_name='Matti', last_name='Hämäläinen', ranking=3)
+        self.maki = Player.objects.create(first_name='Jussi', last_name='Mäki-Petäjä', ranking=1,
+                                          nickname='Jusa')
+        self.hamilton = Player.objects.create(first_name='Anna', last_name='Hamilton', ranking=2)
+
+    def search(self, query):
+        return list(PlayerSearchTerm.search(Player.objects.all(), query).order_by('-search_exact', 'ranking'))
+
+    def test_folding(self):
+        self.assertEqual(fold('Hämäläinen'), 'hamalainen')
+        self.assertEqual(fold('STRAßE'), 'strasse')
+        self.assertEqual(search_tokens(' Mäki-Petäjä  jr. '), ['maki', 'petaja', 'jr'])
+
+    def test_prefix_matching_ignores_case_and_accents(self):
+        self.assertEqual(self.search('hämä'), [self.hamalainen])
+        self.assertEqual(self.search('HAM'), [self.hamilton, self.hamalainen])
+        self.assertEqual(self.search('petaja'), [self.maki])
+        self.assertEqual(self.search('jusa'), [self.maki])
+        self.assertEqual(self.search('zz'), [])
+
+    def test_every_word_must_match(self):
+        self.assertEqual(self.search('ham ma'), [self.hamalainen])
+
+    def test_exact_word_ranks_first(self):
+        hamm = Player.objects.create(first_name='Ham', last_name='Sandwich', ranking=9)
+        self.assertEqual(self.search('ham')[0], hamm)
+
+    def test_rename_reindexes(self):
+        self.hamilton.last_name = 'Öberg'
+        self.hamilton.save()
+        self.assertEqual(self.search('oberg'), [self.hamilton])
+        self.assertEqual(self.search('hamil'), [])
+
+    def test_ranking_only_save_skips_reindex(self):
+        player = Player.objects.get(pk=self.hamilton.pk)
+        player.ranking_points = 50
+        with self.assertNumQueries(1):
+            player.save()
+
+
+class PlayerAutocompleteTest(TestCase):
+
+    def setUp(self):
+        user = get_user_model().objects.create_user(username='director', password='pw')
+        self.client.force_login(user)
+        Player.objects.create(first_name='Matti', last_name='Hämäläinen', ranking=3)
+        Player.objects.create(first_name='Anna', last_name='Hamilton', ranking=2)
+
+    def test_keystroke_is_a_single_ranked_query(self):
+        url = reverse('player-autocomplete')
+        self.client.get(url, {'q': 'x'})  # warm the session/user lookups
+        with self.assertNumQueries(3):  # session, user, search
+            response = self.client.get(url, {'q': 'ham'})
+        results = response.json()['results']
+        self.assertEqual([r['text'] for r in results], ['Anna Hamilton', 'Matti Hämäläinen'])
+        self.assertFalse(response.json()['pagination']['more'])
+
+    def test_pagination_without_count(self):
+        for i in range(12):
+            Player.objects.create(first_name=f'Hanna{i}', last_name='Page', ranking=10 + i)
+        url = reverse('player-autocomplete')
+        first = self.client.get(url, {'q': 'page'}).json()
+        self.assertEqual(len(first['results']), 10)
+        self.assertTrue(first['pagination']['more'])
+        second = self.client.get(url, {'q': 'page', 'page': 2}).json()
+        self.assertEqual(len(second['results']), 2)
+        self.assertFalse(second['pagination']['more'])
+
+
+class PlayerDirectoryTest(TestCase):
+
+    def setUp(self):
+        cache.delete(player_directory.VERSION_KEY)
+        self.addCleanup(setattr, player_directory, '_directory', None)
+        user = get_user_model().objects.create_user(username='director', password='pw')
+        self.client.force_login(user)
+        self.url = reverse('player-directory')
+        self.matti = Player.objects.create(first_name='Matti', last_name='Hämäläinen', ranking=3)
+        self.anna = Player.objects.create(first_name='Anna', last_name='Hamilton', ranking=2)
+        self.hannu = Player.objects.create(first_name='Hannu', last_name='Mäkelä', ranking=1)
+
+    def results(self, **params):
+        data = self.client.get(self.url, params).json()
+        return [r['text'] for r in data['results']], data['pagination']['more']
+
+    def test_prefix_search_ranked_by_ranking(self):
+        self.assertEqual(self.results(q='ha'), (['Hannu Mäkelä', 'Anna Hamilton', 'Matti Hämäläinen'], False))
+        self.assertEqual(self.results(q='häm ma'), (['Matti Hämäläinen'], False))
+        self.assertEqual(self.results(q='nobody'), ([], False))
+
+    def test_selected_players_are_excluded(self):
+        # jQuery serialises the array as selected[].
+        response = self.client.get(self.url, {'q': 'ha', 'selected[]': [self.hannu.pk, self.anna.pk]})
+        self.assertEqual([r['text'] for r in response.json()['results']], ['Matti Hämäläinen'])
+
+    def test_pagination(self):
+        self.results(q='page')
+        with self.captureOnCommitCallbacks(execute=True):
+            Player.objects.bulk_create([Player(first_name=f'Page{i}', last_name='Test', ranking=10 + i)
+                                        for i in range(12)])
+            player_directory.invalidate()  # bulk_create sends no signals
+        texts, more = self.results(q='page')
+        self.assertEqual((len(texts), more), (10, True))
+        texts, more = self.results(q='page', page=2)
+        self.assertEqual(texts, ['Page10 Test', 'Page11 Test'])
+        self.assertFalse(more)
+
+    def test_served_from_memory_and_reloaded_after_changes(self):
+        self.results(q='ha')
+        with self.assertNumQueries(2):  # session and user only
+            self.results(q='ha')
+        with self.captureOnCommitCallbacks(execute=True):
+            Player.objects.create(first_name='Harri', last_name='Uusi', ranking=0)
+        self.assertEqual(self.results(q='harri'), (['Harri Uusi'], False))
+
+    def test_anonymous_gets_nothing(self):
+        self.client.logout()
+        self.assertEqual(self.results(q='ha'), ([], False))
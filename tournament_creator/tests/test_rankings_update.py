@@ -1,11 +1,26 @@
+import gzip
+import hashlib
+import importlib
 import json
-from unittest.mock import patch, MagicMock
-from django.test import TestCase, Client
+import os
+import tempfile
+import threading
+from datetime import timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from pathlib import Path
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlparse
+from django.apps import apps as django_apps
+from django.test import SimpleTestCase, TestCase, Client, override_settings
 from django.urls import reverse
 from django.core.management import call_command
+from django.core.management.base import CommandError
 from django.contrib.auth import get_user_model
+from django.utils import timezone
 
-from tournament_creator.models import Player, RankingsUpdate
+from tournament_creator import rankings_api
+from tournament_creator.models import BackgroundJob, Pair, Player, PlayerRanking, RankingSnapshot, RankingsUpdate
 from tournament_creator.models.auth import User
 
 class RankingsModelTest(TestCase):
@@ -125,46 +140,189 @@ class RankingsViewTest(TestCase):
         charlie_pos = response.content.find(b'Charlie')
         self.assertTrue(charlie_pos < bob_pos < alice_pos)
     
-    @patch('tournament_creator.views.rankings_views.call_command')
-    def test_update_rankings(self, mock_call_command):
-        """Test the update rankings view."""
+    def test_division_list_uses_division_rankings(self):
+        PlayerRanking.objects.create(player=self.player3, division='W', year=2024, rank=1, points=70.0)
+        PlayerRanking.objects.create(player=self.player1, division='W', year=2024, rank=2, points=60.0)
+        PlayerRanking.objects.create(player=self.player2, division='W', year=2023, rank=1, points=99.0)
+
+        response = self.client.get(reverse('player_list'), {'division': 'W'})
+        players = list(response.context['players'])
+        # Latest year only, in Women's order, with Women's numbers.
+        self.assertEqual(players, [self.player3, self.player1])
+        self.assertEqual((players[0].division_rank, players[0].division_points), (1, 70.0))
+        self.assertEqual(response.context['ranking_year'], 2024)
+
+        response = self.client.get(reverse('player_list'), {
+            'division': 'W', 'sort_by': 'ranking_points', 'sort_order': 'asc'})
+        self.assertEqual(list(response.context['players']), [self.player1, self.player3])
+
+        # Open still lists everyone by the Player columns (seed-data players
+        # from migrations rank below these).
+        response = self.client.get(reverse('player_list'), {'division': 'O'})
+        self.assertEqual(list(response.context['players'])[:3], [self.player1, self.player2, self.player3])
+
+    def test_update_rankings(self):
+        """The update view queues a background job instead of running the sync."""
         response = self.client.post(reverse('update_rankings'), {'division': 'O'})
         self.assertEqual(response.status_code, 302)  # Should redirect
-        
-        # Check that the command was called
-        mock_call_command.assert_called_once_with('update_rankings', division='O')
+
+        job = BackgroundJob.objects.get()
+        self.assertEqual((job.kind, job.params, job.status), ('update_rankings', {'division': 'O'}, 'QUEUED'))
+        self.assertEqual(job.created_by, self.user)
+
+        # A second click while it is pending doesn't queue a duplicate.
+        self.client.post(reverse('update_rankings'), {'division': 'O'})
+        self.assertEqual(BackgroundJob.objects.count(), 1)
+
+    def test_status_reports_job_state(self):
+        job, _ = BackgroundJob.enqueue('update_rankings', {'division': 'W'})
+        job.report_progress(40, 'Fetching player data...')
+
+        data = self.client.get(reverse('check_rankings_status')).json()
+        self.assertTrue(data['success'])  # last successful import still reported
+        self.assertEqual(data['job']['id'], job.pk)
+        self.assertEqual(data['job']['progress'], 40)
+        self.assertEqual(data['job']['message'], 'Fetching player data...')
+        self.assertTrue(data['job']['active'])
+
+
+class BackgroundJobTest(TestCase):
+    """The job queue and the run_jobs worker."""
+
+    def test_claim_is_exclusive_and_ordered(self):
+        first, _ = BackgroundJob.enqueue('update_rankings', {'division': 'O'})
+        second, _ = BackgroundJob.enqueue('update_rankings', {'division': 'W'})
+        self.assertEqual(BackgroundJob.claim_next(), first)
+        self.assertEqual(BackgroundJob.claim_next(), second)
+        self.assertIsNone(BackgroundJob.claim_next())
+        first.refresh_from_db()
+        self.assertEqual(first.status, BackgroundJob.Status.RUNNING)
+        self.assertIsNotNone(first.started_at)
+
+    def test_worker_records_success_and_failure(self):
+        ok, _ = BackgroundJob.enqueue('update_rankings', {'division': 'O'})
+        bad, _ = BackgroundJob.enqueue('update_rankings', {'division': 'W'})
+
+        def handler(job):
+            if job.params['division'] == 'W':
+                raise RuntimeError('API down')
+            job.report_progress(50, 'halfway')
+            return 'done'
+
+        with patch.dict('tournament_creator.jobs.JOB_HANDLERS', {'update_rankings': handler}):
+            call_command('run_jobs', once=True, stdout=StringIO())
+
+        ok.refresh_from_db()
+        bad.refresh_from_db()
+        self.assertEqual((ok.status, ok.progress, ok.output), ('SUCCEEDED', 100, 'done'))
+        self.assertEqual((bad.status, bad.error), ('FAILED', 'API down'))
+        self.assertIsNotNone(bad.finished_at)
+
+    def test_rankings_job_runs_the_sync_command(self):
+        job, _ = BackgroundJob.enqueue('update_rankings', {'division': 'MW'})
+        with patch('tournament_creator.jobs.call_command') as mock_call_command:
+            call_command('run_jobs', once=True, stdout=StringIO())
+        command = mock_call_command.call_args.args[0]
+        self.assertEqual(mock_call_command.call_args.kwargs, {'division': 'MW'})
+        self.assertIsNotNone(command.progress)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'SUCCEEDED')
+
+    def test_abandoned_running_jobs_are_failed_at_startup(self):
+        job, _ = BackgroundJob.enqueue('update_rankings')
+        BackgroundJob.objects.filter(pk=job.pk).update(
+            status='RUNNING', started_at=timezone.now() - timedelta(hours=2))
+        call_command('run_jobs', once=True, stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'FAILED')
+
+
+class RecordedRankingsServer:
+    """A local stand-in for doubledisccourt.com serving recorded payloads.
+
+    Sends an ETag per payload, honours If-None-Match with 304 and gzips the
+    body when the client asks for it. ``requests`` lists (op, status) pairs.
+    """
+
+    def __init__(self):
+        self.payloads = {}
+        self.requests = []
+        self.send_etags = True
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                op = parse_qs(urlparse(self.path).query).get('op', [''])[0]
+                body = json.dumps(server.payloads.get(op)).encode()
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()
+                if server.send_etags and self.headers.get('If-None-Match') == etag:
+                    server.requests.append((op, 304))
+                    self.send_response(304)
+                    self.end_headers()
+                    return
+                server.requests.append((op, 200))
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                if server.send_etags:
+                    self.send_header('ETag', etag)
+                if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    body = gzip.compress(body)
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f'http://127.0.0.1:{self.httpd.server_port}'
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def serve(self, entries, division='O'):
+        """Serve (name, rank, points) entries as the rankings + player payloads."""
+        self.payloads['get-rankings'] = [
+            {'rank': str(rank), 'player_id': str(i), 'points': str(points), 'division': division}
+            for i, (name, rank, points) in enumerate(entries)
+        ]
+        self.payloads['load-player'] = [
+            {'id': str(i), 'name': name} for i, (name, rank, points) in enumerate(entries)
+        ]
 
 
 class RankingsCommandTest(TestCase):
     """Tests for the management command to update rankings."""
-    
-    @patch('requests.get')
-    def test_update_rankings_command(self, mock_get):
+
+    def setUp(self):
+        self.server = RecordedRankingsServer()
+        self.addCleanup(self.server.stop)
+        cache_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(cache_dir.cleanup)
+        settings_override = override_settings(RANKINGS_CACHE_DIR=Path(cache_dir.name))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def sync(self, **options):
+        out = StringIO()
+        call_command('update_rankings', division=options.pop('division', 'O'),
+                     base_url=self.server.base_url, stdout=out, **options)
+        return out.getvalue()
+
+    def test_update_rankings_command(self):
         """Test the update_rankings management command."""
-        # Mock API responses
-        rankings_response = MagicMock()
-        rankings_response.json.return_value = [
-            {'rank': '1', 'player_id': '123', 'points': '100.0', 'division': 'O'},
-            {'rank': '2', 'player_id': '456', 'points': '90.0', 'division': 'O'},
-        ]
-        
-        player_response = MagicMock()
-        player_response.json.return_value = [
-            {'id': '123', 'name': 'Alice Smith'},
-            {'id': '456', 'name': 'Bob Jones'},
-        ]
-        
-        # Configure mock to return these responses
-        mock_get.side_effect = [rankings_response, player_response]
-        
-        # Run the command
-        call_command('update_rankings', division='O', dry_run=False)
-        
+        self.server.serve([('Alice Smith', 1, 100.0), ('Bob Jones', 2, 90.0)])
+
+        self.sync(dry_run=False)
+
         # Check that players were created (exactly once each; other rows may be
         # present from seed-data migrations).
         self.assertEqual(Player.objects.filter(first_name='Alice', last_name='Smith').count(), 1)
         self.assertEqual(Player.objects.filter(first_name='Bob', last_name='Jones').count(), 1)
-        
+
         # Check that a rankings update record was created
         self.assertEqual(RankingsUpdate.objects.count(), 1)
         update = RankingsUpdate.objects.first()
@@ -172,8 +330,7 @@ class RankingsCommandTest(TestCase):
         self.assertEqual(update.player_count, 2)
         self.assertTrue(update.successful)
 
-    @patch('requests.get')
-    def test_update_rankings_merges_seeded_player(self, mock_get):
+    def test_update_rankings_merges_seeded_player(self):
         """A hand-seeded player (with a linked account) is updated in place,
         not duplicated, when they appear in the rankings feed."""
         account = User.objects.create_user(username='tessa', password='x')
@@ -181,22 +338,215 @@ class RankingsCommandTest(TestCase):
             first_name='Tessa', last_name='Vainio', ranking=9999,
             ranking_points=0, user=account,
         )
-
-        rankings_response = MagicMock()
-        rankings_response.json.return_value = [
-            {'rank': '5', 'player_id': '123', 'points': '55.0', 'division': 'O'},
-        ]
-        player_response = MagicMock()
         # Note the trailing whitespace / casing the normalized match must absorb.
-        player_response.json.return_value = [
-            {'id': '123', 'name': 'tessa  Vainio '},
-        ]
-        mock_get.side_effect = [rankings_response, player_response]
+        self.server.serve([('tessa  Vainio ', 5, 55.0)])
 
-        call_command('update_rankings', division='O', dry_run=False)
+        self.sync(dry_run=False)
 
         self.assertEqual(Player.objects.filter(last_name__iexact='Vainio').count(), 1)
         seeded.refresh_from_db()
         self.assertEqual(seeded.ranking, 5)
         self.assertEqual(seeded.ranking_points, 55.0)
-        self.assertEqual(seeded.user, account)
\ No newline at end of file
+        self.assertEqual(seeded.user, account)
+
+    def test_only_changed_rows_are_written(self):
+        """Unchanged players are left alone; changed ones get just their ranking columns."""
+        unchanged = Player.objects.create(first_name='Una', last_name='Same', ranking=1, ranking_points=100.0,
+                                          nickname='Keep')
+        moved = Player.objects.create(first_name='Mo', last_name='Ved', ranking=2, ranking_points=90.0)
+        self.server.serve([('Una Same', 1, 100.0), ('Mo Ved', 3, 85.0), ('New Comer', 2, 95.0)])
+
+        out = self.sync()
+
+        self.assertIn('Created 1 new players, updated 1, 1 unchanged', out)
+        moved.refresh_from_db()
+        self.assertEqual((moved.ranking, moved.ranking_points), (3, 85.0))
+        unchanged.refresh_from_db()
+        self.assertEqual(unchanged.nickname, 'Keep')
+        self.assertEqual(RankingsUpdate.objects.get().player_count, 3)
+
+    def test_large_division_syncs_in_a_few_queries(self):
+        Player.objects.bulk_create([
+            Player(first_name=f'Bulk{i}', last_name='Player', ranking=i, ranking_points=1000.0 - i)
+            for i in range(2000)
+        ])
+        # Every other player moves up one place; 100 newcomers join.
+        entries = [(f'Bulk{i} Player', i - (i % 2), 1000.0 - i + (i % 2)) for i in range(2000)]
+        entries += [(f'Fresh{i} Player', 2000 + i, 1.0) for i in range(100)]
+        self.server.serve(entries)
+
+        # Load players, one INSERT plus one for the newcomers' search terms,
+        # batched UPDATEs (SQLite caps a batch at 200 rows), load the division
+        # rankings, batched INSERTs for all 2100 of
+        # them and of their history snapshots (199 rows each), the
+        # RankingsUpdate row and the savepoint pair — not one statement per
+        # player.
+        with self.assertNumQueries(34):
+            out = self.sync()
+        self.assertIn('Created 100 new players, updated 1000, 1000 unchanged', out)
+
+    def test_other_divisions_do_not_clobber_open(self):
+        self.server.serve([('Alice Smith', 1, 100.0), ('Bob Jones', 2, 90.0)])
+        self.sync()
+        self.server.serve([('Alice Smith', 7, 12.0), ('Wendy Newcomer', 1, 50.0)], division='W')
+        self.sync(division='W')
+
+        alice = Player.objects.get(first_name='Alice')
+        self.assertEqual((alice.ranking, alice.ranking_points), (1, 100.0))
+        self.assertEqual(
+            sorted(alice.rankings.values_list('division', 'rank', 'points')),
+            [('O', 1, 100.0), ('W', 7, 12.0)])
+        # First seen in Women: created at the bottom of the Open order.
+        wendy = Player.objects.get(first_name='Wendy')
+        self.assertEqual(wendy.ranking_points, 0)
+        self.assertGreater(wendy.ranking, 2)
+        self.assertFalse(wendy.rankings.filter(division='O').exists())
+
+    def test_all_divisions_sync_in_one_pass(self):
+        self.server.payloads = {
+            'get-rankings': [
+                {'rank': '1', 'player_id': '1', 'points': '100', 'division': 'O'},
+                {'rank': '2', 'player_id': '2', 'points': '90', 'division': 'O'},
+                {'rank': '1', 'player_id': '3', 'points': '80', 'division': 'W'},
+                {'rank': '1', 'player_id': '1', 'points': '70', 'division': 'M'},
+                {'rank': '2', 'player_id': '3', 'points': '60', 'division': 'M'},
+            ],
+            'load-player': [{'id': '1', 'name': 'Alice Smith'}, {'id': '2', 'name': 'Bob Jones'},
+                            {'id': '3', 'name': 'Carol White'}],
+        }
+        out = self.sync(division='all', year='2025')
+        self.assertIn('Division rankings: 5 added, 0 updated, 0 removed', out)
+        self.assertEqual(self.server.requests, [('get-rankings', 200), ('load-player', 200)])
+        self.assertEqual(
+            dict(RankingsUpdate.objects.values_list('division', 'player_count')),
+            {'O': 2, 'W': 1, 'M': 2, 'MO': 0, 'MW': 0})
+        self.assertEqual(PlayerRanking.objects.filter(year=2025, division='M').count(), 2)
+
+        # Bob drops out of Open, Carol moves in Mixed.
+        self.server.payloads['get-rankings'] = [
+            {'rank': '1', 'player_id': '1', 'points': '100', 'division': 'O'},
+            {'rank': '1', 'player_id': '3', 'points': '80', 'division': 'W'},
+            {'rank': '1', 'player_id': '3', 'points': '75', 'division': 'M'},
+            {'rank': '2', 'player_id': '1', 'points': '70', 'division': 'M'},
+        ]
+        out = self.sync(division='all', year='2025')
+        self.assertIn('Division rankings: 0 added, 2 updated, 1 removed', out)
+        self.assertFalse(PlayerRanking.objects.filter(player__first_name='Bob').exists())
+
+    def test_history_records_only_changes(self):
+        self.server.serve([('Alice Smith', 1, 100.0), ('Bob Jones', 2, 90.0)])
+        self.sync()
+        alice = Player.objects.get(first_name='Alice')
+        before = timezone.now()
+        self.server.serve([('Alice Smith', 1, 100.0), ('Bob Jones', 2, 95.0)])
+        self.sync()
+        self.server.serve([('Alice Smith', 1, 100.0)])
+        self.sync()
+
+        bob = Player.objects.get(first_name='Bob')
+        self.assertEqual(alice.ranking_snapshots.count(), 1)
+        self.assertEqual(list(bob.ranking_snapshots.values_list('rank', 'points')),
+                         [(None, 0.0), (2, 95.0), (2, 90.0)])
+        self.assertEqual(RankingSnapshot.as_of(bob, before).points, 90.0)
+        self.assertEqual(RankingSnapshot.points_as_of([alice, bob], before), {alice.pk: 100.0, bob.pk: 90.0})
+
+    def test_backfilled_years_stay_out_of_the_history(self):
+        self.server.serve([('Alice Smith', 1, 100.0)])
+        self.sync(year=str(timezone.now().year - 3))
+        alice = Player.objects.get(first_name='Alice')
+        self.assertTrue(alice.rankings.exists())
+        self.assertFalse(alice.ranking_snapshots.exists())
+
+    def test_unknown_division_is_rejected(self):
+        with self.assertRaises(CommandError):
+            self.sync(division='X')
+
+    def test_unchanged_payloads_skip_database_work(self):
+        self.server.serve([('Alice Smith', 1, 100.0)])
+        self.sync()
+        self.assertEqual(self.server.requests, [('get-rankings', 200), ('load-player', 200)])
+
+        with self.assertNumQueries(0):
+            out = self.sync()
+        self.assertIn('nothing to do', out)
+        self.assertEqual(self.server.requests[2:], [('get-rankings', 304), ('load-player', 304)])
+        self.assertEqual(RankingsUpdate.objects.count(), 1)
+
+        # --force applies them anyway; another division is never skipped.
+        self.sync(force=True)
+        self.sync(division='W')
+        self.assertEqual(RankingsUpdate.objects.count(), 3)
+
+    def test_same_body_without_validators_is_unchanged(self):
+        """Content hashing catches unchanged data when the server sends no ETag."""
+        self.server.send_etags = False
+        self.server.serve([('Alice Smith', 1, 100.0)])
+        self.sync()
+        self.assertIn('nothing to do', self.sync())
+
+        self.server.serve([('Alice Smith', 2, 90.0)])
+        self.assertIn('updated 1', self.sync())
+
+    def test_null_payload_is_an_error(self):
+        self.server.payloads = {'get-rankings': None, 'load-player': []}
+        with self.assertRaises(CommandError):
+            self.sync()
+        self.assertFalse(RankingsUpdate.objects.get().successful)
+
+    def test_unreachable_server_is_reported(self):
+        self.server.stop()
+        with self.assertRaises(CommandError):
+            self.sync(timeout=1)
+
+
+class RankingHistoryTest(TestCase):
+    """Point-in-time lookups over RankingSnapshot."""
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.veteran = Player.objects.create(first_name='Vera', last_name='Vet', ranking=1, ranking_points=120.0)
+        self.rookie = Player.objects.create(first_name='Rob', last_name='Rookie', ranking=2, ranking_points=80.0)
+        self.unsynced = Player.objects.create(first_name='Una', last_name='Synced', ranking=3, ranking_points=5.0)
+        for player, days_ago, points in [(self.veteran, 30, 100.0), (self.veteran, 10, 110.0),
+                                         (self.veteran, 1, 120.0), (self.rookie, 2, 80.0)]:
+            RankingSnapshot.objects.create(player=player, division='O', rank=1, points=points,
+                                           recorded_at=self.now - timedelta(days=days_ago))
+
+    def test_points_as_of(self):
+        points = RankingSnapshot.points_as_of(
+            [self.veteran, self.rookie, self.unsynced], self.now - timedelta(days=5))
+        # Latest snapshot before the date; not yet ranked; never synced (live).
+        self.assertEqual(points, {self.veteran.pk: 110.0, self.rookie.pk: 0.0, self.unsynced.pk: 5.0})
+        self.assertIsNone(RankingSnapshot.as_of(self.veteran, self.now - timedelta(days=40)))
+
+    def test_as_of_before_the_first_sync(self):
+        """The migration's baseline covers every date before the first sync changed anything."""
+        baseline = importlib.import_module('tournament_creator.migrations.0035_ranking_snapshot')
+        RankingSnapshot.objects.all().delete()
+        baseline.record_baseline(django_apps, None)
+        RankingSnapshot.objects.create(player=self.veteran, division='O', rank=1, points=150.0)
+        long_ago = self.now - timedelta(days=400)
+        self.assertEqual(RankingSnapshot.points_as_of([self.veteran, self.rookie], long_ago),
+                         {self.veteran.pk: 120.0, self.rookie.pk: 80.0})
+
+    def test_pair_points_sum_as_of(self):
+        pair = Pair.objects.create(player1=self.veteran, player2=self.unsynced)
+        self.assertEqual(pair.ranking_points_sum, 125.0)
+        self.assertEqual(pair.calculate_points_sum(as_of=self.now - timedelta(days=20)), 105.0)
+        self.assertEqual(Pair.points_sums([pair], self.now - timedelta(days=5)), {pair.pk: 115.0})
+
+
+class JsonArrayStreamingTest(SimpleTestCase):
+
+    def test_elements_spanning_chunks(self):
+        items = [{'id': str(i), 'name': f'Player {i}', 'points': i / 3} for i in range(5000)]
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            json.dump(items, f)
+        self.addCleanup(os.unlink, f.name)
+        self.assertEqual(list(rankings_api.iter_json_array(f.name)), items)
+
+    def test_number_at_chunk_boundary(self):
+        with tempfile.NamedTemporaryFile('w', suffix='.json', delete=False) as f:
+            f.write(' [' + ' ' * (rankings_api.CHUNK_SIZE - 4) + '12345, 6]')
+        self.addCleanup(os.unlink, f.name)
+        self.assertEqual(list(rankings_api.iter_json_array(f.name)), [12345, 6])
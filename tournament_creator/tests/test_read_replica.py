@@ -0,0 +1,150 @@
+import os
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from tournament_creator.location_summary import location_rows
+from tournament_creator.models import Player, TournamentChart
+from tournament_creator import player_directory
+from tournament_creator.player_directory import PlayerDirectory
+from tournament_creator.read_replica import (PIN_COOKIE, REPLICA, ReplicaMiddleware, ReplicaRouter, primary_reads,
+                                             reading_replica, refresh)
+
+
+class ReadReplicaTest(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.primary = Path(directory.name) / 'db.sqlite3'
+        self.replica = Path(directory.name) / 'replica' / 'replica.sqlite3'
+        db = sqlite3.connect(self.primary, isolation_level=None)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('CREATE TABLE score (id INTEGER PRIMARY KEY, points INTEGER)')
+        db.execute('INSERT INTO score (points) VALUES (11)')
+        self.db = db
+        self.addCleanup(db.close)
+
+        settings = override_settings(READ_REPLICA=str(self.replica), READ_REPLICA_MAX_LAG=30,
+                                     READ_REPLICA_PIN_SECONDS=30)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        # The test settings have no replica database; only its connection's close() is used here.
+        patcher = mock.patch('tournament_creator.read_replica.connections', mock.MagicMock())
+        self.connections = patcher.start()
+        self.connections['default'].in_atomic_block = False
+        self.addCleanup(patcher.stop)
+
+    def request(self, method='get', path='/tournaments/1/', cookies=None):
+        seen = {}
+
+        def view(request):
+            seen['replica'] = reading_replica()
+            seen['db'] = ReplicaRouter().db_for_read(TournamentChart)
+            return HttpResponse()
+
+        request = getattr(RequestFactory(), method)(path)
+        request.COOKIES.update(cookies or {})
+        response = ReplicaMiddleware(view)(request)
+        return seen, response
+
+    def test_refresh_makes_a_read_only_snapshot(self):
+        before = time.time()
+        refresh(self.primary, self.replica)
+        self.db.execute('INSERT INTO score (points) VALUES (15)')
+        self.assertGreaterEqual(os.stat(self.replica).st_mtime, before - 1)
+
+        copy = sqlite3.connect(f'file:{self.replica}?mode=ro', uri=True)
+        self.addCleanup(copy.close)
+        self.assertEqual(copy.execute('PRAGMA journal_mode').fetchone()[0], 'delete')
+        self.assertEqual(copy.execute('SELECT points FROM score').fetchall(), [(11,)])
+        with self.assertRaises(sqlite3.OperationalError):
+            copy.execute('INSERT INTO score (points) VALUES (1)')
+        self.assertFalse(list(self.replica.parent.glob('.*.tmp')))
+
+        refresh(self.primary, self.replica)
+        self.assertEqual(sqlite3.connect(self.replica).execute('SELECT COUNT(*) FROM score').fetchone()[0], 2)
+
+    def test_page_views_read_the_replica_until_the_browser_writes(self):
+        refresh(self.primary, self.replica)
+        seen, response = self.request()
+        self.assertEqual(seen, {'replica': True, 'db': REPLICA})
+        self.assertLess(float(response['X-Replica-Lag']), 30)
+        self.assertEqual(ReplicaRouter().db_for_write(TournamentChart), 'default')
+        self.assertFalse(reading_replica())
+
+        seen, response = self.request('post')
+        self.assertEqual(seen['db'], 'default')
+        self.assertIn(PIN_COOKIE, response.cookies)
+        self.assertEqual(self.request(cookies={PIN_COOKIE: '1'})[0]['db'], 'default')
+        self.assertEqual(self.request(path='/admin/tournament_creator/')[0]['db'], 'default')
+
+    def test_connection_reopens_on_a_new_snapshot(self):
+        refresh(self.primary, self.replica)
+        self.request()
+        self.request()
+        self.assertEqual(self.connections[REPLICA].close.call_count, 1)
+        taken = os.stat(self.replica).st_mtime + 1
+        os.utime(self.replica, (taken, taken))
+        self.request()
+        self.assertEqual(self.connections[REPLICA].close.call_count, 2)
+
+    def test_missing_or_stale_snapshot_falls_back_to_the_primary(self):
+        seen, response = self.request()
+        self.assertEqual(seen['db'], 'default')
+        self.assertNotIn('X-Replica-Lag', response)
+
+        refresh(self.primary, self.replica)
+        stale = time.time() - 31
+        os.utime(self.replica, (stale, stale))
+        self.assertEqual(self.request()[0]['db'], 'default')
+
+    def test_cache_fills_read_the_primary(self):
+        """Shared caches are never refilled from a snapshot older than their invalidation."""
+        refresh(self.primary, self.replica)
+        loads = []
+
+        def record(*args, **kwargs):
+            loads.append(ReplicaRouter().db_for_read(Player))
+
+        def view(request):
+            with mock.patch.object(PlayerDirectory, '__init__', lambda self, rows, version=None: record()), \
+                    mock.patch('tournament_creator.location_summary.cache') as cache, \
+                    mock.patch('tournament_creator.location_summary.TournamentChart') as charts:
+                cache.get.return_value = None
+                charts.objects.order_by.return_value.values_list.return_value.annotate.return_value \
+                    .__iter__.side_effect = lambda: record() or iter([])
+                PlayerDirectory.load()
+                location_rows()
+                with primary_reads():
+                    self.assertFalse(reading_replica())
+                loads.append(ReplicaRouter().db_for_read(Player))
+            return HttpResponse()
+
+        ReplicaMiddleware(view)(RequestFactory().get('/player-directory/'))
+        self.assertEqual(loads, ['default', 'default', REPLICA])
+
+    def test_player_stamp_follows_the_snapshot_until_it_catches_up(self):
+        refresh(self.primary, self.replica)
+        version = time.time_ns()
+        cache.set(player_directory.VERSION_KEY, version, None)
+        self.addCleanup(cache.delete, player_directory.VERSION_KEY)
+        stamps = []
+
+        def view(request):
+            stamps.append(player_directory.data_stamp())
+            return HttpResponse()
+
+        ReplicaMiddleware(view)(RequestFactory().get('/tournaments/1/'))
+        taken = version / 1e9 + 1
+        os.utime(self.replica, (taken, taken))
+        ReplicaMiddleware(view)(RequestFactory().get('/tournaments/1/'))
+        self.assertEqual(stamps[1], version)
+        self.assertTrue(str(stamps[0]).startswith(f'{version}@'))
+        self.assertEqual(player_directory.data_stamp(), version)
@@ -0,0 +1,137 @@
+from django.test import TestCase, Client
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import (Matchup, MatchResultLog, MatchScore, PlayerScore, Player, TournamentArchetype,
+                      TournamentChart, User)
+from ..models.tournament_types import get_implementation
+from ..replay import rebuild, results_as_of, standings_as_of
+from ..state import build_tournament_state
+from .test_euros_format import EurosFormatTestBase
+
+
+def scores_by_key(tournament):
+    return {
+        MatchResultLog.key_for(m): (m.pair1_id, m.pair2_id, m.pair1_player1_id,
+                                    [(s.team1_score, s.team2_score) for s in m.scores.all()])
+        for m in Matchup.objects.filter(tournament_chart=tournament)
+        .select_related('stage', 'pool').prefetch_related('scores')
+    }
+
+
+class MocReplayTestBase(TestCase):
+    """A 7-player Monarch of the Court (top seeds get automatic wins) scored through the view."""
+
+    def setUp(self):
+        self.creator = User.objects.create_user(username='creator', password='test123', role='TC')
+        players = [Player.objects.create(first_name=f'M{i}', last_name='Test', ranking=i) for i in range(1, 8)]
+        archetype = TournamentArchetype.objects.get(name='7-player Monarch of the Court')
+        self.tournament = TournamentChart.objects.create(
+            name='MoC', date=timezone.now().date(), number_of_rounds=10, number_of_courts=1,
+            archetype=archetype, created_by=self.creator)
+        self.tournament.players.set(players)
+        get_implementation(archetype).generate_matchups(self.tournament, players)
+        self.matchups = list(self.tournament.matchups.order_by('round_number'))
+        self.client = Client()
+        self.client.login(username='creator', password='test123')
+
+    def record(self, matchup, team1, team2):
+        url = reverse('record_match_result', args=[self.tournament.id, matchup.id])
+        response = self.client.post(url, {'team1_scores': str(team1), 'team2_scores': str(team2), 'confirmed': '1'})
+        self.assertEqual(response.json()['status'], 'success')
+
+    def standings(self):
+        return sorted(PlayerScore.objects.filter(tournament=self.tournament).values_list(
+            'player_id', 'wins', 'matches_played', 'total_point_difference', 'automatic_wins'))
+
+
+class MocReplayTest(MocReplayTestBase):
+    def test_log_is_an_ordered_event_stream(self):
+        self.record(self.matchups[0], [15], [10])
+        self.record(self.matchups[0], [15, 8], [10, 15])
+        events = list(MatchResultLog.objects.filter(tournament=self.tournament).order_by('id'))
+        self.assertEqual([e.action for e in events], ['CREATE', 'UPDATE'])
+        self.assertIsNone(events[0].details['before'])
+        self.assertEqual(events[1].details['before'], {'team1_scores': [15], 'team2_scores': [10]})
+        self.assertEqual(events[1].matchup_key, f'0/0/{self.matchups[0].round_number}/1')
+        self.assertEqual(results_as_of(self.tournament), {events[0].matchup_key: [(15, 10), (8, 15)]})
+
+    def test_rebuild_from_the_log_alone_matches_recorded_standings(self):
+        for i, matchup in enumerate(self.matchups[:6]):
+            self.record(matchup, [15, 9 + i], [11 - i, 15])
+        self.record(self.matchups[2], [12], [15])
+        recorded_scores, recorded_standings = scores_by_key(self.tournament), self.standings()
+
+        MatchScore.objects.filter(matchup__tournament_chart=self.tournament).delete()
+        PlayerScore.objects.filter(tournament=self.tournament).delete()
+        with self.assertNumQueries(17):  # however many events: one read of the log (and its archives), bulk writes
+            self.assertEqual(rebuild(self.tournament), 7)
+        self.assertEqual(scores_by_key(self.tournament), recorded_scores)
+        self.assertEqual(self.standings(), recorded_standings)
+
+    def test_standings_as_of_an_earlier_moment(self):
+        for matchup in self.matchups[:3]:
+            self.record(matchup, [15], [7])
+        then = build_tournament_state(self.tournament)['standings']
+        moment = timezone.now()
+        for matchup in self.matchups[3:6]:
+            self.record(matchup, [9], [15])
+        now_standings = self.standings()
+
+        self.assertEqual(standings_as_of(self.tournament, moment), then)
+        # Answering the question changed nothing.
+        self.assertEqual(self.standings(), now_standings)
+
+
+class EurosReplayTestBase(EurosFormatTestBase):
+    """Scores and phase generations logged the way the views log them."""
+
+    def record_win(self, matchup, winner_pair, winner_score=11, loser_score=5):
+        before = list(matchup.scores.values_list('team1_score', 'team2_score'))
+        super().record_win(matchup, winner_pair, winner_score, loser_score)
+        matchup = Matchup.objects.select_related('stage', 'pool').get(pk=matchup.pk)
+        MatchResultLog.record_result(matchup, None, before,
+                                     list(matchup.scores.values_list('team1_score', 'team2_score')))
+
+    def play_through_finals(self):
+        for stage in self.stages[:2]:
+            self.play_stage_lower_seed_wins(stage)
+            MatchResultLog.record_advance(self.tournament, self.impl.advance_to_next_stage(self.tournament), None)
+        self.play_finals()
+
+    def final_order(self):
+        return [entry['pair'].id for entry in self.impl.get_final_standings(self.tournament)]
+
+
+class EurosReplayTest(EurosReplayTestBase):
+    def test_rebuild_regenerates_phases(self):
+        self.play_through_finals()
+        recorded, final_order = scores_by_key(self.tournament), self.final_order()
+        self.assertEqual(len(recorded), 30 + 90 + 20)
+
+        rebuild(self.tournament)
+        self.assertEqual(scores_by_key(self.tournament), recorded)
+        self.assertEqual(self.final_order(), final_order)
+        # Log entries point at the regenerated matchups again.
+        self.assertFalse(MatchResultLog.objects.filter(tournament=self.tournament, action='UPDATE',
+                                                       matchup__isnull=True).exists())
+
+    def test_rebuild_infers_phase_changes_missing_from_older_logs(self):
+        self.play_through_finals()
+        recorded = scores_by_key(self.tournament)
+        MatchResultLog.objects.filter(action='ADVANCE').delete()
+
+        rebuild(self.tournament)
+        self.assertEqual(scores_by_key(self.tournament), recorded)
+
+    def test_replay_to_before_the_finals(self):
+        for stage in self.stages[:2]:
+            self.play_stage_lower_seed_wins(stage)
+            MatchResultLog.record_advance(self.tournament, self.impl.advance_to_next_stage(self.tournament), None)
+        moment = timezone.now()
+        self.play_finals()
+
+        rebuild(self.tournament, until=moment)
+        self.assertEqual(self.stages[2].matchups.count(), 10)
+        self.assertFalse(MatchScore.objects.filter(matchup__stage=self.stages[2]).exists())
+        self.assertIsNone(self.impl.get_final_standings(self.tournament))
@@ -0,0 +1,155 @@
+import os
+import signal
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+from tournament_creator.replication import Replicator, list_generations, list_segments, restore
+
+# A scorekeeper recording a synthetic tournament: one committed transaction
+# per round, then a round that is still being written (big enough to spill
+# into the WAL) when the process gets killed.
+WRITER = '''
+import sqlite3, sys, time
+db = sqlite3.connect(sys.argv[1], isolation_level=None)
+db.execute('PRAGMA cache_size=5')
+for round_no in range(1, 9):
+    db.execute('BEGIN IMMEDIATE')
+    db.execute('UPDATE matchup SET score1 = ?, score2 = ? WHERE round = ?', (11, round_no, round_no))
+    db.execute('INSERT INTO note (body) VALUES (?)', ('round %d done ' % round_no * 40,))
+    db.execute('COMMIT')
+    print('committed', round_no, flush=True)
+    time.sleep(0.02)
+db.execute('BEGIN IMMEDIATE')
+db.executemany('INSERT INTO note (body) VALUES (?)', [('unfinished ' * 80,)] * 400)
+db.execute('UPDATE matchup SET score1 = 0')
+print('open', flush=True)
+time.sleep(60)
+'''
+
+
+def rows(path):
+    connection = sqlite3.connect(path)
+    try:
+        return (connection.execute('SELECT * FROM matchup ORDER BY id').fetchall(),
+                connection.execute('SELECT * FROM note ORDER BY id').fetchall())
+    finally:
+        connection.close()
+
+
+class ReplicationTest(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = Path(directory.name)
+        self.db = self.dir / 'db.sqlite3'
+        self.replica = self.dir / 'replica'
+        self.writer = sqlite3.connect(self.db, isolation_level=None)
+        self.addCleanup(self.writer.close)
+        self.writer.execute('PRAGMA journal_mode=WAL')
+        self.writer.execute('CREATE TABLE matchup (id INTEGER PRIMARY KEY, round INTEGER, '
+                            'score1 INTEGER, score2 INTEGER)')
+        self.writer.execute('CREATE TABLE note (id INTEGER PRIMARY KEY, body TEXT)')
+        self.writer.executemany('INSERT INTO matchup (round) VALUES (?)',
+                                [(r,) for r in range(1, 9) for _ in range(30)])
+
+    def replicator(self, **kwargs):
+        replicator = Replicator(self.db, self.replica, **kwargs)
+        replicator.open()
+        self.addCleanup(replicator.close)
+        return replicator
+
+    def restored(self, at=None):
+        output = self.dir / f'restored-{len(list(self.dir.glob("restored-*")))}.sqlite3'
+        result = restore(self.replica, output, at=at)
+        self.assertEqual(result.integrity, 'ok')
+        return rows(output)
+
+    def test_killed_writer_loses_nothing_committed(self):
+        replicator = self.replicator()
+        replicator.poll()
+        process = subprocess.Popen([sys.executable, '-c', WRITER, str(self.db)],
+                                   stdout=subprocess.PIPE, text=True)
+        self.addCleanup(process.stdout.close)
+        for line in process.stdout:
+            if line.startswith('open'):
+                break
+            replicator.poll()
+        os.kill(process.pid, signal.SIGKILL)
+        process.wait()
+
+        replicator.poll()
+        matchups, notes = self.restored()
+        self.assertEqual((matchups, notes), rows(self.db))
+        self.assertEqual(len(notes), 8)
+        self.assertTrue(all(score1 == 11 for _, _, score1, _ in matchups))
+        # Only the changed pages travelled, never the whole database again.
+        generation = list_generations(self.replica)[0]
+        self.assertGreater(len(list_segments(self.replica, generation)), 1)
+
+    def test_point_in_time_restore(self):
+        replicator = self.replicator()
+        replicator.poll()
+        self.writer.execute('UPDATE matchup SET score1 = 11 WHERE round = 1')
+        replicator.poll()
+        moment = time.time()
+        time.sleep(0.01)
+        self.writer.execute('UPDATE matchup SET score1 = 11 WHERE round = 2')
+        replicator.poll()
+
+        earlier, _ = self.restored(at=moment)
+        self.assertEqual({r for _, r, score1, _ in earlier if score1}, {1})
+        latest, _ = self.restored()
+        self.assertEqual({r for _, r, score1, _ in latest if score1}, {1, 2})
+
+    def test_checkpoints_restart_the_wal_within_the_generation(self):
+        replicator = self.replicator(checkpoint_pages=5)
+        replicator.poll()
+        for i in range(60):
+            self.writer.execute('INSERT INTO note (body) VALUES (?)', (f'{i} ' * 300,))
+            replicator.poll()
+        replicator.poll()
+        self.assertLess(replicator.position.frames, 10)
+        self.assertEqual(len(list_generations(self.replica)), 1)
+        self.assertEqual(self.restored(), rows(self.db))
+
+    def test_restart_resumes_or_starts_a_new_generation(self):
+        replicator = self.replicator()
+        replicator.poll()
+        replicator.close()
+        self.writer.execute('UPDATE matchup SET score1 = 5')
+
+        # The WAL is untouched since: carry on where the last run stopped.
+        replicator = self.replicator()
+        first = replicator.generation
+        replicator.poll()
+        self.assertEqual(list_generations(self.replica), [first])
+        replicator.close()
+
+        # A checkpoint restarted the WAL while nobody was shipping it.
+        self.writer.execute('UPDATE matchup SET score2 = 7')
+        self.writer.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+        self.writer.execute('UPDATE matchup SET score2 = 8')
+        replicator = self.replicator()
+        replicator.poll()
+        self.assertEqual(len(list_generations(self.replica)), 2)
+        self.assertNotEqual(replicator.generation, first)
+        self.assertEqual(self.restored(), rows(self.db))
+
+    def test_restore_command(self):
+        self.replicator().poll()
+        out = StringIO()
+        call_command('restore_replica', replica=str(self.replica), list=True, stdout=out)
+        self.assertIn('(0 segments)', out.getvalue())
+        output = self.dir / 'out.sqlite3'
+        call_command('restore_replica', replica=str(self.replica), output=str(output), stdout=out)
+        self.assertIn('integrity check ok', out.getvalue())
+        self.assertEqual(rows(output), rows(self.db))
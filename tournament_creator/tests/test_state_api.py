@@ -0,0 +1,114 @@
+"""Tests for the compact JSON tournament state endpoint and results versioning."""
+from django.test import TestCase, Client
+from django.urls import reverse
+
+from ..models import Pair, Player, TournamentArchetype, TournamentChart, User
+from ..models.tournament_types import EurosFormat
+from ..state import build_tournament_state
+
+
+class TournamentStateTests(TestCase):
+    """A 20-pair Euros tournament with phase 1 generated, viewed by its creator."""
+
+    def setUp(self):
+        self.impl = EurosFormat()
+        self.creator = User.objects.create_user(username='creator', password='test123', role='TC')
+        self.pairs = []
+        for i in range(1, 21):
+            player1 = Player.objects.create(first_name=f'P{i}a', last_name='Test', ranking=i * 2 - 1)
+            player2 = Player.objects.create(first_name=f'P{i}b', last_name='Test', ranking=i * 2)
+            self.pairs.append(Pair.objects.create(player1=player1, player2=player2, seed=i, entry_order=i))
+        self.tournament = TournamentChart.objects.create(
+            name='Euros Test', date='2026-07-01', number_of_rounds=self.impl.calculate_rounds(20),
+            number_of_courts=self.impl.calculate_courts(20), number_of_stages=3,
+            archetype=TournamentArchetype.objects.get(name="20 pairs euros format"),
+            created_by=self.creator, is_sandbox=True,
+        )
+        self.tournament.pairs.set(self.pairs)
+        stages = self.impl.create_stages(self.tournament)
+        self.impl.generate_matchups(self.tournament, self.pairs, stage=stages[0])
+        self.matchup = stages[0].matchups.order_by('id').first()
+        self.url = reverse('tournament_state', args=[self.tournament.id])
+        self.client = Client()
+        self.client.login(username='creator', password='test123')
+
+    def record(self, matchup, team1='[21]', team2='[15]'):
+        url = reverse('record_match_result', args=[self.tournament.id, matchup.id])
+        return self.client.post(url, {'team1_scores': team1, 'team2_scores': team2}).json()
+
+    def test_full_snapshot(self):
+        state = build_tournament_state(self.tournament)
+        self.assertTrue(state['full'])
+        self.assertEqual(state['version'], 0)
+        self.assertEqual(len(state['matchups']), 30)
+        self.assertEqual(len(state['names']['pairs']), 20)
+        self.assertEqual(len(state['names']['players']), 40)
+        self.assertEqual(len(state['standings']['pools']), 5)
+        self.assertIsNone(state['standings']['final'])
+        entry = next(m for m in state['matchups'] if m['id'] == self.matchup.id)
+        self.assertEqual(entry['scores'], [])
+        self.assertEqual(entry['pair1'], self.matchup.pair1_id)
+        self.assertTrue(entry['rules'])
+
+    def test_recording_bumps_version_and_delta(self):
+        data = self.record(self.matchup)
+        self.assertEqual(data['status'], 'success')
+        self.assertEqual(data['results_version'], 1)
+        self.tournament.refresh_from_db()
+        self.matchup.refresh_from_db()
+        self.assertEqual(self.tournament.results_version, 1)
+        self.assertEqual(self.matchup.results_version, 1)
+
+        response = self.client.get(self.url, {'since': 0})
+        state = response.json()
+        self.assertFalse(state['full'])
+        self.assertNotIn('names', state)
+        self.assertEqual([m['id'] for m in state['matchups']], [self.matchup.id])
+        self.assertEqual(state['matchups'][0]['scores'], [[21, 15]])
+        self.assertEqual(len(state['matchup_ids']), 30)
+
+        state = self.client.get(self.url, {'since': 1}).json()
+        self.assertEqual(state['matchups'], [])
+
+    def test_future_since_falls_back_to_full(self):
+        state = self.client.get(self.url, {'since': 99}).json()
+        self.assertTrue(state['full'])
+        self.assertIn('names', state)
+
+    def test_invalid_since(self):
+        self.assertEqual(self.client.get(self.url, {'since': 'x'}).status_code, 400)
+
+    def test_conditional_get(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertIn('private', response['Cache-Control'])
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self.record(self.matchup)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_settings_edit_changes_etag(self):
+        etag = self.client.get(self.url)['ETag']
+        self.tournament.name_display_format = 'LAST'
+        self.tournament.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_player_rename_changes_etag_and_snapshot(self):
+        etag = self.client.get(self.url)['ETag']
+        player = self.pairs[0].player1
+        with self.captureOnCommitCallbacks(execute=True):
+            player.first_name = 'Renamed'
+            player.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Renamed', response.json()['names']['players'][str(player.pk)])
+
+    def test_requires_login(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
@@ -0,0 +1,75 @@
+import json
+import shutil
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.urls import reverse
+
+from ..static_site import build_site
+from .test_replay import EurosReplayTestBase, MocReplayTestBase
+
+
+class StaticSiteTest(MocReplayTestBase):
+    """The static copy of a 7-player Monarch of the Court, kept up to date incrementally."""
+
+    def setUp(self):
+        super().setUp()
+        self.directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.page = self.directory / 't' / str(self.tournament.pk) / 'index.html'
+
+    def test_build_renders_pages_and_the_state(self):
+        self.record(self.matchups[0], [15], [9])
+        result = build_site(self.directory)
+        self.assertEqual(result.written, [self.tournament.pk])
+
+        index = (self.directory / 'index.html').read_text()
+        self.assertIn(f'href="t/{self.tournament.pk}/index.html"', index)
+        page = self.page.read_text()
+        self.assertIn('MoC', page)
+        self.assertIn('15–9', page)
+        self.assertIn('href="../../index.html"', page)
+        # state.json is what the state API serves.
+        api = self.client.get(reverse('tournament_state', args=[self.tournament.pk])).json()
+        self.assertEqual(json.loads((self.page.parent / 'state.json').read_text())['standings'], api['standings'])
+
+    def test_only_changed_tournaments_are_rendered_again(self):
+        build_site(self.directory)
+        with self.assertNumQueries(1):
+            result = build_site(self.directory)
+        self.assertEqual((result.written, result.unchanged), ([], 1))
+
+        self.record(self.matchups[1], [15], [12])
+        self.assertEqual(build_site(self.directory).written, [self.tournament.pk])
+        self.assertIn('15–12', self.page.read_text())
+
+    def test_pages_of_unlisted_tournaments_are_removed(self):
+        build_site(self.directory)
+        self.tournament.archived = True
+        self.tournament.save()
+        result = build_site(self.directory)
+        self.assertEqual(result.removed, [self.tournament.pk])
+        self.assertFalse(self.page.parent.exists())
+        self.assertNotIn('MoC', (self.directory / 'index.html').read_text())
+
+    def test_command_reports_what_it_did(self):
+        out = StringIO()
+        call_command('build_static_site', '--output', str(self.directory), stdout=out)
+        self.assertIn('rendered 1, removed 0, unchanged 0', out.getvalue())
+        out = StringIO()
+        call_command('build_static_site', '--output', str(self.directory), '--force', stdout=out)
+        self.assertIn('rendered 1,', out.getvalue())
+
+
+class MultiPhaseStaticSiteTest(EurosReplayTestBase):
+    def test_pool_tables_and_final_standings(self):
+        self.play_through_finals()
+        directory = Path(tempfile.mkdtemp())
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        build_site(directory)
+        page = (directory / 't' / str(self.tournament.pk) / 'index.html').read_text()
+        self.assertIn('Final standings', page)
+        for pool in self.stages[0].pools.all():
+            self.assertIn(pool.name, page)
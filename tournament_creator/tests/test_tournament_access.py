@@ -3,8 +3,12 @@ from django.test import TestCase, Client
 from django.urls import reverse
 from django.utils import timezone
 
+from django.test import RequestFactory
+
+from ..access import TournamentAccess, get_tournament_access
 from ..forms import TournamentCreationForm
-from ..models import Player, TournamentChart, TournamentDirector, User
+from ..location_summary import known_locations, location_facets
+from ..models import Pair, Player, TournamentChart, TournamentDirector, User
 
 
 class LocationMetadataTests(TestCase):
@@ -137,6 +141,18 @@ class LocationFilterTests(TestCase):
         counts = {option['value']: option['count'] for option in response.context['country_options']}
         self.assertEqual(counts, {'Finland': 2, 'Germany': 1})
 
+    def test_location_summary_is_cached_until_a_tournament_changes(self):
+        self.assertEqual(location_facets()[0], [{'value': 'Finland', 'count': 2},
+                                                 {'value': 'Germany', 'count': 1}])
+        with self.assertNumQueries(0):
+            location_facets('Finland')
+        berlin = TournamentChart.objects.get(place='Berlin')
+        berlin.archived = True
+        berlin.save()
+        self.assertEqual(location_facets()[0], [{'value': 'Finland', 'count': 2}])
+        # Archived tournaments still suggest their spellings on the creation form.
+        self.assertEqual(known_locations(), (['Berlin', 'Helsinki', 'Tampere'], ['Finland', 'Germany']))
+
 
 class TournamentCreatorRoleTests(TestCase):
     """Only tournament creators and global admins can create tournaments."""
@@ -302,3 +318,71 @@ class DirectorRightsTests(TestCase):
         self.tournament.save()
         self.assertTrue(self.tournament.user_can_edit_results(self.creator))
         self.assertFalse(self.tournament.user_can_edit_results(self.other_creator))
+
+
+class TournamentAccessTests(TestCase):
+    """A user's role in a tournament is resolved in one query and memoized per request."""
+
+    def setUp(self):
+        self.creator = User.objects.create_user(username='creator', password='test123', role=User.Role.TOURNAMENT_CREATOR)
+        self.director = User.objects.create_user(username='director', password='test123', role=User.Role.PLAYER)
+        self.competitor = User.objects.create_user(username='competitor', password='test123', role=User.Role.PLAYER)
+        self.outsider = User.objects.create_user(username='outsider', password='test123', role=User.Role.PLAYER)
+        player1 = Player.objects.create(first_name='Comp', last_name='Etitor', ranking=1, user=self.competitor)
+        player2 = Player.objects.create(first_name='Part', last_name='Ner', ranking=2)
+        self.tournament = TournamentChart.objects.create(
+            name='Access Tournament', place='Helsinki', country='Finland',
+            date=timezone.now().date(), number_of_rounds=1, number_of_courts=1,
+            created_by=self.creator,
+        )
+        self.tournament.pairs.add(Pair.objects.create(player1=player2, player2=player1))
+        TournamentDirector.objects.create(tournament=self.tournament, user=self.director)
+
+    def test_roles_are_resolved_in_a_single_query(self):
+        access = TournamentAccess(self.tournament, self.competitor)
+        with self.assertNumQueries(1):
+            self.assertTrue(access.can_edit_results)
+            self.assertFalse(access.can_administer)
+            self.assertTrue(access.is_participant)
+            self.assertFalse(access.is_director)
+            self.assertFalse(access.results_locked_past)
+
+    def test_creator_needs_no_query(self):
+        access = TournamentAccess(self.tournament, self.creator)
+        with self.assertNumQueries(0):
+            self.assertTrue(access.can_administer)
+            self.assertTrue(access.can_edit_results)
+
+    def test_director_and_outsider(self):
+        self.assertTrue(TournamentAccess(self.tournament, self.director).can_administer)
+        outsider = TournamentAccess(self.tournament, self.outsider)
+        self.assertFalse(outsider.can_edit_results)
+        self.assertFalse(outsider.is_participant)
+
+    def test_access_is_memoized_on_the_request(self):
+        request = RequestFactory().get('/')
+        request.user = self.competitor
+        access = get_tournament_access(request, self.tournament)
+        self.assertTrue(access.can_edit_results)
+        with self.assertNumQueries(0):
+            again = get_tournament_access(request, self.tournament)
+            self.assertIs(again, access)
+            self.assertFalse(again.can_administer)
+
+    def test_past_tournament_denial_message(self):
+        from datetime import timedelta
+        self.tournament.date = timezone.now().date() - timedelta(days=3)
+        self.tournament.save()
+        access = TournamentAccess(self.tournament, self.competitor)
+        self.assertFalse(access.can_edit_results)
+        self.assertTrue(access.results_locked_past)
+        self.assertIn('in the past', access.edit_denied_message)
+
+    def test_detail_view_shares_the_access_object(self):
+        client = Client()
+        client.login(username='competitor', password='test123')
+        response = client.get(reverse('tournament_detail', kwargs={'pk': self.tournament.pk}))
+        self.assertEqual(response.status_code, 200)
+        self.assertIsInstance(response.context['access'], TournamentAccess)
+        self.assertTrue(response.context['can_record_scores'])
+        self.assertFalse(response.context['can_administer'])
@@ -1,3 +1,5 @@
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
 from django.test import TestCase, SimpleTestCase, Client
 from django.urls import reverse
 from datetime import timedelta
@@ -7,9 +9,10 @@ from ..models.notifications import NotificationBackendSetting # Added
 from ..models.logging import MatchResultLog
 from ..models.scoring import PlayerScore
 from ..forms import TournamentCreationForm # Added
-from ..views.tournament_views import _score_rule_warnings
+from ..score_rules import score_rule_warnings
 from django.utils import timezone
 from django.db.models import Max
+from .test_replay import MocReplayTestBase
 
 class ViewTests(TestCase):
     def setUp(self):
@@ -364,6 +367,47 @@ class TournamentListTabsTests(TestCase):
         past_names = {t.name for t in response.context['past_tournaments']}
         self.assertNotIn('Iloranta Open', past_names)
 
+    def test_tabs_page_through_with_a_cursor(self):
+        today = timezone.now().date()
+        for i in range(4):
+            TournamentChart.objects.create(
+                name=f'Old Cup {i}', date=today - timedelta(days=100 + i),
+                number_of_rounds=7, number_of_courts=2)
+        self.client.login(username='spectator_test', password='test123')
+
+        with patch('tournament_creator.views.tournament_views.TournamentListView.page_size', 2):
+            response = self.client.get(reverse('tournament_list'), {'country': ''})
+            names = [t.name for t in response.context['past_tournaments']]
+            self.assertEqual(names, ['Past Cup', 'Old Cup 0'])
+            # Badges count the whole tab, not the page.
+            self.assertEqual(response.context['tab_counts'], {'upcoming': 2, 'past': 5, 'archived': 1})
+            next_url = response.context['past_next_url']
+            self.assertIn('country=', next_url)  # the filter is kept
+
+            response = self.client.get(reverse('tournament_list') + next_url)
+            names = [t.name for t in response.context['past_tournaments']]
+            self.assertEqual(names, ['Old Cup 1', 'Old Cup 2'])
+            response = self.client.get(reverse('tournament_list') + response.context['past_next_url'])
+            self.assertEqual([t.name for t in response.context['past_tournaments']], ['Old Cup 3'])
+            self.assertIsNone(response.context['past_next_url'])
+            # The upcoming tab kept its first page throughout.
+            self.assertEqual([t.name for t in response.context['upcoming_tournaments']],
+                             ['Ongoing Cup', 'Upcoming Cup'])
+
+    def test_query_count_does_not_grow_with_tournaments(self):
+        today = timezone.now().date()
+        for i in range(30):
+            TournamentChart.objects.create(
+                name=f'Old Cup {i}', date=today - timedelta(days=100 + i),
+                number_of_rounds=7, number_of_courts=2)
+        self.client.login(username='admin_test', password='test123')
+        self.client.get(reverse('tournament_list'))  # caches the location summary
+        # session, user, ETag aggregate, upcoming page, past page, tab counts,
+        # archived page (admins only).
+        with self.assertNumQueries(7):
+            response = self.client.get(reverse('tournament_list'))
+        self.assertEqual(len(response.context['past_tournaments']), 24)
+
 class ScoreRuleWarningsTests(SimpleTestCase):
     """Unit tests for the warn-and-confirm score validation logic."""
 
@@ -372,10 +416,10 @@ class ScoreRuleWarningsTests(SimpleTestCase):
     SETS_FREE = {'points_to': 21, 'cap': 23, 'best_of': None}
 
     def assertConforms(self, rules, team1, team2):
-        self.assertEqual(_score_rule_warnings(rules, team1, team2), [])
+        self.assertEqual(score_rule_warnings(rules, team1, team2), [])
 
     def assertFlagged(self, rules, team1, team2, expected_warnings=1):
-        warnings = _score_rule_warnings(rules, team1, team2)
+        warnings = score_rule_warnings(rules, team1, team2)
         self.assertEqual(len(warnings), expected_warnings,
                          f"{team1} vs {team2}: {warnings}")
 
@@ -556,3 +600,241 @@ class PlayerCreateTests(TestCase):
         self.assertTemplateUsed(response, 'tournament_creator/player_list.html')
         self.assertContains(response, 'Alice')
         self.assertContains(response, '100.0')
+
+
+class ConditionalGetTests(TestCase):
+    """Tournament pages answer 304 until the tournament changes."""
+
+    def setUp(self):
+        self.client = Client()
+        self.user = User.objects.create_user(username='etag_spectator', password='test123', role='SPECTATOR')
+        self.other = User.objects.create_user(username='etag_other', password='test123', role='SPECTATOR')
+        self.players = [
+            Player.objects.create(first_name=f'E{i}', last_name='Tag', ranking=i + 1)
+            for i in range(4)
+        ]
+        self.tournament = TournamentChart.objects.create(
+            name='Validator Cup', date=timezone.now().date(),
+            number_of_rounds=3, number_of_courts=1, is_sandbox=True,
+        )
+        self.tournament.players.set(self.players)
+        self.matchup = Matchup.objects.create(
+            tournament_chart=self.tournament, round_number=1, court_number=1,
+            pair1_player1=self.players[0], pair1_player2=self.players[1],
+            pair2_player1=self.players[2], pair2_player2=self.players[3])
+        self.detail_url = reverse('tournament_detail', args=[self.tournament.pk])
+        self.client.login(username='etag_spectator', password='test123')
+
+    def revalidate(self, url):
+        etag = self.client.get(url)['ETag']
+        return etag, self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    def test_unchanged_pages_are_not_modified(self):
+        for url in (self.detail_url, reverse('tournament_list'),
+                    reverse('tournament_download_results', args=[self.tournament.pk])):
+            etag, response = self.revalidate(url)
+            self.assertEqual(response.status_code, 304, url)
+            self.assertIn('no-cache', response['Cache-Control'])
+
+    def test_not_modified_skips_the_standings_code(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        with self.assertNumQueries(3):  # session, user, tournament stamp
+            response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_recording_a_result_changes_the_etag(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        list_etag = self.client.get(reverse('tournament_list'))['ETag']
+        self.client.post(reverse('record_match_result', args=[self.tournament.pk, self.matchup.pk]),
+                         {'team1_scores': '[21]', 'team2_scores': '[15]'})
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        self.assertEqual(
+            self.client.get(reverse('tournament_list'), HTTP_IF_NONE_MATCH=list_etag).status_code, 200)
+
+    def test_settings_save_changes_the_etag(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        self.tournament.name = 'Renamed Cup'
+        self.tournament.save()
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_player_rename_changes_the_etag(self):
+        etags = {url: self.client.get(url)['ETag'] for url in (
+            self.detail_url, reverse('tournament_list'),
+            reverse('tournament_download_results', args=[self.tournament.pk]))}
+        with self.captureOnCommitCallbacks(execute=True):
+            self.players[0].first_name = 'Renamed'
+            self.players[0].save()
+        for url, etag in etags.items():
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200, url)
+
+    def test_etag_is_per_user(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        self.client.login(username='etag_other', password='test123')
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_pending_messages_bypass_validation(self):
+        etag = self.client.get(self.detail_url)['ETag']
+        # A refused settings visit redirects back with a flash message but
+        # changes nothing; the message must still be shown.
+        self.client.get(reverse('tournament_settings', args=[self.tournament.pk]))
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('ETag', response)
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+
+class LeagueScheduleTests(TestCase):
+    """Match dates for league tournaments: batched edits and the calendar generator."""
+
+    def setUp(self):
+        self.client = Client()
+        User.objects.create_user(username='league_admin', password='test123', role='ADMIN')
+        players = [Player.objects.create(first_name=f'L{i}', last_name='League', ranking=i + 1) for i in range(4)]
+        self.tournament = TournamentChart.objects.create(
+            name='Winter League', date=timezone.now().date(), format_type='LEAGUE',
+            number_of_rounds=5, number_of_courts=1,
+        )
+        self.matchups = [
+            Matchup.objects.create(
+                tournament_chart=self.tournament, round_number=round_number, court_number=1,
+                pair1_player1=players[0], pair1_player2=players[1],
+                pair2_player1=players[2], pair2_player2=players[3])
+            for round_number in range(1, 6)
+        ]
+        self.url = reverse('tournament_settings', args=[self.tournament.pk])
+        self.client.login(username='league_admin', password='test123')
+
+    def schedule(self):
+        return [(m.match_date and m.match_date.isoformat(), m.match_time and m.match_time.strftime('%H:%M'))
+                for m in Matchup.objects.filter(tournament_chart=self.tournament).order_by('round_number')]
+
+    def test_only_changed_matches_are_written(self):
+        Matchup.objects.filter(pk=self.matchups[0].pk).update(match_date='2026-01-05')
+        data = {f'match_date_{m.pk}': '' for m in self.matchups}
+        data[f'match_date_{self.matchups[0].pk}'] = '2026-01-05'  # unchanged
+        data[f'match_date_{self.matchups[1].pk}'] = '2026-01-12'
+        data[f'match_time_{self.matchups[1].pk}'] = '18:30'
+        data[f'match_date_{self.matchups[2].pk}'] = 'not a date'
+        response = self.client.post(self.url, data)
+        self.assertRedirects(response, reverse('tournament_detail', args=[self.tournament.pk]))
+        self.assertEqual(self.schedule()[:3], [('2026-01-05', None), ('2026-01-12', '18:30'), (None, None)])
+        # Only the changed match is stamped for delta consumers.
+        versions = dict(Matchup.objects.values_list('pk', 'results_version'))
+        self.assertEqual(versions[self.matchups[0].pk], 0)
+        self.assertGreater(versions[self.matchups[1].pk], 0)
+
+    def test_unchanged_submission_writes_nothing(self):
+        data = {f'match_date_{m.pk}': '' for m in self.matchups}
+        self.client.get(self.url)
+        # session, user, tournament, matchups: no UPDATE of either.
+        with self.assertNumQueries(4):
+            self.client.post(self.url, data)
+        self.assertEqual(TournamentChart.objects.get(pk=self.tournament.pk).results_version, 0)
+
+    def test_calendar_generator(self):
+        Matchup.objects.filter(pk=self.matchups[4].pk).update(match_date='2026-03-01')
+        response = self.client.post(self.url, {
+            'generate_calendar': '', 'first_day': '2026-01-07', 'every_days': 7,
+            'courts_per_day': 2, 'start_time': '19:00', 'only_unscheduled': 'on',
+        })
+        self.assertRedirects(response, reverse('tournament_detail', args=[self.tournament.pk]))
+        self.assertEqual(self.schedule(), [
+            ('2026-01-07', '19:00'), ('2026-01-07', '19:00'),
+            ('2026-01-14', '19:00'), ('2026-01-14', '19:00'),
+            ('2026-03-01', None),  # already scheduled, left alone
+        ])
+
+    def test_calendar_generator_rejects_bad_input(self):
+        response = self.client.post(self.url, {
+            'generate_calendar': '', 'first_day': '', 'every_days': 0, 'courts_per_day': 2,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.context['calendar_form'].errors)
+        self.assertEqual(self.schedule()[0], (None, None))
+
+
+class TournamentStructureTests(MocReplayTestBase):
+    """The seed grid shown with show_structure, built from the loaded matchups and cached."""
+
+    def setUp(self):
+        super().setUp()
+        self.tournament.show_structure = True
+        self.tournament.save()
+
+    def structure(self):
+        response = self.client.get(reverse('tournament_detail', args=[self.tournament.pk]))
+        return response.context['tournament_structure']
+
+    def test_grid_has_a_cell_per_round_and_court(self):
+        structure = self.structure()
+        self.assertEqual(structure['court_numbers'], [1])
+        self.assertEqual([r['round_number'] for r in structure['rounds']],
+                         sorted({m.round_number for m in self.matchups}))
+        first = self.matchups[0]
+        seeds = [p.ranking for p in (first.pair1_player1, first.pair1_player2, first.pair2_player1,
+                                     first.pair2_player2)]
+        self.assertEqual(structure['rounds'][0]['matchups'], [f'{seeds[0]}&{seeds[1]} vs {seeds[2]}&{seeds[3]}'])
+
+    def test_grid_survives_score_writes(self):
+        structure = self.structure()
+        self.record(self.matchups[0], [15], [9])
+        with patch('tournament_creator.views.tournament_views.TournamentDetailView._format_matchup_structure') as fmt:
+            self.assertEqual(self.structure(), structure)
+        fmt.assert_not_called()
+
+
+class TournamentDetailFragmentTests(MocReplayTestBase):
+    """Schedule, standings and players fragments are cached per change stamp and viewer permission."""
+
+    def detail(self, client=None):
+        response = (client or self.client).get(reverse('tournament_detail', args=[self.tournament.pk]))
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def schedule_key(self, response, can_record):
+        return make_template_fragment_key('tournament_schedule', [
+            self.tournament.pk, response.context['fragment_stamp'], can_record])
+
+    def test_fragments_are_reused_until_a_write(self):
+        response = self.detail()
+        key = self.schedule_key(response, True)
+        self.assertIsNotNone(cache.get(key))
+        self.assertEqual(self.detail().context['fragment_stamp'], response.context['fragment_stamp'])
+
+        self.record(self.matchups[0], [15], [9])
+        response = self.detail()
+        self.assertNotEqual(self.schedule_key(response, True), key)
+        self.assertContains(response, '<strong>15</strong>', html=True)
+
+    def test_player_changes_outside_the_tournament_reach_the_fragments(self):
+        self.tournament.show_structure = True
+        self.tournament.save()
+        response = self.detail()
+        first = response.context['tournament_structure']['rounds'][0]['matchups'][0]
+        etag = response['ETag']
+
+        playing = {m.pk for m in (self.matchups[0].pair1_player1, self.matchups[0].pair1_player2,
+                                  self.matchups[0].pair2_player1, self.matchups[0].pair2_player2)}
+        player = self.matchups[0].pair1_player1
+        benched = self.tournament.players.exclude(pk__in=playing).first()
+        with self.captureOnCommitCallbacks(execute=True):
+            player.first_name = 'Renamed'
+            player.ranking, benched.ranking = benched.ranking, player.ranking
+            player.save()
+            benched.save()
+
+        # A browser revalidating its copy gets the re-keyed fragments, not a 304.
+        response = self.client.get(reverse('tournament_detail', args=[self.tournament.pk]),
+                                   HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        reseeded = response.context['tournament_structure']['rounds'][0]['matchups'][0]
+        self.assertNotEqual(reseeded, first)
+        self.assertContains(response, f'<td>{reseeded}</td>', html=True)
+        self.assertContains(response, 'Renamed')
+
+    def test_record_buttons_only_for_viewers_who_can_record(self):
+        self.assertContains(self.detail(), 'data-matchup-id')
+        User.objects.create_user(username='watcher', password='test123', role='SPECTATOR')
+        spectator = Client()
+        spectator.login(username='watcher', password='test123')
+        self.assertNotContains(self.detail(spectator), 'data-matchup-id')
@@ -0,0 +1,378 @@
+"""
+Standings order for tied players.
+
+The detail page, the state API and the results export all sort PlayerScore
+rows through ``apply_tiebreaks``; the rules for each kind of tournament are
+in its docstring.
+"""
+from .models.base_models import Matchup
+from .models.scoring import ManualTiebreakResolution
+
+
+def apply_tiebreaks(tournament, player_scores):
+    """
+    Apply proper tiebreak analysis to sort players with equal wins.
+
+    For Monarch of the Court (MoC) tournaments:
+    1. Overall wins
+    2. Head-to-head W/L ratio against other tied players
+    3. Point differential in games against other tied players
+    4. Manual resolution (requires UI implementation)
+
+    For other tournaments (Swedish pairs, etc.):
+    1. Overall wins
+    2. Head-to-head record between tied players
+    3. Point differential in games between tied players
+    4. Record against teams that placed above the initial set of tied teams
+    5. Point differential in games against teams that placed above the initial set of tied teams
+    6. Point differential in games against all teams in the pool
+    """
+    # Check if this is a MoC tournament by examining matchup structure
+    is_moc_tournament = _is_moc_tournament(tournament)
+
+    if is_moc_tournament:
+        return _apply_moc_tiebreaks(tournament, player_scores)
+    else:
+        return _apply_pairs_tiebreaks(tournament, player_scores)
+
+
+def _is_moc_tournament(tournament):
+    """
+    Determine if this is a MoC tournament by checking matchup structure.
+    MoC tournaments use individual player fields, pairs tournaments use pair fields.
+    """
+    sample_matchup = tournament.matchups.first()
+    if sample_matchup:
+        # If it uses individual player fields, it's MoC
+        return (sample_matchup.pair1_player1_id is not None or
+                sample_matchup.pair1_player2_id is not None)
+    return False
+
+
+def _apply_moc_tiebreaks(tournament, player_scores):
+    """
+    Apply MoC-specific tiebreak logic:
+    1. Overall wins (already sorted)
+    2. W/L ratio in games against other tied players
+    3. Point differential in games against other tied players
+    4. Manual resolution (to be implemented)
+    """
+    # First sort by wins and total point differential (basic sort)
+    sorted_scores = sorted(player_scores, key=lambda x: (-x.wins, -x.total_point_difference))
+
+    # Look for groups of players with the same number of wins
+    groups_of_tied_players = []
+    current_group = []
+    current_wins = None
+
+    for score in sorted_scores:
+        if current_wins is None or score.wins == current_wins:
+            current_group.append(score)
+            current_wins = score.wins
+        else:
+            if len(current_group) > 1:  # Only record groups with ties
+                groups_of_tied_players.append(list(current_group))
+            current_group = [score]
+            current_wins = score.wins
+
+    # Add the last group if it has ties
+    if len(current_group) > 1:
+        groups_of_tied_players.append(list(current_group))
+
+    # No ties, return the basic sort
+    if not groups_of_tied_players:
+        return sorted_scores
+
+    # Get all matchups in this tournament with scores
+    all_matchups = Matchup.objects.filter(
+        tournament_chart=tournament,
+        scores__isnull=False
+    ).prefetch_related('scores').distinct()
+
+    # Process each group of tied players
+    for group in groups_of_tied_players:
+        wins_level = group[0].wins
+        tied_player_ids = [score.player.id for score in group]
+
+        # Check if there's a manual resolution for this win level
+        manual_resolution = None
+        try:
+            manual_resolution = ManualTiebreakResolution.objects.get(
+                tournament=tournament,
+                wins_tied_at=wins_level
+            )
+        except ManualTiebreakResolution.DoesNotExist:
+            pass
+
+        # Create a record structure to hold MoC tiebreak criteria
+        tiebreak_records = {player_id: {
+            'h2h_wins': 0,                 # Head-to-head wins against tied players
+            'h2h_losses': 0,               # Head-to-head losses against tied players
+            'h2h_point_diff': 0,           # Head-to-head point differential against tied players
+            'needs_manual_resolution': False  # Flag for manual resolution
+        } for player_id in tied_player_ids}
+
+        # Check each matchup to see if it involves tied players
+        for matchup in all_matchups:
+            # Identify players in team 1 and team 2
+            team1_players = set()
+            team2_players = set()
+            if matchup.pair1_player1_id: team1_players.add(matchup.pair1_player1_id)
+            if matchup.pair1_player2_id: team1_players.add(matchup.pair1_player2_id)
+            if matchup.pair2_player1_id: team2_players.add(matchup.pair2_player1_id)
+            if matchup.pair2_player2_id: team2_players.add(matchup.pair2_player2_id)
+
+            # Find tied players in this matchup
+            tied_in_team1 = team1_players.intersection(tied_player_ids)
+            tied_in_team2 = team2_players.intersection(tied_player_ids)
+
+            # Only count games between tied players (head-to-head)
+            is_h2h_match = len(tied_in_team1) > 0 and len(tied_in_team2) > 0
+
+            if is_h2h_match:
+                # Process all sets in this matchup
+                for set_score in matchup.scores.all():
+                    team1_won = set_score.winning_team == 1
+
+                    # Process each tied player's results against other tied players
+                    for player_id in tied_player_ids:
+                        on_team1 = player_id in team1_players
+                        on_team2 = player_id in team2_players
+
+                        if not (on_team1 or on_team2):
+                            continue  # This player wasn't in this match
+
+                        # Calculate point differential from this player's perspective
+                        pd = set_score.point_difference
+                        if (on_team1 and not team1_won) or (on_team2 and team1_won):
+                            pd = -pd  # This player's team lost, so negate the PD
+                            tiebreak_records[player_id]['h2h_losses'] += 1
+                        else:
+                            tiebreak_records[player_id]['h2h_wins'] += 1
+
+                        tiebreak_records[player_id]['h2h_point_diff'] += pd
+
+        # Sort tied players using MoC tiebreak criteria
+        def moc_sort_key(score):
+            player_id = score.player.id
+            h2h_wins = tiebreak_records[player_id]['h2h_wins']
+            h2h_losses = tiebreak_records[player_id]['h2h_losses']
+
+            # Calculate W/L ratio (avoid division by zero)
+            if h2h_losses == 0:
+                h2h_ratio = float('inf') if h2h_wins > 0 else 0
+            else:
+                h2h_ratio = h2h_wins / h2h_losses
+
+            return (
+                -h2h_ratio,  # Higher W/L ratio is better
+                -tiebreak_records[player_id]['h2h_point_diff']  # Higher point diff is better
+            )
+
+        group.sort(key=moc_sort_key)
+
+        # Store the tiebreak info for display
+        for score in group:
+            player_id = score.player.id
+            score.h2h_wins = tiebreak_records[player_id]['h2h_wins']
+            score.h2h_losses = tiebreak_records[player_id]['h2h_losses']
+            score.h2h_point_diff = tiebreak_records[player_id]['h2h_point_diff']
+
+            # Calculate ratio for display
+            if score.h2h_losses == 0:
+                score.h2h_ratio = float('inf') if score.h2h_wins > 0 else 0
+            else:
+                score.h2h_ratio = score.h2h_wins / score.h2h_losses
+
+        # If manual resolution exists, apply it now (after tiebreak stats are calculated)
+        if manual_resolution:
+            # Get the automatic order before manual override
+            auto_order = [score.player.id for score in group]
+
+            # Apply manual order
+            player_order = {player_id: idx for idx, player_id in enumerate(manual_resolution.resolved_order)}
+            group.sort(key=lambda score: player_order.get(score.player.id, 999))
+
+            # Get manual order after sorting
+            manual_order = [score.player.id for score in group]
+
+            # Mark as manually resolved only if order differs from automatic
+            order_differs = auto_order != manual_order
+
+            for score in group:
+                score.manually_resolved = order_differs
+                score.manual_resolution_reason = manual_resolution.reason if order_differs else None
+
+    # Rebuild the complete standings with tiebreak-sorted groups
+    return _rebuild_standings(sorted_scores, groups_of_tied_players)
+
+
+def _apply_pairs_tiebreaks(tournament, player_scores):
+    """
+    Apply the existing 6-step tiebreak logic for pairs tournaments.
+    """
+    # First sort by wins and total point differential (basic sort)
+    sorted_scores = sorted(player_scores, key=lambda x: (-x.wins, -x.total_point_difference))
+
+    # Look for groups of players with the same number of wins
+    groups_of_tied_players = []
+    current_group = []
+    current_wins = None
+
+    for score in sorted_scores:
+        if current_wins is None or score.wins == current_wins:
+            current_group.append(score)
+            current_wins = score.wins
+        else:
+            if len(current_group) > 1:  # Only record groups with ties
+                groups_of_tied_players.append(list(current_group))
+            current_group = [score]
+            current_wins = score.wins
+
+    # Add the last group if it has ties
+    if len(current_group) > 1:
+        groups_of_tied_players.append(list(current_group))
+
+    # No ties, return the basic sort
+    if not groups_of_tied_players:
+        return sorted_scores
+
+    # Get all matchups in this tournament with scores
+    all_matchups = Matchup.objects.filter(
+        tournament_chart=tournament,
+        scores__isnull=False
+    ).prefetch_related('scores').distinct()
+
+    # Get players who placed above our tied groups (for tiebreak steps 4-5)
+    above_player_ids = set()
+    current_win_level = None
+    for score in sorted_scores:
+        if current_win_level is None:
+            current_win_level = score.wins
+        elif score.wins < current_win_level:
+            # We've moved to a new, lower win level
+            break
+
+        # Add players at the current (highest) win level
+        above_player_ids.add(score.player.id)
+
+    # Process each group of tied players
+    for group in groups_of_tied_players:
+        # Get all matchups involving these players
+        tied_player_ids = [score.player.id for score in group]
+
+        # Create a record structure to hold all tiebreak criteria
+        tiebreak_records = {player_id: {
+            'h2h_wins': 0,                 # Head-to-head wins (criterion 2)
+            'h2h_point_diff': 0,           # Head-to-head point diff (criterion 3)
+            'above_team_wins': 0,          # Wins against higher-placed teams (criterion 4)
+            'above_team_point_diff': 0,    # Point diff against higher-placed teams (criterion 5)
+            'total_point_diff': 0          # Point diff against all teams (criterion 6, already in score object)
+        } for player_id in tied_player_ids}
+
+        # Check each matchup to see if it applies to our tiebreak criteria
+        for matchup in all_matchups:
+            # Identify players in team 1 and team 2
+            team1_players = set()
+            team2_players = set()
+            if matchup.pair1_player1_id: team1_players.add(matchup.pair1_player1_id)
+            if matchup.pair1_player2_id: team1_players.add(matchup.pair1_player2_id)
+            if matchup.pair2_player1_id: team2_players.add(matchup.pair2_player1_id)
+            if matchup.pair2_player2_id: team2_players.add(matchup.pair2_player2_id)
+
+            # Find tied players in this matchup
+            tied_in_team1 = team1_players.intersection(tied_player_ids)
+            tied_in_team2 = team2_players.intersection(tied_player_ids)
+
+            # To count for head-to-head criteria, the match must involve players from the tied group
+            # on both sides of the match (as opponents, not just as partners)
+            is_h2h_match = len(tied_in_team1) > 0 and len(tied_in_team2) > 0
+
+            # Identify players from higher-placed teams
+            above_in_team1 = team1_players.intersection(above_player_ids)
+            above_in_team2 = team2_players.intersection(above_player_ids)
+
+            # Process all sets in this matchup
+            for set_score in matchup.scores.all():
+                team1_won = set_score.winning_team == 1
+
+                # Process each tied player's results
+                for player_id in tied_player_ids:
+                    on_team1 = player_id in team1_players
+                    on_team2 = player_id in team2_players
+
+                    if not (on_team1 or on_team2):
+                        continue  # This player wasn't in this match
+
+                    # Calculate point differential from this player's perspective
+                    pd = set_score.point_difference
+                    if (on_team1 and not team1_won) or (on_team2 and team1_won):
+                        pd = -pd  # This player's team lost, so negate the PD
+
+                    # Update head-to-head records (criterion 2-3)
+                    if is_h2h_match:
+                        if (on_team1 and team1_won) or (on_team2 and not team1_won):
+                            tiebreak_records[player_id]['h2h_wins'] += 1
+                        tiebreak_records[player_id]['h2h_point_diff'] += pd
+
+                    # Wins against higher-placed teams (criterion 4-5)
+                    # If this player played against higher-placed teams, count it
+                    opponent_has_above = False
+                    if on_team1 and above_in_team2:
+                        opponent_has_above = True
+                    elif on_team2 and above_in_team1:
+                        opponent_has_above = True
+
+                    if opponent_has_above:
+                        if (on_team1 and team1_won) or (on_team2 and not team1_won):
+                            tiebreak_records[player_id]['above_team_wins'] += 1
+                        tiebreak_records[player_id]['above_team_point_diff'] += pd
+
+        # Apply total point differential from all games
+        for score in group:
+            tiebreak_records[score.player.id]['total_point_diff'] = score.total_point_difference
+
+        # Sort the tied players using all tiebreak criteria
+        group.sort(key=lambda score: (
+            -tiebreak_records[score.player.id]['h2h_wins'],           # Criterion 2: H2H wins
+            -tiebreak_records[score.player.id]['h2h_point_diff'],     # Criterion 3: H2H point diff
+            -tiebreak_records[score.player.id]['above_team_wins'],    # Criterion 4: Wins vs above teams
+            -tiebreak_records[score.player.id]['above_team_point_diff'], # Criterion 5: PD vs above teams
+            -tiebreak_records[score.player.id]['total_point_diff']    # Criterion 6: Total PD
+        ))
+
+        # Store the tiebreak info for display
+        for score in group:
+            player_id = score.player.id
+            score.h2h_wins = tiebreak_records[player_id]['h2h_wins']
+            score.h2h_point_diff = tiebreak_records[player_id]['h2h_point_diff']
+            score.above_wins = tiebreak_records[player_id]['above_team_wins']
+            score.above_pd = tiebreak_records[player_id]['above_team_point_diff']
+
+    # Rebuild the complete standings with tiebreak-sorted groups
+    return _rebuild_standings(sorted_scores, groups_of_tied_players)
+
+
+def _rebuild_standings(sorted_scores, groups_of_tied_players):
+    """
+    Helper method to rebuild final standings with tiebreak-sorted groups.
+    """
+    final_standings = []
+
+    # Map of wins to groups of tied players
+    tied_groups_by_wins = {
+        group[0].wins: group for group in groups_of_tied_players
+    }
+
+    # Rebuild the sorted list with tiebreak groups
+    for score in sorted_scores:
+        if score.wins in tied_groups_by_wins and len(tied_groups_by_wins[score.wins]) > 0:
+            # Add all players from this tied group
+            tied_group = tied_groups_by_wins[score.wins]
+            final_standings.extend(tied_group)
+            tied_groups_by_wins[score.wins] = []  # Mark as processed
+        elif score not in final_standings:
+            # Add individual player not in a tie group
+            final_standings.append(score)
+
+    return final_standings
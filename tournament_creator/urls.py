@@ -2,14 +2,15 @@ from django.urls import path
 from django.views.generic import RedirectView
 from .views.tournament_views import (
     TournamentListView, TournamentCreateView, TournamentDetailView,
-    TournamentDeleteView, TournamentDownloadResultsView, record_match_result,
+    TournamentDeleteView, TournamentDownloadResultsView, SeasonResultsExportView, record_match_result,
     manual_tiebreak_resolution, tournament_settings, generate_next_stage,
     reset_sandbox_scores, tournament_directors
 )
 from .views.player_views import PlayerListView, PlayerCreateView
-from .views.autocomplete import PlayerAutocomplete, LinkablePlayerAutocomplete
+from .views.autocomplete import PlayerAutocomplete, LinkablePlayerAutocomplete, player_directory_autocomplete
 from .views.rankings_views import update_rankings, check_update_status
 from .views.notifications_views import refresh_signal_groups
+from .views.api_views import tournament_state
 
 urlpatterns = [
     path('', RedirectView.as_view(pattern_name='tournament_list', permanent=False)),
@@ -18,6 +19,8 @@ urlpatterns = [
     path('tournaments/<int:pk>/', TournamentDetailView.as_view(), name='tournament_detail'),
     path('tournaments/<int:pk>/delete/', TournamentDeleteView.as_view(), name='tournament_delete'),
     path('tournaments/<int:pk>/download/', TournamentDownloadResultsView.as_view(), name='tournament_download_results'),
+    path('tournaments/<int:pk>/download/<str:fmt>/', TournamentDownloadResultsView.as_view(), name='tournament_export'),
+    path('exports/season/<int:year>/<str:fmt>/', SeasonResultsExportView.as_view(), name='season_results_export'),
     path('tournaments/<int:tournament_id>/settings/', tournament_settings, name='tournament_settings'),
     path('tournaments/<int:tournament_id>/matchup/<int:matchup_id>/record/',
          record_match_result, name='record_match_result'),
@@ -25,9 +28,11 @@ urlpatterns = [
     path('tournaments/<int:tournament_id>/tiebreak/', manual_tiebreak_resolution, name='manual_tiebreak_resolution'),
     path('tournaments/<int:tournament_id>/generate-next-stage/', generate_next_stage, name='generate_next_stage'),
     path('tournaments/<int:tournament_id>/reset-sandbox/', reset_sandbox_scores, name='reset_sandbox_scores'),
+    path('api/tournaments/<int:tournament_id>/state/', tournament_state, name='tournament_state'),
     path('players/', PlayerListView.as_view(), name='player_list'),
     path('players/create/', PlayerCreateView.as_view(), name='player_create'),
     path('player-autocomplete/', PlayerAutocomplete.as_view(), name='player-autocomplete'),
+    path('player-directory/', player_directory_autocomplete, name='player-directory'),
     path('linkable-player-autocomplete/', LinkablePlayerAutocomplete.as_view(), name='linkable-player-autocomplete'),
     
     # Rankings URLs
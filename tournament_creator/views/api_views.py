@@ -0,0 +1,61 @@
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse, HttpResponseBadRequest
+from django.shortcuts import get_object_or_404
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition, require_GET
+
+from .. import player_directory
+from ..caching import get_tournament_cached, tournament_stamp
+from ..models.base_models import TournamentChart
+from ..state import build_tournament_state
+
+# Full snapshots are shared by every poller until the tournament or any player
+# changes (both are in the key); the timeout only bounds dead entries.
+FULL_STATE_CACHE_TIMEOUT = 600
+
+
+def _parse_since(request):
+    since = request.GET.get('since')
+    if since in (None, ''):
+        return None
+    return int(since)
+
+
+def _state_etag(request, tournament_id):
+    """ETag for a state response: the tournament's change stamp plus the delta base.
+
+    The stamp moves on settings edits too (names, rules), not just results;
+    the player data version covers renames, which don't touch the tournament.
+    """
+    tournament = TournamentChart.objects.filter(pk=tournament_id).only('results_version', 'modified_at').first()
+    if tournament is None:
+        return None
+    since = request.GET.get('since', '')
+    etag = f't{tournament_id}-v{tournament_stamp(tournament)}-p{player_directory.data_stamp()}'
+    return etag + (f'-s{since}' if since else '')
+
+
+@login_required
+@require_GET
+@cache_control(private=True, no_cache=True)
+@condition(etag_func=_state_etag)
+def tournament_state(request, tournament_id):
+    """
+    Compact JSON snapshot of a tournament for polling clients.
+
+    ``?since=<version>`` returns only the matchups changed after that version.
+    Clients should send ``If-None-Match``; an unchanged tournament answers 304
+    without building the snapshot.
+    """
+    tournament = get_object_or_404(TournamentChart.objects.select_related('archetype'), pk=tournament_id)
+    try:
+        since = _parse_since(request)
+    except ValueError:
+        return HttpResponseBadRequest('since must be an integer results version')
+    if since is None:
+        state = get_tournament_cached(tournament, f'state:{player_directory.data_stamp()}',
+                                      lambda: build_tournament_state(tournament),
+                                      timeout=FULL_STATE_CACHE_TIMEOUT)
+    else:
+        state = build_tournament_state(tournament, since=since)
+    return JsonResponse(state)
@@ -1,5 +1,6 @@
 from django.contrib.auth.mixins import UserPassesTestMixin, LoginRequiredMixin
 from django.core.exceptions import PermissionDenied
+from ..access import get_tournament_access
 
 class AdminRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
     """
@@ -32,7 +33,7 @@ class TournamentAdminRequiredMixin(LoginRequiredMixin, UserPassesTestMixin):
     The view must expose the tournament through ``get_object()``.
     """
     def test_func(self) -> bool:
-        return self.get_object().user_can_administer(self.request.user)
+        return get_tournament_access(self.request, self.get_object()).can_administer
 
 class SpectatorAccessMixin(LoginRequiredMixin):
     """
@@ -1,58 +1,66 @@
 from dal import autocomplete
 from django.db.models import Q
 from django.http import JsonResponse
-import logging
+from django.views.decorators.http import require_GET
+from .. import player_directory
 from ..models.base_models import Player
-
-logger = logging.getLogger(__name__)
+from ..models.search import PlayerSearchTerm
 
 class PlayerAutocomplete(autocomplete.Select2QuerySetView):
+    """Player picker for tournament creation; matches typed name prefixes via
+    the search index, exact word matches and better-ranked players first."""
+
     def get_queryset(self):
-        # Log authentication status and request details
-        logger.info("User authenticated: %s", self.request.user.is_authenticated)
-        logger.info("Request headers: %s", self.request.headers)
-        logger.info("Query parameters: %s", self.request.GET)
-        
         if not self.request.user.is_authenticated:
-            logger.warning("Unauthenticated user trying to access player autocomplete")
             return Player.objects.none()
-        
+
         qs = Player.objects.all()
-        logger.info("Total players in database: %d", qs.count())
-        
+
         # Filter out already selected players
         selected_player_ids = self.request.GET.getlist('selected')
         if selected_player_ids:
-            logger.info("Excluding %d already selected players", len(selected_player_ids))
             qs = qs.exclude(id__in=selected_player_ids)
-            
+
         if self.q:
-            logger.info("Search query: %s", self.q)
-            qs = qs.filter(Q(first_name__icontains=self.q) | Q(last_name__icontains=self.q))
-            logger.info("Filtered players count: %d", qs.count())
-        else:
-            # Return an initial set of players even without a search query
-            logger.info("No search query, returning first 20 players")
-            qs = qs.order_by('last_name', 'first_name')[:20]
-        
-        return qs
-    
-    def get(self, request, *args, **kwargs):
-        """Override to add more detailed logging"""
+            return PlayerSearchTerm.search(qs, self.q).order_by('-search_exact', 'ranking', 'pk')
+        # Return an initial set of players even without a search query
+        return qs.order_by('last_name', 'first_name')[:20]
+
+    def paginate_queryset(self, queryset, page_size):
+        # Fetch one row past the page instead of running a COUNT, so a
+        # keystroke costs a single query.
         try:
-            result = super().get(request, *args, **kwargs)
-            logger.info("Autocomplete result status: %s", result.status_code)
-            try:
-                import json
-                result_data = json.loads(result.content.decode('utf-8'))
-                logger.info("Autocomplete result count: %d", len(result_data.get('results', [])))
-                logger.info("Autocomplete result: %s", result_data)
-            except Exception as e:
-                logger.error("Error parsing autocomplete result: %s", e)
-            return result
-        except Exception as e:
-            logger.error("Error in autocomplete get: %s", e)
-            raise
+            page = max(1, int(self.request.GET.get('page', 1)))
+        except ValueError:
+            page = 1
+        offset = (page - 1) * page_size
+        rows = list(queryset[offset:offset + page_size + 1])
+        self._has_more = len(rows) > page_size
+        return None, None, rows[:page_size], self._has_more
+
+    def has_more(self, context):
+        return getattr(self, '_has_more', False)
+
+
+@require_GET
+def player_directory_autocomplete(request):
+    """Select2 endpoint for the player pickers, answered from the in-memory
+    player directory: prefix matches on every typed word, best ranked first,
+    minus the players already ``selected``."""
+    if not request.user.is_authenticated:
+        return JsonResponse({'results': [], 'pagination': {'more': False}})
+    # jQuery sends arrays as ``selected[]``.
+    selected = request.GET.getlist('selected') + request.GET.getlist('selected[]')
+    exclude = {int(pk) for pk in selected if pk.isdigit()}
+    page = request.GET.get('page', '1')
+    page = int(page) if page.isdigit() and int(page) > 0 else 1
+    limit = PlayerAutocomplete.paginate_by
+    results, more = player_directory.get_directory().search(
+        request.GET.get('q', ''), exclude=exclude, offset=(page - 1) * limit, limit=limit)
+    return JsonResponse({
+        'results': [{'id': str(pk), 'text': label, 'selected_text': label} for pk, label in results],
+        'pagination': {'more': more},
+    })
 
 
 class LinkablePlayerAutocomplete(autocomplete.Select2QuerySetView):
@@ -71,5 +79,5 @@ class LinkablePlayerAutocomplete(autocomplete.Select2QuerySetView):
             linkable |= Q(user_id=for_user)
         qs = Player.objects.filter(linkable)
         if self.q:
-            qs = qs.filter(Q(first_name__icontains=self.q) | Q(last_name__icontains=self.q))
+            qs = PlayerSearchTerm.search(qs, self.q)
         return qs.order_by('last_name', 'first_name')
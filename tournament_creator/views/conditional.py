@@ -0,0 +1,110 @@
+"""
+Conditional GET (ETag / Last-Modified) for the tournament pages.
+
+Spectators refresh the detail page constantly during a tournament. Each view
+here derives a validator from ``TournamentChart.modified_at`` (kept current by
+score writes, phase generation, settings and director edits), which costs a
+single indexed lookup. When the browser already holds the current version it
+gets a 304 and none of the matchup, standings or tiebreak code runs.
+
+Player renames and ranking syncs don't touch any tournament, so the player
+data version (``player_directory.data_stamp``) is part of every validator.
+
+Pages that show per-user controls fold the user and their role into the ETag,
+and the date too, since "past tournament" locks flip at midnight. Responses
+that carry one-off flash messages are never validated, so a banner doesn't
+stick to a cached copy.
+"""
+import hashlib
+from datetime import datetime, timezone as dt_timezone
+
+from django.contrib import messages
+from django.db.models import Count, Max
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, quote_etag
+from django.utils.http import http_date
+
+from .. import player_directory
+from ..models.base_models import TournamentChart
+
+
+def _has_pending_messages(request):
+    # len() loads the stored messages without marking them as displayed.
+    return bool(len(messages.get_messages(request)))
+
+
+def _viewer_key(request):
+    """The parts of an ETag that depend on who is looking, and when."""
+    user = request.user
+    parts = [f'u{user.pk}', getattr(user, 'role', ''), timezone.localdate().isoformat()]
+    if request.GET:
+        parts.append(hashlib.sha1(request.GET.urlencode().encode()).hexdigest()[:12])
+    return '-'.join(parts)
+
+
+class ConditionalGetMixin:
+    """Answer GETs with 304 Not Modified when ``get_validators()`` still match.
+
+    Subclasses implement ``get_validators()`` returning ``(etag, last_modified)``;
+    ``last_modified`` may be ``None``, and ``(None, None)`` disables the check
+    (e.g. for an unknown tournament, letting the view 404 as usual).
+    """
+
+    def get_validators(self):
+        raise NotImplementedError
+
+    def dispatch(self, request, *args, **kwargs):
+        # Hooked on dispatch rather than get() so views that define their own
+        # get() are covered too; list the mixin after the login mixin.
+        if request.method not in ('GET', 'HEAD'):
+            return super().dispatch(request, *args, **kwargs)
+        etag, last_modified = self.get_validators()
+        if etag is None or _has_pending_messages(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        etag = quote_etag(etag)
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code != 200:
+                return response
+            response['ETag'] = etag
+            if timestamp is not None:
+                response['Last-Modified'] = http_date(timestamp)
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
+
+
+class TournamentConditionalGetMixin(ConditionalGetMixin):
+    """Validators for a single tournament's page, taken from the ``pk`` URL kwarg.
+
+    ``per_user`` pages fold the viewer into the ETag and skip Last-Modified,
+    which can't tell viewers apart.
+    """
+    per_user = True
+
+    def get_validators(self):
+        row = TournamentChart.objects.filter(pk=self.kwargs['pk']).values_list(
+            'modified_at', 'results_version').first()
+        if row is None:
+            return None, None
+        modified_at, version = row
+        etag = f't{self.kwargs["pk"]}-v{version}-{modified_at.timestamp():.6f}-p{player_directory.data_stamp()}'
+        if self.per_user:
+            return f'{etag}-{_viewer_key(self.request)}', None
+        players_changed = datetime.fromtimestamp(player_directory.current_version() / 1e9, dt_timezone.utc)
+        return etag, max(modified_at, players_changed)
+
+
+class TournamentListConditionalGetMixin(ConditionalGetMixin):
+    """Validators for the tournament list: newest change plus the tournament count.
+
+    The count catches deletions, which leave no ``modified_at`` behind.
+    """
+
+    def get_validators(self):
+        summary = TournamentChart.objects.aggregate(latest=Max('modified_at'), count=Count('id'))
+        latest = summary['latest']
+        stamp = f'{latest.timestamp():.6f}' if latest else '0'
+        return f'list-{summary["count"]}-{stamp}-p{player_directory.data_stamp()}-{_viewer_key(self.request)}', None
@@ -1,62 +1,89 @@
-from django.db.models import Max, Q
+from django.db.models import F, Max
 from django.views.generic import ListView, CreateView
 from django.urls import reverse_lazy
 from django.contrib import messages
 from ..models.base_models import Player
-from ..models.rankings import RankingsUpdate
+from ..models.rankings import PlayerRanking, RankingsUpdate
+from ..models.search import PlayerSearchTerm
 from ..views.auth import PlayerOrAdminRequiredMixin, SpectatorAccessMixin
 
 class PlayerListView(SpectatorAccessMixin, ListView):
     """
-    Displays all players with their ranking and ranking points, with search and
-    sorting. Viewable by all logged-in users.
+    Displays players with their ranking and ranking points in one division,
+    with search and sorting. Viewable by all logged-in users.
+
+    Open lists every player by the ``Player`` ranking columns (which mirror
+    the Open list); the other divisions list the players ranked in that
+    division's latest synced year. Both sort on indexed columns, so a page
+    is an index range scan plus a LIMIT.
     """
     model = Player
     template_name = 'tournament_creator/player_list.html'
     context_object_name = 'players'
     paginate_by = 20
 
+    SORT_FIELDS = {
+        'ranking': 'division_rank',
+        'ranking_points': 'division_points',
+        'first_name': 'first_name',
+        'last_name': 'last_name',
+    }
+
+    def get_division(self):
+        division = self.request.GET.get('division', PlayerRanking.Division.OPEN)
+        if division not in PlayerRanking.Division.values:
+            division = PlayerRanking.Division.OPEN
+        return division
+
+    def get_year(self, division):
+        """Latest year with rankings stored for ``division`` (None if never synced)."""
+        if not hasattr(self, '_year'):
+            self._year = (PlayerRanking.objects.filter(division=division)
+                          .aggregate(Max('year'))['year__max'])
+        return self._year
+
     def get_queryset(self):
-        queryset = Player.objects.all()
+        division = self.get_division()
+        if division == PlayerRanking.Division.OPEN:
+            queryset = Player.objects.annotate(
+                division_rank=F('ranking'), division_points=F('ranking_points'))
+        else:
+            queryset = Player.objects.filter(
+                rankings__division=division, rankings__year=self.get_year(division),
+            ).annotate(division_rank=F('rankings__rank'), division_points=F('rankings__points'))
 
         # Apply search filter if provided
         search_query = self.request.GET.get('search', '')
         if search_query:
-            queryset = queryset.filter(
-                Q(first_name__icontains=search_query) |
-                Q(last_name__icontains=search_query)
-            )
+            queryset = PlayerSearchTerm.search(queryset, search_query)
 
         # Apply sorting if provided
-        sort_by = self.request.GET.get('sort_by', 'ranking')
-        if sort_by not in ['ranking', 'first_name', 'last_name', 'ranking_points']:
-            sort_by = 'ranking'  # Default sorting
+        sort_by = self.SORT_FIELDS.get(self.request.GET.get('sort_by'), 'division_rank')
 
         # Handle reverse sorting
         if self.request.GET.get('sort_order') == 'desc':
             sort_by = f'-{sort_by}'
 
-        return queryset.order_by(sort_by)
+        return queryset.order_by(sort_by, 'pk')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
+        division = self.get_division()
 
         # Add last update timestamp
-        context['latest_update'] = RankingsUpdate.objects.filter(successful=True).first()
+        context['latest_update'] = RankingsUpdate.objects.filter(successful=True, division=division).first()
 
         # Add search and sort parameters
         context['search_query'] = self.request.GET.get('search', '')
-        context['sort_by'] = self.request.GET.get('sort_by', 'ranking').replace('-', '')
+        sort_by = self.request.GET.get('sort_by', 'ranking')
+        context['sort_by'] = sort_by if sort_by in self.SORT_FIELDS else 'ranking'
         context['sort_order'] = self.request.GET.get('sort_order', 'asc')
-        context['division'] = self.request.GET.get('division', 'O')
+        context['division'] = division
+        if division != PlayerRanking.Division.OPEN:
+            context['ranking_year'] = self.get_year(division)
 
-        # List available divisions - will be expanded with more divisions later
         context['divisions'] = [
-            {'code': 'O', 'name': 'Open'},
-            {'code': 'W', 'name': 'Women'},
-            {'code': 'M', 'name': 'Mixed'},
-            {'code': 'MO', 'name': 'Masters Open'},
-            {'code': 'MW', 'name': 'Masters Women'},
+            {'code': code, 'name': name} for code, name in PlayerRanking.Division.choices
         ]
 
         return context
@@ -2,45 +2,72 @@ from django.shortcuts import redirect
 from django.urls import reverse
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.core.management import call_command
 from django.http import JsonResponse
 
-from tournament_creator.models import RankingsUpdate
+from tournament_creator.rankings import ALL_DIVISIONS
+from tournament_creator.models import BackgroundJob, PlayerRanking, RankingsUpdate
+
+
+def _job_state(job):
+    return {
+        'id': job.pk,
+        'status': job.status,
+        'active': job.is_active,
+        'progress': job.progress,
+        'message': job.message,
+        'error': job.error,
+        'division': job.params.get('division'),
+        'created_at': job.created_at.strftime('%Y-%m-%d %H:%M'),
+        'finished_at': job.finished_at.strftime('%Y-%m-%d %H:%M') if job.finished_at else None,
+    }
+
 
 @login_required
 def update_rankings(request):
-    """View to manually trigger rankings update."""
+    """Queue a rankings refresh (one division or all of them); the run_jobs worker does the fetching."""
     division = 'O'
     if request.method == 'POST':
         division = request.POST.get('division', 'O')
-
-        try:
-            # Call the management command to update rankings
-            call_command('update_rankings', division=division)
-            messages.success(request, f"Rankings successfully updated for {division} division.")
-        except Exception as e:
-            messages.error(request, f"Error updating rankings: {str(e)}")
+        if division != ALL_DIVISIONS and division not in PlayerRanking.Division.values:
+            division = 'O'
+        job, created = BackgroundJob.enqueue('update_rankings', {'division': division}, user=request.user)
+        if created:
+            messages.info(request, f"Rankings update for {division} division queued; "
+                               "this page will show its progress.")
+        else:
+            messages.info(request, f"A rankings update for {division} division is already in progress.")
 
     # Redirect back to the players page
+    if division == ALL_DIVISIONS:
+        division = 'O'
     return redirect(reverse('player_list') + f'?division={division}')
 
 @login_required
 def check_update_status(request):
-    """AJAX endpoint to check if new rankings have been imported."""
+    """AJAX endpoint reporting the latest rankings job and the last successful
+    import (of ``?division=`` when given)."""
     try:
-        latest_update = RankingsUpdate.objects.filter(successful=True).first()
+        jobs = BackgroundJob.objects.filter(kind='update_rankings')
+        job_id = request.GET.get('job')
+        job = jobs.filter(pk=job_id).first() if job_id and job_id.isdigit() else jobs.first()
+        updates = RankingsUpdate.objects.filter(successful=True)
+        if request.GET.get('division'):
+            updates = updates.filter(division=request.GET['division'])
+        latest_update = updates.first()
+        data = {'job': _job_state(job) if job else None}
         if latest_update:
-            return JsonResponse({
+            data.update({
                 'success': True,
                 'last_update': latest_update.timestamp.strftime('%Y-%m-%d %H:%M'),
                 'division': latest_update.division,
                 'player_count': latest_update.player_count
             })
         else:
-            return JsonResponse({
+            data.update({
                 'success': False,
                 'message': 'No successful rankings updates found.'
             })
+        return JsonResponse(data)
     except Exception as e:
         return JsonResponse({
             'success': False,
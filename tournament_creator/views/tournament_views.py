@@ -2,18 +2,23 @@ from django.views.generic import ListView, CreateView, DetailView, DeleteView, V
 from django.shortcuts import render, redirect, get_object_or_404
 from django.urls import reverse_lazy
 from django.contrib import messages
-from django.http import JsonResponse, HttpResponse
+from django.core.exceptions import PermissionDenied
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.db import models
 from django.contrib.auth.decorators import login_required
 from django.views.decorators.http import require_POST
 from django.conf import settings
-from django.db import connections
+from django.db import close_old_connections, transaction
+from django.db.models.functions import Coalesce
+from django.utils.dateparse import parse_date, parse_time
 import json
 import logging
+import queue
 import threading
-from datetime import time
+from datetime import date, time
 from ..models.base_models import (
-    TournamentChart, Matchup, TournamentArchetype, Player, Pair, Pool, TournamentDirector
+    TournamentChart, Matchup, TournamentArchetype, Player, Pair, Pool, TournamentDirector,
+    TournamentPair, TournamentPlayer
 )
 from ..models.tournament_types import PairsTournamentArchetype
 from ..models.scoring import MatchScore, PlayerScore, ManualTiebreakResolution, ManualPoolTiebreakResolution
@@ -24,12 +29,23 @@ from ..views.auth import (
     TournamentCreatorRequiredMixin, TournamentAdminRequiredMixin,
 )
 from ..forms import (
-    PairFormSet, MoCPlayerSelectForm, TournamentCreationForm, TournamentDirectorAddForm
+    LeagueCalendarForm, PairFormSet, MoCPlayerSelectForm, TournamentCreationForm, TournamentDirectorAddForm
 )
 from ..notifications import send_email_notification, send_signal_notification
+from .. import export, player_directory
+from ..access import get_tournament_access
+from ..caching import get_cached, structure_cache_key, tournament_stamp
+from ..location_summary import known_locations, location_facets
+from ..score_rules import expected_score_rules, score_rule_warnings, score_rules_text
+from ..tiebreaks import apply_tiebreaks
+from .conditional import TournamentConditionalGetMixin, TournamentListConditionalGetMixin
 
 logger = logging.getLogger(__name__)
 
+# Detail page fragments are keyed on the tournament's change stamp, so a
+# write moves them to fresh keys; the timeout only bounds dead entries.
+FRAGMENT_TIMEOUT = 60 * 60
+
 
 def _send_match_notifications(user, match_log_entry, tournament):
     try:
@@ -50,20 +66,44 @@ def _send_match_notifications(user, match_log_entry, tournament):
         logger.error(f"Error sending Signal notification: {str(e_notify_signal)}")
 
 
-def _send_match_notifications_async(user, match_log_entry, tournament):
-    def _worker():
+_notification_queue = queue.Queue()
+_notification_worker = None
+_notification_worker_lock = threading.Lock()
+
+
+def _notification_worker_loop():
+    # One long-lived thread per process sends all notifications, so it keeps
+    # a persistent database connection (CONN_MAX_AGE) instead of opening and
+    # closing one per send. close_old_connections() applies the same age and
+    # health-check rules Django uses between requests.
+    while True:
+        user, match_log_entry, tournament = _notification_queue.get()
         try:
+            close_old_connections()
             _send_match_notifications(user, match_log_entry, tournament)
+        except Exception:
+            logger.exception("Notification worker failed")
         finally:
-            # Connections opened by this thread are thread-local; close them so
-            # they don't linger for the lifetime of the daemon thread.
-            connections.close_all()
-    threading.Thread(target=_worker, daemon=True).start()
+            _notification_queue.task_done()
+
 
-class TournamentListView(SpectatorAccessMixin, ListView):
+def _send_match_notifications_async(user, match_log_entry, tournament):
+    global _notification_worker
+    with _notification_worker_lock:
+        # Started lazily (and restarted after a fork) rather than at import.
+        if _notification_worker is None or not _notification_worker.is_alive():
+            _notification_worker = threading.Thread(
+                target=_notification_worker_loop, name='match-notifications', daemon=True)
+            _notification_worker.start()
+    _notification_queue.put((user, match_log_entry, tournament))
+
+
+class TournamentListView(SpectatorAccessMixin, TournamentListConditionalGetMixin, ListView):
     model = TournamentChart
     template_name = 'tournament_creator/tournament_list.html'
     context_object_name = 'tournaments'
+    # Cards per tab; further cards are fetched a page at a time (see tab_page).
+    page_size = 24
 
     def selected_location(self):
         """The location filter from the query string, as (country, place)."""
@@ -74,7 +114,8 @@ class TournamentListView(SpectatorAccessMixin, ListView):
 
     def get_queryset(self):
         # Non-archived tournaments only; archived ones are handled separately
-        # and only shown to admins.
+        # and only shown to admins. The tabs page through this in the
+        # database, so the full list is never loaded.
         return self.filter_by_location(TournamentChart.objects.filter(archived=False))
 
     def filter_by_location(self, queryset):
@@ -89,30 +130,47 @@ class TournamentListView(SpectatorAccessMixin, ListView):
         """Country and place choices for the filter bar, with tournament counts.
 
         Places are narrowed to the selected country so the two selects can't be
-        combined into an empty result.
+        combined into an empty result. Built from the cached location summary.
         """
-        from collections import Counter
         country, _ = self.selected_location()
-        visible = TournamentChart.objects.filter(archived=False)
+        return location_facets(country)
 
-        countries = Counter(
-            t.country for t in visible.exclude(country='').only('country')
-        )
-        place_source = visible.exclude(place='')
-        if country:
-            place_source = place_source.filter(country__iexact=country)
-        places = Counter(t.place for t in place_source.only('place'))
+    @staticmethod
+    def parse_cursor(value):
+        """A ``date:id`` page cursor from the query string, or None."""
+        try:
+            day, pk = (value or '').split(':')
+            return date.fromisoformat(day), int(pk)
+        except ValueError:
+            return None
 
-        return (
-            [{'value': name, 'count': n} for name, n in sorted(countries.items())],
-            [{'value': name, 'count': n} for name, n in sorted(places.items())],
-        )
+    def tab_page(self, queryset, param, ascending):
+        """One page of a tab, ordered by date then id, resuming after the cursor in ``param``.
+
+        Keyset pagination: the cursor is the last card's ``date:id``, so a
+        page costs the same however many seasons lie before it. Returns
+        ``(tournaments, next_page_url)``; the URL is None on the last page.
+        """
+        order = ('date', 'id') if ascending else ('-date', '-id')
+        queryset = queryset.annotate(player_count=models.Count('players')).order_by(*order)
+        cursor = self.parse_cursor(self.request.GET.get(param))
+        if cursor:
+            day, pk = cursor
+            if ascending:
+                queryset = queryset.filter(models.Q(date__gt=day) | models.Q(date=day, id__gt=pk))
+            else:
+                queryset = queryset.filter(models.Q(date__lt=day) | models.Q(date=day, id__lt=pk))
+        page = list(queryset[:self.page_size + 1])
+        if len(page) <= self.page_size:
+            return page, None
+        page = page[:self.page_size]
+        params = self.request.GET.copy()
+        params[param] = f'{page[-1].date.isoformat()}:{page[-1].pk}'
+        return page, f'?{params.urlencode()}'
 
     def get_context_data(self, **kwargs):
-        from datetime import date
         context = super().get_context_data(**kwargs)
         today = date.today()
-        tournaments = context['tournaments']
 
         country, place = self.selected_location()
         context['selected_country'] = country
@@ -123,24 +181,31 @@ class TournamentListView(SpectatorAccessMixin, ListView):
 
         # A tournament is "past" once its last day has gone by. Use end_date
         # when set (multi-day tournaments), otherwise the start date.
-        def effective_end(t):
-            return t.end_date or t.date
-
-        upcoming = [t for t in tournaments if effective_end(t) >= today]
-        past = [t for t in tournaments if effective_end(t) < today]
+        tournaments = self.get_queryset().annotate(effective_end=Coalesce('end_date', 'date'))
         # Upcoming tournaments read best oldest-first (soonest at the top);
-        # the base ordering is newest-first, which suits past tournaments.
-        upcoming.reverse()
-
-        context['upcoming_tournaments'] = upcoming
-        context['past_tournaments'] = past
+        # past ones newest-first.
+        context['upcoming_tournaments'], context['upcoming_next_url'] = self.tab_page(
+            tournaments.filter(effective_end__gte=today), 'upcoming', ascending=True)
+        context['past_tournaments'], context['past_next_url'] = self.tab_page(
+            tournaments.filter(effective_end__lt=today), 'past', ascending=False)
+
+        # Tab badges count every tournament, not just the page shown: one
+        # aggregate over the (location-filtered) table.
+        is_admin = self.request.user.is_admin()
+        context['tab_counts'] = self.filter_by_location(
+            TournamentChart.objects.annotate(effective_end=Coalesce('end_date', 'date'))
+        ).aggregate(
+            upcoming=models.Count('pk', filter=models.Q(archived=False, effective_end__gte=today)),
+            past=models.Count('pk', filter=models.Q(archived=False, effective_end__lt=today)),
+            archived=models.Count('pk', filter=models.Q(archived=True)),
+        )
 
-        if self.request.user.is_admin():
-            context['archived_tournaments'] = list(
-                self.filter_by_location(TournamentChart.objects.filter(archived=True))
-            )
+        if is_admin:
+            context['archived_tournaments'], context['archived_next_url'] = self.tab_page(
+                self.filter_by_location(TournamentChart.objects.filter(archived=True)),
+                'archived', ascending=False)
         else:
-            context['archived_tournaments'] = []
+            context['archived_tournaments'], context['archived_next_url'] = [], None
 
         return context
 
@@ -204,12 +269,7 @@ class TournamentCreateView(TournamentCreatorRequiredMixin, CreateView):
 
         # Suggestions for the place/country datalists, so directors reuse
         # existing spellings instead of inventing new ones.
-        context['known_places'] = list(
-            TournamentChart.objects.exclude(place='').values_list('place', flat=True).distinct().order_by('place')
-        )
-        context['known_countries'] = list(
-            TournamentChart.objects.exclude(country='').values_list('country', flat=True).distinct().order_by('country')
-        )
+        context['known_places'], context['known_countries'] = known_locations()
 
         # Get tournament category from GET or POST
         tournament_category = self.request.GET.get('tournament_category') or self.request.POST.get('tournament_category')
@@ -241,9 +301,11 @@ class TournamentCreateView(TournamentCreatorRequiredMixin, CreateView):
             return render(request, self.template_name, context)
 
         # Get players in the order they were selected (from POST data)
-        # The form widget submits player IDs in selection order
+        # The form widget submits player IDs in selection order; the form
+        # already fetched them all in one query while validating.
         player_ids = request.POST.getlist('players')
-        players = [Player.objects.get(id=pid) for pid in player_ids]
+        players_by_id = {str(player.pk): player for player in moc_player_form.cleaned_data['players']}
+        players = [players_by_id[pid] for pid in player_ids]
         num_players = len(players)
 
         # Find the matching archetype
@@ -293,8 +355,6 @@ class TournamentCreateView(TournamentCreatorRequiredMixin, CreateView):
             tournament.created_by = request.user
             tournament.number_of_rounds = archetype.calculate_rounds(num_players)
             tournament.number_of_courts = archetype.calculate_courts(num_players)
-            tournament.save()
-            tournament.players.set(players)
 
             # Create a single default stage for MoC tournaments
             from ..models.base_models import Stage
@@ -304,24 +364,23 @@ class TournamentCreateView(TournamentCreatorRequiredMixin, CreateView):
             archetype_impl = get_implementation(archetype)
 
             if tournament.number_of_stages == 1:
-                stage = Stage.objects.create(
-                    tournament=tournament,
-                    stage_number=1,
-                    stage_type='ROUND_ROBIN',
-                    name="Main Stage",
-                    scoring_mode='CUMULATIVE'
-                )
-                archetype_impl.generate_matchups(tournament, players, stage=stage)
+                stages = [Stage(tournament=tournament, stage_number=1, stage_type='ROUND_ROBIN',
+                                name="Main Stage", scoring_mode='CUMULATIVE')]
             else:
                 # Multi-stage MoC (future feature)
-                for stage_num in range(1, tournament.number_of_stages + 1):
-                    stage = Stage.objects.create(
-                        tournament=tournament,
-                        stage_number=stage_num,
-                        stage_type='ROUND_ROBIN',
-                        name=f"Stage {stage_num}",
-                        scoring_mode='CUMULATIVE'
-                    )
+                stages = [
+                    Stage(tournament=tournament, stage_number=stage_num, stage_type='ROUND_ROBIN',
+                          name=f"Stage {stage_num}", scoring_mode='CUMULATIVE')
+                    for stage_num in range(1, tournament.number_of_stages + 1)
+                ]
+
+            # Everything is written with bulk inserts, in one transaction.
+            with transaction.atomic():
+                tournament.save()
+                TournamentPlayer.objects.bulk_create([
+                    TournamentPlayer(tournament_chart=tournament, player=player) for player in players
+                ])
+                for stage in Stage.objects.bulk_create(stages):
                     archetype_impl.generate_matchups(tournament, players, stage=stage)
 
             messages.success(request, f"Tournament created successfully with {num_players} players!")
@@ -329,21 +388,10 @@ class TournamentCreateView(TournamentCreatorRequiredMixin, CreateView):
 
         elif tournament_category == 'PAIRS':
             # For pairs tournaments, create pairs from consecutive players in entry order
-            # Keep players in the order they were entered (not sorted by ranking)
-            pairs = []
-            for i in range(0, len(players), 2):
-                pair = Pair.objects.create(
-                    player1=players[i],
-                    player2=players[i+1],
-                    entry_order=len(pairs) + 1  # 1-based entry order
-                )
-                pairs.append(pair)
-
-            # Now assign seeds based on combined ranking points (higher points = lower seed number)
-            pairs_sorted_by_ranking = sorted(pairs, key=lambda p: p.ranking_points_sum, reverse=True)
-            for idx, pair in enumerate(pairs_sorted_by_ranking, start=1):
-                pair.seed = idx
-                pair.save()
+            # Keep players in the order they were entered (not sorted by ranking), and
+            # seed them by combined ranking points (higher points = lower seed number).
+            # With a registration date, the points are those of that day, from the ranking history.
+            pairs = Pair.seeded_from_players(players, as_of=form.instance.seeding_as_of())
 
             tournament = form.save(commit=False)
             tournament.archetype = archetype
@@ -354,14 +402,21 @@ class TournamentCreateView(TournamentCreatorRequiredMixin, CreateView):
             tournament.number_of_rounds = archetype_impl.calculate_rounds(len(pairs))
             tournament.number_of_courts = archetype_impl.calculate_courts(len(pairs))
 
+            def save_tournament_and_pairs():
+                tournament.save()
+                Pair.objects.bulk_create(pairs)
+                TournamentPair.objects.bulk_create([
+                    TournamentPair(tournament_chart=tournament, pair=pair) for pair in pairs
+                ])
+
             if getattr(archetype_impl, 'is_multi_phase', False):
                 # Multi-phase format (euros): fixed stage structure, later stages are
                 # generated from results via the "Generate next phase" action.
                 tournament.number_of_stages = len(archetype_impl.STAGE_DEFINITIONS)
-                tournament.save()
-                tournament.pairs.set(pairs)
-                stages = archetype_impl.create_stages(tournament)
-                archetype_impl.generate_matchups(tournament, pairs, stage=stages[0])
+                with transaction.atomic():
+                    save_tournament_and_pairs()
+                    stages = archetype_impl.create_stages(tournament)
+                    archetype_impl.generate_matchups(tournament, pairs, stage=stages[0])
                 messages.success(
                     request,
                     f"Tournament created with {len(pairs)} pairs. {stages[0].name} is ready; "
@@ -369,21 +424,17 @@ class TournamentCreateView(TournamentCreatorRequiredMixin, CreateView):
                 )
                 return redirect('tournament_detail', pk=tournament.pk)
 
-            tournament.save()
-            tournament.pairs.set(pairs)
-
             # Create stages and generate matchups for each stage
             num_stages = tournament.number_of_stages
-            for stage_num in range(1, num_stages + 1):
-                stage = Stage.objects.create(
-                    tournament=tournament,
-                    stage_number=stage_num,
-                    stage_type='POOL',
-                    name=f"Stage {stage_num}",
-                    scoring_mode='CUMULATIVE'
-                )
-                # Generate matchups for this stage
-                archetype_impl.generate_matchups(tournament, pairs, stage=stage)
+            with transaction.atomic():
+                save_tournament_and_pairs()
+                stages = Stage.objects.bulk_create([
+                    Stage(tournament=tournament, stage_number=stage_num, stage_type='POOL',
+                          name=f"Stage {stage_num}", scoring_mode='CUMULATIVE')
+                    for stage_num in range(1, num_stages + 1)
+                ])
+                for stage in stages:
+                    archetype_impl.generate_matchups(tournament, pairs, stage=stage)
 
             messages.success(request, f"Tournament created successfully with {len(pairs)} pairs and {num_stages} stage(s)!")
             return redirect('tournament_detail', pk=tournament.pk)
@@ -408,7 +459,7 @@ class TournamentCreateView(TournamentCreatorRequiredMixin, CreateView):
                 return render(request, 'tournament_creator/tournament_create.html', context)
         return super().get(request, *args, **kwargs)
 
-class TournamentDetailView(SpectatorAccessMixin, DetailView):
+class TournamentDetailView(SpectatorAccessMixin, TournamentConditionalGetMixin, DetailView):
     model = TournamentChart
     template_name = 'tournament_creator/tournament_detail.html'
     context_object_name = 'tournament'
@@ -433,8 +484,9 @@ class TournamentDetailView(SpectatorAccessMixin, DetailView):
         # Get all players for name disambiguation BEFORE setting display names
         if is_pairs_tournament:
             # For pairs tournaments, get players from the pairs
+            tournament_pairs = list(tournament.pairs.select_related('player1', 'player2'))
             all_players = []
-            for pair in tournament.pairs.all():
+            for pair in tournament_pairs:
                 all_players.extend([pair.player1, pair.player2])
         else:
             # For MoC tournaments, get players from the tournament
@@ -501,7 +553,7 @@ class TournamentDetailView(SpectatorAccessMixin, DetailView):
         # what you're playing to. Reuses the same rules score validation runs on.
         for matchup in my_matchups:
             if not matchup.scores.all():
-                matchup.score_rules_text = _score_rules_text(_expected_score_rules(tournament, matchup))
+                matchup.score_rules_text = score_rules_text(expected_score_rules(tournament, matchup))
 
         # NOW group matchups by stage (after display names are set)
         matchups_by_stage = {}
@@ -540,7 +592,7 @@ class TournamentDetailView(SpectatorAccessMixin, DetailView):
         if is_pairs_tournament:
             # For doubles tournaments, use PairScore
             from ..models.scoring import PairScore
-            pair_scores = list(PairScore.objects.filter(tournament=tournament))
+            pair_scores = list(PairScore.objects.filter(tournament=tournament).select_related('pair__player1', 'pair__player2'))
 
             # Sort by wins (descending) then point difference (descending)
             pair_scores.sort(key=lambda s: (s.wins, s.total_point_difference), reverse=True)
@@ -583,12 +635,23 @@ class TournamentDetailView(SpectatorAccessMixin, DetailView):
         context['tournament_complete'] = total_matchups > 0 and total_matchups == matchups_with_scores
         
         context['match_logs'] = MatchResultLog.objects.filter(
-            matchup__tournament_chart=tournament
-        ).select_related('recorded_by', 'matchup').order_by('-recorded_at')[:10]
-        context['can_record_scores'] = tournament.user_can_edit_results(self.request.user)
+            tournament=tournament
+        ).select_related('recorded_by', 'matchup').order_by('-id')[:10]
+        # One access object answers every permission question on this page
+        # (and in the templates, as ``access``) from a single role query.
+        access = get_tournament_access(self.request, tournament)
+        context['access'] = access
+        context['can_record_scores'] = access.can_edit_results
         # Director rights are per tournament: its creator, the directors they
         # appointed, and global admins.
-        context['can_administer'] = tournament.user_can_administer(self.request.user)
+        context['can_administer'] = access.can_administer
+        # Cached template fragments (schedule, standings, players, structure)
+        # vary on this; per-viewer parts add their permission to the key.
+        # Player renames and ranking syncs don't touch the tournament, so the
+        # player data version is part of it too.
+        context['fragment_stamp'] = (f'{tournament_stamp(tournament)}.{tournament.name_display_format}.'
+                                     f'{player_directory.data_stamp()}')
+        context['fragment_timeout'] = FRAGMENT_TIMEOUT
         # Creator first, then the directors they appointed — players use this to
         # know who to ask about the schedule.
         directors = [tournament.created_by] if tournament.created_by else []
@@ -596,11 +659,7 @@ class TournamentDetailView(SpectatorAccessMixin, DetailView):
         context['directors'] = directors
         # Surface why recording is unavailable so players aren't left guessing.
         # Sandbox tournaments never lock, so don't claim otherwise.
-        context['results_locked_past'] = (
-            tournament.is_past()
-            and not tournament.is_sandbox
-            and not context['can_administer']
-        )
+        context['results_locked_past'] = access.results_locked_past
 
         # Set display names for player scores
         if not is_pairs_tournament:
@@ -614,12 +673,12 @@ class TournamentDetailView(SpectatorAccessMixin, DetailView):
 
         # Generate tournament structure if show_structure is enabled
         if tournament.show_structure:
-            context['tournament_structure'] = self._generate_tournament_structure(tournament, all_players, use_last_names)
+            context['tournament_structure'] = self._generate_tournament_structure(tournament, all_matchups, all_players)
 
         # Set display names for the Pairs/Players list block
         if is_pairs_tournament:
             # Get pairs and set display names
-            pairs_list = list(tournament.pairs.all())
+            pairs_list = tournament_pairs
             for pair in pairs_list:
                 pair.player1.display_name = pair.player1.get_display_name_last_name_mode(all_players) if use_last_names else pair.player1.get_display_name(all_players)
                 pair.player2.display_name = pair.player2.get_display_name_last_name_mode(all_players) if use_last_names else pair.player2.get_display_name(all_players)
@@ -644,11 +703,13 @@ class TournamentDetailView(SpectatorAccessMixin, DetailView):
                         else player.get_display_name(all_players)
                     )
 
+            # One load answers every question below: pools, standings, progress, finals.
+            phase_state = archetype_impl.get_phase_state(tournament)
             pool_data_by_stage = {}
             for stage in stages:
                 pool_blocks = []
-                for pool in stage.pools.order_by('order'):
-                    standings = archetype_impl.get_pool_standings(pool)
+                for pool in phase_state.pools(stage):
+                    standings = phase_state.standings(pool)
                     for entry in standings:
                         set_pair_display_names(entry['pair'])
                     pool_blocks.append({
@@ -663,27 +724,22 @@ class TournamentDetailView(SpectatorAccessMixin, DetailView):
             context['pool_data_by_stage'] = pool_data_by_stage
 
             # State of the "Generate next phase" action
-            next_stage = archetype_impl.get_next_stage_to_generate(tournament)
-            can_advance_stage = False
-            if next_stage:
-                previous_stage = next((s for s in stages if s.stage_number == next_stage.stage_number - 1), None)
-                can_advance_stage = bool(previous_stage and archetype_impl.is_stage_complete(previous_stage))
-            context['next_stage'] = next_stage
-            context['can_advance_stage'] = can_advance_stage and context['can_record_scores']
+            context['next_stage'] = phase_state.next_stage
+            context['can_advance_stage'] = phase_state.can_advance and context['can_record_scores']
 
             # Warn before generating the next phase if a completed-stage tie is
             # ordered by seed alone — the rules want a disc flip recorded as a
             # manual resolution first (advancement is one-way).
             advance_seed_ties = []
             if context['can_advance_stage']:
-                advance_seed_ties = archetype_impl.get_unresolved_seed_ties(previous_stage)
+                advance_seed_ties = phase_state.unresolved_seed_ties(phase_state.previous_stage)
                 for tie in advance_seed_ties:
                     for pair in tie['pairs']:
                         set_pair_display_names(pair)
             context['advance_seed_ties'] = advance_seed_ties
 
             # Final standings once the finals placement matches are all played
-            final_standings = archetype_impl.get_final_standings(tournament)
+            final_standings = phase_state.final_standings
             if final_standings:
                 for entry in final_standings:
                     set_pair_display_names(entry['pair'])
@@ -695,415 +751,50 @@ class TournamentDetailView(SpectatorAccessMixin, DetailView):
         return context
         
     def apply_tiebreaks(self, tournament, player_scores):
-        """
-        Apply proper tiebreak analysis to sort players with equal wins.
-        
-        For Monarch of the Court (MoC) tournaments:
-        1. Overall wins
-        2. Head-to-head W/L ratio against other tied players
-        3. Point differential in games against other tied players
-        4. Manual resolution (requires UI implementation)
-        
-        For other tournaments (Swedish pairs, etc.):
-        1. Overall wins
-        2. Head-to-head record between tied players
-        3. Point differential in games between tied players
-        4. Record against teams that placed above the initial set of tied teams
-        5. Point differential in games against teams that placed above the initial set of tied teams
-        6. Point differential in games against all teams in the pool
-        """
-        # Check if this is a MoC tournament by examining matchup structure
-        is_moc_tournament = self._is_moc_tournament(tournament)
-        
-        if is_moc_tournament:
-            return self._apply_moc_tiebreaks(tournament, player_scores)
-        else:
-            return self._apply_pairs_tiebreaks(tournament, player_scores)
-    
-    def _is_moc_tournament(self, tournament):
-        """
-        Determine if this is a MoC tournament by checking matchup structure.
-        MoC tournaments use individual player fields, pairs tournaments use pair fields.
-        """
-        sample_matchup = tournament.matchups.first()
-        if sample_matchup:
-            # If it uses individual player fields, it's MoC
-            return (sample_matchup.pair1_player1_id is not None or 
-                    sample_matchup.pair1_player2_id is not None)
-        return False
-    
-    def _apply_moc_tiebreaks(self, tournament, player_scores):
-        """
-        Apply MoC-specific tiebreak logic:
-        1. Overall wins (already sorted)
-        2. W/L ratio in games against other tied players
-        3. Point differential in games against other tied players  
-        4. Manual resolution (to be implemented)
-        """
-        # First sort by wins and total point differential (basic sort)
-        sorted_scores = sorted(player_scores, key=lambda x: (-x.wins, -x.total_point_difference))
-        
-        # Look for groups of players with the same number of wins
-        groups_of_tied_players = []
-        current_group = []
-        current_wins = None
-        
-        for score in sorted_scores:
-            if current_wins is None or score.wins == current_wins:
-                current_group.append(score)
-                current_wins = score.wins
-            else:
-                if len(current_group) > 1:  # Only record groups with ties
-                    groups_of_tied_players.append(list(current_group))
-                current_group = [score]
-                current_wins = score.wins
-        
-        # Add the last group if it has ties
-        if len(current_group) > 1:
-            groups_of_tied_players.append(list(current_group))
-        
-        # No ties, return the basic sort
-        if not groups_of_tied_players:
-            return sorted_scores
-            
-        # Get all matchups in this tournament with scores
-        all_matchups = Matchup.objects.filter(
-            tournament_chart=tournament,
-            scores__isnull=False
-        ).prefetch_related('scores').distinct()
-        
-        # Process each group of tied players
-        for group in groups_of_tied_players:
-            wins_level = group[0].wins
-            tied_player_ids = [score.player.id for score in group]
-
-            # Check if there's a manual resolution for this win level
-            manual_resolution = None
-            try:
-                manual_resolution = ManualTiebreakResolution.objects.get(
-                    tournament=tournament,
-                    wins_tied_at=wins_level
-                )
-            except ManualTiebreakResolution.DoesNotExist:
-                pass
-            
-            # Create a record structure to hold MoC tiebreak criteria
-            tiebreak_records = {player_id: {
-                'h2h_wins': 0,                 # Head-to-head wins against tied players
-                'h2h_losses': 0,               # Head-to-head losses against tied players
-                'h2h_point_diff': 0,           # Head-to-head point differential against tied players
-                'needs_manual_resolution': False  # Flag for manual resolution
-            } for player_id in tied_player_ids}
-            
-            # Check each matchup to see if it involves tied players
-            for matchup in all_matchups:
-                # Identify players in team 1 and team 2
-                team1_players = set()
-                team2_players = set()
-                if matchup.pair1_player1_id: team1_players.add(matchup.pair1_player1_id)
-                if matchup.pair1_player2_id: team1_players.add(matchup.pair1_player2_id)
-                if matchup.pair2_player1_id: team2_players.add(matchup.pair2_player1_id)
-                if matchup.pair2_player2_id: team2_players.add(matchup.pair2_player2_id)
-                
-                # Find tied players in this matchup
-                tied_in_team1 = team1_players.intersection(tied_player_ids)
-                tied_in_team2 = team2_players.intersection(tied_player_ids)
-                
-                # Only count games between tied players (head-to-head)
-                is_h2h_match = len(tied_in_team1) > 0 and len(tied_in_team2) > 0
-                
-                if is_h2h_match:
-                    # Process all sets in this matchup
-                    for set_score in matchup.scores.all():
-                        team1_won = set_score.winning_team == 1
-                        
-                        # Process each tied player's results against other tied players
-                        for player_id in tied_player_ids:
-                            on_team1 = player_id in team1_players
-                            on_team2 = player_id in team2_players
-                            
-                            if not (on_team1 or on_team2):
-                                continue  # This player wasn't in this match
-                            
-                            # Calculate point differential from this player's perspective
-                            pd = set_score.point_difference
-                            if (on_team1 and not team1_won) or (on_team2 and team1_won):
-                                pd = -pd  # This player's team lost, so negate the PD
-                                tiebreak_records[player_id]['h2h_losses'] += 1
-                            else:
-                                tiebreak_records[player_id]['h2h_wins'] += 1
-                                
-                            tiebreak_records[player_id]['h2h_point_diff'] += pd
-            
-            # Sort tied players using MoC tiebreak criteria
-            def moc_sort_key(score):
-                player_id = score.player.id
-                h2h_wins = tiebreak_records[player_id]['h2h_wins']
-                h2h_losses = tiebreak_records[player_id]['h2h_losses']
-                
-                # Calculate W/L ratio (avoid division by zero)
-                if h2h_losses == 0:
-                    h2h_ratio = float('inf') if h2h_wins > 0 else 0
-                else:
-                    h2h_ratio = h2h_wins / h2h_losses
-                
-                return (
-                    -h2h_ratio,  # Higher W/L ratio is better
-                    -tiebreak_records[player_id]['h2h_point_diff']  # Higher point diff is better
-                )
-            
-            group.sort(key=moc_sort_key)
-
-            # Store the tiebreak info for display
-            for score in group:
-                player_id = score.player.id
-                score.h2h_wins = tiebreak_records[player_id]['h2h_wins']
-                score.h2h_losses = tiebreak_records[player_id]['h2h_losses']
-                score.h2h_point_diff = tiebreak_records[player_id]['h2h_point_diff']
-
-                # Calculate ratio for display
-                if score.h2h_losses == 0:
-                    score.h2h_ratio = float('inf') if score.h2h_wins > 0 else 0
-                else:
-                    score.h2h_ratio = score.h2h_wins / score.h2h_losses
-
-            # If manual resolution exists, apply it now (after tiebreak stats are calculated)
-            if manual_resolution:
-                # Get the automatic order before manual override
-                auto_order = [score.player.id for score in group]
-
-                # Apply manual order
-                player_order = {player_id: idx for idx, player_id in enumerate(manual_resolution.resolved_order)}
-                group.sort(key=lambda score: player_order.get(score.player.id, 999))
+        """Sort ``player_scores`` with the tiebreak rules (see tiebreaks.py)."""
+        return apply_tiebreaks(tournament, player_scores)
 
-                # Get manual order after sorting
-                manual_order = [score.player.id for score in group]
-
-                # Mark as manually resolved only if order differs from automatic
-                order_differs = auto_order != manual_order
-
-                for score in group:
-                    score.manually_resolved = order_differs
-                    score.manual_resolution_reason = manual_resolution.reason if order_differs else None
-        
-        # Rebuild the complete standings with tiebreak-sorted groups
-        return self._rebuild_standings(sorted_scores, groups_of_tied_players)
-    
-    def _apply_pairs_tiebreaks(self, tournament, player_scores):
+    def _generate_tournament_structure(self, tournament, matchups, all_players):
         """
-        Apply the existing 6-step tiebreak logic for pairs tournaments.
+        Generate tournament structure data for display: the round x court grid
+        of seed numbers, built in one pass over the already-loaded matchups.
+        Cached until the schedule or the seeding changes (structure_cache_key).
+        Returns a dict with court_numbers and rounds data, and the cache key
+        under ``key`` for the template fragment.
         """
-        # First sort by wins and total point differential (basic sort)
-        sorted_scores = sorted(player_scores, key=lambda x: (-x.wins, -x.total_point_difference))
-        
-        # Look for groups of players with the same number of wins
-        groups_of_tied_players = []
-        current_group = []
-        current_wins = None
-        
-        for score in sorted_scores:
-            if current_wins is None or score.wins == current_wins:
-                current_group.append(score)
-                current_wins = score.wins
-            else:
-                if len(current_group) > 1:  # Only record groups with ties
-                    groups_of_tied_players.append(list(current_group))
-                current_group = [score]
-                current_wins = score.wins
-        
-        # Add the last group if it has ties
-        if len(current_group) > 1:
-            groups_of_tied_players.append(list(current_group))
-        
-        # No ties, return the basic sort
-        if not groups_of_tied_players:
-            return sorted_scores
-            
-        # Get all matchups in this tournament with scores
-        all_matchups = Matchup.objects.filter(
-            tournament_chart=tournament,
-            scores__isnull=False
-        ).prefetch_related('scores').distinct()
-        
-        # Get players who placed above our tied groups (for tiebreak steps 4-5)
-        above_player_ids = set()
-        current_win_level = None
-        for score in sorted_scores:
-            if current_win_level is None:
-                current_win_level = score.wins
-            elif score.wins < current_win_level:
-                # We've moved to a new, lower win level
-                break
-            
-            # Add players at the current (highest) win level 
-            above_player_ids.add(score.player.id)
-        
-        # Process each group of tied players
-        for group in groups_of_tied_players:
-            # Get all matchups involving these players
-            tied_player_ids = [score.player.id for score in group]
-            
-            # Create a record structure to hold all tiebreak criteria
-            tiebreak_records = {player_id: {
-                'h2h_wins': 0,                 # Head-to-head wins (criterion 2)
-                'h2h_point_diff': 0,           # Head-to-head point diff (criterion 3)
-                'above_team_wins': 0,          # Wins against higher-placed teams (criterion 4)
-                'above_team_point_diff': 0,    # Point diff against higher-placed teams (criterion 5)
-                'total_point_diff': 0          # Point diff against all teams (criterion 6, already in score object)
-            } for player_id in tied_player_ids}
-            
-            # Check each matchup to see if it applies to our tiebreak criteria
-            for matchup in all_matchups:
-                # Identify players in team 1 and team 2
-                team1_players = set()
-                team2_players = set()
-                if matchup.pair1_player1_id: team1_players.add(matchup.pair1_player1_id)
-                if matchup.pair1_player2_id: team1_players.add(matchup.pair1_player2_id)
-                if matchup.pair2_player1_id: team2_players.add(matchup.pair2_player1_id)
-                if matchup.pair2_player2_id: team2_players.add(matchup.pair2_player2_id)
-                
-                # Find tied players in this matchup
-                tied_in_team1 = team1_players.intersection(tied_player_ids)
-                tied_in_team2 = team2_players.intersection(tied_player_ids)
-                
-                # To count for head-to-head criteria, the match must involve players from the tied group
-                # on both sides of the match (as opponents, not just as partners)
-                is_h2h_match = len(tied_in_team1) > 0 and len(tied_in_team2) > 0
-                
-                # Identify players from higher-placed teams
-                above_in_team1 = team1_players.intersection(above_player_ids)
-                above_in_team2 = team2_players.intersection(above_player_ids)
-                
-                # Process all sets in this matchup
-                for set_score in matchup.scores.all():
-                    team1_won = set_score.winning_team == 1
-                    
-                    # Process each tied player's results
-                    for player_id in tied_player_ids:
-                        on_team1 = player_id in team1_players
-                        on_team2 = player_id in team2_players
-                        
-                        if not (on_team1 or on_team2):
-                            continue  # This player wasn't in this match
-                        
-                        # Calculate point differential from this player's perspective
-                        pd = set_score.point_difference
-                        if (on_team1 and not team1_won) or (on_team2 and team1_won):
-                            pd = -pd  # This player's team lost, so negate the PD
-                            
-                        # Update head-to-head records (criterion 2-3)
-                        if is_h2h_match:
-                            if (on_team1 and team1_won) or (on_team2 and not team1_won):
-                                tiebreak_records[player_id]['h2h_wins'] += 1
-                            tiebreak_records[player_id]['h2h_point_diff'] += pd
-                            
-                        # Wins against higher-placed teams (criterion 4-5)
-                        # If this player played against higher-placed teams, count it
-                        opponent_has_above = False
-                        if on_team1 and above_in_team2:
-                            opponent_has_above = True
-                        elif on_team2 and above_in_team1:
-                            opponent_has_above = True
-                            
-                        if opponent_has_above:
-                            if (on_team1 and team1_won) or (on_team2 and not team1_won):
-                                tiebreak_records[player_id]['above_team_wins'] += 1
-                            tiebreak_records[player_id]['above_team_point_diff'] += pd
-            
-            # Apply total point differential from all games
-            for score in group:
-                tiebreak_records[score.player.id]['total_point_diff'] = score.total_point_difference
-            
-            # Sort the tied players using all tiebreak criteria
-            group.sort(key=lambda score: (
-                -tiebreak_records[score.player.id]['h2h_wins'],           # Criterion 2: H2H wins
-                -tiebreak_records[score.player.id]['h2h_point_diff'],     # Criterion 3: H2H point diff
-                -tiebreak_records[score.player.id]['above_team_wins'],    # Criterion 4: Wins vs above teams
-                -tiebreak_records[score.player.id]['above_team_point_diff'], # Criterion 5: PD vs above teams
-                -tiebreak_records[score.player.id]['total_point_diff']    # Criterion 6: Total PD
-            ))
-            
-            # Store the tiebreak info for display
-            for score in group:
-                player_id = score.player.id
-                score.h2h_wins = tiebreak_records[player_id]['h2h_wins']
-                score.h2h_point_diff = tiebreak_records[player_id]['h2h_point_diff']
-                score.above_wins = tiebreak_records[player_id]['above_team_wins']
-                score.above_pd = tiebreak_records[player_id]['above_team_point_diff']
-        
-        # Rebuild the complete standings with tiebreak-sorted groups
-        return self._rebuild_standings(sorted_scores, groups_of_tied_players)
-    
-    def _rebuild_standings(self, sorted_scores, groups_of_tied_players):
-        """
-        Helper method to rebuild final standings with tiebreak-sorted groups.
-        """
-        final_standings = []
-        
-        # Map of wins to groups of tied players
-        tied_groups_by_wins = {
-            group[0].wins: group for group in groups_of_tied_players
-        }
-        
-        # Rebuild the sorted list with tiebreak groups
-        for score in sorted_scores:
-            if score.wins in tied_groups_by_wins and len(tied_groups_by_wins[score.wins]) > 0:
-                # Add all players from this tied group
-                tied_group = tied_groups_by_wins[score.wins]
-                final_standings.extend(tied_group)
-                tied_groups_by_wins[score.wins] = []  # Mark as processed
-            elif score not in final_standings:
-                # Add individual player not in a tie group
-                final_standings.append(score)
-        
-        return final_standings
-
-    def _generate_tournament_structure(self, tournament, all_players, use_last_names):
-        """
-        Generate tournament structure data for display.
-        Returns a dict with court_numbers and rounds data.
-        """
-        # Get all matchups ordered by round and court
-        matchups = tournament.matchups.all().order_by('round_number', 'court_number')
-
         if not matchups:
-            return {'court_numbers': [], 'rounds': []}
-
-        # Determine court numbers and round numbers
-        court_numbers = sorted(set(m.court_number for m in matchups))
-        round_numbers = sorted(set(m.round_number for m in matchups))
-
-        # Create player seeding map (rank -> seed number)
-        tournament_players = list(tournament.players.all().order_by('ranking'))
-        seed_map = {player.id: idx + 1 for idx, player in enumerate(tournament_players)}
-
-        # Build structure by rounds
-        rounds_data = []
-        for round_num in round_numbers:
-            round_matchups = matchups.filter(round_number=round_num).order_by('court_number')
-
-            # Create matchups for each court in this round
-            matchup_strings = []
-            for court_num in court_numbers:
-                matchup = round_matchups.filter(court_number=court_num).first()
-
-                if matchup:
-                    matchup_str = self._format_matchup_structure(matchup, seed_map, all_players, use_last_names)
-                    matchup_strings.append(matchup_str)
-                else:
-                    matchup_strings.append('-')
-
-            rounds_data.append({
-                'round_number': round_num,
-                'matchups': matchup_strings
-            })
+            return {'key': '', 'court_numbers': [], 'rounds': []}
+
+        # Player seeding map (player id -> seed number, by ranking)
+        seeding = [player.id for player in sorted(all_players, key=lambda player: player.ranking)]
+        key = structure_cache_key(tournament, matchups, seeding)
+
+        def build():
+            seed_map = {player_id: seed for seed, player_id in enumerate(seeding, start=1)}
+            grid = {}
+            for matchup in sorted(matchups, key=lambda m: (m.round_number, m.court_number)):
+                grid.setdefault((matchup.round_number, matchup.court_number), matchup)
+            court_numbers = sorted({court for _, court in grid})
+            round_numbers = sorted({round_num for round_num, _ in grid})
+            return {
+                'key': key,
+                'court_numbers': court_numbers,
+                'rounds': [
+                    {
+                        'round_number': round_num,
+                        'matchups': [
+                            self._format_matchup_structure(grid[round_num, court_num], seed_map)
+                            if (round_num, court_num) in grid else '-'
+                            for court_num in court_numbers
+                        ],
+                    }
+                    for round_num in round_numbers
+                ],
+            }
 
-        return {
-            'court_numbers': court_numbers,
-            'rounds': rounds_data
-        }
+        return get_cached(key, build)
 
-    def _format_matchup_structure(self, matchup, seed_map, all_players, use_last_names):
+    def _format_matchup_structure(self, matchup, seed_map):
         """
         Format a single matchup for structure display showing seed numbers.
         For MoC: "1&3 vs 6&8"
@@ -1129,75 +820,31 @@ class TournamentDetailView(SpectatorAccessMixin, DetailView):
         else:
             return "-"
 
-class TournamentDownloadResultsView(SpectatorAccessMixin, View):
-    """Download tournament results as a text file."""
+class TournamentDownloadResultsView(SpectatorAccessMixin, TournamentConditionalGetMixin, View):
+    """Download tournament results, streamed: plain text (default), CSV, JSON or,
+    for the tournament's directors, a full archive (see export.py)."""
+    per_user = False
 
-    def get(self, request, pk):
-        tournament = get_object_or_404(TournamentChart, pk=pk)
+    def get(self, request, pk, fmt='txt'):
+        tournament = get_object_or_404(TournamentChart.objects.select_related('archetype'), pk=pk)
+        if fmt not in export.FORMATS:
+            raise Http404(f"Unknown export format '{fmt}'")
+        if fmt == 'archive' and not get_tournament_access(request, tournament).can_administer:
+            raise PermissionDenied
 
-        # Determine if this is a pairs or MoC tournament
-        is_pairs_tournament = tournament.archetype and tournament.archetype.tournament_category == 'PAIRS'
-
-        # Build the text content
-        lines = []
-        lines.append(f"Tournament: {tournament.name}")
-        lines.append(f"Date: {tournament.date.strftime('%B %d, %Y')}")
-        lines.append("")
-        lines.append("Final Standings:")
-        lines.append("-" * 60)
-
-        from ..models.tournament_types import get_implementation
-        archetype_impl = get_implementation(tournament.archetype) if tournament.archetype else None
-        final_standings = None
-        if archetype_impl and getattr(archetype_impl, 'is_multi_phase', False):
-            final_standings = archetype_impl.get_final_standings(tournament)
-
-        if final_standings:
-            # Multi-phase (euros) format: placements come from the finals groups
-            for entry in final_standings:
-                player1 = entry['pair'].player1
-                player2 = entry['pair'].player2
-                full_name1 = f"{player1.first_name} {player1.last_name}".strip()
-                full_name2 = f"{player2.first_name} {player2.last_name}".strip()
-                lines.append(f"{entry['position']}. {full_name1} & {full_name2}")
-        elif is_pairs_tournament:
-            # For doubles tournaments, use PairScore
-            from ..models.scoring import PairScore
-            pair_scores = list(PairScore.objects.filter(tournament=tournament))
-
-            # Sort by wins (descending) then point difference (descending)
-            pair_scores.sort(key=lambda s: (s.wins, s.total_point_difference), reverse=True)
-
-            # Add position numbers and format output
-            for idx, score in enumerate(pair_scores, start=1):
-                player1 = score.pair.player1
-                player2 = score.pair.player2
-                full_name1 = f"{player1.first_name} {player1.last_name}".strip()
-                full_name2 = f"{player2.first_name} {player2.last_name}".strip()
-
-                lines.append(f"{idx}. {full_name1} & {full_name2} - {score.wins}W {score.total_point_difference:+d}PD")
-        else:
-            # For MoC tournaments, use PlayerScore
-            player_scores = list(PlayerScore.objects.filter(tournament=tournament))
-
-            # Get detail view instance to reuse tiebreak logic
-            detail_view = TournamentDetailView()
-            player_scores = detail_view.apply_tiebreaks(tournament, player_scores)
-
-            # Add position numbers and format output
-            for idx, score in enumerate(player_scores, start=1):
-                player = score.player
-                full_name = f"{player.first_name} {player.last_name}".strip()
-                if not full_name:
-                    full_name = player.username
-
-                lines.append(f"{idx}. {full_name} - {score.wins}W {score.total_point_difference:+d}PD")
+        response = StreamingHttpResponse(export.exporter(fmt)(tournament), content_type=export.FORMATS[fmt][0])
+        response['Content-Disposition'] = f'attachment; filename="{export.filename(tournament, fmt)}"'
+        return response
 
-        # Create response with text file
-        response = HttpResponse('\n'.join(lines), content_type='text/plain')
-        filename = f"{tournament.name.replace(' ', '_')}_{tournament.date.strftime('%Y%m%d')}.txt"
-        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+class SeasonResultsExportView(AdminRequiredMixin, View):
+    """Every counting tournament of a season in one streamed CSV or JSON file, for the ranking body."""
 
+    def get(self, request, year, fmt):
+        if fmt not in export.SEASON_FORMATS:
+            raise Http404(f"Unknown season export format '{fmt}'")
+        content = export.exporter(fmt)(export.season_tournaments(year))
+        response = StreamingHttpResponse(content, content_type=export.FORMATS[fmt][0])
+        response['Content-Disposition'] = f'attachment; filename="ddc_season_{year}.{fmt}"'
         return response
 
 class TournamentDeleteView(TournamentAdminRequiredMixin, DeleteView):
@@ -1210,14 +857,47 @@ class TournamentDeleteView(TournamentAdminRequiredMixin, DeleteView):
         messages.success(request, f'Tournament "{tournament.name}" has been deleted successfully.')
         return super().delete(request, *args, **kwargs)
 
+def _submitted_schedule(post, matchups):
+    """Apply the settings form's ``match_date_<id>`` / ``match_time_<id>`` fields to ``matchups``.
+
+    Only fields present in the submission count, and only matchups whose
+    date or time actually differs are changed (in memory). Returns
+    ``(changed, invalid)``: the changed matchups and the number of values
+    that couldn't be parsed, which are left as they were.
+    """
+    changed = []
+    invalid = 0
+    for matchup in matchups:
+        values = {}
+        for field, parse in (('match_date', parse_date), ('match_time', parse_time)):
+            key = f'{field}_{matchup.id}'
+            if key not in post:
+                continue
+            raw = post[key].strip()
+            try:
+                value = parse(raw) if raw else None
+            except ValueError:
+                value = None
+            if raw and value is None:
+                invalid += 1
+                continue
+            if value != getattr(matchup, field):
+                values[field] = value
+        if values:
+            for field, value in values.items():
+                setattr(matchup, field, value)
+            changed.append(matchup)
+    return changed, invalid
+
 @login_required
 def tournament_settings(request, tournament_id):
     """
-    View for assigning dates and times to matchups in league-format tournaments.
+    View for assigning dates and times to matchups in league-format tournaments,
+    one by one or from a calendar pattern (LeagueCalendarForm).
     """
     tournament = get_object_or_404(TournamentChart, id=tournament_id)
 
-    if not tournament.user_can_administer(request.user):
+    if not get_tournament_access(request, tournament).can_administer:
         messages.error(request, "Only this tournament's directors can assign match dates.")
         return redirect('tournament_detail', pk=tournament_id)
 
@@ -1226,36 +906,40 @@ def tournament_settings(request, tournament_id):
         messages.error(request, 'Date assignment is only available for league-format tournaments.')
         return redirect('tournament_detail', pk=tournament_id)
 
-    matchups = Matchup.objects.filter(tournament_chart=tournament).order_by('stage__stage_number', 'round_number', 'court_number')
+    matchups = list(Matchup.objects.filter(tournament_chart=tournament).select_related(
+        'stage', 'pair1__player1', 'pair1__player2', 'pair2__player1', 'pair2__player2',
+        'pair1_player1', 'pair1_player2', 'pair2_player1', 'pair2_player2',
+    ).order_by('stage__stage_number', 'round_number', 'court_number'))
+    calendar_form = LeagueCalendarForm()
 
     if request.method == 'POST':
-        # Process the date and time assignments
-        for matchup in matchups:
-            date_key = f'match_date_{matchup.id}'
-            time_key = f'match_time_{matchup.id}'
-
-            if date_key in request.POST:
-                date_value = request.POST.get(date_key)
-                if date_value:
-                    matchup.match_date = date_value
-                else:
-                    matchup.match_date = None
-
-            if time_key in request.POST:
-                time_value = request.POST.get(time_key)
-                if time_value:
-                    matchup.match_time = time_value
-                else:
-                    matchup.match_time = None
-
-            matchup.save()
-
-        messages.success(request, 'Match dates and times have been updated successfully.')
-        return redirect('tournament_detail', pk=tournament_id)
+        invalid = 0
+        if 'generate_calendar' in request.POST:
+            calendar_form = LeagueCalendarForm(request.POST)
+            changed = calendar_form.assign(matchups) if calendar_form.is_valid() else None
+        else:
+            changed, invalid = _submitted_schedule(request.POST, matchups)
+
+        if changed is not None:
+            # Only the rows that changed are written, in one batched UPDATE,
+            # and only they are marked as changed for delta consumers.
+            if changed:
+                with transaction.atomic():
+                    Matchup.objects.bulk_update(changed, ['match_date', 'match_time'])
+                    tournament.bump_results_version(
+                        Matchup.objects.filter(pk__in=[matchup.pk for matchup in changed]))
+            if invalid:
+                messages.warning(request, f"{invalid} date/time value(s) couldn't be read and were left unchanged.")
+            if changed:
+                messages.success(request, f'Dates and times updated for {len(changed)} match(es).')
+            else:
+                messages.info(request, 'No match dates or times changed.')
+            return redirect('tournament_detail', pk=tournament_id)
 
     context = {
         'tournament': tournament,
         'matchups': matchups,
+        'calendar_form': calendar_form,
     }
     return render(request, 'tournament_creator/tournament_settings.html', context)
 
@@ -1268,7 +952,7 @@ def generate_next_stage(request, tournament_id):
     """
     tournament = get_object_or_404(TournamentChart, id=tournament_id)
 
-    if not tournament.user_can_edit_results(request.user):
+    if not get_tournament_access(request, tournament).can_edit_results:
         messages.error(request, "You don't have permission to generate the next phase.")
         return redirect('tournament_detail', pk=tournament_id)
 
@@ -1279,7 +963,10 @@ def generate_next_stage(request, tournament_id):
         return redirect('tournament_detail', pk=tournament_id)
 
     try:
-        new_stage = archetype_impl.advance_to_next_stage(tournament)
+        with transaction.atomic():
+            new_stage = archetype_impl.advance_to_next_stage(tournament)
+            MatchResultLog.record_advance(tournament, new_stage, request.user)
+        tournament.bump_results_version(new_stage.matchups.all())
         messages.success(request, f"{new_stage.name} has been generated!")
     except ValueError as e:
         messages.error(request, str(e))
@@ -1301,7 +988,7 @@ def reset_sandbox_scores(request, tournament_id):
     from ..models.scoring import PairScore
     from ..models.tournament_types import get_implementation
     MatchScore.objects.filter(matchup__tournament_chart=tournament).delete()
-    MatchResultLog.objects.filter(matchup__tournament_chart=tournament).delete()
+    MatchResultLog.objects.filter(tournament=tournament).delete()
     # Aggregate standings are only recomputed on recording, so wipe them too;
     # they are recreated (get_or_create) as new results come in.
     PairScore.objects.filter(tournament=tournament).delete()
@@ -1314,9 +1001,8 @@ def reset_sandbox_scores(request, tournament_id):
     # tournament and is kept, and "Generate next phase" starts over.
     impl = get_implementation(tournament.archetype) if tournament.archetype else None
     if impl and getattr(impl, 'is_multi_phase', False):
-        for stage in tournament.stages.filter(stage_number__gte=2).order_by('stage_number'):
-            stage.matchups.all().delete()
-            stage.pools.all().delete()
+        impl.clear_generated_stages(tournament)
+    tournament.bump_results_version(tournament.matchups.all())
 
     messages.success(request, "Practice tournament reset — all recorded results were cleared.")
     return redirect('tournament_detail', pk=tournament_id)
@@ -1330,7 +1016,7 @@ def tournament_directors(request, tournament_id):
     """
     tournament = get_object_or_404(TournamentChart, id=tournament_id)
 
-    if not tournament.user_can_manage_directors(request.user):
+    if not get_tournament_access(request, tournament).can_manage_directors:
         messages.error(request, "Only this tournament's directors can manage the director list.")
         return redirect('tournament_detail', pk=tournament_id)
 
@@ -1343,6 +1029,7 @@ def tournament_directors(request, tournament_id):
             if role:
                 removed = role.user
                 role.delete()
+                tournament.touch()
                 messages.success(request, f"{removed.get_username()} is no longer a director of this tournament.")
             else:
                 messages.error(request, "That user isn't a director of this tournament.")
@@ -1356,6 +1043,7 @@ def tournament_directors(request, tournament_id):
                 user=new_director,
                 defaults={'added_by': request.user},
             )
+            tournament.touch()
             messages.success(request, f"{new_director.get_username()} can now direct this tournament.")
             return redirect('tournament_directors', tournament_id=tournament_id)
     else:
@@ -1377,7 +1065,7 @@ def manual_tiebreak_resolution(request, tournament_id):
     """
     tournament = get_object_or_404(TournamentChart, id=tournament_id)
 
-    if not tournament.user_can_administer(request.user):
+    if not get_tournament_access(request, tournament).can_administer:
         messages.error(request, "Only this tournament's directors can resolve tiebreaks.")
         return redirect('tournament_detail', pk=tournament_id)
 
@@ -1442,6 +1130,7 @@ def manual_tiebreak_resolution(request, tournament_id):
         # Add tied players to the many-to-many field
         tied_player_ids = [int(pid) for pid in player_order]
         resolution.tied_players.set(Player.objects.filter(id__in=tied_player_ids))
+        tournament.bump_results_version()
         
         messages.success(request, f'Manual tiebreak resolution saved for players with {wins_level} wins.')
         return redirect('tournament_detail', pk=tournament_id)
@@ -1472,26 +1161,26 @@ def _manual_pool_tiebreak_resolution(request, tournament, archetype_impl):
             reason=reason,
             resolved_by=request.user
         )
+        tournament.bump_results_version()
         messages.success(request, f'Manual tiebreak resolution saved for {pool.name} at {wins_level} wins.')
         return redirect('tournament_detail', pk=tournament.id)
 
+    phase_state = archetype_impl.get_phase_state(tournament)
     pool_ties = []
-    for pool in Pool.objects.filter(stage__tournament=tournament).order_by('stage__stage_number', 'order'):
-        standings = archetype_impl.get_pool_standings(pool)
-        tied_by_wins = {}
-        for entry in standings:
-            if entry.get('tied'):
-                tied_by_wins.setdefault(entry['wins'], []).append(entry)
-        for wins, entries in tied_by_wins.items():
-            pool_ties.append({
-                'pool': pool,
-                'stage': pool.stage,
-                'wins': wins,
-                'entries': entries,
-                'resolved': ManualPoolTiebreakResolution.objects.filter(
-                    pool=pool, wins_tied_at=wins
-                ).exists()
-            })
+    for stage in phase_state.stages:
+        for pool in phase_state.pools(stage):
+            tied_by_wins = {}
+            for entry in phase_state.standings(pool):
+                if entry.get('tied'):
+                    tied_by_wins.setdefault(entry['wins'], []).append(entry)
+            for wins, entries in tied_by_wins.items():
+                pool_ties.append({
+                    'pool': pool,
+                    'stage': stage,
+                    'wins': wins,
+                    'entries': entries,
+                    'resolved': phase_state.resolution(pool, wins) is not None,
+                })
 
     return render(request, 'tournament_creator/manual_tiebreak_resolution.html', {
         'tournament': tournament,
@@ -1512,106 +1201,18 @@ def _is_moc_tournament_helper(tournament):
                 sample_matchup.pair1_player2_id is not None)
     return False
 
-# Practice (sandbox) tournaments rehearse the Euros pool-phase game format so
-# players meet the score-check dialog before the real event; the set count is
-# left free so people can play around with multi-set entries.
-SANDBOX_SCORE_RULES = {'points_to': 21, 'cap': 23, 'best_of': None}
-
-
-def _score_rule_warnings(rules, team1_scores, team2_scores):
-    """Human-readable warnings for scores that don't fit the expected match format.
-
-    ``rules`` is the dict from TournamentArchetype.get_score_rules(): games are
-    played to ``points_to`` win-by-2, ``cap`` ends a game early, ``best_of`` is
-    the sets per match (None: any number of sets, validate each set only).
-    Returns [] when everything conforms.
-    """
-    points_to, cap, best_of = rules['points_to'], rules['cap'], rules['best_of']
-    warnings = []
-    multiple_sets = len(team1_scores) > 1
-    for set_num, (s1, s2) in enumerate(zip(team1_scores, team2_scores), 1):
-        prefix = f"Set {set_num}: " if multiple_sets else ""
-        hi, lo = max(s1, s2), min(s1, s2)
-        if s1 == s2:
-            warnings.append(f"{prefix}{s1}–{s2} is a tie — every game needs a winner.")
-        elif hi > cap:
-            warnings.append(f"{prefix}{hi} points is over the point cap of {cap}.")
-        elif hi < points_to:
-            warnings.append(f"{prefix}the game is played to {points_to}, but the winner has only {hi} points.")
-        elif hi == points_to:
-            if hi - lo < 2:
-                warnings.append(
-                    f"{prefix}the winner must lead by 2 points — at {hi}–{lo} "
-                    f"the game continues up to the cap of {cap}.")
-        elif hi - lo != 2 and not (hi == cap and hi - lo < 2):
-            # Past points_to a game only continues at deuce, so the final margin is
-            # exactly 2 — except a cap game, which can also end with a 1-point lead.
-            warnings.append(
-                f"{prefix}{hi}–{lo} isn't reachable playing to {points_to} "
-                f"win-by-2 (cap {cap}).")
-    if best_of == 1:
-        if multiple_sets:
-            warnings.append(f"This match is a single game, but {len(team1_scores)} sets were entered.")
-    elif best_of:
-        sets_needed = best_of // 2 + 1
-        wins1 = wins2 = 0
-        decided_after = None
-        for set_num, (s1, s2) in enumerate(zip(team1_scores, team2_scores), 1):
-            wins1 += 1 if s1 > s2 else 0
-            wins2 += 1 if s2 > s1 else 0
-            if decided_after is None and max(wins1, wins2) >= sets_needed:
-                decided_after = set_num
-        if decided_after is None:
-            warnings.append(
-                f"Best-of-{best_of} match: the winner needs {sets_needed} set wins, "
-                f"but these sets don't give either team {sets_needed}.")
-        elif decided_after < len(team1_scores):
-            warnings.append(
-                f"The match was already decided after set {decided_after} — "
-                f"the remaining sets shouldn't have been played.")
-    return warnings
-
-
-def _score_rules_text(rules):
-    """One-line human description of a match format, e.g. "Best of 3 to 15, cap 18"."""
-    if not rules:
-        return None
-    if rules['best_of'] == 1:
-        prefix = "One game"
-    elif rules['best_of']:
-        prefix = f"Best of {rules['best_of']}"
-    else:
-        prefix = "Games"
-    return f"{prefix} to {rules['points_to']}, win by 2, cap {rules['cap']}"
-
-
-def _expected_score_rules(tournament, matchup):
-    """The score rules to validate ``matchup`` against, or None (no validation)."""
-    from ..models.tournament_types import get_implementation
-    if tournament.archetype:
-        impl = get_implementation(tournament.archetype)
-        if impl:
-            rules = impl.get_score_rules(matchup)
-            if rules:
-                return rules
-    if tournament.is_sandbox:
-        return SANDBOX_SCORE_RULES
-    return None
-
 
 @login_required
 @require_POST
 def record_match_result(request, tournament_id, matchup_id):
     try:
-        matchup = get_object_or_404(Matchup, id=matchup_id)
+        # stage and pool name the match in the result log.
+        matchup = get_object_or_404(Matchup.objects.select_related('stage', 'pool'), id=matchup_id)
         tournament = get_object_or_404(TournamentChart, id=tournament_id)
 
-        if not tournament.user_can_edit_results(request.user):
-            if tournament.is_past() and not tournament.user_can_administer(request.user):
-                message = 'This tournament is in the past; results can no longer be edited.'
-            else:
-                message = "You don't have permission to record results for this tournament."
-            return JsonResponse({'status': 'error', 'message': message}, status=403)
+        access = get_tournament_access(request, tournament)
+        if not access.can_edit_results:
+            return JsonResponse({'status': 'error', 'message': access.edit_denied_message}, status=403)
 
         team1_scores = json.loads(request.POST.get('team1_scores', '[]'))
         team2_scores = json.loads(request.POST.get('team2_scores', '[]'))
@@ -1629,9 +1230,9 @@ def record_match_result(request, tournament_id, matchup_id):
         # resubmit with confirmed=1 saves anyway — forfeits, injury retirements
         # and director decisions produce legitimately non-conforming scores.
         if not request.POST.get('confirmed'):
-            rules = _expected_score_rules(tournament, matchup)
+            rules = expected_score_rules(tournament, matchup)
             if rules:
-                rule_warnings = _score_rule_warnings(rules, team1_scores, team2_scores)
+                rule_warnings = score_rule_warnings(rules, team1_scores, team2_scores)
                 if rule_warnings:
                     return JsonResponse({'status': 'needs_confirmation', 'warnings': rule_warnings})
 
@@ -1674,6 +1275,7 @@ def record_match_result(request, tournament_id, matchup_id):
         players = [p for p in players if p]
         
         # Delete existing scores and create new ones
+        previous_scores = list(matchup.scores.order_by('set_number').values_list('team1_score', 'team2_score'))
         matchup.scores.all().delete()
         for set_num, (s1, s2) in enumerate(zip(team1_scores, team2_scores), 1):
             # The winning_team and point_difference will be calculated automatically in the save method
@@ -1685,17 +1287,13 @@ def record_match_result(request, tournament_id, matchup_id):
             )
         
         # Create log entry
-        match_log_entry = MatchResultLog.objects.create(
-            matchup=matchup,
-            recorded_by=request.user,
-            action='UPDATE', # TODO: This should be dynamic (CREATE/UPDATE based on prior existence)
-            details={
-                'team1_scores': team1_scores,
-                'team2_scores': team2_scores,
-                'winning_team': winning_team,
-                'team1_sets_won': team1_sets_won,
-                'team2_sets_won': team2_sets_won
-            }
+        match_log_entry = MatchResultLog.record_result(
+            matchup, request.user,
+            before=previous_scores,
+            after=list(zip(team1_scores, team2_scores)),
+            winning_team=winning_team,
+            team1_sets_won=team1_sets_won,
+            team2_sets_won=team2_sets_won,
         )
         
         # Send email/Signal notifications without blocking the response — a Signal
@@ -1849,10 +1447,14 @@ def record_match_result(request, tournament_id, matchup_id):
 
         # For multi-phase pairs formats (euros), create the placement matches of a
         # finals group as soon as both of its semifinals have scores.
+        changed_ids = [matchup.id]
         if is_pairs_tournament and archetype_impl and getattr(archetype_impl, 'is_multi_phase', False):
-            archetype_impl.maybe_generate_placement_matches(tournament, matchup)
+            created = archetype_impl.maybe_generate_placement_matches(tournament, matchup)
+            changed_ids += [m.id for m in created]
+
+        tournament.bump_results_version(Matchup.objects.filter(id__in=changed_ids))
 
-        return JsonResponse({'status': 'success'})
+        return JsonResponse({'status': 'success', 'results_version': tournament.results_version})
         
     except Exception as e:
         # Log the error and return a helpful error message